@@ -0,0 +1,6 @@
+"""AbstractMemory benchmark suite (not shipped in the wheel).
+
+Run from the repository root:
+
+    python -m benchmarks.run --out bench.json
+"""
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional, Sequence
+
+# What a short-lived worker typically needs: the data model plus the stdlib-only store.
+DEFAULT_STATEMENT = "import abstractmemory; from abstractmemory import TripleAssertion, SQLiteTripleStore"
+
+# Must stay out of `DEFAULT_STATEMENT`'s import graph (optional deps and heavyweight stdlib modules).
+HEAVY_MODULES = (
+    "abstractmemory.embeddings",
+    "abstractmemory.in_memory_store",
+    "abstractmemory.lancedb_store",
+    "lancedb",
+    "pyarrow",
+    "numpy",
+    "urllib.request",
+    "http.client",
+    "ssl",
+)
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+exec({statement!r})
+elapsed = time.perf_counter() - t0
+print(json.dumps({{"ms": elapsed * 1000.0, "modules": sorted(sys.modules)}}))
+"""
+
+
+def measure_import(statement: str = DEFAULT_STATEMENT, *, runs: int = 5) -> Dict[str, Any]:
+    """Time `statement` in fresh interpreters; returns median/min ms and the heavy modules it loaded."""
+    env = dict(os.environ)
+    spec = importlib.util.find_spec("abstractmemory")  # locate without importing it here
+    if spec is not None and spec.origin:
+        # Let the child resolve the same (possibly uninstalled, src-layout) package as this process.
+        src = os.path.dirname(os.path.dirname(spec.origin))
+        env["PYTHONPATH"] = os.pathsep.join(p for p in (src, env.get("PYTHONPATH", "")) if p)
+    samples: List[float] = []
+    modules: List[str] = []
+    for _ in range(max(1, int(runs))):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(statement=statement)],
+            check=True,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        data = json.loads(out.stdout.strip().splitlines()[-1])
+        samples.append(float(data["ms"]))
+        modules = data["modules"]
+    return {
+        "statement": statement,
+        "runs": len(samples),
+        "median_ms": statistics.median(samples),
+        "min_ms": min(samples),
+        "modules_loaded": len(modules),
+        "heavy_modules": [m for m in HEAVY_MODULES if m in modules],
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="AbstractMemory cold-start (import time) check")
+    parser.add_argument("--statement", default=DEFAULT_STATEMENT)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=None, help="exit code 1 when the median exceeds this")
+    args = parser.parse_args(argv)
+
+    result = measure_import(args.statement, runs=args.runs)
+    print(json.dumps(result, indent=2, sort_keys=True))
+    over = args.budget_ms is not None and result["median_ms"] > args.budget_ms
+    return 1 if over or result["heavy_modules"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
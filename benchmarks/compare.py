@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+# (workload, metric, higher_is_better)
+_TRACKED = (
+    ("add", "rows_per_s", True),
+    ("point_query", "p50_ms", False),
+    ("point_query", "p99_ms", False),
+    ("subject_scan", "p50_ms", False),
+    ("subject_scan", "p99_ms", False),
+    ("anchor_index_query", "p50_ms", False),
+    ("anchor_index_query", "p99_ms", False),
+    ("time_range_scan", "p50_ms", False),
+    ("time_range_scan", "p99_ms", False),
+    ("semantic_topk", "p50_ms", False),
+    ("semantic_topk", "p99_ms", False),
+    ("semantic_mmr", "p50_ms", False),
+    ("semantic_mmr", "p99_ms", False),
+    ("footprint", "disk_bytes", False),
+    ("footprint", "python_heap_bytes", False),
+)
+
+
+def compare_reports(baseline: Dict[str, Any], candidate: Dict[str, Any], *, threshold: float = 0.10) -> List[Dict[str, Any]]:
+    """Return per-metric deltas; `regression` is set when the candidate is worse by > `threshold`."""
+    rows: List[Dict[str, Any]] = []
+    for backend, cand in (candidate.get("backends") or {}).items():
+        base = (baseline.get("backends") or {}).get(backend) or {}
+        for workload, metric, higher_better in _TRACKED:
+            old = (base.get(workload) or {}).get(metric)
+            new = (cand.get(workload) or {}).get(metric)
+            if not isinstance(old, (int, float)) or not isinstance(new, (int, float)) or old == 0:
+                continue
+            change = (new - old) / abs(old)
+            worse = -change if higher_better else change
+            rows.append(
+                {
+                    "backend": backend,
+                    "workload": workload,
+                    "metric": metric,
+                    "baseline": old,
+                    "candidate": new,
+                    "change": round(change, 4),
+                    "regression": worse > threshold,
+                }
+            )
+    return rows
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two AbstractMemory benchmark JSON reports")
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change counted as a regression")
+    args = parser.parse_args(argv)
+
+    rows = compare_reports(
+        json.loads(args.baseline.read_text(encoding="utf-8")),
+        json.loads(args.candidate.read_text(encoding="utf-8")),
+        threshold=args.threshold,
+    )
+    for r in rows:
+        flag = "REGRESSION" if r["regression"] else ""
+        print(f"{r['backend']:<9} {r['workload']:<16} {r['metric']:<18} {r['baseline']:>14} -> {r['candidate']:>14} ({r['change']:+.1%}) {flag}")
+    return 1 if any(r["regression"] for r in rows) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
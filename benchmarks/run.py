@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from abstractmemory import InMemoryTripleStore, SQLiteTripleStore, TripleAssertion, TripleQuery
+from abstractmemory.quantization import compare_precisions
+
+from .synthetic import HashingEmbedder, SyntheticKGConfig, generate_assertions
+
+
+BACKENDS = ("inmemory", "sqlite", "lancedb")
+
+
+@dataclass(frozen=True)
+class BenchConfig:
+    kg: SyntheticKGConfig = field(default_factory=SyntheticKGConfig)
+    backends: Tuple[str, ...] = BACKENDS
+    batch_size: int = 500
+    queries: int = 200
+    semantic_queries: int = 50
+    top_k: int = 10
+    range_hours: float = 24.0
+    embed_dim: int = 64
+    quantization_corpus: int = 2000  # 0 disables the precision recall/latency comparison
+
+
+def _percentiles(samples_s: Sequence[float]) -> Dict[str, float]:
+    if not samples_s:
+        return {"n": 0}
+    ms = sorted(s * 1000.0 for s in samples_s)
+
+    def _pick(p: float) -> float:
+        idx = min(len(ms) - 1, max(0, int(round(p * (len(ms) - 1)))))
+        return round(ms[idx], 4)
+
+    return {
+        "n": len(ms),
+        "p50_ms": _pick(0.50),
+        "p99_ms": _pick(0.99),
+        "mean_ms": round(sum(ms) / len(ms), 4),
+        "max_ms": round(ms[-1], 4),
+    }
+
+
+def _timed(fn: Callable[[], Any]) -> Tuple[float, Any]:
+    t0 = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t0, out
+
+
+def _dir_size(path: Path) -> int:
+    if path.is_file():
+        return path.stat().st_size
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += (Path(root) / name).stat().st_size
+            except OSError:
+                pass
+    return total
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def _open_store(backend: str, workdir: Path, embedder: HashingEmbedder) -> Tuple[Any, Optional[Path]]:
+    if backend == "inmemory":
+        return InMemoryTripleStore(embedder=embedder), None
+    if backend == "sqlite":
+        path = workdir / "kg.sqlite"
+        return SQLiteTripleStore(path), path
+    if backend == "lancedb":
+        from abstractmemory import LanceDBTripleStore
+
+        path = workdir / "kg.lancedb"
+        return LanceDBTripleStore(path, embedder=embedder), path
+    raise ValueError(f"unknown backend: {backend}")
+
+
+def _bench_backend(backend: str, cfg: BenchConfig, data: List[TripleAssertion], workdir: Path) -> Dict[str, Any]:
+    rng = random.Random(cfg.kg.seed + 1)
+    embedder = HashingEmbedder(cfg.embed_dim)
+    result: Dict[str, Any] = {}
+
+    # -- footprint: a separate traced ingest into a fresh store, so tracing never skews timings ------
+    footprint_dir = workdir / "footprint"
+    footprint_dir.mkdir(parents=True, exist_ok=True)
+    tracemalloc.start()
+    try:
+        traced, _ = _open_store(backend, footprint_dir, HashingEmbedder(cfg.embed_dim))
+        try:
+            for start in range(0, len(data), max(1, cfg.batch_size)):
+                traced.add(data[start : start + cfg.batch_size])
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            traced.close()
+    finally:
+        tracemalloc.stop()
+    shutil.rmtree(footprint_dir, ignore_errors=True)
+
+    store, disk_path = _open_store(backend, workdir, embedder)
+    try:
+        # -- add throughput (untraced) --------------------------------------------------------------
+        add_s = 0.0
+        for start in range(0, len(data), max(1, cfg.batch_size)):
+            batch = data[start : start + cfg.batch_size]
+            dt, _ = _timed(lambda: store.add(batch))
+            add_s += dt
+        result["add"] = {
+            "rows": len(data),
+            "seconds": round(add_s, 4),
+            "rows_per_s": round(len(data) / add_s, 1) if add_s > 0 else None,
+            "embed_calls": embedder.calls,
+        }
+        result["footprint"] = {
+            "python_heap_bytes": int(current),
+            "python_heap_peak_bytes": int(peak),
+            "disk_bytes": _dir_size(disk_path) if disk_path is not None else 0,
+        }
+
+        sample = [data[rng.randrange(len(data))] for _ in range(max(1, cfg.queries))]
+
+        # -- point lookups: (subject, predicate) within one owner --------------------------------------
+        lat = []
+        for a in sample:
+            q = TripleQuery(subject=a.subject, predicate=a.predicate, scope=a.scope, owner_id=a.owner_id, limit=cfg.top_k)
+            dt, _ = _timed(lambda: store.query(q))
+            lat.append(dt)
+        result["point_query"] = _percentiles(lat)
+
+        # -- subject scans: subject across every owner/scope ----------------------------------------------
+        lat = []
+        for a in sample:
+            q = TripleQuery(subject=a.subject, limit=cfg.top_k)
+            dt, _ = _timed(lambda: store.query(q))
+            lat.append(dt)
+        result["subject_scan"] = _percentiles(lat)
+
+        # -- anchor index: the same ids resolved through `anchor_query` (no embedding call) ------------
+        lat = []
+        for a in sample:
+            dt, _ = _timed(lambda: store.anchor_query(a.subject, limit=cfg.top_k))
+            lat.append(dt)
+        result["anchor_index_query"] = _percentiles(lat)
+
+        # -- time-range scans within one owner --------------------------------------------------------------
+        lat = []
+        returned = 0
+        for a in sample:
+            end = datetime.fromisoformat(a.observed_at)
+            q = TripleQuery(
+                scope=a.scope,
+                owner_id=a.owner_id,
+                since=(end - timedelta(hours=cfg.range_hours)).isoformat(timespec="microseconds"),
+                until=a.observed_at,
+                limit=0,
+            )
+            dt, hits = _timed(lambda: store.query(q))
+            lat.append(dt)
+            returned += len(hits)
+        result["time_range_scan"] = {**_percentiles(lat), "mean_rows": round(returned / len(sample), 2)}
+
+        # -- semantic top-k ------------------------------------------------------------------------------------
+        if backend == "sqlite":
+            result["semantic_topk"] = {"skipped": "SQLiteTripleStore is structured-query only"}
+            result["semantic_mmr"] = result["semantic_topk"]
+        else:
+            lat = []
+            for a in sample[: max(1, cfg.semantic_queries)]:
+                q = TripleQuery(query_text=f"{a.subject} {a.predicate}", scope=a.scope, limit=cfg.top_k)
+                dt, _ = _timed(lambda: store.query(q))
+                lat.append(dt)
+            result["semantic_topk"] = _percentiles(lat)
+
+            # -- the same queries diversified with MMR over a 10x candidate pool ----------------------
+            lat = []
+            for a in sample[: max(1, cfg.semantic_queries)]:
+                q = TripleQuery(query_text=f"{a.subject} {a.predicate}", scope=a.scope, limit=cfg.top_k, mmr_lambda=0.5)
+                dt, _ = _timed(lambda: store.query(q))
+                lat.append(dt)
+            result["semantic_mmr"] = _percentiles(lat)
+    finally:
+        store.close()
+    return result
+
+
+def run_suite(cfg: BenchConfig, *, workdir: Optional[Path] = None) -> Dict[str, Any]:
+    """Run every workload against every available backend and return a JSON-able report."""
+    data = generate_assertions(cfg.kg)
+    report: Dict[str, Any] = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "created_at": datetime.now().astimezone().isoformat(timespec="seconds"),
+        },
+        "config": asdict(cfg),
+        "backends": {},
+    }
+    with tempfile.TemporaryDirectory(dir=str(workdir) if workdir else None) as tmp:
+        for backend in cfg.backends:
+            bdir = Path(tmp) / backend
+            bdir.mkdir(parents=True, exist_ok=True)
+            try:
+                report["backends"][backend] = _bench_backend(backend, cfg, data, bdir)
+            except ImportError as e:
+                report["backends"][backend] = {"skipped": str(e)}
+
+    if cfg.quantization_corpus > 0:
+        embedder = HashingEmbedder(cfg.embed_dim)
+        corpus = embedder.embed_texts([f"{a.subject} {a.predicate} {a.object}" for a in data[: cfg.quantization_corpus]])
+        queries = embedder.embed_texts([f"{a.subject} {a.predicate}" for a in data[: max(1, cfg.semantic_queries)]])
+        report["quantization"] = compare_precisions(corpus, queries, k=cfg.top_k)
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="AbstractMemory TripleStore benchmarks")
+    parser.add_argument("--backends", default=",".join(BACKENDS), help="comma-separated: inmemory,sqlite,lancedb")
+    parser.add_argument("--entities", type=int, default=1000)
+    parser.add_argument("--assertions", type=int, default=10000)
+    parser.add_argument("--predicates", type=int, default=50)
+    parser.add_argument("--predicate-skew", type=float, default=1.1)
+    parser.add_argument("--owners", type=int, default=20)
+    parser.add_argument("--time-spread-days", type=float, default=30.0)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--semantic-queries", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--embed-dim", type=int, default=64)
+    parser.add_argument("--quantization-corpus", type=int, default=2000, help="0 disables the precision comparison")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", type=Path, default=None, help="write JSON here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    cfg = BenchConfig(
+        kg=SyntheticKGConfig(
+            entities=args.entities,
+            assertions=args.assertions,
+            predicates=args.predicates,
+            predicate_skew=args.predicate_skew,
+            owners=args.owners,
+            time_spread_days=args.time_spread_days,
+            seed=args.seed,
+        ),
+        backends=tuple(b.strip() for b in str(args.backends).split(",") if b.strip()),
+        batch_size=args.batch_size,
+        queries=args.queries,
+        semantic_queries=args.semantic_queries,
+        embed_dim=args.embed_dim,
+        quantization_corpus=args.quantization_corpus,
+    )
+    report = run_suite(cfg)
+    payload = json.dumps(report, indent=2, sort_keys=True)
+    if args.out is not None:
+        args.out.write_text(payload + "\n", encoding="utf-8")
+    else:
+        print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import random
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import List, Sequence, Tuple
+
+from abstractmemory import TripleAssertion
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+class HashingEmbedder:
+    """Deterministic, dependency-free `TextEmbedder` for benchmarks and tests.
+
+    Tokens are hashed into `dim` signed buckets (feature hashing) and the result is L2-normalized,
+    so texts sharing tokens are close in cosine space. No network, stable across processes.
+    """
+
+    def __init__(self, dim: int = 64) -> None:
+        self.dim = max(2, int(dim))
+        self.model_id = f"hashing-{self.dim}"
+        self.calls = 0
+        self.texts = 0
+
+    def embed_texts(self, texts: Sequence[str]) -> List[List[float]]:
+        self.calls += 1
+        self.texts += len(texts)
+        out: List[List[float]] = []
+        for t in texts:
+            v = [0.0] * self.dim
+            for tok in _TOKEN_RE.findall(str(t or "").lower()):
+                h = int.from_bytes(hashlib.blake2b(tok.encode("utf-8"), digest_size=8).digest(), "little")
+                v[h % self.dim] += 1.0 if (h >> 63) & 1 else -1.0
+            n = math.sqrt(sum(x * x for x in v)) or 1.0
+            out.append([x / n for x in v])
+        return out
+
+
+@dataclass(frozen=True)
+class SyntheticKGConfig:
+    """Shape of a synthetic knowledge graph.
+
+    - `predicate_skew`: Zipf exponent over predicates (0 = uniform; ~1.1 resembles extractor output).
+    - `owners`: number of distinct `owner_id`s, spread over `scopes` (global rows have no owner).
+    - `time_spread_days`: `observed_at` is uniform over this window ending at `end`.
+    """
+
+    entities: int = 1000
+    assertions: int = 10000
+    predicates: int = 50
+    predicate_skew: float = 1.1
+    owners: int = 20
+    scopes: Tuple[str, ...] = ("run", "session", "global")
+    time_spread_days: float = 30.0
+    literal_ratio: float = 0.2
+    end: str = "2026-01-31T00:00:00+00:00"
+    seed: int = 42
+
+
+def _zipf_weights(n: int, s: float) -> List[float]:
+    return [1.0 / ((i + 1) ** max(0.0, float(s))) for i in range(max(1, n))]
+
+
+def generate_assertions(cfg: SyntheticKGConfig) -> List[TripleAssertion]:
+    """Generate `cfg.assertions` deterministic assertions (same config -> same data)."""
+    rng = random.Random(cfg.seed)
+    end = datetime.fromisoformat(cfg.end)
+    if end.tzinfo is None:
+        end = end.replace(tzinfo=timezone.utc)
+    spread_us = int(float(cfg.time_spread_days) * 86400 * 1_000_000)
+
+    predicates = [f"p:rel_{i}" for i in range(max(1, cfg.predicates))]
+    weights = _zipf_weights(len(predicates), cfg.predicate_skew)
+    owners = [f"owner-{i:05d}" for i in range(max(1, cfg.owners))]
+    scopes = tuple(cfg.scopes) or ("run",)
+
+    out: List[TripleAssertion] = []
+    for i in range(int(cfg.assertions)):
+        subject = f"e:{rng.randrange(max(1, cfg.entities))}"
+        predicate = rng.choices(predicates, weights=weights, k=1)[0]
+        literal = rng.random() < float(cfg.literal_ratio)
+        obj = f"Value {rng.randrange(1000)}" if literal else f"e:{rng.randrange(max(1, cfg.entities))}"
+        scope = scopes[i % len(scopes)]
+        owner = None if scope == "global" else owners[rng.randrange(len(owners))]
+        observed = end - timedelta(microseconds=rng.randrange(max(1, spread_us)))
+        out.append(
+            TripleAssertion(
+                subject=subject,
+                predicate=predicate,
+                object=obj,
+                scope=scope,
+                owner_id=owner,
+                observed_at=observed.isoformat(timespec="microseconds"),
+                confidence=round(rng.random(), 3),
+                provenance={"span_id": f"span-{i}"},
+                attributes={"literal": True} if literal else {"evidence_quote": f"{subject} {predicate} {obj}"},
+            )
+        )
+    return out
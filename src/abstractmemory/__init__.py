@@ -1,17 +1,110 @@
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
 from .models import TripleAssertion
-from .embeddings import AbstractGatewayTextEmbedder, TextEmbedder
-from .in_memory_store import InMemoryTripleStore
-from .lancedb_store import LanceDBTripleStore
-from .sqlite_store import SQLiteTripleStore
-from .store import TripleStore, TripleQuery
+from .store import MaintainableTripleStore, TripleStore, TripleQuery
+
+# Everything else is imported on first attribute access (PEP 562), so `import abstractmemory` only
+# pays for the data model; backends, embedders and their dependencies load when used.
+_LAZY = {
+    "AbstractGatewayTextEmbedder": ".embeddings",
+    "CachedTextEmbedder": ".embedding_cache",
+    "CachedTripleStore": ".cached_store",
+    "CallbackSink": ".instrumentation",
+    "CopyStats": ".replication",
+    "FanOutSink": ".instrumentation",
+    "InMemoryTripleStore": ".in_memory_store",
+    "IngestPipeline": ".ingest",
+    "IngestStats": ".ingest",
+    "LanceDBTripleStore": ".lancedb_store",
+    "MetricsRegistry": ".instrumentation",
+    "MetricsSink": ".instrumentation",
+    "OpenTelemetrySink": ".instrumentation",
+    "OperationEvent": ".instrumentation",
+    "RecallScoring": ".scoring",
+    "RecallTrace": ".trace",
+    "RetentionEngine": ".retention",
+    "RetentionPolicy": ".retention",
+    "RetentionReport": ".retention",
+    "SQLiteTripleStore": ".sqlite_store",
+    "SQLiteWriterClient": ".sqlite_writer",
+    "SQLiteWriterServer": ".sqlite_writer",
+    "ShardedTripleStore": ".sharded_store",
+    "TextEmbedder": ".embeddings",
+    "TraceLog": ".trace",
+    "TraceRingBuffer": ".trace",
+    "TraceSink": ".trace",
+    "VectorBackfill": ".vector_columns",
+    "VectorColumn": ".vector_columns",
+    "copy_store": ".replication",
+}
+
+if TYPE_CHECKING:
+    from .cached_store import CachedTripleStore
+    from .embedding_cache import CachedTextEmbedder
+    from .embeddings import AbstractGatewayTextEmbedder, TextEmbedder
+    from .in_memory_store import InMemoryTripleStore
+    from .ingest import IngestPipeline, IngestStats
+    from .instrumentation import CallbackSink, FanOutSink, MetricsRegistry, MetricsSink, OpenTelemetrySink, OperationEvent
+    from .lancedb_store import LanceDBTripleStore
+    from .replication import CopyStats, copy_store
+    from .retention import RetentionEngine, RetentionPolicy, RetentionReport
+    from .scoring import RecallScoring
+    from .sharded_store import ShardedTripleStore
+    from .sqlite_store import SQLiteTripleStore
+    from .sqlite_writer import SQLiteWriterClient, SQLiteWriterServer
+    from .trace import RecallTrace, TraceLog, TraceRingBuffer, TraceSink
+    from .vector_columns import VectorBackfill, VectorColumn
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value  # later lookups skip this hook
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
+
 
 __all__ = [
     "AbstractGatewayTextEmbedder",
+    "CachedTextEmbedder",
+    "CallbackSink",
+    "CachedTripleStore",
+    "CopyStats",
+    "FanOutSink",
     "InMemoryTripleStore",
+    "IngestPipeline",
+    "IngestStats",
     "LanceDBTripleStore",
+    "MaintainableTripleStore",
+    "MetricsRegistry",
+    "MetricsSink",
+    "OpenTelemetrySink",
+    "OperationEvent",
+    "RecallScoring",
+    "RecallTrace",
+    "RetentionEngine",
+    "RetentionPolicy",
+    "RetentionReport",
     "SQLiteTripleStore",
+    "SQLiteWriterClient",
+    "SQLiteWriterServer",
+    "ShardedTripleStore",
     "TextEmbedder",
+    "TraceLog",
+    "TraceRingBuffer",
+    "TraceSink",
     "TripleAssertion",
     "TripleQuery",
     "TripleStore",
+    "VectorBackfill",
+    "VectorColumn",
+    "copy_store",
 ]
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .models import _EPOCH, iso_to_epoch_us
+from .store import TripleQuery
+
+# Columns an aggregate can group by (all canonical, exact-match fields).
+AGGREGATE_FIELDS = ("subject", "predicate", "object", "scope", "owner_id")
+# `min/max_observed_at` are computed on the epoch-microsecond axis and returned as UTC ISO strings;
+# rows whose `observed_at` does not parse are counted but ignored by min/max.
+AGGREGATE_METRICS = ("count", "min_observed_at", "max_observed_at")
+
+
+def normalize_aggregate(
+    q: TripleQuery, group_by: Sequence[str], metrics: Sequence[str]
+) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    if q.query_text or q.query_vector:
+        raise ValueError("aggregate() supports structured filters only")
+    groups = tuple(str(g).strip().lower() for g in group_by)
+    for g in groups:
+        if g not in AGGREGATE_FIELDS:
+            raise ValueError(f"group_by fields must be among {', '.join(AGGREGATE_FIELDS)}")
+    if len(set(groups)) != len(groups):
+        raise ValueError("group_by fields must be unique")
+    wanted = tuple(str(m).strip().lower() for m in metrics) or ("count",)
+    for m in wanted:
+        if m not in AGGREGATE_METRICS:
+            raise ValueError(f"metrics must be among {', '.join(AGGREGATE_METRICS)}")
+    return groups, wanted
+
+
+def epoch_us_to_iso(value: Optional[int]) -> Optional[str]:
+    if value is None:
+        return None
+    return (_EPOCH + timedelta(microseconds=int(value))).isoformat(timespec="microseconds")
+
+
+class GroupAccumulator:
+    """Partial aggregates keyed by group tuple (`count`, min/max observed epoch us); mergeable."""
+
+    def __init__(self, group_by: Sequence[str]) -> None:
+        self.group_by = tuple(group_by)
+        self.groups: Dict[Tuple[Any, ...], List[Any]] = {}
+
+    def add(self, key: Tuple[Any, ...], count: int, min_us: Optional[int], max_us: Optional[int]) -> None:
+        g = self.groups.get(key)
+        if g is None:
+            self.groups[key] = [int(count), min_us, max_us]
+            return
+        g[0] += int(count)
+        if min_us is not None and (g[1] is None or min_us < g[1]):
+            g[1] = min_us
+        if max_us is not None and (g[2] is None or max_us > g[2]):
+            g[2] = max_us
+
+    def add_row(self, key: Tuple[Any, ...], observed_us: Optional[int]) -> None:
+        self.add(key, 1, observed_us, observed_us)
+
+    def merge_rows(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """Fold in rows returned by another store's `aggregate()` (with every metric requested)."""
+        for r in rows:
+            self.add(
+                tuple(r.get(g) for g in self.group_by),
+                r.get("count") or 0,
+                iso_to_epoch_us(r.get("min_observed_at")),
+                iso_to_epoch_us(r.get("max_observed_at")),
+            )
+
+    def rows(self, metrics: Sequence[str], *, limit: Optional[int]) -> List[Dict[str, Any]]:
+        """Groups ordered by count (desc), then group values (asc, `None` first), capped at `limit`."""
+        ordered = sorted(
+            self.groups.items(),
+            key=lambda kv: (-kv[1][0], tuple((v is not None, v if v is not None else "") for v in kv[0])),
+        )
+        if not ordered and not self.group_by:
+            ordered = [((), [0, None, None])]  # a global aggregate always has one row
+        if limit is not None:
+            ordered = ordered[:limit]
+        out: List[Dict[str, Any]] = []
+        for key, (count, min_us, max_us) in ordered:
+            row: Dict[str, Any] = dict(zip(self.group_by, key))
+            if "count" in metrics:
+                row["count"] = count
+            if "min_observed_at" in metrics:
+                row["min_observed_at"] = epoch_us_to_iso(min_us)
+            if "max_observed_at" in metrics:
+                row["max_observed_at"] = epoch_us_to_iso(max_us)
+            out.append(row)
+        return out
+
+
+def group_limit(q: TripleQuery) -> Optional[int]:
+    """`q.limit` caps the number of groups (`limit <= 0` means unbounded, as for `query`)."""
+    raw = int(q.limit) if isinstance(q.limit, int) else 100
+    return None if raw <= 0 else max(1, raw)
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple, Union
+
+from .models import EPOCH_US_MIN, TripleAssertion, canonicalize_term
+
+# Typed facets indexed as `key=value` anchors (bounded: only these keys, short scalar values).
+ANCHOR_ATTRIBUTE_FACETS = ("subject_type", "object_type")
+ANCHOR_PROVENANCE_FACETS = (
+    "source_path",
+    "source_url",
+    "artifact_id",
+    "span_id",
+    "command",
+    "provider",
+    "model",
+    "tool_id",
+    "route",
+)
+ANCHOR_FACETS = ANCHOR_ATTRIBUTE_FACETS + ANCHOR_PROVENANCE_FACETS
+# Free-text attributes scanned for id-like tokens.
+ANCHOR_TEXT_ATTRIBUTES = ("evidence_quote", "original_context")
+
+# Token anchors taken from free text per assertion (first ones in text order win).
+MAX_TEXT_ANCHORS = 32
+MAX_ANCHOR_LENGTH = 200
+# Facet cues outrank token cues: a typed match is a stronger signal than a mention in text.
+FACET_WEIGHT = 2.0
+TOKEN_WEIGHT = 1.0
+# Anchors on more rows than this are too generic to seed candidates (they still add to scores).
+MAX_ANCHOR_POSTINGS = 5000
+
+_TOKEN = re.compile(r"\w[\w./:@#+~-]*")
+_ID_MARK = re.compile(r"[0-9/._:@#-]")
+
+
+def anchor_tokens(text: Any) -> List[str]:
+    """Id-like tokens in `text` (lowercased, in order, unique).
+
+    A token is kept when it has at least 3 characters and a digit or one of `/ . _ - : @ #`:
+    file paths, URLs, model names (`gpt-4o`), ticket/ADR ids (`adr-0009`), versions, snake_case
+    identifiers. Plain words are not anchors, so stopwords never are. Paths and URLs also
+    contribute their last segment (`src/a/store.py` -> `store.py`).
+    """
+    return list(_term_tokens(text)) if isinstance(text, str) and len(text) <= 64 else _tokens(str(text or ""))
+
+
+@lru_cache(maxsize=65536)
+def _term_tokens(text: str) -> Tuple[str, ...]:
+    # Short strings (subjects, objects) repeat across many assertions.
+    return tuple(_tokens(text))
+
+
+def _tokens(text: str) -> List[str]:
+    out: List[str] = []
+    seen: Set[str] = set()
+    has_mark = _ID_MARK.search
+    for raw in _TOKEN.findall(text):
+        token = raw.rstrip(".:-#@~+").lower()
+        if 3 <= len(token) <= MAX_ANCHOR_LENGTH and token not in seen and has_mark(token):
+            seen.add(token)
+            out.append(token)
+        if "/" in token:
+            tail = token.rstrip("/").rsplit("/", 1)[-1]
+            if 3 <= len(tail) <= MAX_ANCHOR_LENGTH and tail not in seen and has_mark(tail):
+                seen.add(tail)
+                out.append(tail)
+    return out
+
+
+def _facet_value(value: Any) -> Optional[str]:
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        return None
+    v = canonicalize_term(str(value))
+    return v if v and len(v) <= MAX_ANCHOR_LENGTH else None
+
+
+def extract_anchors(a: TripleAssertion) -> Tuple[str, ...]:
+    """Deterministic anchors for one assertion (sorted, unique).
+
+    - the whole subject and object terms
+    - id-like tokens (`anchor_tokens`) from the subject, the object and `ANCHOR_TEXT_ATTRIBUTES`
+    - `key=value` facets from `ANCHOR_ATTRIBUTE_FACETS` (attributes) and
+      `ANCHOR_PROVENANCE_FACETS` (provenance)
+    """
+    obj = a.object.lower()
+    anchors: Set[str] = {t for t in (a.subject, obj) if t and len(t) <= MAX_ANCHOR_LENGTH}
+    attrs = a.attributes if isinstance(a.attributes, dict) else {}
+    prov = a.provenance if isinstance(a.provenance, dict) else {}
+
+    texts = [a.subject, obj]
+    if attrs:
+        texts.extend(v for v in (attrs.get(k) for k in ANCHOR_TEXT_ATTRIBUTES) if isinstance(v, str))
+    budget = MAX_TEXT_ANCHORS
+    for text in texts:
+        for token in anchor_tokens(text):
+            if budget <= 0:
+                break
+            if token not in anchors:
+                anchors.add(token)
+                budget -= 1
+
+    for keys, source in ((ANCHOR_ATTRIBUTE_FACETS, attrs), (ANCHOR_PROVENANCE_FACETS, prov)):
+        if not source:
+            continue
+        for key in keys:
+            raw = source.get(key)
+            if raw is not None:
+                value = _facet_value(raw)
+                if value is not None:
+                    anchors.add(f"{key}={value}")
+    return tuple(sorted(anchors))
+
+
+def anchor_cues(
+    cues: Union[str, Iterable[str]] = (),
+    facets: Optional[Mapping[str, Any]] = None,
+) -> Dict[str, float]:
+    """Anchors to look up for an `anchor_query(...)`, with the weight each contributes to a score.
+
+    Each cue matches as a whole term (`"alice"`) and through its id-like tokens
+    (`"see src/store.py"` -> `src/store.py`, `store.py`).
+    """
+    weights: Dict[str, float] = {}
+    for cue in [cues] if isinstance(cues, str) else list(cues or ()):
+        whole = canonicalize_term(str(cue or ""))
+        if whole and len(whole) <= MAX_ANCHOR_LENGTH:
+            weights.setdefault(whole, TOKEN_WEIGHT)
+        for token in anchor_tokens(cue):
+            weights.setdefault(token, TOKEN_WEIGHT)
+    for key, value in (facets or {}).items():
+        k = str(key or "").strip().lower()
+        if k not in ANCHOR_FACETS:
+            raise ValueError(f"unknown anchor facet {key!r} (expected one of {', '.join(ANCHOR_FACETS)})")
+        v = _facet_value(value)
+        if v is None:
+            raise ValueError(f"anchor facet {k!r} needs a non-empty scalar value")
+        weights[f"{k}={v}"] = FACET_WEIGHT
+    if not weights:
+        raise ValueError("anchor_query() needs at least one cue or facet")
+    return weights
+
+
+def anchor_limit(limit: int) -> Optional[int]:
+    n = int(limit)
+    return n if n > 0 else None
+
+
+def selective_anchors(postings: Mapping[str, int], weights: Mapping[str, float], max_postings: int) -> List[str]:
+    """Looked-up anchors with at most `max_postings` rows (`postings`: rows per anchor); these seed candidates."""
+    cap = int(max_postings)
+    return sorted(k for k in weights if 0 < postings.get(k, 0) and (cap <= 0 or postings[k] <= cap))
+
+
+AnchorHit = Tuple[str, Optional[int], Sequence[str]]  # (assertion_id, observed_at epoch us, matched anchors)
+
+
+def rank_anchor_hits(
+    hits: Iterable[AnchorHit], weights: Mapping[str, float], *, limit: Optional[int]
+) -> List[Tuple[str, float, Tuple[str, ...]]]:
+    """`(assertion_id, score, matched)` by score (desc), then `observed_at` (desc), then id.
+
+    The score is the sum of the weights of the distinct matched anchors.
+    """
+    ranked = []
+    for assertion_id, observed_us, matched in hits:
+        m = tuple(sorted(set(matched) & weights.keys()))
+        if m:
+            observed = observed_us if observed_us is not None else EPOCH_US_MIN
+            ranked.append((-sum(weights[x] for x in m), -observed, assertion_id, m))
+    ranked.sort()
+    if limit is not None:
+        ranked = ranked[:limit]
+    return [(assertion_id, -neg_score, m) for neg_score, _, assertion_id, m in ranked]
+
+
+def with_anchor_retrieval(a: TripleAssertion, score: float, matched: Sequence[str]) -> TripleAssertion:
+    """Copy of `a` explaining the match in `attributes["_retrieval"]` (score + matched anchors)."""
+    attrs = dict(a.attributes) if isinstance(a.attributes, dict) else {}
+    attrs["_retrieval"] = {"metric": "anchors", "score": float(score), "anchors": list(matched)}
+    return TripleAssertion._from_canonical(
+        subject=a.subject,
+        predicate=a.predicate,
+        object=a.object,
+        scope=a.scope,
+        owner_id=a.owner_id,
+        observed_at=a.observed_at,
+        valid_from=a.valid_from,
+        valid_until=a.valid_until,
+        confidence=a.confidence,
+        provenance=dict(a.provenance),
+        attributes=attrs,
+        assertion_id=a.assertion_id,
+    )
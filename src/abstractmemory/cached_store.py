@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .instrumentation import MetricsSink, start_span
+from .models import TripleAssertion, canonicalize_term
+from .store import TripleQuery, TripleStore
+
+
+_Bucket = Tuple[Optional[str], Optional[str]]  # (scope, owner_id) pinned by the query (None = any)
+
+
+def query_cache_key(q: TripleQuery) -> Tuple[Hashable, ...]:
+    """Return a hashable key for a (normalized) `TripleQuery`.
+
+    `TripleQuery.__post_init__` already canonicalizes terms/timestamps; here we only freeze the
+    vector and collapse equivalent limit/order spellings.
+    """
+    raw_limit = int(q.limit) if isinstance(q.limit, int) else 100
+    vector = tuple(float(x) for x in q.query_vector) if q.query_vector else None
+    semantic = bool(q.query_text or vector)
+    return (
+        q.subject,
+        q.predicate,
+        q.object,
+        q.scope,
+        q.owner_id,
+        q.since,
+        q.until,
+        q.active_at,
+        q.query_text,
+        vector,
+        q.vector_column if semantic else None,
+        q.min_score if semantic else None,
+        (q.mmr_lambda, q.mmr_pool, q.collapse_triples, q.scoring) if semantic else None,
+        max(0, raw_limit),
+        # Semantic results are score-ranked; `order` only matters for structured queries.
+        None if semantic else ("asc" if str(q.order).lower() == "asc" else "desc"),
+    )
+
+
+@dataclass
+class _Entry:
+    results: List[TripleAssertion]
+    bucket: _Bucket
+    subject: Optional[str]
+    predicate: Optional[str]
+    object: Optional[str]
+
+
+class CachedTripleStore:
+    """Read-through LRU cache for `query(...)` results with write-aware invalidation.
+
+    Notes:
+    - Wraps any `TripleStore`; `add(...)` is forwarded and then evicts exactly the cached queries an
+      added assertion could match (pinned scope/owner_id/subject/predicate/object compared against
+      the assertion; time/semantic filters are treated conservatively as "could match").
+    - Writes that bypass this wrapper (other processes, direct backend calls) are not seen; use
+      `invalidate_all()` or keep the cache per-process/per-session.
+    - Cached semantic results also skip re-embedding `query_text`.
+    - `instrumentation` (a `MetricsSink`) receives one `cache.query` event per lookup with a
+      `cache_hit` or `cache_miss` counter (miss latency includes the wrapped store's query).
+    """
+
+    def __init__(
+        self,
+        store: TripleStore,
+        *,
+        max_entries: int = 1024,
+        instrumentation: Optional[MetricsSink] = None,
+    ) -> None:
+        self._store = store
+        self._instrumentation = instrumentation
+        self._max_entries = max(1, int(max_entries))
+        self._lock = threading.RLock()
+        self._entries: "OrderedDict[Tuple[Hashable, ...], _Entry]" = OrderedDict()
+        self._by_bucket: Dict[_Bucket, Set[Tuple[Hashable, ...]]] = {}
+        # Bumped on every write so a query that raced with `add()` does not cache stale results.
+        self._generation = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    @property
+    def store(self) -> TripleStore:
+        return self._store
+
+    def close(self) -> None:
+        self.invalidate_all()
+        self._store.close()
+
+    # ---------------------------------------------------------------------------------------------
+    # Cache bookkeeping
+
+    def _drop_locked(self, key: Tuple[Hashable, ...]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._by_bucket.get(entry.bucket)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                self._by_bucket.pop(entry.bucket, None)
+
+    def invalidate_all(self) -> None:
+        with self._lock:
+            self._invalidations += len(self._entries)
+            self._entries.clear()
+            self._by_bucket.clear()
+            self._generation += 1
+
+    def _invalidate_for(self, assertions: List[TripleAssertion]) -> None:
+        with self._lock:
+            self._generation += 1
+            if not self._entries:
+                return
+            touched: Set[Tuple[Hashable, ...]] = set()
+            for a in assertions:
+                owner = a.owner_id or None
+                # Query terms are canonicalized; literal objects keep their case in the assertion.
+                subject, predicate, obj = canonicalize_term(a.subject), canonicalize_term(a.predicate), canonicalize_term(a.object)
+                for bucket in ((a.scope, owner), (a.scope, None), (None, owner), (None, None)):
+                    for key in self._by_bucket.get(bucket, ()):
+                        if key in touched:
+                            continue
+                        e = self._entries[key]
+                        if e.subject is not None and e.subject != subject:
+                            continue
+                        if e.predicate is not None and e.predicate != predicate:
+                            continue
+                        if e.object is not None and e.object != obj:
+                            continue
+                        touched.add(key)
+            for key in touched:
+                self._drop_locked(key)
+            self._invalidations += len(touched)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache statistics (`hit_rate` is hits / lookups, 0.0 before the first lookup)."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": (self._hits / lookups) if lookups else 0.0,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+            }
+
+    # ---------------------------------------------------------------------------------------------
+    # TripleStore API
+
+    def add(self, assertions: Iterable[TripleAssertion], **kwargs: Any) -> List[str]:
+        pending: List[TripleAssertion] = [a for a in assertions]
+        if not pending:
+            return []
+        try:
+            # kwargs (e.g. precomputed `vectors=`) pass through to the wrapped store.
+            return self._store.add(pending, **kwargs)
+        finally:
+            # Invalidate even on partial failure: some rows may have been written.
+            self._invalidate_for(pending)
+
+    def query(self, q: TripleQuery) -> List[TripleAssertion]:
+        with start_span(self._instrumentation, "cache.query") as span:
+            return self._query(q, span)
+
+    def _query(self, q: TripleQuery, span: Any) -> List[TripleAssertion]:
+        key = query_cache_key(q)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                span.count("cache_hit")
+                return list(entry.results)
+            self._misses += 1
+            generation = self._generation
+        span.count("cache_miss")
+
+        results = self._store.query(q)
+
+        with self._lock:
+            if generation == self._generation and key not in self._entries:
+                bucket: _Bucket = (q.scope, q.owner_id)
+                self._entries[key] = _Entry(
+                    results=list(results),
+                    bucket=bucket,
+                    subject=q.subject,
+                    predicate=q.predicate,
+                    object=q.object,
+                )
+                self._by_bucket.setdefault(bucket, set()).add(key)
+                while len(self._entries) > self._max_entries:
+                    oldest = next(iter(self._entries))
+                    self._drop_locked(oldest)
+                    self._evictions += 1
+        return list(results)
+
+    def get_many(self, assertion_ids: Iterable[str]) -> Dict[str, TripleAssertion]:
+        # Id lookups are already point reads on every backend; they bypass the query cache.
+        return self._store.get_many(assertion_ids)
+
+    def aggregate(self, q: TripleQuery, **kwargs: Any) -> List[Dict[str, Any]]:
+        return self._store.aggregate(q, **kwargs)
+
+    def get_vectors(self, assertion_ids: Iterable[str], **kwargs: Any) -> Dict[str, List[float]]:
+        return self._store.get_vectors(assertion_ids, **kwargs)  # type: ignore[attr-defined]
+
+    # Vector columns pass through; a backfill drops the cache after every batch it writes.
+
+    def vector_columns(self) -> List[Dict[str, Any]]:
+        return self._store.vector_columns()  # type: ignore[attr-defined]
+
+    def add_vector_column(self, column: Any) -> None:
+        self._store.add_vector_column(column)  # type: ignore[attr-defined]
+
+    def backfill_vectors(self, column: str, **kwargs: Any) -> Any:
+        on_batch = kwargs.pop("on_batch", None)
+
+        def invalidate(rows: int) -> None:
+            self.invalidate_all()
+            if on_batch is not None:
+                on_batch(rows)
+
+        return self._store.backfill_vectors(column, on_batch=invalidate, **kwargs)  # type: ignore[attr-defined]
+
+    def anchor_query(self, cues: Any = (), **kwargs: Any) -> List[TripleAssertion]:
+        # Index lookups without an embedding call; not worth a cache entry.
+        return self._store.anchor_query(cues, **kwargs)  # type: ignore[attr-defined]
+
+    # Change feed passes through (subscribers hear every write made through the wrapped store).
+
+    def last_seq(self) -> int:
+        return int(self._store.last_seq())  # type: ignore[attr-defined]
+
+    def changes(self, since_seq: int = 0, **kwargs: Any) -> List[Tuple[int, TripleAssertion]]:
+        return self._store.changes(since_seq, **kwargs)  # type: ignore[attr-defined]
+
+    def subscribe(self, callback: Callable[[List[Tuple[int, TripleAssertion]]], None]) -> Callable[[], None]:
+        return self._store.subscribe(callback)  # type: ignore[attr-defined]
+
+    # Maintenance hooks (retention) pass through and drop the whole cache on removal.
+
+    def scan(self, q: TripleQuery) -> Iterator[Tuple[str, TripleAssertion]]:
+        return self._store.scan(q)  # type: ignore[attr-defined]
+
+    def purge(self, assertion_ids: Iterable[str]) -> int:
+        try:
+            return int(self._store.purge(assertion_ids))  # type: ignore[attr-defined]
+        finally:
+            self.invalidate_all()
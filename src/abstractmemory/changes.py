@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import threading
+from typing import Callable, List, Optional, Tuple
+
+from .models import TripleAssertion
+
+# One change-feed entry: the store's insertion sequence number and the stored assertion (with id).
+Change = Tuple[int, TripleAssertion]
+ChangeCallback = Callable[[List[Change]], None]
+
+
+def change_limit(limit: int) -> Optional[int]:
+    """`changes()` page size (None = unbounded, matching `TripleQuery.limit <= 0`)."""
+    n = int(limit)
+    return n if n > 0 else None
+
+
+class ChangeSubscribers:
+    """In-process `subscribe()` callbacks, called after each committed `add()` with its new rows.
+
+    Notes:
+    - Callbacks run synchronously on the writing thread, after the write is durable; keep them
+      cheap (hand off to a queue) since they add to `add()` latency.
+    - A callback that raises is ignored, like a metrics sink: the rows are already stored, and a
+      consumer that missed them can catch up with `changes(since_seq=...)`.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._callbacks: Tuple[ChangeCallback, ...] = ()
+
+    def __bool__(self) -> bool:
+        return bool(self._callbacks)
+
+    def subscribe(self, callback: ChangeCallback) -> Callable[[], None]:
+        """Register `callback`; returns a function that unregisters it."""
+        if not callable(callback):
+            raise ValueError("callback must be callable")
+        with self._lock:
+            self._callbacks = self._callbacks + (callback,)
+
+        def _unsubscribe() -> None:
+            with self._lock:
+                self._callbacks = tuple(c for c in self._callbacks if c is not callback)
+
+        return _unsubscribe
+
+    def notify(self, changes: List[Change]) -> None:
+        if not changes:
+            return
+        for callback in self._callbacks:
+            try:
+                callback(list(changes))
+            except Exception:
+                pass
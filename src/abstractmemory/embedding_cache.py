@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import sys
+import threading
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from .embeddings import TextEmbedder
+from .instrumentation import MetricsSink, start_span
+
+
+def _text_key(text: str) -> str:
+    return hashlib.sha256(str(text or "").encode("utf-8")).hexdigest()
+
+
+def _pack_f32(vector: Sequence[float]) -> bytes:
+    buf = array("f", (float(x) for x in vector))
+    if sys.byteorder != "little":  # pragma: no cover - keep files portable across hosts
+        buf.byteswap()
+    return buf.tobytes()
+
+
+def _unpack_f32(blob: bytes) -> List[float]:
+    buf = array("f")
+    buf.frombytes(blob)
+    if sys.byteorder != "little":  # pragma: no cover
+        buf.byteswap()
+    return buf.tolist()
+
+
+class CachedTextEmbedder:
+    """`TextEmbedder` wrapper backed by a persistent on-disk embedding cache.
+
+    Notes:
+    - Entries are keyed by `(model_id, sha256(text))` and stored as little-endian float32 BLOBs in
+      a SQLite file, so rebuilding/migrating a store or restarting a process only embeds new text.
+    - `model_id` must identify the embedding space (provider + model + dimensions); changing the
+      gateway model without changing `model_id` would serve stale vectors.
+    - Vectors come back as float32-rounded values even on the first (miss) call, so cached and
+      fresh results are identical.
+    - `instrumentation` (a `MetricsSink`) receives `embedding_cache.embed` events with
+      `cache_hits`/`cache_misses` counters and `lookup`/`embed`/`write` phases.
+    """
+
+    def __init__(
+        self,
+        embedder: TextEmbedder,
+        *,
+        path: Path,
+        model_id: Optional[str] = None,
+        table_name: str = "embedding_cache",
+        instrumentation: Optional[MetricsSink] = None,
+    ) -> None:
+        mid = model_id if model_id is not None else getattr(embedder, "model_id", None)
+        if not isinstance(mid, str) or not mid.strip():
+            raise ValueError("CachedTextEmbedder requires a model_id (embedding model identity)")
+        self._embedder = embedder
+        self._instrumentation = instrumentation
+        self._model_id = mid.strip()
+        self._table = str(table_name or "embedding_cache").strip() or "embedding_cache"
+
+        self._path = Path(path).expanduser()
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self._path), check_same_thread=False)
+        # WAL lets several processes share one cache file without blocking readers.
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {self._table} (
+              model_id TEXT NOT NULL,
+              text_sha256 TEXT NOT NULL,
+              dim INTEGER NOT NULL,
+              vector BLOB NOT NULL,
+              PRIMARY KEY (model_id, text_sha256)
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.commit()
+
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def model_id(self) -> str:
+        return self._model_id
+
+    @classmethod
+    def alongside(cls, store_path: Path, embedder: TextEmbedder, *, model_id: Optional[str] = None) -> "CachedTextEmbedder":
+        """Open the cache file that lives next to a store (`<store_path>.embeddings.sqlite`)."""
+        p = Path(store_path).expanduser()
+        return cls(embedder, path=p.with_name(p.name + ".embeddings.sqlite"), model_id=model_id)
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            (entries,) = self._conn.execute(
+                f"SELECT COUNT(*) FROM {self._table} WHERE model_id = ?", (self._model_id,)
+            ).fetchone()
+            return {
+                "model_id": self._model_id,
+                "entries": int(entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": (self._hits / lookups) if lookups else 0.0,
+            }
+
+    def _lookup(self, keys: List[str]) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start : start + 500]
+                marks = ",".join("?" for _ in chunk)
+                cur = self._conn.execute(
+                    f"SELECT text_sha256, vector FROM {self._table} WHERE model_id = ? AND text_sha256 IN ({marks})",
+                    [self._model_id, *chunk],
+                )
+                for key, blob in cur.fetchall():
+                    found[str(key)] = _unpack_f32(blob)
+        return found
+
+    def embed_texts(self, texts: Sequence[str]) -> List[List[float]]:
+        items = [str(t or "") for t in texts]
+        if not items:
+            return []
+        with start_span(self._instrumentation, "embedding_cache.embed") as span:
+            return self._embed(items, span)
+
+    def _embed(self, items: List[str], span: Any) -> List[List[float]]:
+        keys = [_text_key(t) for t in items]
+        found = self._lookup(sorted(set(keys)))
+        span.lap("lookup")
+
+        # Deduplicate misses so repeated texts in one batch are embedded once.
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, items):
+            if key not in found and key not in missing:
+                missing[key] = text
+
+        if missing:
+            miss_keys = list(missing.keys())
+            vectors = self._embedder.embed_texts([missing[k] for k in miss_keys])
+            span.lap("embed")
+            if len(vectors) != len(miss_keys):
+                raise RuntimeError(
+                    f"Embedder returned {len(vectors)} vectors for {len(miss_keys)} texts; refusing to cache a misaligned batch"
+                )
+            rows = []
+            for key, vec in zip(miss_keys, vectors):
+                blob = _pack_f32(vec)
+                rows.append((self._model_id, key, len(vec), blob))
+                found[key] = _unpack_f32(blob)
+            with self._lock:
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO {self._table} (model_id, text_sha256, dim, vector) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.commit()
+            span.lap("write")
+
+        with self._lock:
+            self._misses += len(missing)
+            self._hits += len(items) - len(missing)
+        span.count("cache_hits", len(items) - len(missing))
+        span.count("cache_misses", len(missing))
+        return [list(found[k]) for k in keys]
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 import json
-from typing import List, Protocol, Sequence
-from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
+from typing import Any, List, Optional, Protocol, Sequence
+
+from .instrumentation import MetricsSink, start_span
 
 
 class TextEmbedder(Protocol):
@@ -19,6 +19,9 @@ class AbstractGatewayTextEmbedder:
     - selecting the embedding provider/model (singleton per gateway instance)
     - generating embeddings via AbstractRuntime+AbstractCore integration
     - enforcing a stable embedding space
+
+    `instrumentation` (a `MetricsSink`) receives one `gateway.embed` event per call with the batch
+    size and `http`/`decode` phase timings.
     """
 
     def __init__(
@@ -28,6 +31,8 @@ class AbstractGatewayTextEmbedder:
         auth_token: str | None = None,
         endpoint_path: str = "/api/gateway/embeddings",
         timeout_s: float = 30.0,
+        model_id: str | None = None,
+        instrumentation: Optional[MetricsSink] = None,
     ) -> None:
         root = str(base_url or "").strip().rstrip("/")
         if not root:
@@ -40,9 +45,21 @@ class AbstractGatewayTextEmbedder:
         self._headers = {"Content-Type": "application/json"}
         if isinstance(auth_token, str) and auth_token.strip():
             self._headers["Authorization"] = f"Bearer {auth_token.strip()}"
+        # Optional identity of the gateway's embedding space (used as the `CachedTextEmbedder` key).
+        self.model_id = model_id.strip() if isinstance(model_id, str) and model_id.strip() else None
+        self._instrumentation = instrumentation
 
     def embed_texts(self, texts: Sequence[str]) -> List[List[float]]:
         items = [str(t or "") for t in texts]
+        with start_span(self._instrumentation, "gateway.embed") as span:
+            span.count("embed_texts", len(items))
+            return self._embed(items, span)
+
+    def _embed(self, items: List[str], span: Any) -> List[List[float]]:
+        # `urllib.request` pulls in http.client/ssl/email; load it on the first request, not at import.
+        from urllib.error import HTTPError, URLError
+        from urllib.request import Request, urlopen
+
         payload = {"input": items}
         req = Request(
             self._url,
@@ -68,6 +85,7 @@ class AbstractGatewayTextEmbedder:
             raise RuntimeError(f"Gateway embeddings HTTP {e.code}: {detail or e.reason}{hint}") from e
         except URLError as e:
             raise RuntimeError(f"Gateway embeddings request failed: {e}") from e
+        span.lap("http")
 
         try:
             data = json.loads(raw)
@@ -93,4 +111,5 @@ class AbstractGatewayTextEmbedder:
             parsed.append((index, [float(x) for x in emb]))
 
         parsed.sort(key=lambda t: t[0])
+        span.lap("decode")
         return [v for _, v in parsed]
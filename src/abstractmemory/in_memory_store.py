@@ -1,12 +1,44 @@
 from __future__ import annotations
 
+import gc
+import json
 import math
-import uuid
-from typing import Any, Iterable, List, Optional, Sequence
+import os
+from bisect import bisect_right
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
 
+from .aggregate import GroupAccumulator, group_limit, normalize_aggregate
+from .anchors import (
+    MAX_ANCHOR_POSTINGS,
+    anchor_cues,
+    anchor_limit,
+    extract_anchors,
+    rank_anchor_hits,
+    selective_anchors,
+    with_anchor_retrieval,
+)
+from .changes import Change, ChangeCallback, ChangeSubscribers, change_limit
 from .embeddings import TextEmbedder
-from .models import TripleAssertion, normalize_term
+from .instrumentation import MetricsSink, start_span
+from .interval_index import IntervalIndex
+from .models import (
+    EPOCH_US_MIN,
+    TripleAssertion,
+    given_assertion_ids,
+    iso_to_epoch_us,
+    new_assertion_id,
+    normalize_id_mode,
+    normalize_term,
+)
+from .quantization import QuantizedVector, normalize_precision, quantize, rank_quantized
+from .rerank import rerank, rerank_pool, reranks
+from .scoring import top_scored
+from .snapshot import Snapshot, row_assertion, row_vector, write_snapshot
 from .store import TripleQuery
+from .trace import TraceSink
+from .vector_columns import VectorBackfill, VectorColumn, VectorColumnRegistry
 
 
 def _canonical_text(a: TripleAssertion) -> str:
@@ -54,13 +86,111 @@ def _cosine(a: Sequence[float], b: Sequence[float]) -> float:
     return dot / (math.sqrt(na) * math.sqrt(nb))
 
 
+def _match(row: Dict[str, Any], q: TripleQuery) -> bool:
+    # Rows keep the canonical terms next to the assertion, so filtering never needs the assertion
+    # object itself (snapshot rows materialize it lazily). Query terms are canonical too.
+    if q.subject and row["subject"] != q.subject:
+        return False
+    if q.predicate and row["predicate"] != q.predicate:
+        return False
+    if q.object and row["object"] != q.object and normalize_term(row["object"]) != q.object:
+        return False  # literal objects keep their case but still match case-insensitively
+    if q.scope and row["scope"] != q.scope:
+        return False
+    if q.owner_id and (row["owner_id"] or "") != q.owner_id:
+        return False
+    # Time bounds compare epoch microseconds (computed once at add); bounds that do not parse as
+    # ISO-8601 fall back to the legacy string comparison.
+    if q.since:
+        if q.since_us is not None:
+            if row["observed_at_us"] is None or row["observed_at_us"] < q.since_us:
+                return False
+        elif (row_assertion(row).observed_at or "") < q.since:
+            return False
+    if q.until:
+        if q.until_us is not None:
+            if row["observed_at_us"] is None or row["observed_at_us"] > q.until_us:
+                return False
+        elif (row_assertion(row).observed_at or "") > q.until:
+            return False
+    if q.active_at:
+        if q.active_at_us is not None:
+            at_us = q.active_at_us
+            vf, vu = row["valid_from_us"], row["valid_until_us"]
+            if vf is not None and vf > at_us:
+                return False
+            if vu is not None and vu <= at_us:
+                return False
+        else:
+            at = q.active_at
+            a: TripleAssertion = row_assertion(row)
+            if a.valid_from and a.valid_from > at:
+                return False
+            if a.valid_until and a.valid_until <= at:
+                return False
+    return True
+
+
+# Equality filters served by a snapshot's inverted indexes, most selective first.
+_INDEXED_FIELDS = ("subject", "object", "predicate", "owner_id", "scope")
+
+
+def _raw_vector(vectors: Optional[Sequence[Sequence[float]]], i: int) -> Optional[List[float]]:
+    if vectors is None or i >= len(vectors):
+        return None
+    return [float(x) for x in vectors[i]]
+
+
+def _wal_add(
+    assertion_id: str,
+    a: TripleAssertion,
+    vectors: Optional[Sequence[Sequence[float]]],
+    extra: Mapping[str, Sequence[Sequence[float]]],
+    i: int,
+) -> Dict[str, Any]:
+    rec: Dict[str, Any] = {"op": "add", "id": assertion_id, "a": a.to_dict(), "v": _raw_vector(vectors, i)}
+    if extra:
+        rec["x"] = {name: _raw_vector(column_vectors, i) for name, column_vectors in extra.items()}
+    return rec
+
+
+def _observed_key(row: Dict[str, Any]) -> int:
+    us = row["observed_at_us"]
+    return EPOCH_US_MIN if us is None else us
+
+
 class InMemoryTripleStore:
     """A dependency-free triple store (best-effort).
 
     Notes:
     - Intended for tests/dev and hosts without LanceDB installed.
-    - Append-only: updates are represented as new assertions.
+    - Append-only: updates are represented as new assertions (`purge(...)` exists for retention only).
+    - Time filters and ordering use UTC epoch microseconds computed once per row at `add()`;
+      `active_at` queries only visit rows returned by an interval tree over validity windows.
     - Vector search is optional and stores vectors in-memory only.
+    - `vector_precision` trades memory for accuracy: `float64` (default, plain lists), `float32`,
+      `float16`, `int8` (per-vector scale) or `binary` (sign-bit first pass, then the best
+      `limit * rescore_factor` candidates are rescored against int8 codes).
+    - `id_mode="content"` derives ids from the canonical fields (plus `id_provenance_keys`); adding an
+      assertion whose id is already present is a no-op that returns the existing id.
+    - `instrumentation` (a `MetricsSink`) receives `inmemory.add` / `inmemory.query` timings
+      (`embed`/`filter`/`score`/`sort`/`materialize`) and rows scanned vs returned.
+    - `save(path)` writes a columnar snapshot; `InMemoryTripleStore.load(path)` memory-maps it and
+      only decodes the filter columns up front (assertions and vectors are decoded on first access).
+    - `wal_path` appends every `add()` / `purge()` to a JSON-lines log that is replayed on open;
+      `save()` truncates it. Lines are flushed per call (`wal_fsync=True` also fsyncs them).
+    - `trace_sink` (a `TraceSink`, e.g. `TraceRingBuffer`) receives one `RecallTrace` per `query()`
+      (index used, candidates, `min_score` pruning, timings, result ids); off by default.
+    - Rows get a monotonic `seq` at insert (kept by snapshots, re-assigned identically on WAL
+      replay); `changes(since_seq)` pages through them and `subscribe(callback)` hears every `add()`.
+    - `anchor_query(...)` uses an inverted index from anchors (see `anchors.py`) to assertion ids,
+      built on the first call and then kept up to date by `add()` / `purge()`.
+    - `TripleQuery.mmr_lambda` / `collapse_triples` rerank the best `mmr_pool` semantic candidates
+      (see `rerank.py`) before `limit` is applied.
+    - `vector_columns` / `add_vector_column()` bind more named columns to their own embedders
+      (see `vector_columns.py`); `add()` fills all of them and `backfill_vectors(name)` embeds
+      older rows. The WAL keeps every column; snapshots keep only `vector_column`, so extra
+      columns are backfilled again after `load()`.
     """
 
     def __init__(
@@ -68,34 +198,549 @@ class InMemoryTripleStore:
         *,
         embedder: Optional[TextEmbedder] = None,
         vector_column: str = "vector",
+        vector_columns: Sequence[VectorColumn] = (),
+        vector_precision: str = "float64",
+        rescore_factor: int = 4,
+        id_mode: str = "uuid",
+        id_provenance_keys: Sequence[str] = (),
+        wal_path: Optional[Path] = None,
+        wal_fsync: bool = False,
+        instrumentation: Optional[MetricsSink] = None,
+        trace_sink: Optional[TraceSink] = None,
     ) -> None:
-        self._embedder = embedder
+        self._id_mode = normalize_id_mode(id_mode)
+        self._id_provenance_keys = tuple(str(k) for k in id_provenance_keys)
+        self._instrumentation = instrumentation
+        self._trace_sink = trace_sink
         self._vector_column = str(vector_column or "vector")
+        self._columns = VectorColumnRegistry(self._vector_column, embedder, vector_columns)
+        self._embedder = self._columns.default_embedder
+        # column -> last `seq` a backfill has looked at (every earlier row has the column).
+        self._fill_cursor: Dict[str, int] = {}
+        self._precision = normalize_precision(vector_precision)
+        self._rescore_factor = max(1, int(rescore_factor))
         self._rows: list[dict[str, Any]] = []
+        self._by_id: dict[str, dict[str, Any]] = {}
+        # `active_at` candidates come from an interval tree over the validity windows.
+        self._validity: IntervalIndex[str] = IntervalIndex()
+        # Rows loaded from a snapshot stay in the mapped file until something needs them all.
+        self._base: Optional[Snapshot] = None
+        # The mapped snapshot itself, kept after absorbing (rows decode from it lazily) until close().
+        self._snapshot: Optional[Snapshot] = None
+        self._last_seq = 0
+        self._subscribers = ChangeSubscribers()
+        # anchor -> ids; None until the first `anchor_query()` (stores that never use it pay nothing).
+        self._anchors: Optional[Dict[str, set[str]]] = None
+        self._wal_path = Path(wal_path).expanduser() if wal_path is not None else None
+        self._wal_fsync = bool(wal_fsync)
+        self._wal: Any = None
+        if self._wal_path is not None:
+            self._replay_wal()
 
     def close(self) -> None:
-        return None
+        if self._wal is not None:
+            try:
+                self._wal.close()
+            except Exception:
+                pass
+            self._wal = None
+        if self._snapshot is not None:
+            self._snapshot.close()
+            self._snapshot = None
+
+    @property
+    def embedder(self) -> Optional[TextEmbedder]:
+        return self._embedder
+
+    def vector_columns(self) -> List[Dict[str, Any]]:
+        """Registered vector columns: `name`, `dimension` (once known), `model_id`, `default`."""
+        return self._columns.describe()
 
-    def add(self, assertions: Iterable[TripleAssertion]) -> List[str]:
+    def add_vector_column(self, column: VectorColumn) -> None:
+        """Register another vector column; later `add()`s fill it, `backfill_vectors()` the older rows."""
+        self._columns.register(column)
+
+    def backfill_vectors(
+        self,
+        column: str,
+        *,
+        batch_size: int = 256,
+        background: bool = False,
+        on_batch: Optional[Callable[[int], None]] = None,
+    ) -> VectorBackfill:
+        """Embed `column` for rows that lack it (`background=True` returns a started job)."""
+        if self._columns.get(column) is None:
+            raise ValueError(f"no embedder registered for vector column {column!r}")
+        self._absorb_base()
+        job = VectorBackfill(self, column, batch_size=batch_size, on_batch=on_batch)
+        if background:
+            return job.start()
+        job.run()
+        return job
+
+    def _backfill_batch(self, column: str, limit: int) -> int:
+        with start_span(self._instrumentation, "inmemory.backfill") as span:
+            rows = self._rows
+            cursor = self._fill_cursor.get(column, 0)
+            batch: list[dict[str, Any]] = []
+            i = bisect_right(rows, cursor, key=itemgetter("seq"))
+            while i < len(rows) and len(batch) < limit:
+                if row_vector(rows[i], column) is None:
+                    batch.append(rows[i])
+                i += 1
+            span.count("rows_scanned", i)
+            if batch:
+                vectors = self._columns.embed(column, [_canonical_text(row_assertion(r)) for r in batch])
+                span.lap("embed")
+                span.count("embed_texts", len(batch))
+                for r, v in zip(batch, vectors):
+                    r[column] = self._encode_vector(v)
+                span.count("rows_written", len(batch))
+            if i:
+                self._fill_cursor[column] = max(cursor, rows[i - 1]["seq"])
+        return len(batch)
+
+    def _encode_vector(self, vector: Sequence[float]) -> Any:
+        v = [float(x) for x in vector]
+        return v if self._precision == "float64" else quantize(v, self._precision)
+
+    def add(
+        self,
+        assertions: Iterable[TripleAssertion],
+        *,
+        vectors: Optional[Sequence[Sequence[float]]] = None,
+        ids: Optional[Sequence[str]] = None,
+    ) -> List[str]:
+        """Append assertions; `vectors` (one per assertion) skips the configured embedder.
+
+        `ids` (one per assertion) keeps existing ids instead of assigning new ones (replication).
+        """
         pending: list[TripleAssertion] = [a for a in assertions]
         if not pending:
             return []
+        if vectors is not None and len(vectors) != len(pending):
+            raise ValueError(f"got {len(vectors)} vectors for {len(pending)} assertions")
 
-        vectors: Optional[List[List[float]]] = None
-        if self._embedder is not None:
-            vectors = self._embedder.embed_texts([_canonical_text(a) for a in pending])
+        with start_span(self._instrumentation, "inmemory.add") as span:
+            if ids is not None:
+                ids = given_assertion_ids(ids, len(pending))
+            else:
+                ids = [new_assertion_id(a, id_mode=self._id_mode, provenance_keys=self._id_provenance_keys) for a in pending]
+            # Known ids (content ids, replicated ids) and repeats within the batch are no-ops; only
+            # fresh rows are embedded.
+            fresh: list[int] = []
+            seen: set[str] = set()
+            for i, assertion_id in enumerate(ids):
+                if assertion_id in seen or self._has_id(assertion_id):
+                    continue
+                seen.add(assertion_id)
+                fresh.append(i)
+            if len(fresh) < len(pending):
+                span.count("rows_deduplicated", len(pending) - len(fresh))
+                if vectors is not None:
+                    vectors = [vectors[i] for i in fresh]
+                pending = [pending[i] for i in fresh]
+            fresh_ids = [ids[i] for i in fresh]
 
-        ids: list[str] = []
-        for i, a in enumerate(pending):
-            assertion_id = str(uuid.uuid4())
-            ids.append(assertion_id)
-            row: dict[str, Any] = {"assertion_id": assertion_id, "assertion": a}
-            if vectors is not None and i < len(vectors):
-                row[self._vector_column] = vectors[i]
-            self._rows.append(row)
+            extra: Dict[str, List[List[float]]] = {}
+            if pending and (vectors is None and self._embedder is not None or self._columns.extra_names()):
+                texts = [_canonical_text(a) for a in pending]
+                if vectors is None and self._embedder is not None:
+                    vectors = self._columns.embed(self._vector_column, texts)
+                    span.count("embed_texts", len(pending))
+                for name in self._columns.extra_names():
+                    extra[name] = self._columns.embed(name, texts)
+                    span.count("embed_texts", len(pending))
+                span.lap("embed")
+
+            self._insert(fresh_ids, pending, vectors, extra)
+            span.lap("insert")
+            if self._wal_path is not None and pending:
+                self._log(_wal_add(fresh_ids[i], a, vectors, extra, i) for i, a in enumerate(pending))
+                span.lap("wal")
+            span.count("rows_written", len(pending))
+            if self._subscribers and pending:
+                self._subscribers.notify([(r["seq"], r["assertion"]) for r in self._rows[-len(pending) :]])
+                span.lap("notify")
         return ids
 
+    def _insert(
+        self,
+        ids: Sequence[str],
+        assertions: Sequence[TripleAssertion],
+        vectors: Optional[Sequence[Sequence[float]]],
+        extra: Optional[Mapping[str, Sequence[Sequence[float]]]] = None,
+    ) -> None:
+        rows = self._rows
+        by_id = self._by_id
+        for i, a in enumerate(assertions):
+            assertion_id = ids[i]
+            self._last_seq += 1
+            row: dict[str, Any] = {
+                "assertion_id": assertion_id,
+                "assertion": a._with_assertion_id(assertion_id),
+                "subject": a.subject,
+                "predicate": a.predicate,
+                "object": a.object,
+                "scope": a.scope,
+                "owner_id": a.owner_id,
+                "observed_at_us": iso_to_epoch_us(a.observed_at),
+                "valid_from_us": iso_to_epoch_us(a.valid_from),
+                "valid_until_us": iso_to_epoch_us(a.valid_until),
+                "seq": self._last_seq,
+            }
+            if vectors is not None and i < len(vectors):
+                row[self._vector_column] = self._encode_vector(vectors[i])
+            if extra:
+                for name, column_vectors in extra.items():
+                    if i < len(column_vectors) and column_vectors[i]:
+                        row[name] = self._encode_vector(column_vectors[i])
+            rows.append(row)
+            by_id[assertion_id] = row
+            self._validity.add(assertion_id, row["valid_from_us"], row["valid_until_us"])
+            if self._anchors is not None:
+                self._index_anchors(assertion_id, row["assertion"])
+
+    def scan(self, q: TripleQuery) -> Iterator[Tuple[str, TripleAssertion]]:
+        """Yield `(assertion_id, assertion)` for structured matches, ordered by `observed_at`."""
+        if q.query_text or q.query_vector:
+            raise ValueError("scan() supports structured filters only")
+        matched = [r for r in self._candidates(q) if _match(r, q)]
+        matched.sort(key=lambda r: (_observed_key(r), r["assertion_id"]), reverse=(str(q.order).lower() != "asc"))
+        limit = int(q.limit) if isinstance(q.limit, int) else 100
+        for r in matched if limit <= 0 else matched[:limit]:
+            yield r["assertion_id"], row_assertion(r)
+
+    def purge(self, assertion_ids: Iterable[str]) -> int:
+        """Physically remove rows by id (retention only; callers record tombstones first)."""
+        doomed = {str(i) for i in assertion_ids}
+        if not doomed:
+            return 0
+        removed = self._remove(doomed)
+        if removed and self._wal_path is not None:
+            self._log([{"op": "purge", "ids": sorted(doomed)}])
+        return removed
+
+    def _remove(self, doomed: set[str]) -> int:
+        self._absorb_base()
+        if self._anchors is not None:
+            for r in self._rows:
+                if r["assertion_id"] in doomed:
+                    for anchor in extract_anchors(row_assertion(r)):
+                        self._anchors.get(anchor, set()).discard(r["assertion_id"])
+        before = len(self._rows)
+        self._rows = [r for r in self._rows if r["assertion_id"] not in doomed]
+        for assertion_id in doomed:
+            self._by_id.pop(assertion_id, None)
+        self._validity.discard(doomed)
+        return before - len(self._rows)
+
+    def save(self, path: Path) -> int:
+        """Write a snapshot of every row to `path` (atomic replace); returns its size in bytes.
+
+        The write-ahead log (if any) is truncated afterwards: the snapshot now covers it.
+        """
+        with start_span(self._instrumentation, "inmemory.save") as span:
+            rows = self._all_rows()
+            size = write_snapshot(
+                Path(path),
+                rows,
+                vector_column=self._vector_column,
+                vector_precision=self._precision,
+                settings={"id_mode": self._id_mode, "id_provenance_keys": list(self._id_provenance_keys)},
+                last_seq=self._last_seq,
+            )
+            span.count("rows_written", len(rows))
+            if self._wal_path is not None:
+                if self._wal is not None:
+                    self._wal.close()
+                    self._wal = None
+                self._wal_path.write_bytes(b"")
+        return size
+
+    @classmethod
+    def load(
+        cls,
+        path: Path,
+        *,
+        embedder: Optional[TextEmbedder] = None,
+        vector_columns: Sequence[VectorColumn] = (),
+        rescore_factor: int = 4,
+        wal_path: Optional[Path] = None,
+        wal_fsync: bool = False,
+        instrumentation: Optional[MetricsSink] = None,
+        trace_sink: Optional[TraceSink] = None,
+    ) -> "InMemoryTripleStore":
+        """Open a snapshot written by `save()` (vector column, precision and id mode come from it).
+
+        `embedder` must match the one used to build the snapshot for `query_text` to be meaningful.
+        """
+        snap = Snapshot(Path(path))
+        settings = snap.header.get("settings") if isinstance(snap.header.get("settings"), dict) else {}
+        store = cls(
+            embedder=embedder,
+            vector_column=snap.vector_column,
+            vector_columns=vector_columns,
+            vector_precision=snap.precision,
+            rescore_factor=rescore_factor,
+            id_mode=str(settings.get("id_mode") or "uuid"),
+            id_provenance_keys=tuple(settings.get("id_provenance_keys") or ()),
+            instrumentation=instrumentation,
+            trace_sink=trace_sink,
+        )
+        store._base = store._snapshot = snap
+        store._last_seq = snap.last_seq
+        if wal_path is not None:
+            store._wal_path = Path(wal_path).expanduser()
+            store._wal_fsync = bool(wal_fsync)
+            store._replay_wal()
+        return store
+
+    def _log(self, records: Iterable[Dict[str, Any]]) -> None:
+        if self._wal is None:
+            assert self._wal_path is not None
+            self._wal_path.parent.mkdir(parents=True, exist_ok=True)
+            self._wal = open(self._wal_path, "a", encoding="utf-8")
+        self._wal.write("".join(json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n" for r in records))
+        self._wal.flush()
+        if self._wal_fsync:
+            os.fsync(self._wal.fileno())
+
+    def _replay_wal(self) -> None:
+        """Re-apply logged adds/purges (ids already present are skipped; a torn last line is ignored)."""
+        path = self._wal_path
+        if path is None or not path.exists():
+            return
+        with open(path, "r", encoding="utf-8") as fh:
+            lines = fh.read().split("\n")
+        for n, line in enumerate(lines):
+            if not line.strip():
+                continue
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                if n >= len(lines) - 2:
+                    break  # torn tail from a crash mid-write
+                raise ValueError(f"corrupt write-ahead log line {n + 1}: {path}")
+            if rec.get("op") == "add":
+                assertion_id = str(rec.get("id") or "")
+                if not assertion_id or self._has_id(assertion_id):
+                    continue
+                v = rec.get("v")
+                extra = {str(k): [x] for k, x in (rec.get("x") or {}).items()}
+                self._insert([assertion_id], [TripleAssertion.from_dict(rec.get("a") or {})], [v] if v else None, extra)
+            elif rec.get("op") == "purge":
+                self._remove({str(i) for i in rec.get("ids") or ()})
+
+    def _row(self, assertion_id: str) -> Optional[Dict[str, Any]]:
+        row = self._by_id.get(assertion_id)
+        if row is None and self._base is not None:
+            pos = self._base.position_of(assertion_id)
+            row = self._base.row(pos) if pos is not None else None
+        return row
+
+    def _has_id(self, assertion_id: str) -> bool:
+        if assertion_id in self._by_id:
+            return True
+        return self._base is not None and self._base.position_of(assertion_id) is not None
+
+    def _all_rows(self) -> List[Dict[str, Any]]:
+        if self._base is None:
+            return self._rows
+        return self._base.rows() + self._rows
+
+    def _absorb_base(self) -> None:
+        """Turn snapshot rows into regular rows (id map and validity index included)."""
+        base = self._base
+        if base is None:
+            return
+        with start_span(self._instrumentation, "inmemory.absorb_snapshot") as span:
+            rows = base.rows() + self._rows
+            span.lap("decode")
+            gc_was_enabled = gc.isenabled()
+            gc.disable()  # only acyclic containers are created below
+            try:
+                by_id: dict[str, dict[str, Any]] = {r["assertion_id"]: r for r in rows}
+                validity: IntervalIndex[str] = IntervalIndex()
+                validity.extend((r["assertion_id"], r["valid_from_us"], r["valid_until_us"]) for r in rows)
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
+            span.lap("index")
+            span.count("rows_loaded", len(base))
+        self._rows, self._by_id, self._validity, self._base = rows, by_id, validity, None
+
+    def last_seq(self) -> int:
+        """Highest sequence number assigned so far (0 for an empty store)."""
+        return self._last_seq
+
+    def changes(self, since_seq: int = 0, *, limit: int = 1000) -> List[Change]:
+        """`(seq, assertion)` for rows inserted after `since_seq`, in `seq` order (purged rows are gone)."""
+        since = int(since_seq)
+        n = change_limit(limit)
+        rows: List[Dict[str, Any]] = []
+        base = self._base
+        if base is not None:
+            # Snapshot rows precede every later insert; only the requested slice is decoded.
+            seqs = base.seqs()
+            start = bisect_right(seqs, since)
+            stop = len(seqs) if n is None else min(len(seqs), start + n)
+            rows = base.rows_at(range(start, stop))
+        if n is None or len(rows) < n:
+            tail = self._rows
+            start = bisect_right(tail, since, key=itemgetter("seq"))
+            rows += tail[start:] if n is None else tail[start : start + n - len(rows)]
+        return [(r["seq"], row_assertion(r)) for r in rows]
+
+    def subscribe(self, callback: ChangeCallback) -> Callable[[], None]:
+        """Call `callback(changes)` after each `add()` that wrote rows (returns an unsubscribe)."""
+        return self._subscribers.subscribe(callback)
+
+    def get_many(self, assertion_ids: Iterable[str]) -> Dict[str, TripleAssertion]:
+        """Fetch assertions by id (unknown ids are absent from the result)."""
+        out: Dict[str, TripleAssertion] = {}
+        for i in assertion_ids:
+            row = self._row(str(i))
+            if row is not None:
+                out[row["assertion_id"]] = row_assertion(row)
+        return out
+
+    def get_vectors(self, assertion_ids: Iterable[str], *, vector_column: Optional[str] = None) -> Dict[str, List[float]]:
+        """Stored vectors by id, decoded to floats (ids without a vector are absent)."""
+        out: Dict[str, List[float]] = {}
+        for i in assertion_ids:
+            row = self._row(str(i))
+            if row is None:
+                continue
+            v = row_vector(row, vector_column or self._vector_column)
+            if isinstance(v, QuantizedVector):
+                out[row["assertion_id"]] = v.to_list()
+            elif isinstance(v, list):
+                out[row["assertion_id"]] = list(v)
+        return out
+
+    def aggregate(
+        self,
+        q: TripleQuery,
+        *,
+        group_by: Sequence[str] = (),
+        metrics: Sequence[str] = ("count",),
+    ) -> List[Dict[str, Any]]:
+        """Grouped counts / observed_at bounds over structured matches (see `aggregate.py`)."""
+        groups, wanted = normalize_aggregate(q, group_by, metrics)
+        with start_span(self._instrumentation, "inmemory.aggregate") as span:
+            acc = GroupAccumulator(groups)
+            candidates = self._candidates(q)
+            filtered = any((q.subject, q.predicate, q.object, q.scope, q.owner_id, q.since, q.until, q.active_at))
+            key_of = itemgetter(*groups) if groups else None
+            # One pass over the candidate rows; nothing is copied or materialized.
+            for row in candidates:
+                if filtered and not _match(row, q):
+                    continue
+                if key_of is None:
+                    key: Tuple[Any, ...] = ()
+                elif len(groups) == 1:
+                    key = (key_of(row),)
+                else:
+                    key = key_of(row)
+                acc.add_row(key, row["observed_at_us"])
+            span.lap("filter")
+            out = acc.rows(wanted, limit=group_limit(q))
+            span.lap("sort")
+            span.count("rows_scanned", len(candidates))
+            span.count("groups_returned", len(out))
+        return out
+
+    def _index_anchors(self, assertion_id: str, a: TripleAssertion) -> None:
+        assert self._anchors is not None
+        for anchor in extract_anchors(a):
+            ids = self._anchors.get(anchor)
+            if ids is None:
+                ids = self._anchors[anchor] = set()
+            ids.add(assertion_id)
+
+    def anchor_query(
+        self,
+        cues: Union[str, Iterable[str]] = (),
+        *,
+        facets: Optional[Mapping[str, Any]] = None,
+        scope: Optional[str] = None,
+        owner_id: Optional[str] = None,
+        limit: int = 20,
+        max_postings: int = MAX_ANCHOR_POSTINGS,
+    ) -> List[TripleAssertion]:
+        """Assertions sharing anchors (ids, paths, model names, typed facets) with `cues` / `facets`.
+
+        Ranked by matched anchor weight, then `observed_at` (desc); no embedding is computed. Each
+        result explains itself in `attributes["_retrieval"]` (`metric="anchors"`, `score`, `anchors`).
+        """
+        weights = anchor_cues(cues, facets)
+        scoped = TripleQuery(scope=scope, owner_id=owner_id)
+        with start_span(self._instrumentation, "inmemory.anchor_query") as span:
+            if self._anchors is None:
+                self._anchors = {}
+                for r in self._all_rows():
+                    self._index_anchors(r["assertion_id"], row_assertion(r))
+                span.lap("index")
+            index = self._anchors
+            postings = {k: len(index.get(k, ())) for k in weights}
+            seeds = selective_anchors(postings, weights, max_postings)
+            candidates: set[str] = set()
+            for anchor in seeds:
+                candidates |= index[anchor]
+            hits = []
+            rows: Dict[str, Dict[str, Any]] = {}
+            for assertion_id in candidates:
+                row = self._row(assertion_id)
+                if row is None or not _match(row, scoped):
+                    continue
+                rows[assertion_id] = row
+                matched = [k for k in weights if assertion_id in index.get(k, ())]
+                hits.append((assertion_id, _observed_key(row), matched))
+            span.lap("filter")
+            ranked = rank_anchor_hits(hits, weights, limit=anchor_limit(limit))
+            span.lap("sort")
+            out = [with_anchor_retrieval(row_assertion(rows[i]), score, m) for i, score, m in ranked]
+            span.count("rows_scanned", len(candidates))
+            span.count("rows_returned", len(out))
+        return out
+
+    def _candidates(self, q: TripleQuery, span: Any = None) -> List[Dict[str, Any]]:
+        """Rows that can match `q`, in insertion order (an interval-tree stab for `active_at`).
+
+        `span` (when tracing) is told which filter, if any, narrowed the candidates.
+        """
+        base = self._base
+        if base is not None:
+            # Snapshot rows: a selective equality filter is answered from the snapshot's codes;
+            # anything else needs every row, so the snapshot is absorbed (once).
+            if q.active_at_us is None:
+                for field in _INDEXED_FIELDS:
+                    value = getattr(q, field)
+                    if value:
+                        normalize = normalize_term if field == "object" else None
+                        positions = base.positions(field, value, normalize=normalize)
+                        if len(positions) <= max(1024, len(base) // 8):
+                            if span is not None and span.tracing:
+                                span.pushdown((f"{field}@snapshot_codes",))
+                            return base.rows_at(positions) + self._rows
+                        break
+            self._absorb_base()
+        if q.active_at_us is not None:
+            if span is not None and span.tracing:
+                span.pushdown(("active_at@interval_index",))
+            by_id = self._by_id
+            return [by_id[i] for i in self._validity.stab(q.active_at_us)]
+        return self._rows
+
     def query(self, q: TripleQuery) -> List[TripleAssertion]:
+        with start_span(self._instrumentation, "inmemory.query", tracer=self._trace_sink, query=q) as span:
+            out = self._query(q, span)
+            span.count("rows_returned", len(out))
+            span.results(out)
+        return out
+
+    def _query(self, q: TripleQuery, span: Any) -> List[TripleAssertion]:
         raw_limit = int(q.limit) if isinstance(q.limit, int) else 100
         limit: Optional[int]
         if raw_limit <= 0:
@@ -103,48 +748,38 @@ class InMemoryTripleStore:
         else:
             limit = max(1, raw_limit)
 
-        def _match(a: TripleAssertion) -> bool:
-            if q.subject and normalize_term(a.subject) != normalize_term(q.subject):
-                return False
-            if q.predicate and normalize_term(a.predicate) != normalize_term(q.predicate):
-                return False
-            if q.object and normalize_term(a.object) != normalize_term(q.object):
-                return False
-            if q.scope and a.scope != q.scope:
-                return False
-            if q.owner_id and (a.owner_id or "") != q.owner_id:
-                return False
-            if q.since and (a.observed_at or "") < q.since:
-                return False
-            if q.until and (a.observed_at or "") > q.until:
-                return False
-            if q.active_at:
-                at = q.active_at
-                if a.valid_from and a.valid_from > at:
-                    return False
-                if a.valid_until and a.valid_until <= at:
-                    return False
-            return True
-
-        rows = [r for r in self._rows if isinstance(r, dict) and isinstance(r.get("assertion"), TripleAssertion)]
+        rows = self._candidates(q, span)
         filtered: list[dict[str, Any]] = []
         for r in rows:
-            a = r["assertion"]
-            if _match(a):
+            if _match(r, q):
                 filtered.append(r)
+        span.lap("filter")
+        span.count("rows_scanned", len(rows))
 
         query_vector: Optional[Sequence[float]] = None
         if q.query_vector:
             query_vector = q.query_vector
         elif q.query_text:
-            if self._embedder is None:
+            embedder = self._columns.query_embedder(q.vector_column or self._vector_column)
+            if embedder is None:
                 raise ValueError("query_text requires a configured embedder (vector search); keyword fallback is disabled")
-            query_vector = self._embedder.embed_texts([q.query_text])[0]
+            query_vector = embedder.embed_texts([q.query_text])[0]
+            span.lap("embed")
+            span.count("embed_texts", 1)
 
         if query_vector is not None:
-            ranked: list[tuple[float, TripleAssertion]] = []
+            diversify = reranks(q)
+            keep = rerank_pool(q, limit) if diversify else limit
+            factor = q.scoring.factor() if q.scoring is not None else None
+            # (score, assertion, vector, cosine, observed_at_us)
+            ranked: list[tuple[float, TripleAssertion, Any, float, Optional[int]]] = []
+            quantized: list[tuple[QuantizedVector, tuple[TripleAssertion, QuantizedVector, Optional[int]]]] = []
+            pruned = 0
             for r in filtered:
-                v = r.get(q.vector_column or self._vector_column)
+                v = row_vector(r, q.vector_column or self._vector_column)
+                if isinstance(v, QuantizedVector):
+                    quantized.append((v, (row_assertion(r), v, r["observed_at_us"])))
+                    continue
                 if not isinstance(v, list):
                     continue
                 try:
@@ -152,20 +787,66 @@ class InMemoryTripleStore:
                 except Exception:
                     score = 0.0
                 if q.min_score is not None and score < float(q.min_score):
+                    pruned += 1
                     continue
-                ranked.append((score, r["assertion"]))
-            ranked.sort(key=lambda t: t[0], reverse=True)
+                ranked.append((score, row_assertion(r), v, score, r["observed_at_us"]))
+            if quantized:
+                # With scoring, the binary first pass still keeps `keep * rescore_factor` candidates
+                # by Hamming similarity; the rescored ones are all ranked below.
+                for score, (a, v, observed_us) in rank_quantized(
+                    query_vector, quantized, limit=keep, rescore_factor=self._rescore_factor, truncate=factor is None
+                ):
+                    if q.min_score is not None and score < float(q.min_score):
+                        pruned += 1
+                        continue
+                    ranked.append((score, a, v, score, observed_us))
+            span.lap("score")
+            span.count("vectors_scored", len(filtered))
+            if pruned:
+                span.count("rows_pruned_min_score", pruned)
+            if factor is not None:
+                ranked = [
+                    (cosine * factor(observed_us, a.confidence, a.predicate), a, v, cosine, observed_us)
+                    for _, a, v, cosine, observed_us in ranked
+                ]
+                span.lap("rescore")
+            # A bounded heap when `limit` is set (same order as a stable full sort).
+            ranked = top_scored(ranked, keep)
+            span.lap("sort")
+
+            picked: list[tuple[float, TripleAssertion, Optional[float], float]]
+            if diversify:
+                pool = ranked
+                span.count("rerank_pool", len(pool))
+                picked = [
+                    (pool[i][0], pool[i][1], mmr, pool[i][3])
+                    for i, mmr in rerank(
+                        [t[0] for t in pool],
+                        # Cosine is scale-invariant: int8 codes are compared without their scale.
+                        [t[2].values() if isinstance(t[2], QuantizedVector) else t[2] for t in pool],
+                        [(t[1].subject, t[1].predicate, t[1].object) for t in pool] if q.collapse_triples else None,
+                        limit=limit,
+                        mmr_lambda=q.mmr_lambda,
+                    )
+                ]
+                span.lap("rerank")
+            else:
+                picked = [(t[0], t[1], None, t[3]) for t in ranked]
 
             out: list[TripleAssertion] = []
-            for score, a in (ranked if limit is None else ranked[:limit]):
+            for score, a, mmr, cosine in picked:
                 attrs = dict(a.attributes) if isinstance(a.attributes, dict) else {}
                 retrieval = attrs.get("_retrieval") if isinstance(attrs.get("_retrieval"), dict) else {}
                 retrieval2 = dict(retrieval)
                 retrieval2["score"] = float(score)
                 retrieval2.setdefault("metric", "cosine")
+                if factor is not None:
+                    retrieval2["cosine"] = float(cosine)
+                if mmr is not None:
+                    retrieval2["mmr"] = mmr
                 attrs["_retrieval"] = retrieval2
                 out.append(
-                    TripleAssertion(
+                    TripleAssertion._from_canonical(
                         subject=a.subject,
                         predicate=a.predicate,
                         object=a.object,
@@ -177,10 +858,13 @@ class InMemoryTripleStore:
                         confidence=a.confidence,
                         provenance=dict(a.provenance),
                         attributes=attrs,
+                        assertion_id=a.assertion_id,
                     )
                 )
+            span.lap("materialize")
             return out
 
-        out: list[TripleAssertion] = [r["assertion"] for r in filtered]
-        out.sort(key=lambda a: a.observed_at or "", reverse=(str(q.order).lower() != "asc"))
-        return out if limit is None else out[:limit]
+        filtered.sort(key=_observed_key, reverse=(str(q.order).lower() != "asc"))
+        span.lap("sort")
+        out: list[TripleAssertion] = [row_assertion(r) for r in (filtered if limit is None else filtered[:limit])]
+        return out
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .embeddings import TextEmbedder
+from .in_memory_store import _canonical_text
+from .instrumentation import MetricsSink, start_span
+from .models import TripleAssertion
+from .store import TripleQuery, TripleStore
+
+_DONE = object()
+
+
+@dataclass
+class IngestStats:
+    """Throughput counters for one `IngestPipeline.run()` call (seconds are wall-clock per stage)."""
+
+    rows_in: int = 0
+    rows_written: int = 0
+    rows_skipped: int = 0  # already committed by a previous (interrupted) run
+    chunks: int = 0
+    embed_seconds: float = 0.0  # summed over concurrent embed calls
+    write_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    writer_wait_seconds: float = 0.0  # writer idle, waiting on embeddings
+
+    @property
+    def rows_per_s(self) -> float:
+        return (self.rows_written / self.wall_seconds) if self.wall_seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = asdict(self)
+        out["rows_per_s"] = self.rows_per_s
+        return out
+
+
+class _Checkpoint:
+    """JSON progress file: `offset` input items are durably written; `pending` is the chunk in flight."""
+
+    def __init__(self, path: Optional[Path]) -> None:
+        self._path = Path(path).expanduser() if path is not None else None
+        self.offset = 0
+        self.pending: Optional[Dict[str, int]] = None
+        if self._path is not None and self._path.exists():
+            try:
+                data = json.loads(self._path.read_text(encoding="utf-8"))
+            except Exception as e:
+                raise ValueError(f"unreadable ingest checkpoint: {self._path}") from e
+            self.offset = max(0, int(data.get("offset") or 0))
+            p = data.get("pending")
+            if isinstance(p, dict):
+                self.pending = {"offset": int(p.get("offset") or 0), "count": int(p.get("count") or 0)}
+
+    def save(self) -> None:
+        if self._path is None:
+            return
+        payload = {"version": 1, "offset": self.offset, "pending": self.pending}
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._path.with_suffix(self._path.suffix + ".tmp")
+        tmp.write_text(json.dumps(payload), encoding="utf-8")
+        tmp.replace(self._path)
+
+    def begin(self, offset: int, count: int) -> None:
+        self.pending = {"offset": offset, "count": count}
+        self.save()
+
+    def commit(self, offset: int) -> None:
+        self.offset = offset
+        self.pending = None
+        self.save()
+
+
+class IngestPipeline:
+    """Chunked bulk loader that overlaps embedding with store writes.
+
+    Notes:
+    - A reader thread chunks the input and submits each chunk's canonical texts to a pool of
+      `embed_concurrency` workers; the calling thread writes chunks in input order via
+      `store.add(chunk, vectors=...)`. At most `queue_size` chunks are in flight, so a slow store
+      throttles embedding (and a slow embedder leaves the writer waiting, see `IngestStats`).
+    - `embedder` defaults to the store's own (`store.embedder`); stores without one (SQLite) get
+      plain `add(chunk)` calls and the pipeline only batches.
+    - With `checkpoint_path`, progress is recorded after every write. Re-running with the same input
+      (same order) skips committed items, and the one chunk that was in flight when the previous run
+      died is reconciled by querying the store, so nothing is written twice.
+    - The first error (reader, embedder or store) stops the pipeline and is re-raised from `run()`.
+    """
+
+    def __init__(
+        self,
+        store: TripleStore,
+        *,
+        embedder: Optional[TextEmbedder] = None,
+        chunk_size: int = 256,
+        embed_concurrency: int = 4,
+        queue_size: Optional[int] = None,
+        checkpoint_path: Optional[Path] = None,
+        instrumentation: Optional[MetricsSink] = None,
+    ) -> None:
+        if int(chunk_size) <= 0:
+            raise ValueError("chunk_size must be > 0")
+        if int(embed_concurrency) <= 0:
+            raise ValueError("embed_concurrency must be > 0")
+        self._store = store
+        self._embedder = embedder if embedder is not None else getattr(store, "embedder", None)
+        self._chunk_size = int(chunk_size)
+        self._embed_concurrency = int(embed_concurrency)
+        self._queue_size = max(1, int(queue_size)) if queue_size is not None else 2 * self._embed_concurrency
+        self._checkpoint_path = checkpoint_path
+        self._instrumentation = instrumentation
+
+    def run(self, assertions: Iterable[TripleAssertion]) -> IngestStats:
+        stats = IngestStats()
+        ckpt = _Checkpoint(self._checkpoint_path)
+        t0 = time.perf_counter()
+
+        source = iter(assertions)
+        skipped = 0
+        while skipped < ckpt.offset and next(source, _DONE) is not _DONE:
+            skipped += 1
+        stats.rows_in = stats.rows_skipped = skipped
+
+        # The chunk in flight when a previous run stopped may or may not have been written.
+        in_doubt = 0
+        if ckpt.pending is not None and ckpt.pending["offset"] == ckpt.offset:
+            in_doubt = ckpt.pending["count"]
+
+        stats_lock = threading.Lock()
+        stop = threading.Event()
+        chunks: "queue.Queue[Any]" = queue.Queue(maxsize=self._queue_size)
+        pool = ThreadPoolExecutor(max_workers=self._embed_concurrency, thread_name_prefix="abstractmemory-embed")
+
+        def _embed(texts: List[str]) -> List[List[float]]:
+            start = time.perf_counter()
+            try:
+                return self._embedder.embed_texts(texts)  # type: ignore[union-attr]
+            finally:
+                with stats_lock:
+                    stats.embed_seconds += time.perf_counter() - start
+
+        def _put(item: Any) -> bool:
+            while not stop.is_set():
+                try:
+                    chunks.put(item, timeout=0.05)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def _read() -> None:
+            try:
+                first = in_doubt
+                for chunk in _chunked(source, self._chunk_size, first=first):
+                    if stop.is_set():
+                        return
+                    reconcile, first = first > 0, 0
+                    future: Optional[Future] = None
+                    if self._embedder is not None:
+                        future = pool.submit(_embed, [_canonical_text(a) for a in chunk])
+                    if not _put((chunk, future, reconcile)):
+                        return
+                _put(_DONE)
+            except BaseException as e:
+                _put(e)
+
+        reader = threading.Thread(target=_read, name="abstractmemory-ingest-reader", daemon=True)
+        reader.start()
+        offset = ckpt.offset
+        try:
+            with start_span(self._instrumentation, "ingest.run") as span:
+                while True:
+                    wait_start = time.perf_counter()
+                    item = chunks.get()
+                    if item is _DONE:
+                        break
+                    if isinstance(item, BaseException):
+                        raise item
+                    chunk, future, reconcile = item
+                    vectors = future.result() if future is not None else None
+                    stats.writer_wait_seconds += time.perf_counter() - wait_start
+
+                    write_start = time.perf_counter()
+                    todo, todo_vectors = chunk, vectors
+                    if reconcile:
+                        todo, todo_vectors = self._drop_existing(chunk, vectors)
+                        stats.rows_skipped += len(chunk) - len(todo)
+                    ckpt.begin(offset, len(chunk))
+                    if todo:
+                        if todo_vectors is not None:
+                            self._store.add(todo, vectors=todo_vectors)  # type: ignore[call-arg]
+                        else:
+                            self._store.add(todo)
+                    offset += len(chunk)
+                    ckpt.commit(offset)
+                    stats.write_seconds += time.perf_counter() - write_start
+
+                    stats.rows_in += len(chunk)
+                    stats.rows_written += len(todo)
+                    stats.chunks += 1
+                span.count("rows_written", stats.rows_written)
+                span.count("rows_skipped", stats.rows_skipped)
+                span.count("chunks", stats.chunks)
+        finally:
+            stop.set()
+            pool.shutdown(wait=True, cancel_futures=True)
+            reader.join(timeout=5.0)
+            stats.wall_seconds = time.perf_counter() - t0
+        return stats
+
+    def _drop_existing(
+        self, chunk: List[TripleAssertion], vectors: Optional[Sequence[Sequence[float]]]
+    ) -> Tuple[List[TripleAssertion], Optional[List[Sequence[float]]]]:
+        keep: List[TripleAssertion] = []
+        keep_vectors: Optional[List[Sequence[float]]] = [] if vectors is not None else None
+        for i, a in enumerate(chunk):
+            q = TripleQuery(
+                subject=a.subject,
+                predicate=a.predicate,
+                object=a.object,
+                scope=a.scope,
+                owner_id=a.owner_id,
+                since=a.observed_at,
+                until=a.observed_at,
+                limit=0,
+            )
+            if any(hit == a for hit in self._store.query(q)):
+                continue
+            keep.append(a)
+            if keep_vectors is not None and vectors is not None:
+                keep_vectors.append(vectors[i])
+        return keep, keep_vectors
+
+
+def _chunked(source: Iterator[TripleAssertion], size: int, *, first: int = 0) -> Iterator[List[TripleAssertion]]:
+    """Yield lists of `size` items (the first one of `first` items when > 0)."""
+    want = first if first > 0 else size
+    chunk: List[TripleAssertion] = []
+    for a in source:
+        chunk.append(a)
+        if len(chunk) >= want:
+            yield chunk
+            chunk, want = [], size
+    if chunk:
+        yield chunk
@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Protocol, Sequence
+
+from .trace import RecallTrace
+
+
+@dataclass(frozen=True)
+class OperationEvent:
+    """One timed store/embedder operation.
+
+    - `operation`: dotted name, e.g. `sqlite.query`, `inmemory.add`, `gateway.embed`
+    - `phases`: seconds spent per named step (`sql`, `decode`, `embed`, `score`, `sort`, ...)
+    - `counters`: sizes/counts (`rows_scanned`, `rows_returned`, `embed_texts`, `cache_hit`, ...)
+    """
+
+    operation: str
+    duration_s: float
+    ok: bool = True
+    phases: Dict[str, float] = field(default_factory=dict)
+    counters: Dict[str, float] = field(default_factory=dict)
+
+
+class MetricsSink(Protocol):
+    """Receives one `OperationEvent` per instrumented call (must be cheap and must not raise)."""
+
+    def record(self, event: OperationEvent) -> None: ...
+
+
+class _Span:
+    __slots__ = (
+        "_sink", "_operation", "_t0", "_mark", "_phases", "_counters",
+        "_tracer", "_query", "_started_at", "_pushdown", "_results",
+    )
+
+    def __init__(self, sink: Optional[MetricsSink], operation: str, tracer: Any = None, query: Any = None) -> None:
+        self._sink = sink
+        self._operation = operation
+        self._phases: Dict[str, float] = {}
+        self._counters: Dict[str, float] = {}
+        self._tracer = tracer
+        self._query = query
+        self._pushdown: Any = ()
+        self._results: Sequence[Any] = ()
+        self._started_at = time.time() if tracer is not None else 0.0
+        self._t0 = self._mark = time.perf_counter()
+
+    @property
+    def tracing(self) -> bool:
+        """True when a `RecallTrace` will be built (stores only compute trace-only details then)."""
+        return self._tracer is not None
+
+    def pushdown(self, entries: Any) -> None:
+        """Filters answered by an index/backend: a tuple, or a callable evaluated when the trace is read."""
+        self._pushdown = entries
+
+    def results(self, items: Sequence[Any]) -> None:
+        self._results = items
+
+    def lap(self, phase: str) -> None:
+        """Attribute the time since the previous lap (or span start) to `phase`."""
+        now = time.perf_counter()
+        self._phases[phase] = self._phases.get(phase, 0.0) + (now - self._mark)
+        self._mark = now
+
+    def count(self, name: str, value: float = 1) -> None:
+        self._counters[name] = self._counters.get(name, 0) + value
+
+    def __enter__(self) -> "_Span":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        duration_s = time.perf_counter() - self._t0
+        if self._sink is not None:
+            event = OperationEvent(
+                operation=self._operation,
+                duration_s=duration_s,
+                ok=exc_type is None,
+                phases=self._phases,
+                counters=self._counters,
+            )
+            try:
+                self._sink.record(event)
+            except Exception:
+                # Metrics must never break a store call.
+                pass
+        if self._tracer is not None:
+            try:
+                self._tracer.record(
+                    RecallTrace(
+                        operation=self._operation,
+                        started_at=self._started_at,
+                        duration_s=duration_s,
+                        ok=exc_type is None,
+                        query=self._query,
+                        pushdown=self._pushdown,
+                        phases=self._phases,
+                        counters=self._counters,
+                        results=self._results,
+                    )
+                )
+            except Exception:
+                pass
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    tracing = False
+
+    def pushdown(self, entries: Any) -> None:
+        return None
+
+    def results(self, items: Sequence[Any]) -> None:
+        return None
+
+    def lap(self, phase: str) -> None:
+        return None
+
+    def count(self, name: str, value: float = 1) -> None:
+        return None
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def start_span(sink: Optional[MetricsSink], operation: str, *, tracer: Any = None, query: Any = None) -> Any:
+    """Return a context manager timing `operation` (a shared no-op when `sink` and `tracer` are None).
+
+    With a `tracer` (a `TraceSink`) and the `TripleQuery` being answered, the span also emits a
+    `RecallTrace` on exit, filled from its phases/counters plus `pushdown(...)` and `results(...)`.
+    """
+    if sink is None and tracer is None:
+        return _NULL_SPAN
+    return _Span(sink, operation, tracer, query)
+
+
+class CallbackSink:
+    """Forward every event to a callable (logging, ad-hoc tracing, tests)."""
+
+    def __init__(self, callback: Callable[[OperationEvent], None]) -> None:
+        self._callback = callback
+
+    def record(self, event: OperationEvent) -> None:
+        self._callback(event)
+
+
+class FanOutSink:
+    """Send each event to several sinks (e.g. a registry plus an OpenTelemetry adapter)."""
+
+    def __init__(self, *sinks: MetricsSink) -> None:
+        self._sinks = tuple(s for s in sinks if s is not None)
+
+    def record(self, event: OperationEvent) -> None:
+        for sink in self._sinks:
+            try:
+                sink.record(event)
+            except Exception:
+                pass
+
+
+# Latency bucket upper bounds in milliseconds (roughly x2 steps from 50us to ~30s).
+DEFAULT_BUCKETS_MS: Sequence[float] = (
+    0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768,
+)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (constant memory; percentiles are bucket upper bounds)."""
+
+    def __init__(self, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS) -> None:
+        self._bounds = sorted(float(b) for b in buckets_ms)
+        self._counts = [0] * (len(self._bounds) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        self._counts[bisect.bisect_left(self._bounds, value_ms)] += 1
+        self.count += 1
+        self.sum_ms += value_ms
+        if value_ms > self.max_ms:
+            self.max_ms = value_ms
+
+    def percentile(self, p: float) -> float:
+        if self.count == 0:
+            return 0.0
+        target = max(1, int(round(float(p) * self.count)))
+        seen = 0
+        for i, c in enumerate(self._counts):
+            seen += c
+            if seen >= target:
+                return self._bounds[i] if i < len(self._bounds) else self.max_ms
+        return self.max_ms
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean_ms": (self.sum_ms / self.count) if self.count else 0.0,
+            "p50_ms": self.percentile(0.50),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": self.max_ms,
+        }
+
+
+class MetricsRegistry:
+    """In-process sink aggregating events into per-operation/per-phase histograms and counter sums.
+
+    Notes:
+    - `snapshot()` returns a JSON-able dict: `{operation: {calls, errors, latency, phases, counters}}`.
+    - Thread-safe; memory is bounded by the number of distinct operation/phase/counter names.
+    """
+
+    def __init__(self, *, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS) -> None:
+        self._buckets = tuple(buckets_ms)
+        self._lock = threading.Lock()
+        self._ops: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, event: OperationEvent) -> None:
+        with self._lock:
+            op = self._ops.get(event.operation)
+            if op is None:
+                op = {"calls": 0, "errors": 0, "latency": Histogram(self._buckets), "phases": {}, "counters": {}}
+                self._ops[event.operation] = op
+            op["calls"] += 1
+            if not event.ok:
+                op["errors"] += 1
+            op["latency"].observe(event.duration_s * 1000.0)
+            for name, seconds in event.phases.items():
+                h = op["phases"].get(name)
+                if h is None:
+                    h = op["phases"][name] = Histogram(self._buckets)
+                h.observe(seconds * 1000.0)
+            for name, value in event.counters.items():
+                op["counters"][name] = op["counters"].get(name, 0) + value
+
+    def reset(self) -> None:
+        with self._lock:
+            self._ops.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                name: {
+                    "calls": op["calls"],
+                    "errors": op["errors"],
+                    "latency": op["latency"].snapshot(),
+                    "phases": {p: h.snapshot() for p, h in op["phases"].items()},
+                    "counters": dict(op["counters"]),
+                }
+                for name, op in self._ops.items()
+            }
+
+
+class OpenTelemetrySink:
+    """Adapter that records events on an OpenTelemetry `Meter` (or any meter-like object).
+
+    Notes:
+    - Duck-typed: anything with `create_histogram(name, unit=, description=)` and
+      `create_counter(name, unit=, description=)` works, so `opentelemetry-api` stays optional.
+    - Emits `abstractmemory.operation.duration` and `abstractmemory.phase.duration` (ms) plus one
+      counter per event counter name (`abstractmemory.<name>`), attributed by `operation`/`phase`.
+    """
+
+    def __init__(self, meter: Any, *, prefix: str = "abstractmemory") -> None:
+        self._meter = meter
+        self._prefix = str(prefix or "abstractmemory").strip(".")
+        self._lock = threading.Lock()
+        self._duration = meter.create_histogram(
+            f"{self._prefix}.operation.duration", unit="ms", description="AbstractMemory operation latency"
+        )
+        self._phase = meter.create_histogram(
+            f"{self._prefix}.phase.duration", unit="ms", description="AbstractMemory per-phase latency"
+        )
+        self._counters: Dict[str, Any] = {}
+
+    def _counter(self, name: str) -> Any:
+        with self._lock:
+            c = self._counters.get(name)
+            if c is None:
+                c = self._counters[name] = self._meter.create_counter(f"{self._prefix}.{name}", unit="1", description="")
+            return c
+
+    def record(self, event: OperationEvent) -> None:
+        attrs = {"operation": event.operation, "ok": bool(event.ok)}
+        self._duration.record(event.duration_s * 1000.0, attributes=attrs)
+        for name, seconds in event.phases.items():
+            self._phase.record(seconds * 1000.0, attributes={"operation": event.operation, "phase": name})
+        for name, value in event.counters.items():
+            self._counter(name).add(value, attributes={"operation": event.operation})
+
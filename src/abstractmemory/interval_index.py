@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import Generic, Iterable, List, Optional, Set, Tuple, TypeVar
+
+from .models import EPOCH_US_MIN
+
+K = TypeVar("K")
+
+# Open interval ends (`valid_from` / `valid_until` unset) map to the extremes of the int64 axis.
+OPEN_START = EPOCH_US_MIN
+OPEN_END = (1 << 63) - 1
+
+
+class _Node:
+    __slots__ = ("center", "by_start", "starts", "by_end", "neg_ends", "left", "right")
+
+    def __init__(self, center: int, overlapping: List[Tuple[int, int, int]]) -> None:
+        self.center = center
+        # Intervals containing `center` (already sorted by start), plus an end-sorted copy, so a
+        # stab only walks the ones that match.
+        self.by_start = overlapping
+        self.starts = [t[0] for t in self.by_start]
+        self.by_end = sorted(overlapping, key=lambda t: -t[1])
+        self.neg_ends = [-t[1] for t in self.by_end]
+        self.left: Optional[_Node] = None
+        self.right: Optional[_Node] = None
+
+
+def _build(items: List[Tuple[int, int, int]]) -> Optional[_Node]:
+    """Build from non-empty intervals sorted by start (partitions keep that order)."""
+    if not items:
+        return None
+    # The median interval contains its own start, so every node keeps at least one interval.
+    center = items[len(items) // 2][0]
+    left: List[Tuple[int, int, int]] = []
+    right: List[Tuple[int, int, int]] = []
+    here: List[Tuple[int, int, int]] = []
+    for item in items:
+        start, end, _ = item
+        if end <= center:
+            left.append(item)
+        elif start > center:
+            right.append(item)
+        else:
+            here.append(item)
+    node = _Node(center, here)
+    node.left = _build(left)
+    node.right = _build(right)
+    return node
+
+
+class IntervalIndex(Generic[K]):
+    """Stabbing-query index over half-open `[start, end)` validity intervals (epoch microseconds).
+
+    Notes:
+    - A centered interval tree answers "which intervals contain t" in O(log n + k).
+    - Inserts go to an unsorted tail that is scanned linearly; the tree is rebuilt lazily once the
+      tail outgrows `max(rebuild_min, n / 8)`, so append-heavy workloads stay O(1) per insert.
+    - `None` bounds are open (`OPEN_START` / `OPEN_END`). Empty intervals (`end <= start`) never match.
+    """
+
+    def __init__(self, *, rebuild_min: int = 512) -> None:
+        self._rebuild_min = max(1, int(rebuild_min))
+        self._keys: List[K] = []
+        self._tree_items: List[Tuple[int, int, int]] = []
+        self._tail: List[Tuple[int, int, int]] = []
+        self._removed: Set[int] = set()
+        self._root: Optional[_Node] = None
+
+    def __len__(self) -> int:
+        return len(self._tree_items) + len(self._tail) - len(self._removed)
+
+    def add(self, key: K, start: Optional[int], end: Optional[int]) -> None:
+        lo = OPEN_START if start is None else int(start)
+        hi = OPEN_END if end is None else int(end)
+        if hi <= lo:
+            return  # empty validity window: never active
+        slot = len(self._keys)
+        self._keys.append(key)
+        self._tail.append((lo, hi, slot))
+
+    def extend(self, entries: Iterable[Tuple[K, Optional[int], Optional[int]]]) -> None:
+        """Bulk `add` of `(key, start, end)` triples."""
+        keys = self._keys
+        tail = self._tail
+        for key, start, end in entries:
+            lo = OPEN_START if start is None else start
+            hi = OPEN_END if end is None else end
+            if hi <= lo:
+                continue
+            tail.append((lo, hi, len(keys)))
+            keys.append(key)
+
+    def discard(self, keys: Iterable[K]) -> None:
+        doomed = set(keys)
+        if not doomed:
+            return
+        for slot, key in enumerate(self._keys):
+            if key in doomed:
+                self._removed.add(slot)
+        if len(self._removed) > max(self._rebuild_min, len(self._keys) // 4):
+            self._compact()
+
+    def _compact(self) -> None:
+        live = [t for t in self._tree_items + self._tail if t[2] not in self._removed]
+        keys = [self._keys[t[2]] for t in live]
+        self._keys = keys
+        self._tree_items = [(s, e, i) for i, (s, e, _) in enumerate(live)]
+        self._tail = []
+        self._removed = set()
+        self._root = _build(sorted(self._tree_items))
+
+    def _maybe_rebuild(self) -> None:
+        if len(self._tail) > max(self._rebuild_min, len(self._tree_items) // 8):
+            self._tree_items.extend(self._tail)
+            self._tail = []
+            self._root = _build(sorted(t for t in self._tree_items if t[2] not in self._removed))
+
+    def stab(self, point: int) -> List[K]:
+        """Keys whose interval contains `point` (`start <= point < end`), in insertion order."""
+        self._maybe_rebuild()
+        at = int(point)
+        slots: List[int] = []
+        node = self._root
+        while node is not None:
+            if at < node.center:
+                # Every interval here ends after `center > at`; keep those starting at or before `at`.
+                n = bisect_right(node.starts, at)
+                slots.extend(t[2] for t in node.by_start[:n])
+                node = node.left
+            else:
+                # Every interval here starts at or before `center <= at`; keep those ending after `at`.
+                n = bisect_right(node.neg_ends, -at - 1)
+                slots.extend(t[2] for t in node.by_end[:n])
+                node = node.right
+        slots.extend(t[2] for t in self._tail if t[0] <= at < t[1])
+        removed = self._removed
+        return [self._keys[s] for s in sorted(slots) if s not in removed]
@@ -1,13 +1,38 @@
 from __future__ import annotations
 
 import json
-import uuid
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Sequence
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple, Union
 
+from .aggregate import GroupAccumulator, group_limit, normalize_aggregate
+from .anchors import (
+    MAX_ANCHOR_POSTINGS,
+    anchor_cues,
+    anchor_limit,
+    extract_anchors,
+    rank_anchor_hits,
+    selective_anchors,
+    with_anchor_retrieval,
+)
+from .changes import Change, ChangeCallback, ChangeSubscribers, change_limit
 from .embeddings import TextEmbedder
-from .models import TripleAssertion, normalize_term
+from .instrumentation import MetricsSink, start_span
+from .models import (
+    EPOCH_US_MIN,
+    TripleAssertion,
+    epoch_sort_key,
+    given_assertion_ids,
+    iso_to_epoch_us,
+    new_assertion_id,
+    normalize_id_mode,
+    normalize_term,
+)
+from .quantization import cosine_to, from_int8_codes, normalize_precision, pack_sign_bits, quantize_int8
+from .rerank import rerank, rerank_pool, reranks
+from .scoring import top_scored
 from .store import TripleQuery
+from .trace import TraceSink, structured_filters
+from .vector_columns import VectorBackfill, VectorColumn, VectorColumnRegistry
 
 
 def _import_lancedb():
@@ -22,12 +47,20 @@ def _import_lancedb():
         ) from e
 
 
+def _import_pyarrow_numpy():
+    # Both ship as LanceDB dependencies; import lazily to keep module import cheap.
+    import numpy  # type: ignore
+    import pyarrow  # type: ignore
+
+    return pyarrow, numpy
+
+
 def _escape_sql_string(value: str) -> str:
     # LanceDB uses SQL-like filter strings; escape single quotes.
     return str(value).replace("'", "''")
 
 
-def _build_where_clause(q: TripleQuery) -> str:
+def _build_where_clause(q: TripleQuery, *, epoch_columns: bool = True) -> str:
     parts: list[str] = []
 
     if q.subject:
@@ -41,15 +74,28 @@ def _build_where_clause(q: TripleQuery) -> str:
     if q.owner_id:
         parts.append(f"owner_id = '{_escape_sql_string(q.owner_id)}'")
 
+    # Time bounds compare the epoch-microsecond columns; bounds that do not parse as ISO-8601 (or
+    # tables that could not be migrated) fall back to the legacy string comparison.
     if q.since:
-        parts.append(f"observed_at >= '{_escape_sql_string(q.since)}'")
+        if epoch_columns and q.since_us is not None:
+            parts.append(f"observed_at_us >= {int(q.since_us)}")
+        else:
+            parts.append(f"observed_at >= '{_escape_sql_string(q.since)}'")
     if q.until:
-        parts.append(f"observed_at <= '{_escape_sql_string(q.until)}'")
+        if epoch_columns and q.until_us is not None:
+            parts.append(f"observed_at_us <= {int(q.until_us)}")
+        else:
+            parts.append(f"observed_at <= '{_escape_sql_string(q.until)}'")
 
     if q.active_at:
-        at = _escape_sql_string(q.active_at)
-        parts.append(f"(valid_from IS NULL OR valid_from <= '{at}')")
-        parts.append(f"(valid_until IS NULL OR valid_until > '{at}')")
+        if epoch_columns and q.active_at_us is not None:
+            at_us = int(q.active_at_us)
+            parts.append(f"(valid_from_us IS NULL OR valid_from_us <= {at_us})")
+            parts.append(f"(valid_until_us IS NULL OR valid_until_us > {at_us})")
+        else:
+            at = _escape_sql_string(q.active_at)
+            parts.append(f"(valid_from IS NULL OR valid_from <= '{at}')")
+            parts.append(f"(valid_until IS NULL OR valid_until > '{at}')")
 
     return " AND ".join(parts)
 
@@ -96,6 +142,72 @@ def _loads_json(raw: object) -> dict:
         return {}
 
 
+def _row_to_assertion(
+    r: Dict[str, Any],
+    *,
+    provenance: Optional[Dict[str, Any]] = None,
+    attributes: Optional[Dict[str, Any]] = None,
+) -> TripleAssertion:
+    # Rows were written from canonical `TripleAssertion`s: skip re-canonicalization.
+    return TripleAssertion._from_canonical(
+        subject=str(r.get("subject") or ""),
+        predicate=str(r.get("predicate") or ""),
+        object=str(r.get("object") or ""),
+        scope=str(r.get("scope") or "run"),
+        owner_id=str(r.get("owner_id")) if r.get("owner_id") is not None else None,
+        observed_at=str(r.get("observed_at") or ""),
+        valid_from=str(r.get("valid_from")) if r.get("valid_from") is not None else None,
+        valid_until=str(r.get("valid_until")) if r.get("valid_until") is not None else None,
+        confidence=r.get("confidence") if isinstance(r.get("confidence"), (int, float)) else None,
+        provenance=provenance if provenance is not None else _loads_json(r.get("provenance_json")),
+        attributes=attributes if attributes is not None else _loads_json(r.get("attributes_json")),
+        assertion_id=str(r.get("assertion_id")) if r.get("assertion_id") is not None else None,
+    )
+
+
+def _row_observed_us(r: Dict[str, Any]) -> Optional[int]:
+    us = _observed_key(r)
+    return None if us == EPOCH_US_MIN else us
+
+
+def _observed_key(r: Dict[str, Any]) -> int:
+    us = r.get("observed_at_us")
+    if isinstance(us, int):
+        return us
+    # Unparseable timestamps, or rows from a table without the epoch column.
+    return epoch_sort_key(r.get("observed_at"))
+
+
+# Scalar columns every table is created with (types pinned so later batches never hit a
+# column missing from an inferred schema, e.g. the first batch had no `valid_from`).
+_CORE_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("assertion_id", "string"),
+    ("subject", "string"),
+    ("predicate", "string"),
+    ("object", "string"),
+    ("scope", "string"),
+    ("owner_id", "string"),
+    ("observed_at", "string"),
+    ("valid_from", "string"),
+    ("valid_until", "string"),
+    ("confidence", "float64"),
+    ("provenance_json", "string"),
+    ("attributes_json", "string"),
+    ("text", "string"),
+    ("observed_at_us", "int64"),
+    ("valid_from_us", "int64"),
+    ("valid_until_us", "int64"),
+    ("seq", "int64"),
+)
+# `list<string>` of anchors (see `anchors.py`), LabelList-indexed for `anchor_query`. Not a core
+# column: `get_many` and friends never need to read it.
+_ANCHOR_COLUMN = "anchors"
+
+
+def _string_list(values: Iterable[str]) -> str:
+    return "[" + ", ".join(f"'{_escape_sql_string(v)}'" for v in values) + "]"
+
+
 def _list_lancedb_tables(db: Any) -> set[str]:
     list_tables = getattr(db, "list_tables", None)
     if callable(list_tables):
@@ -116,8 +228,37 @@ class LanceDBTripleStore:
     """LanceDB-backed append-only triple store with optional vector search.
 
     Notes:
-    - Append-only: updates are represented as new assertions.
+    - Append-only: updates are represented as new assertions (`purge(...)` exists for retention only).
     - Vector search is optional and requires `embedder` (for query_text) or query_vector.
+    - `vector_precision` sets the stored vector dtype: `float32`, `float16` (searched natively),
+      or `int8`/`binary` (int8 codes + per-vector scale + packed sign bits; LanceDB cannot search
+      int8 columns, so both use a native Hamming first pass over the sign bits and rescore the best
+      `limit * rescore_factor` candidates with the full-precision query against the int8 codes;
+      the pool grows while fewer than `limit` candidates pass `min_score`).
+      Default: inferred from an existing table, else float32.
+    - Timestamps are kept verbatim and mirrored into UTC epoch microsecond columns (`*_us`) used
+      for time filters and ordering; tables from older versions get them via `add_columns` on open.
+    - `id_mode="content"` derives ids from the canonical fields (plus `id_provenance_keys`); ids
+      already in the table are skipped before embedding and writes go through
+      `merge_insert(...).when_not_matched_insert_all()`, so replays do not duplicate rows.
+    - `instrumentation` (a `MetricsSink`) receives `lancedb.add` / `lancedb.query` timings
+      (`embed`/`encode`/`write`/`search`/`decode`/`sort`) and rows scanned vs returned.
+    - `trace_sink` (a `TraceSink`) receives one `RecallTrace` per `query()` (filters in the `where`
+      clause, ANN vs Hamming first pass, candidates, `min_score` pruning, timings, result ids).
+    - Rows get a monotonic `seq` (BTree-indexed) for `changes(since_seq)` / `subscribe(callback)`.
+      Numbers are assigned by the writing process, so a table should have one writer at a time;
+      rows written before the column existed have no `seq` and are not in the feed.
+    - Anchors (see `anchors.py`) are extracted at `add()` into a `list<string>` column with a
+      LabelList index; `anchor_query(...)` resolves cues with `array_has_any` filters. Tables from
+      older versions get the column on open, backfilled with `merge_insert`.
+    - `TripleQuery.mmr_lambda` / `collapse_triples` fetch `mmr_pool` nearest neighbours (vectors
+      included) and rerank them client-side (see `rerank.py`).
+    - `TripleQuery.scoring` (a `RecallScoring`) fetches ANN candidates in rounds, starting at
+      `limit`, until the combined-score top `limit` is provably complete.
+    - `vector_columns` / `add_vector_column()` bind more named columns to their own embedders
+      (see `vector_columns.py`). They are fixed-size float lists (float32 unless the store is
+      float16/float64), added to existing tables as NULL columns; `backfill_vectors(name)` fills
+      them with `merge_insert` batches while the table stays online.
     """
 
     def __init__(
@@ -127,12 +268,28 @@ class LanceDBTripleStore:
         table_name: str = "triple_assertions",
         embedder: Optional[TextEmbedder] = None,
         vector_column: str = "vector",
+        vector_columns: Sequence[VectorColumn] = (),
+        vector_precision: Optional[str] = None,
+        rescore_factor: int = 4,
+        id_mode: str = "uuid",
+        id_provenance_keys: Sequence[str] = (),
+        instrumentation: Optional[MetricsSink] = None,
+        trace_sink: Optional[TraceSink] = None,
+        flat_search_max_rows: int = 10_000,
     ):
+        self._id_mode = normalize_id_mode(id_mode)
+        self._id_provenance_keys = tuple(str(k) for k in id_provenance_keys)
         self._lancedb = _import_lancedb()
         self._db = self._lancedb.connect(str(uri))
         self._table_name = str(table_name)
         self._vector_column = str(vector_column or "vector")
-        self._embedder = embedder
+        self._columns = VectorColumnRegistry(self._vector_column, embedder, vector_columns)
+        self._embedder = self._columns.default_embedder
+        self._precision: Optional[str] = normalize_precision(vector_precision) if vector_precision else None
+        self._rescore_factor = max(1, int(rescore_factor))
+        self._instrumentation = instrumentation
+        self._trace_sink = trace_sink
+        self._flat_search_max_rows = max(0, int(flat_search_max_rows))
 
         self._table = None
         try:
@@ -140,14 +297,339 @@ class LanceDBTripleStore:
                 self._table = self._db.open_table(self._table_name)
         except Exception:
             self._table = None
+        self._epoch_columns = self._migrate_epoch_columns()
+        self._seq_column = self._migrate_seq_column()
+        self._anchor_column = self._migrate_anchor_column()
+        self._ensure_scalar_indexes()
+        self._vector_indexes = self._indexed_vector_columns()
+        self._last_seq: Optional[int] = None  # read from the table on first use
+        self._subscribers = ChangeSubscribers()
+
+        existing = self._stored_precision(self._vector_column)
+        if existing is not None:
+            quantized = ("int8", "binary")
+            if self._precision is not None and self._precision != existing and not (
+                self._precision in quantized and existing in quantized
+            ):
+                raise ValueError(
+                    f"vector_precision={self._precision!r} does not match the existing table layout ({existing!r})"
+                )
+            self._precision = self._precision or existing
+        for name in self._columns.extra_names():
+            self._pin_stored_dimension(name)
+
+    def _migrate_epoch_columns(self) -> bool:
+        """Ensure `*_us` columns exist; returns False when time filters must stay string-based."""
+        if self._table is None:
+            return True  # created with the full core schema on first add
+        try:
+            names = set(self._table.schema.names)
+            if "observed_at_us" in names:
+                return True
+            added: Dict[str, str] = {}
+            for column in ("valid_from", "valid_until"):
+                if column not in names:
+                    added[column] = "CAST(NULL AS STRING)"
+            if added:
+                self._table.add_columns(added)
+            # DataFusion parses RFC 3339 with offsets (naive values are UTC), matching `iso_to_epoch_us`.
+            self._table.add_columns(
+                {
+                    f"{column}_us": f"CAST(to_timestamp_micros({column}) AS BIGINT)"
+                    for column in ("observed_at", "valid_from", "valid_until")
+                }
+            )
+            return True
+        except Exception:
+            # e.g. a stored timestamp DataFusion cannot parse: keep legacy string comparisons.
+            return False
+
+    def _migrate_seq_column(self) -> bool:
+        """Ensure the `seq` column exists (NULL for rows written before it); False if it cannot be added."""
+        if self._table is None:
+            return True
+        try:
+            if "seq" not in set(self._table.schema.names):
+                self._table.add_columns({"seq": "CAST(NULL AS BIGINT)"})
+            return True
+        except Exception:
+            return False
+
+    def _migrate_anchor_column(self) -> bool:
+        """Ensure the anchors column exists, backfilled for older rows; False if it cannot be added."""
+        if self._table is None:
+            return True
+        try:
+            names = set(self._table.schema.names)
+            if _ANCHOR_COLUMN in names:
+                return True
+            pa, _ = _import_pyarrow_numpy()
+            self._table.add_columns(pa.field(_ANCHOR_COLUMN, pa.list_(pa.string())))
+            columns = [name for name, _ in _CORE_COLUMNS if name in names]
+            rows = self._table.search().select(columns).limit(None).to_list()
+            for start in range(0, len(rows), 10_000):
+                chunk = rows[start : start + 10_000]
+                update = pa.table(
+                    {
+                        "assertion_id": pa.array([str(r.get("assertion_id")) for r in chunk], type=pa.string()),
+                        _ANCHOR_COLUMN: pa.array(
+                            [list(extract_anchors(_row_to_assertion(r))) for r in chunk], type=pa.list_(pa.string())
+                        ),
+                    }
+                )
+                self._table.merge_insert("assertion_id").when_matched_update_all().execute(update)
+            return True
+        except Exception:
+            return False
+
+    def _ensure_scalar_indexes(self) -> None:
+        """Best-effort indexes: BTree on `assertion_id` (`get_many`, content-id lookups), `seq`
+        (`changes`) and `owner_id` (prefiltered vector search per owner), LabelList on the anchors
+        (`anchor_query`)."""
+        if self._table is None:
+            return
+        try:
+            indexed = {c for idx in self._table.list_indices() for c in list(getattr(idx, "columns", None) or [])}
+            names = set(self._table.schema.names)
+        except Exception:
+            return
+        for column in ("assertion_id", "seq", "owner_id", _ANCHOR_COLUMN):
+            if column in indexed or column not in names:
+                continue
+            try:
+                from lancedb.index import BTree, LabelList  # type: ignore
+
+                self._table.create_index(column, config=LabelList() if column == _ANCHOR_COLUMN else BTree())
+            except Exception:
+                try:
+                    self._table.create_scalar_index(column, index_type="LABEL_LIST" if column == _ANCHOR_COLUMN else "BTREE")  # older LanceDB
+                except Exception:
+                    # Lookups still work (as scans) without the index.
+                    pass
+
+    def _indexed_vector_columns(self) -> Set[str]:
+        """Columns with an ANN index (IVF/HNSW); searches on other columns are exact scans."""
+        if self._table is None:
+            return set()
+        try:
+            indices = self._table.list_indices()
+        except Exception:
+            return set()
+        out: Set[str] = set()
+        for idx in indices:
+            kind = str(getattr(idx, "index_type", "") or "").lower()
+            if "ivf" in kind or "hnsw" in kind:
+                out.update(str(c) for c in list(getattr(idx, "columns", None) or []))
+        return out
+
+    def create_vector_index(self, *, vector_column: Optional[str] = None, config: Any = None, replace: bool = True) -> None:
+        """Build an ANN index on a vector column (default: `lancedb.index.IvfPq(distance_type="cosine")`).
+
+        Without one, vector queries scan the prefiltered rows exactly, which is fine up to a few
+        hundred thousand rows. Rows added later are still found (LanceDB scans unindexed rows)
+        until the index is rebuilt.
+        """
+        if self._table is None:
+            raise ValueError("create_vector_index() needs a non-empty table")
+        col = vector_column or self._vector_column
+        if self._is_quantized(col):
+            raise ValueError("int8/binary vectors are searched through their sign bits; they cannot take an ANN index")
+        try:
+            from lancedb.index import IvfPq  # type: ignore
+        except Exception:  # older LanceDB: legacy signature
+            if config is not None:
+                raise
+            self._table.create_index(metric="cosine", vector_column_name=col, replace=replace)
+        else:
+            self._table.create_index(col, config=config if config is not None else IvfPq(distance_type="cosine"), replace=replace)
+        self._vector_indexes = self._indexed_vector_columns() | {col}
+
+    def _pin_stored_dimension(self, column: str) -> None:
+        """A registered column that already exists in the table must match its embedder's dimension."""
+        try:
+            names = set(self._table.schema.names) if self._table is not None else set()
+            size = getattr(self._table.schema.field(column).type, "list_size", None) if column in names else None  # type: ignore[union-attr]
+        except Exception:
+            return
+        if size:
+            self._columns.pin(column, int(size))
+
+    def _extra_vector_type(self, dim: int) -> Any:
+        pa, _ = _import_pyarrow_numpy()
+        dtype = {"float64": pa.float64(), "float16": pa.float16()}.get(str(self._precision), pa.float32())
+        return pa.list_(dtype, int(dim))
+
+    def _ensure_vector_column(self, column: str, dim: int) -> None:
+        """Add `column` to an existing table as a NULL vector column (no rewrite of existing data)."""
+        if self._table is None or column in set(self._table.schema.names):
+            return
+        pa, _ = _import_pyarrow_numpy()
+        self._table.add_columns(pa.field(column, self._extra_vector_type(dim)))
+
+    def vector_columns(self) -> List[Dict[str, Any]]:
+        """Registered vector columns: `name`, `dimension` (once known), `model_id`, `default`."""
+        return self._columns.describe()
+
+    def add_vector_column(self, column: VectorColumn) -> None:
+        """Register another vector column; later `add()`s fill it, `backfill_vectors()` the older rows."""
+        self._columns.register(column)
+        self._pin_stored_dimension(column.name)
+
+    def backfill_vectors(
+        self,
+        column: str,
+        *,
+        batch_size: int = 256,
+        background: bool = False,
+        on_batch: Optional[Callable[[int], None]] = None,
+    ) -> VectorBackfill:
+        """Embed `column` for rows where it is NULL (`background=True` returns a started job)."""
+        if self._columns.get(column) is None:
+            raise ValueError(f"no embedder registered for vector column {column!r}")
+        if column == self._vector_column and self._is_quantized(column):
+            raise ValueError("backfill writes float vectors; the int8/binary default column cannot take them")
+        job = VectorBackfill(self, column, batch_size=batch_size, on_batch=on_batch)
+        if background:
+            return job.start()
+        job.run()
+        return job
+
+    def _backfill_batch(self, column: str, limit: int) -> int:
+        if self._table is None:
+            return 0
+        with start_span(self._instrumentation, "lancedb.backfill") as span:
+            qb = self._table.search()
+            if column in set(self._table.schema.names):
+                qb = qb.where(f"{column} IS NULL")
+            rows = [r for r in qb.select(["assertion_id", "text"]).limit(limit).to_list() if isinstance(r, dict)]
+            span.lap("search")
+            span.count("rows_scanned", len(rows))
+            if not rows:
+                return 0
+            vectors = self._columns.embed(column, [str(r.get("text") or "") for r in rows])
+            span.lap("embed")
+            span.count("embed_texts", len(rows))
+            dim = len(vectors[0])
+            self._ensure_vector_column(column, dim)
+            pa, _ = _import_pyarrow_numpy()
+            update = pa.table(
+                {
+                    "assertion_id": pa.array([str(r.get("assertion_id")) for r in rows], type=pa.string()),
+                    column: pa.array([[float(x) for x in v] for v in vectors], type=self._table.schema.field(column).type),
+                }
+            )
+            self._table.merge_insert("assertion_id").when_matched_update_all().execute(update)
+            span.lap("write")
+            span.count("rows_written", len(rows))
+        return len(rows)
+
+    def _stored_precision(self, column: str) -> Optional[str]:
+        if self._table is None:
+            return None
+        try:
+            schema = self._table.schema
+            names = set(schema.names)
+            if column not in names:
+                return None
+            if f"{column}_bits" in names:
+                return "int8"
+            value_type = str(getattr(schema.field(column).type, "value_type", ""))
+        except Exception:
+            return None
+        return {"halffloat": "float16", "float": "float32", "double": "float64"}.get(value_type)
+
+    def _is_quantized(self, column: str) -> bool:
+        try:
+            return self._table is not None and f"{column}_bits" in set(self._table.schema.names)
+        except Exception:
+            return False
+
+    def _vector_fields(self, vector: Sequence[float]) -> Dict[str, Any]:
+        col = self._vector_column
+        if self._precision in ("int8", "binary"):
+            codes, scale = quantize_int8(vector)
+            return {col: list(codes), f"{col}_scale": float(scale), f"{col}_bits": list(pack_sign_bits(vector))}
+        return {col: [float(x) for x in vector]}
+
+    def _typed_table(self, rows: List[Dict[str, Any]], dim: Optional[int], extra_dims: Optional[Mapping[str, int]] = None) -> Any:
+        """Build the first batch as an Arrow table with pinned core and vector column types."""
+        pa, _ = _import_pyarrow_numpy()
+        scalar = {"string": pa.string(), "float64": pa.float64(), "int64": pa.int64()}
+        types: Dict[str, Any] = {name: scalar[kind] for name, kind in _CORE_COLUMNS}
+        types[_ANCHOR_COLUMN] = pa.list_(pa.string())
+        col = self._vector_column
+        if dim:
+            # Without an explicit precision keep LanceDB's own default (float32).
+            dtype = {"float64": pa.float64(), "float16": pa.float16(), "int8": pa.int8(), "binary": pa.int8()}.get(
+                str(self._precision), pa.float32()
+            )
+            types[col] = pa.list_(dtype, dim)
+            if self._precision in ("int8", "binary"):
+                types[f"{col}_bits"] = pa.list_(pa.uint8(), (dim + 7) // 8)
+                types[f"{col}_scale"] = pa.float32()
+        for name, extra_dim in (extra_dims or {}).items():
+            types[name] = self._extra_vector_type(extra_dim)
+
+        names = list(types)
+        for r in rows:
+            names.extend(k for k in r if k not in types and k not in names)
+        columns = {
+            name: pa.array([r.get(name) for r in rows], type=types.get(name))
+            for name in names
+        }
+        return pa.table(columns)
+
+    def _batch(self, rows: List[Dict[str, Any]]) -> Any:
+        """Rows as an Arrow table in the stored schema.
+
+        Plain dict lists would have their columns inferred from the first row, and rows omit nulls,
+        so a later row's `valid_from`/`confidence` could be silently dropped.
+        """
+        pa, _ = _import_pyarrow_numpy()
+        schema = self._table.schema
+        names = set(schema.names)
+        unknown = sorted({k for r in rows for k in r if k not in names})
+        if unknown:
+            raise ValueError(f"columns not in table {self._table_name!r}: {', '.join(unknown)}")
+        return pa.Table.from_pylist(rows, schema=schema)
+
+    def _rows_by_id(self, ids: Sequence[str], *, columns: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Rows whose `assertion_id` is in `ids` (one indexed `IN` filter per 4096 ids)."""
+        if self._table is None or not ids:
+            return []
+        rows: List[Dict[str, Any]] = []
+        for start in range(0, len(ids), 4096):
+            chunk = ids[start : start + 4096]
+            values = ", ".join(f"'{_escape_sql_string(i)}'" for i in chunk)
+            qb = self._table.search().where(f"assertion_id IN ({values})")
+            if columns is not None:
+                qb = qb.select(columns)
+            rows.extend(r for r in qb.limit(None).to_list() if isinstance(r, dict))
+        return rows
+
+    def _existing_ids(self, ids: Sequence[str]) -> set[str]:
+        return {str(r.get("assertion_id")) for r in self._rows_by_id(ids, columns=["assertion_id"])}
 
     def close(self) -> None:
         # LanceDB tables/connections are managed by the library; nothing required here.
         return None
 
-    def add(self, assertions: Iterable[TripleAssertion]) -> List[str]:
+    @property
+    def embedder(self) -> Optional[TextEmbedder]:
+        return self._embedder
+
+    def add(
+        self,
+        assertions: Iterable[TripleAssertion],
+        *,
+        vectors: Optional[Sequence[Sequence[float]]] = None,
+        ids: Optional[Sequence[str]] = None,
+    ) -> List[str]:
+        """Append assertions; `vectors` (one per assertion) skips the configured embedder.
+
+        `ids` (one per assertion) keeps existing ids; ids already stored are skipped (replication).
+        """
         rows: list[dict[str, Any]] = []
-        ids: List[str] = []
         pending: List[TripleAssertion] = []
 
         for a in assertions:
@@ -155,49 +637,319 @@ class LanceDBTripleStore:
 
         if not pending:
             return []
+        if vectors is not None and len(vectors) != len(pending):
+            raise ValueError(f"got {len(vectors)} vectors for {len(pending)} assertions")
 
-        # Always store a canonical text column (useful for debugging and future indexing).
-        texts: List[str] = [_canonical_text(a) for a in pending]
-        vectors: Optional[List[List[float]]] = None
-        if self._embedder is not None:
-            vectors = self._embedder.embed_texts(texts)
-
-        for idx, a in enumerate(pending):
-            assertion_id = str(uuid.uuid4())
-            ids.append(assertion_id)
-            row: Dict[str, Any] = {
-                "assertion_id": assertion_id,
-                "subject": a.subject,
-                "predicate": a.predicate,
-                "object": a.object,
-                "scope": a.scope,
-                "owner_id": a.owner_id,
-                "observed_at": a.observed_at,
-                "valid_from": a.valid_from,
-                "valid_until": a.valid_until,
-                "confidence": a.confidence,
-                "provenance_json": json.dumps(a.provenance, ensure_ascii=False, separators=(",", ":")),
-                "attributes_json": json.dumps(a.attributes, ensure_ascii=False, separators=(",", ":")),
-                "text": texts[idx],
-            }
-
-            if vectors is not None and idx < len(vectors):
-                row[self._vector_column] = vectors[idx]
-
-            # Keep JSON compact (omit nulls).
-            row = {k: v for k, v in row.items() if v is not None}
-            rows.append(row)
+        with start_span(self._instrumentation, "lancedb.add") as span:
+            dedupe = self._id_mode == "content" or ids is not None
+            if ids is not None:
+                ids = given_assertion_ids(ids, len(pending))
+            else:
+                ids = [new_assertion_id(a, id_mode=self._id_mode, provenance_keys=self._id_provenance_keys) for a in pending]
+            fresh_ids = ids
+            if dedupe:
+                # Drop repeats and ids already stored before paying for embeddings.
+                existing = self._existing_ids(sorted(set(ids)))
+                fresh: List[int] = []
+                for i, assertion_id in enumerate(ids):
+                    if assertion_id not in existing:
+                        existing.add(assertion_id)
+                        fresh.append(i)
+                span.lap("dedupe")
+                if len(fresh) < len(pending):
+                    span.count("rows_deduplicated", len(pending) - len(fresh))
+                    if vectors is not None:
+                        vectors = [vectors[i] for i in fresh]
+                    pending = [pending[i] for i in fresh]
+                    fresh_ids = [ids[i] for i in fresh]
+                if not pending:
+                    return ids
 
-        if self._table is None:
-            # Create on first insert so we can infer vector dimensionality from real data.
-            self._table = self._db.create_table(self._table_name, data=rows, mode="create")
-        else:
-            self._table.add(rows)
+            # Always store a canonical text column (useful for debugging and future indexing).
+            texts: List[str] = [_canonical_text(a) for a in pending]
+            seq0 = self._current_seq() if self._seq_column else None
+            if vectors is None and self._embedder is not None:
+                vectors = self._columns.embed(self._vector_column, texts)
+                span.lap("embed")
+                span.count("embed_texts", len(texts))
+            extra = {name: self._columns.embed(name, texts) for name in self._columns.extra_names()}
+            if extra:
+                span.lap("embed")
+                span.count("embed_texts", len(texts) * len(extra))
+
+            for idx, a in enumerate(pending):
+                assertion_id = fresh_ids[idx]
+                row: Dict[str, Any] = {
+                    "assertion_id": assertion_id,
+                    "subject": a.subject,
+                    "predicate": a.predicate,
+                    "object": a.object,
+                    "scope": a.scope,
+                    "owner_id": a.owner_id,
+                    "observed_at": a.observed_at,
+                    "valid_from": a.valid_from,
+                    "valid_until": a.valid_until,
+                    "confidence": a.confidence,
+                    "provenance_json": json.dumps(a.provenance, ensure_ascii=False, separators=(",", ":")),
+                    "attributes_json": json.dumps(a.attributes, ensure_ascii=False, separators=(",", ":")),
+                    "text": texts[idx],
+                }
+                if self._epoch_columns:
+                    row["observed_at_us"] = iso_to_epoch_us(a.observed_at)
+                    row["valid_from_us"] = iso_to_epoch_us(a.valid_from)
+                    row["valid_until_us"] = iso_to_epoch_us(a.valid_until)
+                if seq0 is not None:
+                    row["seq"] = seq0 + idx + 1
+                if self._anchor_column:
+                    row[_ANCHOR_COLUMN] = list(extract_anchors(a))
+
+                if vectors is not None and idx < len(vectors):
+                    row.update(self._vector_fields(vectors[idx]))
+                for name, column_vectors in extra.items():
+                    row[name] = [float(x) for x in column_vectors[idx]]
+
+                # Keep JSON compact (omit nulls).
+                row = {k: v for k, v in row.items() if v is not None}
+                rows.append(row)
+
+            span.lap("encode")
+
+            if self._table is None:
+                # Create on first insert so we can infer vector dimensionality from real data.
+                data = self._typed_table(
+                    rows, len(vectors[0]) if vectors else None, {name: len(v[0]) for name, v in extra.items()}
+                )
+                self._table = self._db.create_table(self._table_name, data=data, mode="create")
+                self._ensure_scalar_indexes()
+            else:
+                for name, column_vectors in extra.items():
+                    self._ensure_vector_column(name, len(column_vectors[0]))
+                if dedupe:
+                    # Concurrent writers may have inserted the same ids since `_existing_ids`.
+                    self._table.merge_insert("assertion_id").when_not_matched_insert_all().execute(self._batch(rows))
+                else:
+                    self._table.add(self._batch(rows))
+            span.lap("write")
+            span.count("rows_written", len(rows))
+            if seq0 is not None:
+                self._last_seq = seq0 + len(rows)
+                if self._subscribers:
+                    self._subscribers.notify(
+                        [(seq0 + n + 1, a._with_assertion_id(fresh_ids[n])) for n, a in enumerate(pending)]
+                    )
+                    span.lap("notify")
         return ids
 
+    def _current_seq(self) -> int:
+        """Highest `seq` in the table (cached; rows appended by others since are picked up via the index)."""
+        if self._table is None:
+            return self._last_seq or 0
+        import pyarrow.compute as pc  # type: ignore
+
+        where = "seq IS NOT NULL" if self._last_seq is None else f"seq > {int(self._last_seq)}"
+        col = self._table.search().where(where).select(["seq"]).limit(None).to_arrow().column("seq")
+        top = pc.max(col).as_py() if len(col) else None
+        self._last_seq = max(int(self._last_seq or 0), int(top or 0))
+        return self._last_seq
+
+    def last_seq(self) -> int:
+        """Highest sequence number assigned so far (0 for an empty table)."""
+        return self._current_seq() if self._seq_column else 0
+
+    def changes(self, since_seq: int = 0, *, limit: int = 1000) -> List[Change]:
+        """`(seq, assertion)` for rows inserted after `since_seq`, in `seq` order (purged rows are gone).
+
+        Reads `seq` windows through the BTree index, widening the window when purges left gaps.
+        """
+        if self._table is None or not self._seq_column:
+            return []
+        n = change_limit(limit)
+        top = self._current_seq()
+        lo = int(since_seq)
+        window = n or max(1, top - lo)
+        rows: List[Dict[str, Any]] = []
+        with start_span(self._instrumentation, "lancedb.changes") as span:
+            while lo < top and (n is None or len(rows) < n):
+                hi = min(top, lo + window)
+                page = self._table.search().where(f"seq > {lo} AND seq <= {hi}").limit(None).to_list()
+                page.sort(key=lambda r: int(r["seq"]))
+                rows.extend(page)
+                lo, window = hi, window * 2
+            span.lap("search")
+            out = [(int(r["seq"]), _row_to_assertion(r)) for r in (rows if n is None else rows[:n])]
+            span.lap("decode")
+            span.count("rows_returned", len(out))
+        return out
+
+    def subscribe(self, callback: ChangeCallback) -> Callable[[], None]:
+        """Call `callback(changes)` after each `add()` on this instance that wrote rows (returns an unsubscribe)."""
+        return self._subscribers.subscribe(callback)
+
+    def anchor_query(
+        self,
+        cues: Union[str, Iterable[str]] = (),
+        *,
+        facets: Optional[Mapping[str, Any]] = None,
+        scope: Optional[str] = None,
+        owner_id: Optional[str] = None,
+        limit: int = 20,
+        max_postings: int = MAX_ANCHOR_POSTINGS,
+    ) -> List[TripleAssertion]:
+        """Assertions sharing anchors with `cues` / `facets`, ranked by matched weight then recency.
+
+        Candidates come from `array_has_any` over the LabelList index (only anchors on at most
+        `max_postings` rows seed them); results carry `attributes["_retrieval"]` explanations.
+        """
+        weights = anchor_cues(cues, facets)
+        if self._table is None or not self._anchor_column:
+            return []
+        with start_span(self._instrumentation, "lancedb.anchor_query") as span:
+            postings = {k: int(self._table.count_rows(f"array_has_any({_ANCHOR_COLUMN}, {_string_list([k])})")) for k in weights}
+            seeds = selective_anchors(postings, weights, max_postings)
+            span.lap("count")
+            if not seeds:
+                return []
+            where = f"array_has_any({_ANCHOR_COLUMN}, {_string_list(seeds)})"
+            scoped = _build_where_clause(TripleQuery(scope=scope, owner_id=owner_id), epoch_columns=self._epoch_columns)
+            time_col = "observed_at_us" if self._epoch_columns else "observed_at"
+            rows = (
+                self._table.search()
+                .where(f"{where} AND {scoped}" if scoped else where)
+                .select(["assertion_id", time_col, _ANCHOR_COLUMN])
+                .limit(None)
+                .to_list()
+            )
+            span.lap("search")
+            hits = [(str(r.get("assertion_id")), _observed_key(r), r.get(_ANCHOR_COLUMN) or ()) for r in rows]
+            ranked = rank_anchor_hits(hits, weights, limit=anchor_limit(limit))
+            span.lap("sort")
+            found = self.get_many([i for i, _, _ in ranked])
+            out = [with_anchor_retrieval(found[i], score, m) for i, score, m in ranked if i in found]
+            span.count("rows_scanned", len(rows))
+            span.count("rows_returned", len(out))
+        return out
+
+    def scan(self, q: TripleQuery) -> Iterator[Tuple[str, TripleAssertion]]:
+        """Yield `(assertion_id, assertion)` for structured matches, ordered by `observed_at`."""
+        if q.query_text or q.query_vector:
+            raise ValueError("scan() supports structured filters only")
+        if self._table is None:
+            return
+        qb = self._table.search()
+        where = _build_where_clause(q, epoch_columns=self._epoch_columns)
+        if where:
+            qb = qb.where(where)
+        rows = [r for r in qb.to_list() if isinstance(r, dict)]
+        rows.sort(
+            key=lambda r: (_observed_key(r), str(r.get("assertion_id") or "")),
+            reverse=(str(q.order).lower() != "asc"),
+        )
+        limit = int(q.limit) if isinstance(q.limit, int) else 100
+        for r in rows if limit <= 0 else rows[:limit]:
+            yield str(r.get("assertion_id") or ""), _row_to_assertion(r)
+
+    def purge(self, assertion_ids: Iterable[str]) -> int:
+        """Physically remove rows by id (retention only; callers record tombstones first)."""
+        ids = [str(i) for i in assertion_ids]
+        if self._table is None or not ids:
+            return 0
+        before = int(self._table.count_rows())
+        for start in range(0, len(ids), 500):
+            chunk = ids[start : start + 500]
+            values = ", ".join(f"'{_escape_sql_string(i)}'" for i in chunk)
+            self._table.delete(f"assertion_id IN ({values})")
+        return before - int(self._table.count_rows())
+
+    def get_many(self, assertion_ids: Iterable[str]) -> Dict[str, TripleAssertion]:
+        """Fetch assertions by id via the `assertion_id` index (unknown ids are absent from the result)."""
+        ids = list(dict.fromkeys(str(i) for i in assertion_ids))
+        if self._table is None or not ids:
+            return {}
+        with start_span(self._instrumentation, "lancedb.get_many") as span:
+            rows = self._rows_by_id(ids, columns=[name for name, _ in _CORE_COLUMNS if name in set(self._table.schema.names)])
+            span.lap("search")
+            out = {str(r.get("assertion_id")): _row_to_assertion(r) for r in rows}
+            span.lap("decode")
+            span.count("rows_returned", len(out))
+        return out
+
+    def get_vectors(self, assertion_ids: Iterable[str], *, vector_column: Optional[str] = None) -> Dict[str, List[float]]:
+        """Stored vectors by id, decoded to floats (int8 codes are rescaled; ids without one are absent)."""
+        ids = list(dict.fromkeys(str(i) for i in assertion_ids))
+        col = vector_column or self._vector_column
+        if self._table is None or not ids or col not in set(self._table.schema.names):
+            return {}
+        quantized = self._is_quantized(col)
+        columns = ["assertion_id", col] + ([f"{col}_scale"] if quantized else [])
+        out: Dict[str, List[float]] = {}
+        with start_span(self._instrumentation, "lancedb.get_vectors") as span:
+            for r in self._rows_by_id(ids, columns=columns):
+                v = r.get(col)
+                if v is None:
+                    continue
+                if quantized:
+                    scale = float(r.get(f"{col}_scale") or 0.0)
+                    out[str(r.get("assertion_id"))] = [float(c) * scale for c in v]
+                else:
+                    out[str(r.get("assertion_id"))] = [float(x) for x in v]
+            span.count("rows_returned", len(out))
+        return out
+
+    def aggregate(
+        self,
+        q: TripleQuery,
+        *,
+        group_by: Sequence[str] = (),
+        metrics: Sequence[str] = ("count",),
+    ) -> List[Dict[str, Any]]:
+        """Grouped counts / observed_at bounds: filtered projection to Arrow, grouped with `pyarrow`."""
+        groups, wanted = normalize_aggregate(q, group_by, metrics)
+        acc = GroupAccumulator(groups)
+        if self._table is None:
+            return acc.rows(wanted, limit=group_limit(q))
+        with start_span(self._instrumentation, "lancedb.aggregate") as span:
+            time_col = "observed_at_us" if self._epoch_columns else "observed_at"
+            qb = self._table.search()
+            where = _build_where_clause(q, epoch_columns=self._epoch_columns)
+            if where:
+                qb = qb.where(where)
+            # Only the grouped columns and the timestamp are read; no rows are decoded into assertions.
+            data = qb.select(list(groups) + [time_col]).limit(None).to_arrow()
+            span.lap("search")
+            span.count("rows_scanned", data.num_rows)
+            if not self._epoch_columns:
+                pa, _ = _import_pyarrow_numpy()
+                data = data.set_column(
+                    data.schema.get_field_index(time_col),
+                    "observed_at_us",
+                    pa.array([iso_to_epoch_us(v) for v in data.column(time_col).to_pylist()], type=pa.int64()),
+                )
+            try:
+                grouped = data.group_by(list(groups)).aggregate(
+                    [([], "count_all"), ("observed_at_us", "min"), ("observed_at_us", "max")]
+                )
+                for r in grouped.to_pylist():
+                    if r["count_all"]:
+                        acc.add(tuple(r.get(g) for g in groups), r["count_all"], r["observed_at_us_min"], r["observed_at_us_max"])
+            except Exception:
+                # Older pyarrow without `count_all` / keyless group_by.
+                for r in data.to_pylist():
+                    acc.add_row(tuple(r.get(g) for g in groups), r.get("observed_at_us"))
+            span.lap("aggregate")
+            out = acc.rows(wanted, limit=group_limit(q))
+            span.count("groups_returned", len(out))
+        return out
+
     def query(self, q: TripleQuery) -> List[TripleAssertion]:
         if self._table is None:
             return []
+        with start_span(self._instrumentation, "lancedb.query", tracer=self._trace_sink, query=q) as span:
+            out = self._query(q, span)
+            span.count("rows_returned", len(out))
+            span.results(out)
+        return out
+
+    def _query(self, q: TripleQuery, span: Any) -> List[TripleAssertion]:
 
         raw_limit = int(q.limit) if isinstance(q.limit, int) else 100
         limit: Optional[int]
@@ -206,35 +958,67 @@ class LanceDBTripleStore:
         else:
             limit = max(1, raw_limit)
 
-        where = _build_where_clause(q)
+        where = _build_where_clause(q, epoch_columns=self._epoch_columns)
 
         query_vector: Optional[Sequence[float]] = None
         if q.query_vector:
             query_vector = q.query_vector
         elif q.query_text:
-            if self._embedder is None:
+            embedder = self._columns.query_embedder(q.vector_column or self._vector_column)
+            if embedder is None:
                 raise ValueError("query_text requires a configured embedder (vector search); keyword fallback is disabled")
-            query_vector = self._embedder.embed_texts([q.query_text])[0]
+            query_vector = embedder.embed_texts([q.query_text])[0]
+            span.lap("embed")
+            span.count("embed_texts", 1)
 
-        qb = None
-        if query_vector is not None:
-            # Use cosine metric so `min_score` can be expressed as cosine similarity.
-            qb = self._table.search(query_vector, vector_column_name=q.vector_column or self._vector_column).metric("cosine")
-        if qb is None:
-            qb = self._table.search()
+        quantized = query_vector is not None and self._is_quantized(q.vector_column or self._vector_column)
+        if span.tracing:
+            vector: Tuple[str, ...] = ()
+            if query_vector is not None:
+                vector = ("vector@hamming",) if quantized else ("vector@ann",)
+                if q.min_score is not None and not quantized:
+                    vector += ("min_score@distance_range",)
+            span.pushdown(lambda: tuple(f"{name}@where" for name in structured_filters(q)) + vector)
+        if quantized:
+            return self._query_quantized(q, query_vector, where, limit, span)
 
-        if where:
-            qb = qb.where(where)
+        diversify = query_vector is not None and reranks(q)
+        fetch = rerank_pool(q, limit) if diversify else limit
 
         if query_vector is None:
             # LanceDB does not currently expose an order_by API on query builders. For deterministic
             # observed_at ordering (and correct limit semantics), fetch all matching rows then sort
             # in Python and apply the limit after sorting.
+            qb = self._table.search()
+            if where:
+                qb = qb.where(where)
             rows = qb.to_list()
         else:
-            rows = qb.limit(limit).to_list() if limit is not None else qb.to_list()
+            search = self._vector_search(q, query_vector, where, span)
+            rows = self._search_scored(q, search, fetch, span) if q.scoring is not None else search(fetch)
+        if q.scoring is None:
+            span.lap("search")
+            span.count("rows_scanned", len(rows))
+        if diversify:
+            rows = self._rerank_rows(
+                q,
+                [(r["_score"] if "_score" in r else 1.0 - float(r.get("_distance") or 0.0), r) for r in rows if isinstance(r, dict)],
+                limit,
+                span,
+            )
+
+        # For non-semantic queries, keep compatibility with SQLite semantics: order by observed_at
+        # (epoch microseconds) and decode only the rows within `limit`.
+        # For semantic queries, LanceDB already returns similarity-ranked results.
+        if query_vector is None:
+            rows = [r for r in rows if isinstance(r, dict)]
+            rows.sort(key=_observed_key, reverse=(str(q.order).lower() != "asc"))
+            if limit is not None:
+                rows = rows[:limit]
+            span.lap("sort")
 
         out: List[TripleAssertion] = []
+        pruned = 0
         for r in rows:
             if not isinstance(r, dict):
                 continue
@@ -253,8 +1037,12 @@ class LanceDBTripleStore:
                 score: Optional[float] = None
                 if dist is not None:
                     score = 1.0 - dist
+                cosine = r.get("_cosine", score)
+                if "_score" in r:
+                    score = r["_score"]
 
-                if q.min_score is not None and score is not None and score < float(q.min_score):
+                if q.min_score is not None and cosine is not None and cosine < float(q.min_score):
+                    pruned += 1
                     continue
 
                 retrieval = attributes.get("_retrieval") if isinstance(attributes.get("_retrieval"), dict) else {}
@@ -264,26 +1052,210 @@ class LanceDBTripleStore:
                 if dist is not None:
                     retrieval2["distance"] = dist
                 retrieval2.setdefault("metric", "cosine")
+                if "_cosine" in r:
+                    retrieval2["cosine"] = r["_cosine"]
+                if r.get("_mmr") is not None:
+                    retrieval2["mmr"] = r["_mmr"]
                 attributes = dict(attributes)
                 attributes["_retrieval"] = retrieval2
-            out.append(
-                TripleAssertion(
-                    subject=str(r.get("subject") or ""),
-                    predicate=str(r.get("predicate") or ""),
-                    object=str(r.get("object") or ""),
-                    scope=str(r.get("scope") or "run"),
-                    owner_id=str(r.get("owner_id")) if r.get("owner_id") is not None else None,
-                    observed_at=str(r.get("observed_at") or ""),
-                    valid_from=str(r.get("valid_from")) if r.get("valid_from") is not None else None,
-                    valid_until=str(r.get("valid_until")) if r.get("valid_until") is not None else None,
-                    confidence=r.get("confidence") if isinstance(r.get("confidence"), (int, float)) else None,
-                    provenance=provenance,
-                    attributes=attributes,
-                )
-            )
-
-        # For non-semantic queries, keep compatibility with SQLite semantics: order by observed_at.
-        # For semantic queries, LanceDB already returns similarity-ranked results.
-        if query_vector is None:
-            out.sort(key=lambda a: a.observed_at or "", reverse=(str(q.order).lower() != "asc"))
+            out.append(_row_to_assertion(r, provenance=provenance, attributes=attributes))
+        span.lap("decode")
+        if pruned:
+            span.count("rows_pruned_min_score", pruned)
         return out if limit is None else out[:limit]
+
+    def _vector_search(
+        self, q: TripleQuery, query_vector: Sequence[float], where: str, span: Any
+    ) -> Callable[[Optional[int]], List[Dict[str, Any]]]:
+        """`fetch(n)`: the `n` nearest rows matching `where` (prefilter) and `min_score` (distance bound).
+
+        Without an ANN index on the column LanceDB scans the prefiltered rows, which is exact. With
+        one, filters matching at most `flat_search_max_rows` rows (e.g. one owner, through the
+        `owner_id` index) are still scanned exactly. Other searches probe extra partitions while a
+        narrow filter leaves too few hits, and a short result is retried as an exact scan whenever
+        more rows could qualify. So `fetch(n)` returns `n` rows whenever `n` rows qualify.
+        """
+        col = q.vector_column or self._vector_column
+        indexed = col in self._vector_indexes
+        matching = int(self._table.count_rows(where)) if indexed and where else None  # type: ignore[union-attr]
+        scan = matching is not None and matching <= self._flat_search_max_rows
+
+        def build(exact: bool) -> Any:
+            qb = self._table.search(query_vector, vector_column_name=col).metric("cosine")  # type: ignore[union-attr]
+            if where:
+                qb = qb.where(where, prefilter=True)
+            if q.min_score is not None and hasattr(qb, "distance_range"):
+                # Cosine distance is `1 - similarity`; the range end is exclusive (hence the slack,
+                # the exact `min_score` check happens on decode).
+                qb = qb.distance_range(upper_bound=1.0 - float(q.min_score) + 1e-6)
+            if exact:
+                qb = qb.bypass_vector_index()
+            elif indexed and hasattr(qb, "maximum_nprobes"):
+                qb = qb.maximum_nprobes(0)  # probe more partitions only if too few rows matched
+            return qb
+
+        def fetch(n: Optional[int]) -> List[Dict[str, Any]]:
+            qb = build(scan)
+            rows = [r for r in (qb.limit(n).to_list() if n is not None else qb.to_list()) if isinstance(r, dict)]
+            if not indexed or scan or n is None or len(rows) >= n:
+                return rows
+            if q.min_score is None:
+                total = matching if matching is not None else int(self._table.count_rows())  # type: ignore[union-attr]
+                if total <= len(rows):
+                    return rows
+            span.count("vector_exact_retries", 1)
+            return [r for r in build(True).limit(n).to_list() if isinstance(r, dict)]
+
+        return fetch
+
+    def _search_scored(
+        self, q: TripleQuery, search: Callable[[Optional[int]], List[Dict[str, Any]]], k: Optional[int], span: Any
+    ) -> List[Dict[str, Any]]:
+        """The best `k` ANN candidates by `q.scoring`, best-first, with `_score` / `_cosine` set.
+
+        LanceDB ranks by cosine only, so candidates are fetched in growing rounds (the first one
+        is just `k` rows) until no unseen row can beat the k-th combined score: unseen rows have a
+        cosine of at most the last fetched one and a factor of at most `scoring.max_factor`.
+        """
+        factor = q.scoring.factor()  # type: ignore[union-attr]
+        bound = q.scoring.max_factor  # type: ignore[union-attr]
+        n = k
+        rounds = 0
+        while True:
+            rounds += 1
+            rows = search(n)
+            scored: List[Tuple[float, Dict[str, Any]]] = []
+            for r in rows:
+                cosine = 1.0 - float(r.get("_distance") or 0.0)
+                if q.min_score is not None and cosine < float(q.min_score):
+                    continue
+                r["_cosine"] = cosine
+                scored.append((cosine * factor(_row_observed_us(r), r.get("confidence"), r.get("predicate")), r))
+            top = top_scored(scored, k)
+            if n is None or k is None or len(rows) < n:
+                break  # every match was seen
+            last = 1.0 - float(rows[-1].get("_distance") or 0.0)
+            if q.min_score is not None and last < float(q.min_score):
+                break  # the rest is under `min_score`
+            if len(top) >= k and top[-1][0] >= max(last, 0.0) * bound:
+                break
+            n *= 4
+        span.lap("search")
+        span.count("rows_scanned", len(rows))
+        span.count("search_rounds", rounds)
+        for score, r in top:
+            r["_score"] = score
+        return [r for _, r in top]
+
+    def _rerank_rows(
+        self,
+        q: TripleQuery,
+        scored: List[Tuple[float, Dict[str, Any]]],
+        limit: Optional[int],
+        span: Any,
+    ) -> List[Dict[str, Any]]:
+        """Apply MMR / triple collapsing to best-first `(score, row)` candidates.
+
+        Selected rows come back in result order with `_score` and `_mmr` (None without MMR) set;
+        candidates whose cosine is under `min_score` are dropped first.
+        """
+        col = q.vector_column or self._vector_column
+        quantized = self._is_quantized(col)
+        pool: List[Tuple[float, Dict[str, Any], Any]] = []
+        for score, r in scored:
+            if q.min_score is not None and r.get("_cosine", score) < float(q.min_score):
+                continue
+            v = r.get(col)
+            if v is None:
+                continue
+            if quantized:
+                v = from_int8_codes(v, r.get(f"{col}_scale") or 0.0).payload  # cosine ignores the scale
+            pool.append((score, r, v))
+        span.count("rerank_pool", len(pool))
+        picks = rerank(
+            [t[0] for t in pool],
+            [t[2] for t in pool],
+            [(r.get("subject"), r.get("predicate"), r.get("object")) for _, r, _ in pool] if q.collapse_triples else None,
+            limit=limit,
+            mmr_lambda=q.mmr_lambda,
+        )
+        span.lap("rerank")
+        out: List[Dict[str, Any]] = []
+        for i, mmr in picks:
+            score, r, _ = pool[i]
+            r["_score"] = score
+            r["_mmr"] = mmr
+            out.append(r)
+        return out
+
+    def _query_quantized(
+        self,
+        q: TripleQuery,
+        query_vector: Sequence[float],
+        where: str,
+        limit: Optional[int],
+        span: Any,
+    ) -> List[TripleAssertion]:
+        _, np = _import_pyarrow_numpy()
+        col = q.vector_column or self._vector_column
+
+        # Fast first pass: native Hamming search over packed sign bits (prefiltered by `where`).
+        # Hamming distance does not bound the cosine, so `min_score` is applied on rescoring and
+        # the candidate pool grows until `fetch` rows pass it or the filter has no rows left.
+        qbits = np.frombuffer(pack_sign_bits(query_vector), dtype=np.uint8)
+        fetch = rerank_pool(q, limit) if reranks(q) else limit
+        pool = max(1, fetch * self._rescore_factor) if fetch is not None else int(self._table.count_rows())
+        qnorm = sum(float(x) * float(x) for x in query_vector) ** 0.5
+        factor = q.scoring.factor() if q.scoring is not None else None
+        rounds = 0
+        while True:
+            rounds += 1
+            qb = self._table.search(qbits, vector_column_name=f"{col}_bits").metric("hamming")
+            if where:
+                qb = qb.where(where, prefilter=True)
+            rows = [r for r in qb.limit(max(1, pool)).to_list() if isinstance(r, dict)]
+
+            # Rescore candidates with the full-precision query against the int8 codes.
+            scored: List[Tuple[float, Dict[str, Any]]] = []
+            pruned = 0
+            for r in rows:
+                if r.get(col) is None:
+                    continue
+                score = cosine_to(query_vector, qnorm, from_int8_codes(r.get(col) or [], r.get(f"{col}_scale") or 0.0))
+                if q.min_score is not None and score < float(q.min_score):
+                    pruned += 1
+                    continue
+                if q.scoring is not None:
+                    r["_cosine"] = score
+                    score *= factor(_row_observed_us(r), r.get("confidence"), r.get("predicate"))
+                scored.append((score, r))
+            if fetch is None or len(scored) >= fetch or len(rows) < pool:
+                break
+            pool *= 4
+        span.lap("search")
+        span.count("rows_scanned", len(rows))
+        span.count("search_rounds", rounds)
+        scored = top_scored(scored, None if reranks(q) else limit)
+        span.lap("score")
+        if pruned:
+            span.count("rows_pruned_min_score", pruned)
+        if reranks(q):
+            scored = [(r["_score"], r) for r in self._rerank_rows(q, scored, limit, span)]
+
+        out: List[TripleAssertion] = []
+        for score, r in scored if limit is None else scored[:limit]:
+            attributes = _loads_json(r.get("attributes_json"))
+            retrieval = attributes.get("_retrieval") if isinstance(attributes.get("_retrieval"), dict) else {}
+            retrieval2 = dict(retrieval)
+            retrieval2["score"] = score
+            retrieval2["distance"] = 1.0 - r.get("_cosine", score)
+            retrieval2.setdefault("metric", "cosine")
+            retrieval2["first_pass"] = "hamming"
+            if "_cosine" in r:
+                retrieval2["cosine"] = r["_cosine"]
+            if r.get("_mmr") is not None:
+                retrieval2["mmr"] = r["_mmr"]
+            attributes["_retrieval"] = retrieval2
+            out.append(_row_to_assertion(r, attributes=attributes))
+        span.lap("decode")
+        return out
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 
 def utc_now_iso_seconds() -> str:
@@ -21,15 +24,107 @@ def canonicalize_term(value: str) -> str:
     return str(value or "").strip().lower()
 
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Sort position of timestamps that cannot be parsed (before every real instant).
+EPOCH_US_MIN = -(1 << 63)
+
+
+def iso_to_epoch_us(value: Optional[str]) -> Optional[int]:
+    """Parse an ISO-8601 timestamp into UTC epoch microseconds (`None` when unparseable).
+
+    Naive timestamps are taken as UTC and a trailing `Z` is accepted, so `...+02:00`, `...Z`
+    and second/microsecond precisions all land on one monotonic integer axis.
+    """
+    s = str(value or "").strip()
+    if not s:
+        return None
+    if s[-1] in "Zz":
+        s = s[:-1] + "+00:00"
+    try:
+        dt = datetime.fromisoformat(s)
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    delta = dt - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def epoch_sort_key(value: Optional[str]) -> int:
+    """`iso_to_epoch_us` for ordering: unparseable timestamps sort first (like SQL NULLs)."""
+    us = iso_to_epoch_us(value)
+    return EPOCH_US_MIN if us is None else us
+
+
+# Assertion id strategies for `add()`:
+# - uuid: random `uuid4` per row (every add appends)
+# - content: hash of the canonical fields, so re-adding the same assertion is a no-op
+ID_MODES = ("uuid", "content")
+
+
+def normalize_id_mode(value: Optional[str]) -> str:
+    m = str(value or "").strip().lower() or "uuid"
+    if m not in ID_MODES:
+        raise ValueError(f"id_mode must be one of {', '.join(ID_MODES)}")
+    return m
+
+
+def content_assertion_id(a: "TripleAssertion", *, provenance_keys: Sequence[str] = ()) -> str:
+    """Deterministic id for `a` (UUID-formatted sha256 prefix).
+
+    Covers subject, predicate, object, scope, owner_id, the observed instant (so `Z` and `+00:00`
+    spellings agree) and the listed `provenance` keys. Confidence, validity and attributes are
+    deliberately excluded: a replay that only re-scores a triple is still the same assertion.
+    """
+    observed_us = iso_to_epoch_us(a.observed_at)
+    prov = a.provenance if isinstance(a.provenance, dict) else {}
+    payload = [
+        a.subject,
+        a.predicate,
+        a.object,
+        a.scope,
+        a.owner_id or "",
+        observed_us if observed_us is not None else a.observed_at,
+        [[k, prov.get(k)] for k in provenance_keys],
+    ]
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":"), sort_keys=True, default=str)
+    return str(uuid.UUID(bytes=hashlib.sha256(raw.encode("utf-8")).digest()[:16]))
+
+
+def new_assertion_id(a: "TripleAssertion", *, id_mode: str = "uuid", provenance_keys: Sequence[str] = ()) -> str:
+    if id_mode == "content":
+        return content_assertion_id(a, provenance_keys=provenance_keys)
+    return str(uuid.uuid4())
+
+
+def given_assertion_ids(ids: Sequence[Any], count: int) -> List[str]:
+    """Validate caller-supplied ids for `add(..., ids=...)` (one non-empty id per assertion)."""
+    out = [str(i or "").strip() for i in ids]
+    if len(out) != count:
+        raise ValueError(f"got {len(out)} ids for {count} assertions")
+    if not all(out):
+        raise ValueError("ids must be non-empty strings")
+    return out
+
+
+_new_instance = object.__new__
+_set_field = object.__setattr__
+
+
 def normalize_term(value: str) -> str:
     """Normalize a KG term for case-insensitive matching (query-time)."""
     # `canonicalize_term` already lowercases; keep this for clarity/compatibility.
     return canonicalize_term(value).lower()
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TripleAssertion:
-    """An append-only semantic assertion with temporal and provenance metadata."""
+    """An append-only semantic assertion with temporal and provenance metadata.
+
+    `assertion_id` is assigned by the store: `add()` ignores it, query results carry it. It is not
+    part of equality (the same fact read back from two stores compares equal).
+    """
 
     subject: str
     predicate: str
@@ -45,6 +140,8 @@ class TripleAssertion:
     provenance: Dict[str, Any] = field(default_factory=dict)
     attributes: Dict[str, Any] = field(default_factory=dict)
 
+    assertion_id: Optional[str] = field(default=None, compare=False)
+
     def __post_init__(self) -> None:
         # Canonicalize KG terms (trim + lower) for stable matching.
         object.__setattr__(self, "subject", canonicalize_term(self.subject))
@@ -70,6 +167,63 @@ class TripleAssertion:
         if isinstance(self.valid_until, str):
             vu = self.valid_until.strip()
             object.__setattr__(self, "valid_until", vu if vu else None)
+        if self.assertion_id is not None:
+            aid = str(self.assertion_id).strip()
+            object.__setattr__(self, "assertion_id", aid if aid else None)
+
+    @classmethod
+    def _from_canonical(
+        cls,
+        *,
+        subject: str,
+        predicate: str,
+        object: str,
+        scope: str,
+        owner_id: Optional[str],
+        observed_at: str,
+        valid_from: Optional[str],
+        valid_until: Optional[str],
+        confidence: Optional[float],
+        provenance: Dict[str, Any],
+        attributes: Dict[str, Any],
+        assertion_id: Optional[str] = None,
+    ) -> "TripleAssertion":
+        """Trusted construction for values this package already canonicalized (store rows, copies).
+
+        Skips `__post_init__`. Callers guarantee that terms and scope are canonical, that blank
+        ids/timestamps are `None`, and that `observed_at` is set. Never use it for user input.
+        """
+        self = _new_instance(cls)
+        _set_field(self, "subject", subject)
+        _set_field(self, "predicate", predicate)
+        _set_field(self, "object", object)
+        _set_field(self, "scope", scope)
+        _set_field(self, "owner_id", owner_id)
+        _set_field(self, "observed_at", observed_at)
+        _set_field(self, "valid_from", valid_from)
+        _set_field(self, "valid_until", valid_until)
+        _set_field(self, "confidence", confidence)
+        _set_field(self, "provenance", provenance)
+        _set_field(self, "attributes", attributes)
+        _set_field(self, "assertion_id", assertion_id)
+        return self
+
+    def _with_assertion_id(self, assertion_id: Optional[str]) -> "TripleAssertion":
+        """Copy carrying a store-assigned id (shares the provenance/attributes dicts)."""
+        return TripleAssertion._from_canonical(
+            subject=self.subject,
+            predicate=self.predicate,
+            object=self.object,
+            scope=self.scope,
+            owner_id=self.owner_id,
+            observed_at=self.observed_at,
+            valid_from=self.valid_from,
+            valid_until=self.valid_until,
+            confidence=self.confidence,
+            provenance=self.provenance,
+            attributes=self.attributes,
+            assertion_id=assertion_id,
+        )
 
     def to_dict(self) -> Dict[str, Any]:
         out: Dict[str, Any] = {
@@ -84,6 +238,7 @@ class TripleAssertion:
             "confidence": self.confidence,
             "provenance": dict(self.provenance),
             "attributes": dict(self.attributes),
+            "assertion_id": self.assertion_id,
         }
         # Keep JSON compact (omit nulls).
         return {k: v for k, v in out.items() if v is not None}
@@ -130,4 +285,5 @@ class TripleAssertion:
             confidence=confidence,
             provenance=dict(provenance),
             attributes=dict(attributes),
+            assertion_id=data.get("assertion_id") if isinstance(data.get("assertion_id"), str) else None,
         )
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import math
+import struct
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+# Storage precisions for stored embeddings.
+# - float64: Python lists as produced by the embedder (legacy in-memory behavior)
+# - float32 / float16: plain casts, scored exactly against the full-precision query
+# - int8: symmetric scalar quantization with one scale per vector
+# - binary: sign bits for a fast Hamming first pass, rescored against int8 codes
+VECTOR_PRECISIONS = ("float64", "float32", "float16", "int8", "binary")
+
+
+def normalize_precision(value: Optional[str], *, default: str = "float64") -> str:
+    p = str(value or "").strip().lower() or default
+    if p not in VECTOR_PRECISIONS:
+        raise ValueError(f"vector_precision must be one of {', '.join(VECTOR_PRECISIONS)}")
+    return p
+
+
+def bytes_per_vector(precision: str, dim: int) -> int:
+    """Approximate payload size of one stored vector (excluding container overhead)."""
+    p = normalize_precision(precision)
+    if p == "float64":
+        return 8 * dim
+    if p == "float32":
+        return 4 * dim
+    if p == "float16":
+        return 2 * dim
+    if p == "int8":
+        return dim + 4
+    return dim + 4 + (dim + 7) // 8
+
+
+def pack_sign_bits(vector: Sequence[float]) -> bytes:
+    """Pack `x > 0` bits MSB-first (same layout as `numpy.packbits`)."""
+    n = len(vector)
+    out = bytearray((n + 7) // 8)
+    for i, x in enumerate(vector):
+        if float(x) > 0.0:
+            out[i >> 3] |= 0x80 >> (i & 7)
+    return bytes(out)
+
+
+def quantize_int8(vector: Sequence[float]) -> Tuple[array, float]:
+    """Return `(codes, scale)` with `vector ~= codes * scale` and codes in [-127, 127]."""
+    peak = max((abs(float(x)) for x in vector), default=0.0)
+    if peak <= 0.0 or not math.isfinite(peak):
+        return array("b", bytes(len(vector))), 0.0
+    scale = peak / 127.0
+    return array("b", (max(-127, min(127, int(round(float(x) / scale)))) for x in vector)), scale
+
+
+def _norm(values: Sequence[float]) -> float:
+    return math.sqrt(sum(float(x) * float(x) for x in values))
+
+
+@dataclass(frozen=True)
+class QuantizedVector:
+    """A stored embedding in reduced precision (in-memory representation)."""
+
+    precision: str
+    dim: int
+    payload: Any  # array("f") | bytes (float16) | array("b") (int8 codes)
+    scale: float = 1.0
+    norm: float = 0.0  # norm of the decoded vector (cosine denominators are precomputed)
+    bits: int = 0  # sign bits as an int (binary precision only)
+
+    def values(self) -> Sequence[float]:
+        """Decoded values (int8 codes are left unscaled: cosine is scale-invariant)."""
+        if self.precision == "float16":
+            return struct.unpack(f"<{self.dim}e", self.payload)
+        return self.payload
+
+    def to_list(self) -> List[float]:
+        if self.precision in ("int8", "binary"):
+            return [float(c) * self.scale for c in self.payload]
+        return [float(x) for x in self.values()]
+
+
+def quantize(vector: Sequence[float], precision: str) -> QuantizedVector:
+    p = normalize_precision(precision)
+    dim = len(vector)
+    if p in ("float64", "float32"):
+        payload = array("d" if p == "float64" else "f", (float(x) for x in vector))
+        return QuantizedVector(precision=p, dim=dim, payload=payload, norm=_norm(payload))
+    if p == "float16":
+        packed = struct.pack(f"<{dim}e", *(float(x) for x in vector))
+        return QuantizedVector(precision=p, dim=dim, payload=packed, norm=_norm(struct.unpack(f"<{dim}e", packed)))
+    codes, scale = quantize_int8(vector)
+    bits = int.from_bytes(pack_sign_bits(vector), "big") if p == "binary" else 0
+    return QuantizedVector(precision=p, dim=dim, payload=codes, scale=scale, norm=_norm(codes), bits=bits)
+
+
+def from_int8_codes(codes: Sequence[int], scale: float) -> QuantizedVector:
+    """Wrap stored int8 codes (e.g. read back from a table) for scoring."""
+    payload = array("b", (int(c) for c in codes))
+    return QuantizedVector(precision="int8", dim=len(payload), payload=payload, scale=float(scale or 0.0), norm=_norm(payload))
+
+
+def cosine_to(query: Sequence[float], query_norm: float, stored: QuantizedVector) -> float:
+    """Asymmetric cosine: full-precision query against the decoded stored vector."""
+    if query_norm <= 0.0 or stored.norm <= 0.0:
+        return 0.0
+    values = stored.values()
+    n = min(len(query), len(values))
+    dot = 0.0
+    for i in range(n):
+        dot += float(query[i]) * float(values[i])
+    return dot / (query_norm * stored.norm)
+
+
+def hamming_similarity(query_bits: int, stored_bits: int, dim: int) -> float:
+    """Map Hamming distance between sign codes to a cosine estimate (SimHash: cos(pi * h / d))."""
+    if dim <= 0:
+        return 0.0
+    h = (query_bits ^ stored_bits).bit_count()
+    return math.cos(math.pi * h / dim)
+
+
+def rank_quantized(
+    query: Sequence[float],
+    candidates: Sequence[Tuple[QuantizedVector, Any]],
+    *,
+    limit: Optional[int],
+    rescore_factor: int = 4,
+    truncate: bool = True,
+) -> List[Tuple[float, Any]]:
+    """Score `(stored_vector, payload)` candidates and return `(score, payload)` best-first.
+
+    Binary vectors take a Hamming first pass over every candidate and only the best
+    `limit * rescore_factor` are rescored with the full-precision query. Other precisions are
+    scored directly (their decoded values are already close to full precision).
+    `truncate=False` returns every rescored candidate (callers that re-rank them).
+    """
+    qnorm = _norm(query)
+    pool: Sequence[Tuple[QuantizedVector, Any]] = candidates
+    if candidates and candidates[0][0].precision == "binary" and limit is not None:
+        keep = max(1, int(limit) * max(1, int(rescore_factor)))
+        if keep < len(candidates):
+            qbits = int.from_bytes(pack_sign_bits(query), "big")
+            first = sorted(
+                candidates,
+                key=lambda c: hamming_similarity(qbits, c[0].bits, c[0].dim),
+                reverse=True,
+            )
+            pool = first[:keep]
+    scored = [(cosine_to(query, qnorm, qv), payload) for qv, payload in pool]
+    scored.sort(key=lambda t: t[0], reverse=True)
+    return scored if limit is None or not truncate else scored[:limit]
+
+
+def compare_precisions(
+    corpus: Sequence[Sequence[float]],
+    queries: Sequence[Sequence[float]],
+    *,
+    k: int = 10,
+    precisions: Sequence[str] = ("float16", "int8", "binary"),
+    rescore_factor: int = 4,
+) -> Dict[str, Dict[str, float]]:
+    """Measure recall@k and per-query latency of each precision against a float32 baseline."""
+    results: Dict[str, Dict[str, float]] = {}
+    dim = len(corpus[0]) if corpus else 0
+
+    def _run(precision: str) -> Tuple[List[List[int]], float]:
+        stored = [(quantize(v, precision), i) for i, v in enumerate(corpus)]
+        t0 = time.perf_counter()
+        tops = [[i for _, i in rank_quantized(q, stored, limit=k, rescore_factor=rescore_factor)] for q in queries]
+        elapsed = time.perf_counter() - t0
+        return tops, (elapsed / max(1, len(queries))) * 1000.0
+
+    baseline, base_ms = _run("float32")
+    results["float32"] = {"recall_at_k": 1.0, "latency_ms": base_ms, "bytes_per_vector": float(bytes_per_vector("float32", dim))}
+    for precision in precisions:
+        tops, ms = _run(precision)
+        hits = sum(len(set(t) & set(b)) for t, b in zip(tops, baseline))
+        total = sum(len(b) for b in baseline) or 1
+        results[normalize_precision(precision)] = {
+            "recall_at_k": hits / total,
+            "latency_ms": ms,
+            "bytes_per_vector": float(bytes_per_vector(precision, dim)),
+        }
+    return results
@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import argparse
+import json
+import queue
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .aggregate import epoch_us_to_iso
+from .instrumentation import MetricsSink, start_span
+from .models import EPOCH_US_MIN, TripleAssertion, iso_to_epoch_us
+from .store import TripleQuery, TripleStore
+
+_DONE = object()
+
+
+@dataclass
+class CopyStats:
+    """Counters for one `copy_store()` call (seconds are wall-clock per side)."""
+
+    rows_read: int = 0
+    rows_sent: int = 0  # handed to `dst.add` (ids already in `dst` are skipped there)
+    vectors_copied: int = 0
+    batches: int = 0
+    read_seconds: float = 0.0
+    write_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    watermark_us: Optional[int] = None  # resume point: everything observed before it was copied
+
+    @property
+    def rows_per_s(self) -> float:
+        return (self.rows_sent / self.wall_seconds) if self.wall_seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = asdict(self)
+        out["rows_per_s"] = self.rows_per_s
+        return out
+
+
+class _Watermark:
+    """JSON sync state: rows observed before `observed_at_us` are known to be in the destination."""
+
+    def __init__(self, path: Optional[Path]) -> None:
+        self._path = Path(path).expanduser() if path is not None else None
+        self.observed_at_us: Optional[int] = None
+        if self._path is not None and self._path.exists():
+            try:
+                data = json.loads(self._path.read_text(encoding="utf-8"))
+            except Exception as e:
+                raise ValueError(f"unreadable copy state: {self._path}") from e
+            us = data.get("observed_at_us")
+            self.observed_at_us = int(us) if isinstance(us, int) else None
+
+    def advance(self, observed_at_us: Optional[int]) -> None:
+        if observed_at_us is None or (self.observed_at_us is not None and observed_at_us <= self.observed_at_us):
+            return
+        self.observed_at_us = observed_at_us
+        if self._path is None:
+            return
+        payload = {"version": 1, "observed_at_us": observed_at_us, "observed_at": epoch_us_to_iso(observed_at_us)}
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._path.with_suffix(self._path.suffix + ".tmp")
+        tmp.write_text(json.dumps(payload), encoding="utf-8")
+        tmp.replace(self._path)
+
+
+def _unwrap(store: Any) -> Any:
+    inner = getattr(store, "store", None)  # `CachedTripleStore`
+    return inner if inner is not None and hasattr(inner, "add") else store
+
+
+def _sort_us(a: TripleAssertion) -> int:
+    us = iso_to_epoch_us(a.observed_at)
+    return EPOCH_US_MIN if us is None else us
+
+
+def copy_store(
+    src: TripleStore,
+    dst: TripleStore,
+    *,
+    where: Optional[TripleQuery] = None,
+    batch_size: int = 1000,
+    copy_vectors: Optional[bool] = None,
+    state_path: Optional[Path] = None,
+    queue_size: int = 4,
+    instrumentation: Optional[MetricsSink] = None,
+) -> CopyStats:
+    """Stream assertions from `src` into `dst`, keeping their ids (and stored vectors).
+
+    Notes:
+    - `src` is read in `observed_at` order, one `query(since=..., order="asc", limit=batch_size)`
+      page at a time, on a reader thread that also fetches the page's vectors; the calling thread
+      writes pages to `dst` through `add(..., ids=...)`. At most `queue_size` pages are buffered.
+    - Ids already in `dst` are skipped by `add`, so re-running (or overlapping a previous run) never
+      duplicates rows. A page is only cut between distinct `observed_at` instants; a page made of one
+      instant is re-read with a larger limit.
+    - `where` restricts the copy with structured filters (`scope`, `owner_id`, `subject`, ...).
+    - `copy_vectors` (default: when `src` has `get_vectors` and `dst` is a vector store) passes the
+      stored vectors through instead of re-embedding. Rows without one are added plainly (`dst`
+      embeds them if it has an embedder).
+    - `state_path` keeps an `observed_at` watermark: the next call resumes from it (incremental sync),
+      or from `where.since` if that is later.
+      Rows later inserted into `src` with an older `observed_at` are not picked up by a resumed sync.
+    """
+    if int(batch_size) <= 0:
+        raise ValueError("batch_size must be > 0")
+    template = where if where is not None else TripleQuery()
+    if template.query_text or template.query_vector:
+        raise ValueError("copy_store() supports structured filters only")
+    page_size = int(batch_size)
+    mark = _Watermark(state_path)
+    stats = CopyStats(watermark_us=mark.observed_at_us)
+
+    get_vectors = getattr(_unwrap(src), "get_vectors", None)
+    if copy_vectors is None:
+        copy_vectors = get_vectors is not None and hasattr(_unwrap(dst), "embedder")
+    if copy_vectors and get_vectors is None:
+        raise ValueError("copy_vectors=True requires a source store with get_vectors()")
+
+    stop = threading.Event()
+    pages: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, int(queue_size)))
+
+    def _put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.05)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _read() -> None:
+        try:
+            # A resumed sync starts at the later of the watermark and the caller's own `since`.
+            since_us = mark.observed_at_us
+            if template.since_us is not None and (since_us is None or template.since_us > since_us):
+                since_us = template.since_us
+            limit = page_size
+            while not stop.is_set():
+                start = time.perf_counter()
+                q = replace(
+                    template,
+                    since=epoch_us_to_iso(since_us) if since_us is not None else template.since,
+                    order="asc",
+                    limit=limit,
+                )
+                page = src.query(q)
+                if not page:
+                    break
+                keys = [_sort_us(a) for a in page]
+                full = len(page) >= limit
+                if full:
+                    # Only hand over whole instants: the last one may continue on the next page.
+                    cut = keys.index(keys[-1])
+                    if cut == 0:
+                        limit *= 2
+                        continue
+                    batch, resume_us = page[:cut], keys[-1]
+                else:
+                    batch, resume_us = page, keys[-1]
+                if resume_us == EPOCH_US_MIN:
+                    resume_us = None  # only unparseable timestamps so far
+                vectors: Dict[str, List[float]] = {}
+                if copy_vectors:
+                    vectors = get_vectors([a.assertion_id for a in batch if a.assertion_id])  # type: ignore[misc]
+                stats.read_seconds += time.perf_counter() - start
+                if not _put((batch, vectors, resume_us)):
+                    return
+                if not full:
+                    break
+                since_us, limit = resume_us, page_size
+            _put(_DONE)
+        except BaseException as e:
+            _put(e)
+
+    reader = threading.Thread(target=_read, name="abstractmemory-copy-reader", daemon=True)
+    t0 = time.perf_counter()
+    reader.start()
+    try:
+        with start_span(instrumentation, "replication.copy") as span:
+            while True:
+                item = pages.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                batch, vectors, resume_us = item
+                start = time.perf_counter()
+                _write(dst, batch, vectors)
+                stats.write_seconds += time.perf_counter() - start
+                mark.advance(resume_us)
+                stats.rows_read += len(batch)
+                stats.rows_sent += len(batch)
+                stats.vectors_copied += len(vectors)
+                stats.batches += 1
+                stats.watermark_us = mark.observed_at_us
+            span.count("rows_sent", stats.rows_sent)
+            span.count("vectors_copied", stats.vectors_copied)
+            span.count("batches", stats.batches)
+    finally:
+        stop.set()
+        reader.join(timeout=5.0)
+        stats.wall_seconds = time.perf_counter() - t0
+    return stats
+
+
+def _write(dst: TripleStore, batch: List[TripleAssertion], vectors: Dict[str, List[float]]) -> None:
+    with_vec: List[Tuple[TripleAssertion, str]] = []
+    plain: List[Tuple[TripleAssertion, str]] = []
+    for a in batch:
+        if not a.assertion_id:
+            raise ValueError("source store returned an assertion without assertion_id")
+        (with_vec if a.assertion_id in vectors else plain).append((a, a.assertion_id))
+    if with_vec:
+        dst.add([a for a, _ in with_vec], ids=[i for _, i in with_vec], vectors=[vectors[i] for _, i in with_vec])  # type: ignore[call-arg]
+    if plain:
+        dst.add([a for a, _ in plain], ids=[i for _, i in plain])  # type: ignore[call-arg]
+
+
+def open_store(spec: str, *, create: bool = False) -> Any:
+    """Open a store from `sqlite:PATH`, `lancedb:PATH[#TABLE]` or `snapshot:PATH` (in-memory snapshot)."""
+    kind, _, target = str(spec).partition(":")
+    kind = kind.strip().lower()
+    if not target:
+        raise ValueError(f"store spec must look like KIND:PATH, got {spec!r}")
+    if kind == "sqlite":
+        from .sqlite_store import SQLiteTripleStore
+
+        return SQLiteTripleStore(Path(target))
+    if kind == "lancedb":
+        from .lancedb_store import LanceDBTripleStore
+
+        path, _, table = target.partition("#")
+        return LanceDBTripleStore(path, table_name=table or "triple_assertions")
+    if kind == "snapshot":
+        from .in_memory_store import InMemoryTripleStore
+
+        path = Path(target).expanduser()
+        if path.exists():
+            return InMemoryTripleStore.load(path)
+        if create:
+            return InMemoryTripleStore()
+        raise ValueError(f"snapshot not found: {path}")
+    raise ValueError(f"unknown store kind {kind!r} (expected sqlite, lancedb or snapshot)")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m abstractmemory.replication",
+        description="Copy or incrementally sync assertions between stores, keeping ids and vectors",
+    )
+    parser.add_argument("src", help="sqlite:PATH | lancedb:PATH[#TABLE] | snapshot:PATH")
+    parser.add_argument("dst", help="same forms; a missing snapshot is created")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--state", type=Path, default=None, help="watermark file for incremental sync")
+    parser.add_argument("--no-vectors", action="store_true", help="do not copy stored vectors")
+    parser.add_argument("--scope", default=None)
+    parser.add_argument("--owner-id", default=None)
+    args = parser.parse_args(argv)
+
+    src = open_store(args.src)
+    dst = open_store(args.dst, create=True)
+    try:
+        stats = copy_store(
+            src,
+            dst,
+            where=TripleQuery(scope=args.scope, owner_id=args.owner_id),
+            batch_size=args.batch_size,
+            copy_vectors=False if args.no_vectors else None,
+            state_path=args.state,
+        )
+        if str(args.dst).lower().startswith("snapshot:"):
+            dst.save(Path(str(args.dst).partition(":")[2]))
+    finally:
+        src.close()
+        dst.close()
+    json.dump(stats.to_dict(), sys.stdout, indent=2, sort_keys=True)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from array import array
+from operator import mul
+from typing import Any, Hashable, List, Optional, Sequence, Tuple
+
+# Candidates over-fetched per requested result when reranking (`TripleQuery.mmr_pool` overrides).
+MMR_POOL_FACTOR = 10
+# Pools up to this size get the full pairwise similarity matrix (one matrix product, 64 MiB at
+# most); larger pools compare each pick with the remaining candidates instead.
+MMR_GRAM_MAX = 4096
+
+
+def reranks(q: Any) -> bool:
+    """True when a semantic `TripleQuery` asks for MMR and/or triple collapsing."""
+    return q.mmr_lambda is not None or bool(q.collapse_triples)
+
+
+def rerank_pool(q: Any, limit: Optional[int]) -> Optional[int]:
+    """Candidates to fetch before reranking (None: every match, as for an unbounded `limit`)."""
+    if q.mmr_pool is not None:
+        return max(int(q.mmr_pool), limit or 0)
+    return None if limit is None else limit * MMR_POOL_FACTOR
+
+
+def _numpy() -> Any:
+    try:
+        import numpy  # type: ignore
+    except Exception:
+        return None
+    return numpy
+
+
+def rerank(
+    scores: Sequence[float],
+    vectors: Sequence[Sequence[float]],
+    keys: Optional[Sequence[Hashable]] = None,
+    *,
+    limit: Optional[int],
+    mmr_lambda: Optional[float],
+) -> List[Tuple[int, Optional[float]]]:
+    """Pick `(index, mmr)` pairs from best-first candidates, in result order.
+
+    - `keys` (e.g. `(subject, predicate, object)`): only the first, i.e. best-scoring, candidate
+      per key is kept
+    - `mmr_lambda`: greedy maximal marginal relevance over the kept candidates,
+      `lambda * score - (1 - lambda) * max cosine to the already picked ones`; `mmr` is that value
+      when picked (None without MMR)
+
+    With numpy (when importable) the pool's pairwise cosine matrix is computed in one product and
+    each step is a vector update over it; without numpy each step compares the last pick with the
+    remaining candidates in pure Python (O(k * n * dim)).
+    """
+    kept = list(range(len(scores)))
+    if keys is not None:
+        seen: set = set()
+        kept = [i for i in kept if not (keys[i] in seen or seen.add(keys[i]))]
+    k = len(kept) if limit is None else min(int(limit), len(kept))
+    if mmr_lambda is None or k <= 0:
+        return [(i, None) for i in kept[:k]]
+
+    lam = float(mmr_lambda)
+    np = _numpy()
+    if np is not None:
+        picks = _mmr_numpy(np, [scores[i] for i in kept], [vectors[i] for i in kept], k, lam)
+    else:
+        picks = _mmr_python([scores[i] for i in kept], [vectors[i] for i in kept], k, lam)
+    return [(kept[j], value) for j, value in picks]
+
+
+def _matrix(np: Any, vectors: List[Sequence[float]]) -> Any:
+    first = vectors[0]
+    if isinstance(first, array) and all(isinstance(v, array) and v.typecode == first.typecode for v in vectors):
+        # Stored `array` payloads (float32/float64/int8 codes) are copied as one buffer, not per value.
+        flat = np.frombuffer(b"".join(v.tobytes() for v in vectors), dtype=np.dtype(first.typecode))
+        return flat.reshape(len(vectors), -1).astype(np.float32)
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def _mmr_numpy(np: Any, scores: List[float], vectors: List[Sequence[float]], k: int, lam: float) -> List[Tuple[int, float]]:
+    m = _matrix(np, vectors)
+    norms = np.linalg.norm(m, axis=1)
+    norms[norms == 0.0] = 1.0
+    m /= norms[:, None]
+    relevance = lam * np.asarray(scores, dtype=np.float64)
+    # Ties pick the lowest index, i.e. the more relevant candidate (the input is best-first).
+    gram = m @ m.T if len(scores) <= MMR_GRAM_MAX else None
+
+    def similarities(j: int) -> Any:
+        return gram[j] if gram is not None else m @ m[j]
+
+    first = int(np.argmax(relevance))
+    picks = [(first, float(relevance[first]))]
+    max_sim = similarities(first).astype(np.float64)
+    taken = np.zeros(len(scores), dtype=bool)
+    taken[first] = True
+    while len(picks) < k:
+        mmr = relevance - (1.0 - lam) * max_sim
+        mmr[taken] = -np.inf
+        j = int(np.argmax(mmr))
+        picks.append((j, float(mmr[j])))
+        taken[j] = True
+        np.maximum(max_sim, similarities(j), out=max_sim)
+    return picks
+
+
+def _mmr_python(scores: List[float], vectors: List[Sequence[float]], k: int, lam: float) -> List[Tuple[int, float]]:
+    unit: List[List[float]] = []
+    for v in vectors:
+        values = [float(x) for x in v]
+        norm = sum(x * x for x in values) ** 0.5 or 1.0
+        unit.append([x / norm for x in values])
+    relevance = [lam * float(s) for s in scores]
+    first = max(range(len(scores)), key=lambda i: (relevance[i], -i))
+    picks = [(first, relevance[first])]
+    max_sim: List[Optional[float]] = [None] * len(scores)
+    remaining = [i for i in range(len(scores)) if i != first]
+    last = first
+    while len(picks) < k:
+        anchor = unit[last]
+        best_i, best = -1, float("-inf")
+        for i in remaining:
+            sim = sum(map(mul, unit[i], anchor))
+            prev = max_sim[i]
+            if prev is None or sim > prev:
+                max_sim[i] = prev = sim
+            value = relevance[i] - (1.0 - lam) * prev
+            if value > best:
+                best_i, best = i, value
+        picks.append((best_i, best))
+        remaining.remove(best_i)
+        last = best_i
+    return picks
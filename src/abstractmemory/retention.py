@@ -0,0 +1,411 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import heapq
+import json
+import os
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+from urllib.parse import quote
+
+from .in_memory_store import InMemoryTripleStore
+from .models import EPOCH_US_MIN, TripleAssertion, epoch_sort_key, utc_now_iso_seconds
+from .store import MaintainableTripleStore, TripleQuery
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow  # type: ignore
+        import pyarrow.parquet  # type: ignore  # noqa: F401
+
+        return pyarrow
+    except Exception as e:  # pragma: no cover
+        raise ImportError(
+            "Parquet archives require `pyarrow`. Install it (e.g. `pip install pyarrow`) "
+            "or use archive_format='jsonl.gz'."
+        ) from e
+
+
+def _parse_iso(value: str) -> datetime:
+    dt = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def _cutoff(now: datetime, seconds: float) -> int:
+    # Epoch microseconds, so cutoffs compare correctly against any stored UTC offset.
+    return epoch_sort_key((now - timedelta(seconds=float(seconds))).isoformat(timespec="microseconds"))
+
+
+def _archive_record(assertion_id: str, a: TripleAssertion) -> Dict[str, Any]:
+    out = a.to_dict()
+    out["assertion_id"] = assertion_id
+    return out
+
+
+_PARQUET_COLUMNS = (
+    "assertion_id",
+    "subject",
+    "predicate",
+    "object",
+    "scope",
+    "owner_id",
+    "observed_at",
+    "valid_from",
+    "valid_until",
+    "confidence",
+    "provenance_json",
+    "attributes_json",
+)
+
+
+def _write_archive(path: Path, records: List[Dict[str, Any]], fmt: str) -> str:
+    """Write archive records and return the sha256 of their canonical JSON lines."""
+    lines = [json.dumps(r, ensure_ascii=False, sort_keys=True, separators=(",", ":")) for r in records]
+    digest = hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest()
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if fmt == "parquet":
+        pa = _import_pyarrow()
+        cols: Dict[str, List[Any]] = {c: [] for c in _PARQUET_COLUMNS}
+        for r in records:
+            for c in _PARQUET_COLUMNS:
+                if c == "provenance_json":
+                    cols[c].append(json.dumps(r.get("provenance") or {}, ensure_ascii=False, separators=(",", ":")))
+                elif c == "attributes_json":
+                    cols[c].append(json.dumps(r.get("attributes") or {}, ensure_ascii=False, separators=(",", ":")))
+                else:
+                    cols[c].append(r.get(c))
+        cols["confidence"] = [float(v) if v is not None else None for v in cols["confidence"]]
+        pa.parquet.write_table(pa.table(cols), str(path), compression="zstd")
+    else:
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            for line in lines:
+                f.write(line + "\n")
+    return digest
+
+
+def _read_archive(path: Path) -> List[Tuple[str, TripleAssertion]]:
+    out: List[Tuple[str, TripleAssertion]] = []
+    if path.suffix == ".parquet":
+        pa = _import_pyarrow()
+        for r in pa.parquet.read_table(str(path)).to_pylist():
+            data = {k: v for k, v in r.items() if v is not None and not k.endswith("_json")}
+            data["provenance"] = json.loads(r.get("provenance_json") or "{}")
+            data["attributes"] = json.loads(r.get("attributes_json") or "{}")
+            out.append((str(r.get("assertion_id") or ""), TripleAssertion.from_dict(data)))
+        return out
+
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            data = json.loads(line)
+            out.append((str(data.get("assertion_id") or ""), TripleAssertion.from_dict(data)))
+    return out
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """What the retention engine may remove or move to cold storage.
+
+    - `ttl_seconds`: per-scope TTL on `observed_at` (e.g. `{"run": 7 * 86400}`).
+    - `keep_latest`: keep only the newest N assertions per `(scope, owner_id, subject, predicate)`
+      (restricted to `compact_scopes` when set).
+    - `archive_after_seconds`: per-scope idle time after which a whole `(scope, owner_id)`
+      partition (newest `observed_at` older than the cutoff) is archived.
+    - `archive_removed`: also archive expired/compacted rows (not only cold partitions).
+    """
+
+    ttl_seconds: Mapping[str, float] = field(default_factory=dict)
+    keep_latest: Optional[int] = None
+    compact_scopes: Optional[Tuple[str, ...]] = None
+    archive_after_seconds: Mapping[str, float] = field(default_factory=dict)
+    archive_removed: bool = True
+    archive_format: str = "jsonl.gz"  # jsonl.gz|parquet
+
+    def __post_init__(self) -> None:
+        fmt = str(self.archive_format or "").strip().lower() or "jsonl.gz"
+        if fmt not in ("jsonl.gz", "parquet"):
+            raise ValueError("archive_format must be 'jsonl.gz' or 'parquet'")
+        object.__setattr__(self, "archive_format", fmt)
+        if self.keep_latest is not None and int(self.keep_latest) < 1:
+            raise ValueError("keep_latest must be >= 1")
+        object.__setattr__(self, "ttl_seconds", {str(k).strip().lower(): float(v) for k, v in dict(self.ttl_seconds).items()})
+        object.__setattr__(
+            self,
+            "archive_after_seconds",
+            {str(k).strip().lower(): float(v) for k, v in dict(self.archive_after_seconds).items()},
+        )
+        if self.compact_scopes is not None:
+            object.__setattr__(self, "compact_scopes", tuple(str(s).strip().lower() for s in self.compact_scopes))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "ttl_seconds": dict(self.ttl_seconds),
+            "keep_latest": self.keep_latest,
+            "compact_scopes": list(self.compact_scopes) if self.compact_scopes is not None else None,
+            "archive_after_seconds": dict(self.archive_after_seconds),
+            "archive_removed": bool(self.archive_removed),
+            "archive_format": self.archive_format,
+        }
+
+
+@dataclass
+class RetentionReport:
+    expired: int = 0
+    compacted: int = 0
+    archived: int = 0
+    resumed: int = 0  # rows purged for tombstones left pending by an interrupted run
+    tombstone_ids: List[str] = field(default_factory=list)
+    archive_paths: List[str] = field(default_factory=list)
+
+
+class RetentionEngine:
+    """Apply a `RetentionPolicy` to a store while keeping an append-only audit trail.
+
+    Notes:
+    - Every removal is recorded first in `<root>/tombstones.jsonl` (append-only, fsync'd): action,
+      policy, affected assertion ids, archive file and content digest. Rows are purged only after
+      the tombstone is durable, and an `applied` marker is appended afterwards; a crashed run is
+      completed by the next `run()`.
+    - Archives live under `<root>/archive/` and remain queryable via `query_archived(...)`.
+    - Timestamps are compared as UTC epoch microseconds (same contract as the stores), so any
+      ISO-8601 offset works. Rows whose `observed_at` cannot be parsed never expire, and a
+      partition is archived by its newest parseable row.
+    """
+
+    def __init__(
+        self,
+        store: MaintainableTripleStore,
+        policy: RetentionPolicy,
+        *,
+        root: Path,
+        max_cached_archives: int = 8,
+    ) -> None:
+        self._store = store
+        self._policy = policy
+        self._root = Path(root).expanduser()
+        self._root.mkdir(parents=True, exist_ok=True)
+        self._manifest = self._root / "tombstones.jsonl"
+        self._max_cached = max(1, int(max_cached_archives))
+        self._archive_cache: "OrderedDict[str, InMemoryTripleStore]" = OrderedDict()
+
+    # ---------------------------------------------------------------------------------------------
+    # Manifest
+
+    def tombstones(self) -> List[Dict[str, Any]]:
+        """Return tombstone records in write order (`applied` markers are folded in)."""
+        if not self._manifest.exists():
+            return []
+        records: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        with self._manifest.open("r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rec = json.loads(line)
+                except Exception:
+                    continue  # torn trailing write from a crash
+                if not isinstance(rec, dict) or not isinstance(rec.get("tombstone_id"), str):
+                    continue
+                tid = rec["tombstone_id"]
+                if rec.get("kind") == "applied":
+                    if tid in records:
+                        records[tid]["applied_at"] = rec.get("applied_at")
+                    continue
+                records[tid] = rec
+        return list(records.values())
+
+    def tombstoned_ids(self) -> Set[str]:
+        out: Set[str] = set()
+        for rec in self.tombstones():
+            out.update(str(i) for i in rec.get("assertion_ids") or [])
+        return out
+
+    def _append_manifest(self, rec: Dict[str, Any]) -> None:
+        line = json.dumps(rec, ensure_ascii=False, separators=(",", ":"))
+        with self._manifest.open("a", encoding="utf-8") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    # ---------------------------------------------------------------------------------------------
+    # Run
+
+    def run(self, *, now: Optional[str] = None, dry_run: bool = False) -> RetentionReport:
+        report = RetentionReport()
+        now_dt = _parse_iso(now) if now else _parse_iso(utc_now_iso_seconds())
+        policy = self._policy
+
+        # Finish removals recorded by an interrupted run before planning new ones.
+        if not dry_run:
+            for rec in self.tombstones():
+                if rec.get("applied_at"):
+                    continue
+                report.resumed += int(self._store.purge(rec.get("assertion_ids") or []))
+                self._append_manifest({"kind": "applied", "tombstone_id": rec["tombstone_id"], "applied_at": utc_now_iso_seconds()})
+
+        rows = list(self._store.scan(TripleQuery(limit=0, order="desc")))
+        taken: Set[str] = set()
+
+        # action -> (scope, owner_id) -> rows
+        plan: Dict[str, Dict[Tuple[str, Optional[str]], List[Tuple[str, TripleAssertion]]]] = {
+            "expire": {},
+            "archive": {},
+            "compact": {},
+        }
+
+        # 1) Per-scope TTLs.
+        ttl_cutoffs = {scope: _cutoff(now_dt, secs) for scope, secs in policy.ttl_seconds.items()}
+        for assertion_id, a in rows:
+            cutoff = ttl_cutoffs.get(a.scope)
+            # Undatable (unparseable) timestamps are never expired.
+            if cutoff is not None and EPOCH_US_MIN < epoch_sort_key(a.observed_at) < cutoff:
+                plan["expire"].setdefault((a.scope, a.owner_id), []).append((assertion_id, a))
+                taken.add(assertion_id)
+
+        # 2) Cold partitions: newest observed_at older than the scope's archive cutoff.
+        archive_cutoffs = {scope: _cutoff(now_dt, secs) for scope, secs in policy.archive_after_seconds.items()}
+        if archive_cutoffs:
+            partitions: Dict[Tuple[str, Optional[str]], List[Tuple[str, TripleAssertion]]] = {}
+            for assertion_id, a in rows:
+                if assertion_id in taken or a.scope not in archive_cutoffs:
+                    continue
+                partitions.setdefault((a.scope, a.owner_id), []).append((assertion_id, a))
+            for key, members in partitions.items():
+                newest = max(epoch_sort_key(a.observed_at) for _, a in members)
+                if EPOCH_US_MIN < newest < archive_cutoffs[key[0]]:
+                    plan["archive"][key] = members
+                    taken.update(i for i, _ in members)
+
+        # 3) Compact superseded (subject, predicate) histories down to the newest N.
+        if policy.keep_latest is not None:
+            seen: Dict[Tuple[str, Optional[str], str, str], int] = {}
+            # `rows` is newest-first; ties break on assertion id for determinism.
+            ordered = sorted(rows, key=lambda t: (epoch_sort_key(t[1].observed_at), t[0]), reverse=True)
+            for assertion_id, a in ordered:
+                if assertion_id in taken:
+                    continue
+                if policy.compact_scopes is not None and a.scope not in policy.compact_scopes:
+                    continue
+                group = (a.scope, a.owner_id, a.subject, a.predicate)
+                n = seen.get(group, 0) + 1
+                seen[group] = n
+                if n > int(policy.keep_latest):
+                    plan["compact"].setdefault((a.scope, a.owner_id), []).append((assertion_id, a))
+
+        for action, groups in plan.items():
+            for (scope, owner_id), members in sorted(groups.items(), key=lambda kv: (kv[0][0], kv[0][1] or "")):
+                if not members:
+                    continue
+                if action == "expire":
+                    report.expired += len(members)
+                elif action == "archive":
+                    report.archived += len(members)
+                else:
+                    report.compacted += len(members)
+                if dry_run:
+                    continue
+                tid, archive_path = self._apply(action, scope, owner_id, members, now_dt)
+                report.tombstone_ids.append(tid)
+                if archive_path:
+                    report.archive_paths.append(archive_path)
+        return report
+
+    def _apply(
+        self,
+        action: str,
+        scope: str,
+        owner_id: Optional[str],
+        members: List[Tuple[str, TripleAssertion]],
+        now_dt: datetime,
+    ) -> Tuple[str, Optional[str]]:
+        tid = str(uuid.uuid4())
+        ids = [assertion_id for assertion_id, _ in members]
+        archive_rel: Optional[str] = None
+        digest: Optional[str] = None
+
+        if action == "archive" or self._policy.archive_removed:
+            ext = "parquet" if self._policy.archive_format == "parquet" else "jsonl.gz"
+            partition = f"{scope}__{quote(owner_id, safe='') if owner_id else '_'}"
+            stamp = now_dt.strftime("%Y%m%dT%H%M%S%fZ")
+            archive_rel = f"archive/{partition}/{stamp}-{action}-{tid[:8]}.{ext}"
+            records = [_archive_record(i, a) for i, a in sorted(members, key=lambda t: (epoch_sort_key(t[1].observed_at), t[0]))]
+            digest = _write_archive(self._root / archive_rel, records, self._policy.archive_format)
+
+        self._append_manifest(
+            {
+                "kind": "tombstone",
+                "tombstone_id": tid,
+                "action": action,
+                "created_at": utc_now_iso_seconds(),
+                "scope": scope,
+                "owner_id": owner_id,
+                "count": len(ids),
+                "assertion_ids": ids,
+                "archive_path": archive_rel,
+                "content_sha256": digest,
+                "policy": self._policy.to_dict(),
+            }
+        )
+        self._store.purge(ids)
+        self._append_manifest({"kind": "applied", "tombstone_id": tid, "applied_at": utc_now_iso_seconds()})
+        return tid, archive_rel
+
+    # ---------------------------------------------------------------------------------------------
+    # Archive reads
+
+    def _load_archive(self, rel_path: str) -> InMemoryTripleStore:
+        cached = self._archive_cache.get(rel_path)
+        if cached is not None:
+            self._archive_cache.move_to_end(rel_path)
+            return cached
+        store = InMemoryTripleStore()
+        # Keep the original ids: they are what the tombstone manifest records.
+        records = list(_read_archive(self._root / rel_path))
+        store.add([a for _, a in records], ids=[i for i, _ in records])
+        self._archive_cache[rel_path] = store
+        while len(self._archive_cache) > self._max_cached:
+            self._archive_cache.popitem(last=False)
+        return store
+
+    def query_archived(self, q: TripleQuery, *, include_live: bool = False) -> List[TripleAssertion]:
+        """Query archived assertions (structured filters only), optionally merged with the live store.
+
+        Only archives whose partition can match `q.scope`/`q.owner_id` are opened.
+        """
+        if q.query_text or q.query_vector:
+            raise ValueError("Archived assertions do not keep vectors; use structured filters")
+
+        runs: List[List[TripleAssertion]] = []
+        for rec in self.tombstones():
+            rel = rec.get("archive_path")
+            if not isinstance(rel, str) or not rel:
+                continue
+            if q.scope and rec.get("scope") != q.scope:
+                continue
+            if q.owner_id and (rec.get("owner_id") or "") != q.owner_id:
+                continue
+            runs.append(self._load_archive(rel).query(q))
+        if include_live:
+            runs.append(self._store.query(q))
+
+        descending = str(q.order).lower() != "asc"
+        merged = heapq.merge(*runs, key=lambda a: epoch_sort_key(a.observed_at), reverse=descending)
+        limit = int(q.limit) if isinstance(q.limit, int) else 100
+        return list(merged) if limit <= 0 else list(islice(merged, limit))
+
+
+def archived_assertions(path: Path) -> Iterable[Tuple[str, TripleAssertion]]:
+    """Read `(assertion_id, assertion)` pairs from one archive file (jsonl.gz or parquet)."""
+    return _read_archive(Path(path))
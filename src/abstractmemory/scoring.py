@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import heapq
+import math
+import time
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, TypeVar, Union
+
+from .models import canonicalize_term, iso_to_epoch_us
+
+T = TypeVar("T", bound=Tuple[Any, ...])
+
+# Combined factor for one candidate: (observed_at epoch us, confidence, predicate) -> multiplier.
+ScoreFactor = Callable[[Optional[int], Optional[float], Optional[str]], float]
+
+
+@dataclass(frozen=True)
+class RecallScoring:
+    """Rank semantic results by `cosine * recency * confidence * predicate boost`.
+
+    - `half_life_s`: recency decay `0.5 ** (age_s / half_life_s)` on `observed_at` (None: no decay).
+      Ages are measured from `now` (ISO timestamp; default: when the query runs). Future rows
+      count as age 0, and rows without a parseable `observed_at` are not decayed.
+    - `confidence_weight` in `[0, 1]`: factor `1 - w + w * confidence` (confidence clamped to
+      `[0, 1]`; assertions without one count as `default_confidence`).
+    - `predicate_boosts`: multiplier per predicate (a mapping; keys are canonicalized, others 1.0).
+
+    `min_score` still thresholds the raw cosine; results carry the combined value as
+    `_retrieval["score"]` and the raw similarity as `_retrieval["cosine"]`.
+    """
+
+    half_life_s: Optional[float] = None
+    confidence_weight: float = 0.0
+    default_confidence: float = 1.0
+    predicate_boosts: Union[Mapping[str, float], Tuple[Tuple[str, float], ...]] = ()
+    now: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        if self.half_life_s is not None:
+            half_life = float(self.half_life_s)
+            if not half_life > 0.0:
+                raise ValueError("half_life_s must be > 0")
+            object.__setattr__(self, "half_life_s", half_life)
+        weight = float(self.confidence_weight)
+        if not (0.0 <= weight <= 1.0):
+            raise ValueError("confidence_weight must be within [0, 1]")
+        object.__setattr__(self, "confidence_weight", weight)
+        object.__setattr__(self, "default_confidence", min(1.0, max(0.0, float(self.default_confidence))))
+
+        items = self.predicate_boosts.items() if isinstance(self.predicate_boosts, Mapping) else self.predicate_boosts
+        boosts: Dict[str, float] = {}
+        for key, value in items:
+            boost = float(value)
+            if not (boost >= 0.0 and math.isfinite(boost)):
+                raise ValueError(f"predicate boost for {key!r} must be a finite number >= 0")
+            term = canonicalize_term(str(key or ""))
+            if term:
+                boosts[term] = boost
+        # A sorted tuple keeps the query hashable (cache keys) and its fingerprint stable.
+        object.__setattr__(self, "predicate_boosts", tuple(sorted(boosts.items())))
+
+        if isinstance(self.now, str):
+            now = self.now.strip() or None
+            if now is not None and iso_to_epoch_us(now) is None:
+                raise ValueError(f"now must be an ISO timestamp, got {self.now!r}")
+            object.__setattr__(self, "now", now)
+
+    @property
+    def max_factor(self) -> float:
+        """Upper bound of the combined factor (recency and confidence never exceed 1)."""
+        return max([1.0] + [boost for _, boost in self.predicate_boosts])  # type: ignore[misc]
+
+    def factor(self) -> ScoreFactor:
+        """The combined factor, with `now` resolved once (call per query, not per row)."""
+        now_us = iso_to_epoch_us(self.now) if self.now else int(time.time() * 1_000_000)
+        decay = (math.log(2.0) / (self.half_life_s * 1_000_000)) if self.half_life_s else 0.0
+        weight = self.confidence_weight
+        default = self.default_confidence
+        boosts = dict(self.predicate_boosts)  # type: ignore[arg-type]
+        exp = math.exp
+
+        def combined(observed_us: Optional[int], confidence: Optional[float], predicate: Optional[str]) -> float:
+            f = boosts.get(predicate, 1.0) if boosts else 1.0  # type: ignore[arg-type]
+            if decay and observed_us is not None and observed_us < now_us:
+                f *= exp(-decay * (now_us - observed_us))
+            if weight:
+                c = default if confidence is None else min(1.0, max(0.0, float(confidence)))
+                f *= 1.0 - weight + weight * c
+            return f
+
+        return combined
+
+    def to_dict(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        if self.half_life_s is not None:
+            out["half_life_s"] = self.half_life_s
+        if self.confidence_weight:
+            out["confidence_weight"] = self.confidence_weight
+            out["default_confidence"] = self.default_confidence
+        if self.predicate_boosts:
+            out["predicate_boosts"] = dict(self.predicate_boosts)  # type: ignore[arg-type]
+        if self.now is not None:
+            out["now"] = self.now
+        return out
+
+
+def top_scored(items: Sequence[T], limit: Optional[int]) -> List[T]:
+    """Best `limit` tuples by their first element, descending (a bounded heap; None sorts all).
+
+    Ties keep input order, exactly like a stable `sorted(..., reverse=True)[:limit]`.
+    """
+    if limit is None:
+        return sorted(items, key=itemgetter(0), reverse=True)
+    return heapq.nlargest(limit, items, key=itemgetter(0))
@@ -0,0 +1,496 @@
+from __future__ import annotations
+
+import heapq
+import json
+import threading
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from urllib.parse import quote
+
+from .aggregate import AGGREGATE_METRICS, GroupAccumulator, group_limit, normalize_aggregate
+from .models import TripleAssertion, epoch_sort_key, given_assertion_ids
+from .store import TripleQuery, TripleStore
+
+
+ShardFactory = Callable[[str], TripleStore]
+
+
+def _retrieval_score(a: TripleAssertion, key: str = "score") -> float:
+    attrs = a.attributes if isinstance(a.attributes, dict) else {}
+    retrieval = attrs.get("_retrieval") if isinstance(attrs.get("_retrieval"), dict) else {}
+    score = retrieval.get(key)
+    try:
+        return float(score) if score is not None else float("-inf")
+    except Exception:
+        return float("-inf")
+
+
+def _first_per_triple(results: Iterable[TripleAssertion]) -> Iterator[TripleAssertion]:
+    seen: Set[Tuple[str, str, str]] = set()
+    for a in results:
+        key = (a.subject, a.predicate, a.object)
+        if key not in seen:
+            seen.add(key)
+            yield a
+
+
+def _query_embedder(store: TripleStore, column: str) -> Any:
+    # The store's `embedder` answers its default vector column only; other columns stay per shard.
+    describe = getattr(store, "vector_columns", None)
+    default = next((c["name"] for c in describe() if c.get("default")), None) if describe is not None else None
+    return getattr(store, "embedder", None) if column == default else None
+
+
+def _hash_bucket(owner_id: Optional[str], num_shards: int) -> int:
+    # Stable across processes (unlike `hash()`), cheap, and good enough for spreading owners.
+    return zlib.crc32(str(owner_id or "").encode("utf-8")) % num_shards
+
+
+class ShardedTripleStore:
+    """Router that partitions assertions across lazily opened per-shard stores.
+
+    Notes:
+    - Wraps any `TripleStore`: `shard_factory(shard_id)` opens (or creates) the backend for one shard.
+    - `partition="owner"`: one shard per `(scope, owner_id)`; `partition="hash"`: `num_shards`
+      buckets keyed by `owner_id` (all scopes of an owner land in the same bucket).
+    - Queries pinned to a single shard go straight to it; other queries fan out in parallel and
+      results are k-way merged (by `observed_at`, or by retrieval score for semantic queries).
+    - A fanned-out `query_text` on the default vector column is embedded once, with the first
+      shard's embedder, and sent to every shard as `query_vector`.
+    - At most `max_open_shards` handles stay open (LRU). Evicted shards are `close()`d and reopened
+      on demand, so the factory must return persistent stores when eviction is enabled.
+    - With `partition="owner"`, shard discovery across restarts requires `manifest_path`.
+    """
+
+    def __init__(
+        self,
+        shard_factory: ShardFactory,
+        *,
+        partition: str = "owner",
+        num_shards: int = 16,
+        max_open_shards: Optional[int] = 64,
+        max_workers: int = 8,
+        manifest_path: Optional[Path] = None,
+    ) -> None:
+        mode = str(partition or "owner").strip().lower()
+        if mode not in ("owner", "hash"):
+            raise ValueError("partition must be 'owner' or 'hash'")
+        if mode == "hash" and int(num_shards) <= 0:
+            raise ValueError("num_shards must be > 0 for hash partitioning")
+
+        self._factory = shard_factory
+        self._partition = mode
+        self._num_shards = int(num_shards)
+        self._max_open = int(max_open_shards) if max_open_shards is not None and int(max_open_shards) > 0 else None
+        self._max_workers = max(1, int(max_workers))
+        self._manifest_path = Path(manifest_path).expanduser() if manifest_path is not None else None
+
+        self._lock = threading.RLock()
+        self._open: "OrderedDict[str, TripleStore]" = OrderedDict()
+        self._in_use: Dict[str, int] = {}
+        # shard_id -> (scope, owner_id); only meaningful for owner partitioning.
+        self._known: Dict[str, Tuple[str, Optional[str]]] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        self._load_manifest()
+
+    # ---------------------------------------------------------------------------------------------
+    # Routing
+
+    def shard_id_for(self, scope: str, owner_id: Optional[str]) -> str:
+        """Return the shard id an assertion with this `(scope, owner_id)` is routed to."""
+        if self._partition == "hash":
+            return f"h{_hash_bucket(owner_id, self._num_shards):04d}"
+        # Percent-encode the owner so shard ids are safe to use as file names.
+        owner_part = quote(owner_id, safe="") if owner_id else "_"
+        return f"{scope}__{owner_part}"
+
+    def shard_ids(self) -> List[str]:
+        """Return all shard ids currently known to the router (sorted)."""
+        if self._partition == "hash":
+            return [f"h{i:04d}" for i in range(self._num_shards)]
+        with self._lock:
+            return sorted(self._known.keys())
+
+    def _shards_for_query(self, q: TripleQuery) -> List[str]:
+        if self._partition == "hash":
+            if q.owner_id:
+                return [self.shard_id_for(q.scope or "run", q.owner_id)]
+            return self.shard_ids()
+
+        if q.scope and q.owner_id:
+            # Reads never create shards: an owner the router has not seen has no data.
+            shard_id = self.shard_id_for(q.scope, q.owner_id)
+            with self._lock:
+                return [shard_id] if shard_id in self._known else []
+        with self._lock:
+            known = list(self._known.items())
+        out: List[str] = []
+        for shard_id, (scope, owner_id) in known:
+            if q.scope and scope != q.scope:
+                continue
+            if q.owner_id and (owner_id or "") != q.owner_id:
+                continue
+            out.append(shard_id)
+        return sorted(out)
+
+    # ---------------------------------------------------------------------------------------------
+    # Shard handles (LRU)
+
+    def _acquire(self, shard_id: str) -> TripleStore:
+        with self._lock:
+            store = self._open.get(shard_id)
+            if store is not None:
+                return self._use_locked(shard_id, store)
+        # Open outside the lock so a slow shard does not stall every other call; if another thread
+        # opened the same shard meanwhile, its handle wins and ours is closed.
+        opened = self._factory(shard_id)
+        with self._lock:
+            store = self._open.get(shard_id)
+            if store is None:
+                store, opened = opened, None
+                self._open[shard_id] = store
+            store = self._use_locked(shard_id, store)
+        if opened is not None:
+            try:
+                opened.close()
+            except Exception:
+                pass
+        return store
+
+    def _use_locked(self, shard_id: str, store: TripleStore) -> TripleStore:
+        self._open.move_to_end(shard_id)
+        self._in_use[shard_id] = self._in_use.get(shard_id, 0) + 1
+        self._evict_locked()
+        return store
+
+    def _release(self, shard_id: str) -> None:
+        with self._lock:
+            n = self._in_use.get(shard_id, 0) - 1
+            if n > 0:
+                self._in_use[shard_id] = n
+            else:
+                self._in_use.pop(shard_id, None)
+            self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        if self._max_open is None:
+            return
+        # Never close a handle another thread is still using; it is evicted on a later release.
+        for shard_id in list(self._open.keys()):
+            if len(self._open) <= self._max_open:
+                break
+            if self._in_use.get(shard_id):
+                continue
+            store = self._open.pop(shard_id)
+            try:
+                store.close()
+            except Exception:
+                pass
+
+    def open_shard_ids(self) -> List[str]:
+        """Return shard ids with an open handle, least recently used first."""
+        with self._lock:
+            return list(self._open.keys())
+
+    # ---------------------------------------------------------------------------------------------
+    # Manifest (shard discovery)
+
+    def _load_manifest(self) -> None:
+        if self._manifest_path is None or not self._manifest_path.exists():
+            return
+        try:
+            data = json.loads(self._manifest_path.read_text(encoding="utf-8"))
+        except Exception:
+            return
+        shards = data.get("shards") if isinstance(data, dict) else None
+        if not isinstance(shards, dict):
+            return
+        for shard_id, meta in shards.items():
+            if not isinstance(meta, dict):
+                continue
+            scope = str(meta.get("scope") or "run")
+            owner_id = meta.get("owner_id") if isinstance(meta.get("owner_id"), str) else None
+            self._known[str(shard_id)] = (scope, owner_id)
+
+    def _write_manifest_locked(self) -> None:
+        if self._manifest_path is None:
+            return
+        payload = {
+            "partition": self._partition,
+            "num_shards": self._num_shards if self._partition == "hash" else None,
+            "shards": {
+                shard_id: {"scope": scope, "owner_id": owner_id}
+                for shard_id, (scope, owner_id) in sorted(self._known.items())
+            },
+        }
+        self._manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._manifest_path.with_suffix(self._manifest_path.suffix + ".tmp")
+        tmp.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        tmp.replace(self._manifest_path)
+
+    # ---------------------------------------------------------------------------------------------
+    # TripleStore API
+
+    def close(self) -> None:
+        with self._lock:
+            for store in self._open.values():
+                try:
+                    store.close()
+                except Exception:
+                    pass
+            self._open.clear()
+            self._in_use.clear()
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def add(
+        self,
+        assertions: Iterable[TripleAssertion],
+        *,
+        vectors: Optional[Sequence[Sequence[float]]] = None,
+        ids: Optional[Sequence[str]] = None,
+    ) -> List[str]:
+        """Route assertions to their shards; precomputed `vectors` and given `ids` are split along with them."""
+        pending: List[TripleAssertion] = [a for a in assertions]
+        if not pending:
+            return []
+        if vectors is not None and len(vectors) != len(pending):
+            raise ValueError(f"got {len(vectors)} vectors for {len(pending)} assertions")
+        if ids is not None:
+            ids = given_assertion_ids(ids, len(pending))
+
+        # Group by shard while remembering input positions so ids are returned in input order.
+        groups: "OrderedDict[str, List[int]]" = OrderedDict()
+        new_shards = False
+        for i, a in enumerate(pending):
+            shard_id = self.shard_id_for(a.scope, a.owner_id)
+            groups.setdefault(shard_id, []).append(i)
+            if self._partition == "owner":
+                with self._lock:
+                    if shard_id not in self._known:
+                        self._known[shard_id] = (a.scope, a.owner_id)
+                        new_shards = True
+        if new_shards:
+            with self._lock:
+                self._write_manifest_locked()
+
+        out: List[str] = [""] * len(pending)
+        for shard_id, positions in groups.items():
+            kwargs: Dict[str, Any] = {}
+            if vectors is not None:
+                kwargs["vectors"] = [vectors[i] for i in positions]
+            if ids is not None:
+                kwargs["ids"] = [ids[i] for i in positions]
+            store = self._acquire(shard_id)
+            try:
+                shard_ids = store.add([pending[i] for i in positions], **kwargs)
+            finally:
+                self._release(shard_id)
+            for pos, assertion_id in zip(positions, shard_ids):
+                out[pos] = assertion_id
+        return out
+
+    def _query_shard(self, shard_id: str, q: TripleQuery) -> List[TripleAssertion]:
+        store = self._acquire(shard_id)
+        try:
+            return store.query(q)
+        finally:
+            self._release(shard_id)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="abstractmemory-shard")
+            return self._executor
+
+    def _embed_once(self, q: TripleQuery, shard_id: str) -> TripleQuery:
+        if not q.query_text or q.query_vector:
+            return q
+        store = self._acquire(shard_id)
+        try:
+            embedder = _query_embedder(store, q.vector_column)
+        finally:
+            self._release(shard_id)
+        if embedder is None:
+            return q  # each shard embeds with its own column embedder (or reports the error)
+        return replace(q, query_text=None, query_vector=list(embedder.embed_texts([q.query_text])[0]))
+
+    def query(self, q: TripleQuery) -> List[TripleAssertion]:
+        shard_ids = self._shards_for_query(q)
+        if not shard_ids:
+            return []
+        if len(shard_ids) == 1:
+            return self._query_shard(shard_ids[0], q)
+
+        q = self._embed_once(q, shard_ids[0])
+        executor = self._get_executor()
+        futures = [executor.submit(self._query_shard, shard_id, q) for shard_id in shard_ids]
+        per_shard: List[List[TripleAssertion]] = [f.result() for f in futures]
+
+        raw_limit = int(q.limit) if isinstance(q.limit, int) else 100
+        limit: Optional[int] = None if raw_limit <= 0 else max(1, raw_limit)
+
+        # Each shard already applied ordering + limit, so a k-way merge of the sorted runs is exact.
+        merged: Iterable[TripleAssertion]
+        if (q.query_text or q.query_vector) and q.mmr_lambda is not None:
+            # Shards diversify their own candidates; picks are merged by their MMR value (not
+            # monotonic within a run, hence a sort), so cross-shard diversity is approximate.
+            merged = sorted((a for run in per_shard for a in run), key=lambda a: _retrieval_score(a, "mmr"), reverse=True)
+        elif q.query_text or q.query_vector:
+            merged = heapq.merge(*per_shard, key=_retrieval_score, reverse=True)
+        else:
+            descending = str(q.order).lower() != "asc"
+            merged = heapq.merge(*per_shard, key=lambda a: epoch_sort_key(a.observed_at), reverse=descending)
+        if (q.query_text or q.query_vector) and q.collapse_triples:
+            merged = _first_per_triple(merged)
+        return list(merged) if limit is None else list(islice(merged, limit))
+
+    def _anchor_query_shard(self, shard_id: str, cues: Any, kwargs: Dict[str, Any]) -> List[TripleAssertion]:
+        store = self._acquire(shard_id)
+        try:
+            return store.anchor_query(cues, **kwargs)  # type: ignore[attr-defined]
+        finally:
+            self._release(shard_id)
+
+    def anchor_query(
+        self,
+        cues: Any = (),
+        *,
+        scope: Optional[str] = None,
+        owner_id: Optional[str] = None,
+        limit: int = 20,
+        **kwargs: Any,
+    ) -> List[TripleAssertion]:
+        """`anchor_query` on every matching shard (requires it on shards); merged by score, then recency, then id."""
+        kwargs.update(scope=scope, owner_id=owner_id, limit=limit)
+        shard_ids = self._shards_for_query(TripleQuery(scope=scope, owner_id=owner_id))
+        if len(shard_ids) <= 1:
+            return self._anchor_query_shard(shard_ids[0], cues, kwargs) if shard_ids else []
+        executor = self._get_executor()
+        futures = [executor.submit(self._anchor_query_shard, shard_id, cues, kwargs) for shard_id in shard_ids]
+        merged = [a for f in futures for a in f.result()]
+        merged.sort(key=lambda a: (-_retrieval_score(a), -epoch_sort_key(a.observed_at), a.assertion_id or ""))
+        return merged if int(limit) <= 0 else merged[: int(limit)]
+
+    def scan(self, q: TripleQuery) -> Iterator[Tuple[str, TripleAssertion]]:
+        """Yield `(assertion_id, assertion)` across matching shards (requires `scan` on shards)."""
+        runs = []
+        for shard_id in self._shards_for_query(q):
+            store = self._acquire(shard_id)
+            try:
+                runs.append(list(store.scan(q)))  # type: ignore[attr-defined]
+            finally:
+                self._release(shard_id)
+        descending = str(q.order).lower() != "asc"
+        merged = heapq.merge(*runs, key=lambda t: (epoch_sort_key(t[1].observed_at), t[0]), reverse=descending)
+        limit = int(q.limit) if isinstance(q.limit, int) else 100
+        yield from (merged if limit <= 0 else islice(merged, limit))
+
+    def _get_many_shard(self, shard_id: str, ids: List[str]) -> Dict[str, TripleAssertion]:
+        store = self._acquire(shard_id)
+        try:
+            return store.get_many(ids)
+        finally:
+            self._release(shard_id)
+
+    def get_many(self, assertion_ids: Iterable[str]) -> Dict[str, TripleAssertion]:
+        """Fetch assertions by id from every known shard in parallel (ids do not encode their shard)."""
+        ids = list(dict.fromkeys(str(i) for i in assertion_ids))
+        shard_ids = self.shard_ids()
+        if not ids or not shard_ids:
+            return {}
+        if len(shard_ids) == 1:
+            return self._get_many_shard(shard_ids[0], ids)
+        executor = self._get_executor()
+        futures = [executor.submit(self._get_many_shard, shard_id, ids) for shard_id in shard_ids]
+        out: Dict[str, TripleAssertion] = {}
+        for f in futures:
+            out.update(f.result())
+        return out
+
+    def _get_vectors_shard(self, shard_id: str, ids: List[str]) -> Dict[str, List[float]]:
+        store = self._acquire(shard_id)
+        try:
+            get_vectors = getattr(store, "get_vectors", None)
+            return get_vectors(ids) if get_vectors is not None else {}
+        finally:
+            self._release(shard_id)
+
+    def get_vectors(self, assertion_ids: Iterable[str]) -> Dict[str, List[float]]:
+        """Stored vectors by id from every known shard in parallel (shards without vectors contribute none)."""
+        ids = list(dict.fromkeys(str(i) for i in assertion_ids))
+        shard_ids = self.shard_ids()
+        if not ids or not shard_ids:
+            return {}
+        if len(shard_ids) == 1:
+            return self._get_vectors_shard(shard_ids[0], ids)
+        executor = self._get_executor()
+        futures = [executor.submit(self._get_vectors_shard, shard_id, ids) for shard_id in shard_ids]
+        out: Dict[str, List[float]] = {}
+        for f in futures:
+            out.update(f.result())
+        return out
+
+    def _aggregate_shard(self, shard_id: str, q: TripleQuery, groups: Tuple[str, ...]) -> List[Dict[str, Any]]:
+        store = self._acquire(shard_id)
+        try:
+            return store.aggregate(q, group_by=groups, metrics=AGGREGATE_METRICS)
+        finally:
+            self._release(shard_id)
+
+    def aggregate(
+        self,
+        q: TripleQuery,
+        *,
+        group_by: Sequence[str] = (),
+        metrics: Sequence[str] = ("count",),
+    ) -> List[Dict[str, Any]]:
+        """Aggregate on the matching shards in parallel and merge the partial groups."""
+        groups, wanted = normalize_aggregate(q, group_by, metrics)
+        shard_ids = self._shards_for_query(q)
+        if len(shard_ids) == 1:
+            store = self._acquire(shard_ids[0])
+            try:
+                return store.aggregate(q, group_by=groups, metrics=wanted)
+            finally:
+                self._release(shard_ids[0])
+        # A group can span shards, so every shard returns all of its groups before the final cut.
+        unbounded = replace(q, limit=0)
+        executor = self._get_executor()
+        futures = [executor.submit(self._aggregate_shard, shard_id, unbounded, groups) for shard_id in shard_ids]
+        acc = GroupAccumulator(groups)
+        for f in futures:
+            acc.merge_rows(f.result())
+        return acc.rows(wanted, limit=group_limit(q))
+
+    def purge(self, assertion_ids: Iterable[str]) -> int:
+        """Remove rows by id from every known shard (requires `purge` on shards)."""
+        ids = [str(i) for i in assertion_ids]
+        if not ids:
+            return 0
+        removed = 0
+        for shard_id in self.shard_ids():
+            store = self._acquire(shard_id)
+            try:
+                removed += int(store.purge(ids))  # type: ignore[attr-defined]
+            finally:
+                self._release(shard_id)
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Return routing stats (known shards and open handles)."""
+        with self._lock:
+            return {
+                "partition": self._partition,
+                "known_shards": len(self.shard_ids()) if self._partition == "hash" else len(self._known),
+                "open_shards": len(self._open),
+                "max_open_shards": self._max_open,
+            }
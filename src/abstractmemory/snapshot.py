@@ -0,0 +1,455 @@
+from __future__ import annotations
+
+import gc
+import json
+import mmap
+import os
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .models import TripleAssertion
+from .quantization import QuantizedVector
+
+# Layout (all integers little-endian on the writing host; the loader checks `byteorder`):
+#   MAGIC | u64 header offset | u64 header length | 8-byte aligned sections ... | JSON header
+# Sections are flat `array` dumps (`typecode` in the header); `memoryview.cast` maps them
+# without copying. String columns are dictionary-encoded: int32 codes (-1 = None) into a
+# per-column table stored as one UTF-8 text plus int64 character offsets.
+MAGIC = b"AMSNAP01"
+FORMAT_VERSION = 1
+_PREFIX = len(MAGIC) + 16
+_NULL_US = -(1 << 63)  # int64 sentinel for "no epoch value" (never produced by `iso_to_epoch_us`)
+
+# Columns copied into store rows (filters read them); the others stay in the map until a row's assertion
+# is materialized.
+ROW_STRING_COLUMNS = ("assertion_id", "subject", "predicate", "object", "scope", "owner_id")
+EPOCH_COLUMNS = ("observed_at_us", "valid_from_us", "valid_until_us")
+_ROW_FIELDS = ROW_STRING_COLUMNS + EPOCH_COLUMNS
+
+
+class _Writer:
+    def __init__(self, fh: Any) -> None:
+        self._fh = fh
+        self._pos = _PREFIX
+        self.sections: Dict[str, Dict[str, Any]] = {}
+
+    def write(self, name: str, data: array) -> None:
+        pad = (-self._pos) % 8
+        if pad:
+            self._fh.write(b"\0" * pad)
+            self._pos += pad
+        raw = data.tobytes()
+        self._fh.write(raw)
+        self.sections[name] = {"offset": self._pos, "nbytes": len(raw), "typecode": data.typecode}
+        self._pos += len(raw)
+
+    def write_strings(self, name: str, values: Iterable[Optional[str]]) -> None:
+        table: Dict[str, int] = {}
+        codes = array("i")
+        for v in values:
+            if v is None:
+                codes.append(-1)
+                continue
+            code = table.get(v)
+            if code is None:
+                code = table[v] = len(table)
+            codes.append(code)
+        offsets = array("q", [0])
+        total = 0
+        for v in table:  # dicts keep insertion order, i.e. code order
+            total += len(v)
+            offsets.append(total)
+        self.write(f"{name}.codes", codes)
+        self.write(f"{name}.offsets", offsets)
+        self.write(f"{name}.text", array("B", "".join(table).encode("utf-8")))
+
+    @property
+    def position(self) -> int:
+        return self._pos
+
+
+def _json_or_none(value: Any) -> str:
+    if not value:
+        return "{}"
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+
+
+def write_snapshot(
+    path: Path,
+    rows: Sequence[Dict[str, Any]],
+    *,
+    vector_column: str,
+    vector_precision: str,
+    settings: Dict[str, Any],
+    last_seq: int = 0,
+) -> int:
+    """Write `rows` (in-memory store rows, in `seq` order) to `path` atomically; returns the file size in bytes."""
+    path = Path(path).expanduser()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    assertions: List[TripleAssertion] = [row_assertion(r) for r in rows]
+    n = len(rows)
+
+    vectors = [row_vector(r, vector_column) for r in rows]
+    dims = {len(v) if isinstance(v, list) else v.dim for v in vectors if v is not None}
+    if len(dims) > 1:
+        raise ValueError(f"cannot snapshot vectors of mixed dimensions: {sorted(dims)}")
+    dim = dims.pop() if dims else 0
+
+    with open(tmp, "wb") as fh:
+        fh.write(b"\0" * _PREFIX)
+        w = _Writer(fh)
+        for name in ROW_STRING_COLUMNS:
+            w.write_strings(name, (r[name] for r in rows))
+        w.write_strings("observed_at", (a.observed_at for a in assertions))
+        w.write_strings("valid_from", (a.valid_from for a in assertions))
+        w.write_strings("valid_until", (a.valid_until for a in assertions))
+        w.write_strings("provenance", (_json_or_none(a.provenance) for a in assertions))
+        w.write_strings("attributes", (_json_or_none(a.attributes) for a in assertions))
+        for name in EPOCH_COLUMNS:
+            w.write(name, array("q", (_NULL_US if r[name] is None else r[name] for r in rows)))
+        w.write("confidence", array("d", (float("nan") if a.confidence is None else float(a.confidence) for a in assertions)))
+        w.write("seq", array("q", (r["seq"] for r in rows)))
+
+        if dim:
+            _write_vectors(w, vectors, vector_precision, dim)
+
+        header = {
+            "format": "abstractmemory.inmemory",
+            "version": FORMAT_VERSION,
+            "byteorder": sys.byteorder,
+            "count": n,
+            "vector_column": vector_column,
+            "vector_precision": vector_precision,
+            "dim": dim,
+            "settings": settings,
+            "last_seq": max(int(last_seq), rows[-1]["seq"] if rows else 0),
+            "sections": w.sections,
+        }
+        raw = json.dumps(header, separators=(",", ":")).encode("utf-8")
+        header_offset = w.position
+        fh.write(raw)
+        fh.seek(0)
+        fh.write(MAGIC + header_offset.to_bytes(8, "little") + len(raw).to_bytes(8, "little"))
+        fh.flush()
+        os.fsync(fh.fileno())
+    tmp.replace(path)
+    return header_offset + len(raw)
+
+
+def _write_vectors(w: _Writer, vectors: Sequence[Any], precision: str, dim: int) -> None:
+    present = array("B", (0 if v is None else 1 for v in vectors))
+    w.write("vector.present", present)
+    zeros = [0.0] * dim
+    if precision == "float64":
+        flat = array("d")
+        for v in vectors:
+            flat.extend(zeros if v is None else v)
+        w.write("vector.values", flat)
+        return
+    norms = array("d", (0.0 if v is None else v.norm for v in vectors))
+    w.write("vector.norm", norms)
+    if precision == "float32":
+        flat = array("f")
+        for v in vectors:
+            flat.extend(zeros if v is None else v.payload)
+        w.write("vector.values", flat)
+    elif precision == "float16":
+        blank = bytes(2 * dim)
+        w.write("vector.values", array("B", b"".join(blank if v is None else bytes(v.payload) for v in vectors)))
+    else:
+        codes = array("b")
+        for v in vectors:
+            codes.extend(array("b", bytes(dim)) if v is None else v.payload)
+        w.write("vector.values", codes)
+        w.write("vector.scale", array("d", (0.0 if v is None else v.scale for v in vectors)))
+        if precision == "binary":
+            nbytes = (dim + 7) // 8
+            blank = bytes(nbytes)
+            w.write(
+                "vector.bits",
+                array("B", b"".join(blank if v is None else v.bits.to_bytes(nbytes, "big") for v in vectors)),
+            )
+
+
+def row_assertion(row: Dict[str, Any]) -> TripleAssertion:
+    """The row's assertion, decoded from its snapshot on first access."""
+    a = row.get("assertion")
+    if a is None:
+        a = row["assertion"] = row["snapshot"].assertion(row["snapshot_pos"], row)
+    return a
+
+
+def row_vector(row: Dict[str, Any], column: str) -> Any:
+    """The row's stored vector in `column` (`None` if absent), decoded from its snapshot on first access."""
+    if column in row:
+        return row[column]
+    snap = row.get("snapshot")
+    if snap is None or column != snap.vector_column:
+        return None
+    v = row[column] = snap.vector(row["snapshot_pos"])
+    return v
+
+
+class Snapshot:
+    """Read side of a snapshot file: memory-mapped columns, decoded and indexed on demand.
+
+    Notes:
+    - Opening only maps the file and parses the header; nothing is decoded until used.
+    - `positions(column, value)` answers equality filters from the dictionary codes alone, so a
+      selective query only builds row objects for the rows it matches.
+    - Rows are plain dicts carrying the filter columns plus `snapshot` / `snapshot_pos`; read their
+      assertion and vector through `row_assertion` / `row_vector`, which decode on first access.
+    - `rows()` materializes every row (once).
+    - `close()` unmaps the file; rows not decoded by then can no longer be read.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path).expanduser()
+        with open(self.path, "rb") as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        prefix = self._mm[:_PREFIX]
+        if prefix[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"not an AbstractMemory snapshot: {self.path}")
+        offset = int.from_bytes(prefix[8:16], "little")
+        length = int.from_bytes(prefix[16:24], "little")
+        header = json.loads(self._mm[offset : offset + length].decode("utf-8"))
+        if int(header.get("version") or 0) != FORMAT_VERSION:
+            raise ValueError(f"unsupported snapshot version: {header.get('version')}")
+        if header.get("byteorder") != sys.byteorder:
+            raise ValueError("snapshot was written on a host with a different byte order")
+        self.header = header
+        self.count = int(header["count"])
+        self.dim = int(header.get("dim") or 0)
+        self.vector_column = str(header["vector_column"])
+        self.precision = str(header["vector_precision"])
+        self.last_seq = int(header.get("last_seq") or self.count)
+        self._view = memoryview(self._mm)
+        self._sections: Dict[str, memoryview] = {}
+        self._texts: Dict[str, Tuple[memoryview, memoryview, str]] = {}
+        self._codes: Dict[str, List[int]] = {}
+        self._lookups: Dict[str, Dict[str, List[int]]] = {}
+        self._columns: Dict[str, List[Any]] = {}
+        self._ids: Optional[Dict[str, int]] = None
+        self._cache: Dict[int, Dict[str, Any]] = {}
+        self._all: Optional[List[Dict[str, Any]]] = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self) -> None:
+        """Release every view into the map, then unmap the file (idempotent)."""
+        if self._mm.closed:
+            return
+        column = self.vector_column
+        for r in self._all if self._all is not None else self._cache.values():
+            v = r.get(column)
+            if isinstance(v, QuantizedVector) and isinstance(v.payload, memoryview):
+                del r[column]  # decoded from the map: it dies with it
+                v.payload.release()
+        for view in self._sections.values():
+            view.release()
+        self._sections.clear()
+        self._texts.clear()
+        self._view.release()
+        self._mm.close()
+
+    def section(self, name: str) -> memoryview:
+        view = self._sections.get(name)
+        if view is None:
+            if self._mm.closed:
+                raise ValueError(f"snapshot is closed: {self.path}")
+            meta = self.header["sections"][name]
+            start = int(meta["offset"])
+            view = self._sections[name] = self._view[start : start + int(meta["nbytes"])].cast(meta["typecode"])
+        return view
+
+    def _text(self, name: str) -> Tuple[memoryview, memoryview, str]:
+        """`(codes, offsets, text)` of a dictionary-encoded column, straight from the map."""
+        cached = self._texts.get(name)
+        if cached is None:
+            text = bytes(self.section(f"{name}.text")).decode("utf-8")
+            cached = self._texts[name] = (self.section(f"{name}.codes"), self.section(f"{name}.offsets"), text)
+        return cached
+
+    def _values(self, name: str) -> List[str]:
+        """Distinct values of a string column, in code order."""
+        _, offsets, text = self._text(name)
+        bounds = offsets.tolist()
+        return [text[a:b] for a, b in zip(bounds, bounds[1:])]
+
+    def column(self, name: str) -> List[Any]:
+        """A whole decoded column (string columns share one object per distinct value)."""
+        cached = self._columns.get(name)
+        if cached is None:
+            if name in EPOCH_COLUMNS:
+                cached = [None if v == _NULL_US else v for v in self.section(name).tolist()]
+            else:
+                lookup: List[Optional[str]] = list(self._values(name))
+                lookup.append(None)  # code -1
+                cached = [lookup[c] for c in self.section(f"{name}.codes").tolist()]
+            self._columns[name] = cached
+        return cached
+
+    def seqs(self) -> List[int]:
+        """Insert sequence numbers, ascending (snapshots written before they existed count from 1)."""
+        cached = self._columns.get("seq")
+        if cached is None:
+            if "seq" in self.header["sections"]:
+                cached = self.section("seq").tolist()
+            else:
+                cached = list(range(1, self.count + 1))
+            self._columns["seq"] = cached
+        return cached
+
+    def seq_at(self, i: int) -> int:
+        return self.section("seq")[i] if "seq" in self.header["sections"] else i + 1
+
+    def string_at(self, name: str, i: int) -> Optional[str]:
+        codes, offsets, text = self._text(name)
+        c = codes[i]
+        return None if c < 0 else text[offsets[c] : offsets[c + 1]]
+
+    def value_at(self, name: str, i: int) -> Any:
+        if name in EPOCH_COLUMNS:
+            v = self.section(name)[i]
+            return None if v == _NULL_US else v
+        return self.string_at(name, i)
+
+    def positions(self, column: str, value: str, *, normalize: Optional[Callable[[str], str]] = None) -> List[int]:
+        """Ascending row positions whose `column` equals `value` (or whose `normalize(v)` does).
+
+        The value-to-code map is built once per column; rows are then located with `list.index`
+        over the code column, which runs at C speed and touches no row objects.
+        """
+        lookup = self._lookups.get(column)
+        if lookup is None:
+            lookup = {}
+            for c, v in enumerate(self._values(column)):
+                lookup.setdefault(v, []).append(c)
+                if normalize is not None:
+                    alias = normalize(v)
+                    if alias != v:
+                        lookup.setdefault(alias, []).append(c)
+            self._lookups[column] = lookup
+        found = lookup.get(value)
+        if not found:
+            return []
+        codes = self._codes.get(column)
+        if codes is None:
+            codes = self._codes[column] = self.section(f"{column}.codes").tolist()
+        out: List[int] = []
+        for c in found:
+            i = -1
+            try:
+                while True:
+                    i = codes.index(c, i + 1)
+                    out.append(i)
+            except ValueError:
+                pass
+        if len(found) > 1:
+            out.sort()
+        return out
+
+    def position_of(self, assertion_id: str) -> Optional[int]:
+        if self._ids is None:
+            self._ids = {v: i for i, v in enumerate(self._values("assertion_id"))}  # unique: code == position
+        return self._ids.get(assertion_id)
+
+    def row(self, i: int) -> Dict[str, Any]:
+        if self._all is not None:
+            return self._all[i]
+        r = self._cache.get(i)
+        if r is None:
+            r = self._cache[i] = {name: self.value_at(name, i) for name in _ROW_FIELDS}
+            r["seq"] = self.seq_at(i)
+            r["snapshot"] = self
+            r["snapshot_pos"] = i
+        return r
+
+    def rows_at(self, positions: Iterable[int]) -> List[Dict[str, Any]]:
+        return [self.row(i) for i in positions]
+
+    def rows(self) -> List[Dict[str, Any]]:
+        if self._all is None:
+            cols = [self.column(name) for name in _ROW_FIELDS] + [self.seqs()]
+            # A dict display is several times cheaper than building rows field by field, and the
+            # cyclic GC is paused: a million fresh dicts would otherwise trigger repeated full passes.
+            gc_was_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                out = [
+                    {
+                        "assertion_id": aid,
+                        "subject": s,
+                        "predicate": p,
+                        "object": o,
+                        "scope": sc,
+                        "owner_id": ow,
+                        "observed_at_us": obs,
+                        "valid_from_us": vf,
+                        "valid_until_us": vu,
+                        "seq": seq,
+                        "snapshot": self,
+                        "snapshot_pos": i,
+                    }
+                    for i, (aid, s, p, o, sc, ow, obs, vf, vu, seq) in enumerate(zip(*cols))
+                ]
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
+            for i, r in self._cache.items():
+                out[i] = r  # keep rows (and anything decoded on them) handed out earlier
+            self._all = out
+            self._cache = {}
+            self._columns = {}  # the rows hold the values now
+        return self._all
+
+    def assertion(self, i: int, row: Dict[str, Any]) -> TripleAssertion:
+        confidence = self.section("confidence")[i]
+        return TripleAssertion._from_canonical(
+            subject=row["subject"],
+            predicate=row["predicate"],
+            object=row["object"],
+            scope=row["scope"],
+            owner_id=row["owner_id"],
+            observed_at=self.string_at("observed_at", i) or "",
+            valid_from=self.string_at("valid_from", i),
+            valid_until=self.string_at("valid_until", i),
+            confidence=None if confidence != confidence else confidence,
+            provenance=_loads(self.string_at("provenance", i)),
+            attributes=_loads(self.string_at("attributes", i)),
+            assertion_id=row["assertion_id"],
+        )
+
+    def vector(self, i: int) -> Any:
+        if not self.dim or not self.section("vector.present")[i]:
+            return None
+        d = self.dim
+        if self.precision == "float64":
+            return self.section("vector.values")[i * d : (i + 1) * d].tolist()
+        norm = self.section("vector.norm")[i]
+        if self.precision == "float32":
+            return QuantizedVector(precision="float32", dim=d, payload=self.section("vector.values")[i * d : (i + 1) * d], norm=norm)
+        if self.precision == "float16":
+            payload = self.section("vector.values")[i * 2 * d : (i + 1) * 2 * d]
+            return QuantizedVector(precision="float16", dim=d, payload=payload, norm=norm)
+        codes = self.section("vector.values")[i * d : (i + 1) * d]
+        scale = self.section("vector.scale")[i]
+        bits = 0
+        if self.precision == "binary":
+            nb = (d + 7) // 8
+            bits = int.from_bytes(self.section("vector.bits")[i * nb : (i + 1) * nb], "big")
+        return QuantizedVector(precision=self.precision, dim=d, payload=codes, scale=scale, norm=norm, bits=bits)
+
+
+def _loads(raw: Optional[str]) -> Dict[str, Any]:
+    if not raw or raw == "{}":
+        return {}
+    try:
+        parsed = json.loads(raw)
+    except Exception:
+        return {}
+    return parsed if isinstance(parsed, dict) else {}
@@ -1,13 +1,31 @@
 from __future__ import annotations
 
 import json
+import queue
+import random
 import sqlite3
-import uuid
+import threading
+import time
+from functools import partial
 from pathlib import Path
-from typing import Any, Iterable, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, TypeVar, Union
 
-from .models import TripleAssertion
+from .aggregate import GroupAccumulator, group_limit, normalize_aggregate
+from .anchors import (
+    MAX_ANCHOR_POSTINGS,
+    anchor_cues,
+    anchor_limit,
+    extract_anchors,
+    rank_anchor_hits,
+    selective_anchors,
+    with_anchor_retrieval,
+)
+from .changes import Change, ChangeCallback, ChangeSubscribers, change_limit
+from .instrumentation import MetricsSink, start_span
+from .interval_index import OPEN_END, OPEN_START
+from .models import TripleAssertion, given_assertion_ids, iso_to_epoch_us, new_assertion_id, normalize_id_mode
 from .store import TripleQuery
+from .trace import TraceSink, structured_filters
 
 
 def _canonical_text(a: TripleAssertion) -> str:
@@ -36,29 +54,393 @@ def _canonical_text(a: TripleAssertion) -> str:
     return "\n".join(parts)
 
 
+def _build_where(q: TripleQuery, *, validity_table: Optional[str] = None) -> Tuple[str, List[Any]]:
+    parts: List[str] = []
+    params: List[Any] = []
+
+    if q.subject:
+        parts.append("subject = ?")
+        params.append(q.subject)
+    if q.predicate:
+        parts.append("predicate = ?")
+        params.append(q.predicate)
+    if q.object:
+        parts.append("object = ?")
+        params.append(q.object)
+    if q.scope:
+        parts.append("scope = ?")
+        params.append(q.scope)
+    if q.owner_id:
+        # `q.owner_id` is never empty here, so a plain equality (index-friendly) is equivalent.
+        parts.append("owner_id = ?")
+        params.append(q.owner_id)
+    # Time bounds compare the epoch-microsecond columns; a bound that does not parse as ISO-8601
+    # falls back to the legacy string comparison.
+    if q.since:
+        parts.append("observed_at_us >= ?" if q.since_us is not None else "observed_at >= ?")
+        params.append(q.since_us if q.since_us is not None else q.since)
+    if q.until:
+        parts.append("observed_at_us <= ?" if q.until_us is not None else "observed_at <= ?")
+        params.append(q.until_us if q.until_us is not None else q.until)
+    if q.active_at:
+        # valid_until is exclusive: valid_until > active_at
+        at: Any = q.active_at_us if q.active_at_us is not None else q.active_at
+        suffix = "_us" if q.active_at_us is not None else ""
+        parts.append(f"(valid_from{suffix} IS NULL OR valid_from{suffix} <= ?)")
+        params.append(at)
+        parts.append(f"(valid_until{suffix} IS NULL OR valid_until{suffix} > ?)")
+        params.append(at)
+        if validity_table and q.active_at_us is not None:
+            # Bitemporal R*Tree pre-filter (observed point x validity interval). Its float32 boxes
+            # are rounded outwards, so it returns a superset; the exact predicates above decide.
+            box = ["valid_min <= ?", "valid_max > ?"]
+            box_params: List[Any] = [q.active_at_us, q.active_at_us]
+            if q.since and q.since_us is not None:
+                box.append("observed_max >= ?")
+                box_params.append(q.since_us)
+            if q.until and q.until_us is not None:
+                box.append("observed_min <= ?")
+                box_params.append(q.until_us)
+            parts.append(f"seq IN (SELECT id FROM {validity_table} WHERE {' AND '.join(box)})")
+            params.extend(box_params)
+
+    return " AND ".join(parts), params
+
+
+# Explicit column list: `_row_to_assertion` reads by position (cheaper than by name).
+_COLUMNS = (
+    "assertion_id",
+    "subject",
+    "predicate",
+    "object",
+    "scope",
+    "owner_id",
+    "observed_at",
+    "valid_from",
+    "valid_until",
+    "confidence",
+    "provenance_json",
+    "attributes_json",
+)
+
+_decode_json = json.JSONDecoder().decode
+
+
+def _loads_dict(raw: Optional[str]) -> dict:
+    # Most rows carry "{}" provenance/attributes; skip the decoder for those.
+    if not raw or raw == "{}":
+        return {}
+    try:
+        parsed = _decode_json(raw)
+    except Exception:
+        return {}
+    return dict(parsed) if isinstance(parsed, dict) else {}
+
+
+T = TypeVar("T")
+
+
+def _is_busy(e: sqlite3.OperationalError) -> bool:
+    msg = str(e).lower()
+    return "locked" in msg or "busy" in msg
+
+
+class _PendingWrite:
+    __slots__ = ("verb", "rows", "done", "written", "last_seq", "group_size", "error")
+
+    def __init__(self, verb: str, rows: List[tuple]) -> None:
+        self.verb = verb
+        self.rows = rows
+        self.done = threading.Event()
+        self.written = 0
+        self.last_seq = 0
+        self.group_size = 0
+        self.error: Optional[BaseException] = None
+
+
+class _GroupCommitter:
+    """Background thread that coalesces concurrent `add()` calls into one transaction.
+
+    The first queued write opens a window of `window_s`; every write queued before it closes (up to
+    `max_rows` rows) is committed with it. If the group fails, its writes are retried one by one so
+    only the offending call sees the error. After `close()`, `submit()` raises and writes still
+    queued when the thread stops fail with `sqlite3.ProgrammingError`.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        write: Callable[[List[Tuple[str, List[tuple]]]], List[Tuple[int, int]]],
+        *,
+        window_s: float,
+        max_rows: int,
+    ) -> None:
+        self._write = write
+        self._window_s = window_s
+        self._max_rows = max_rows
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._closed = False
+        self._state = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="abstractmemory-sqlite-commit", daemon=True)
+        self._thread.start()
+
+    def submit(self, verb: str, rows: List[tuple]) -> _PendingWrite:
+        item = _PendingWrite(verb, rows)
+        with self._state:
+            # Checked under the lock `close()` takes, so nothing is queued behind `_STOP`.
+            if self._closed:
+                raise sqlite3.ProgrammingError("store closed")
+            self._queue.put(item)
+        item.done.wait()
+        if item.error is not None:
+            raise item.error
+        return item
+
+    def close(self) -> None:
+        with self._state:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(self._STOP)
+        self._thread.join(timeout=5.0)
+
+    def _run(self) -> None:
+        try:
+            self._loop()
+        finally:
+            self._fail_pending()
+
+    def _fail_pending(self) -> None:
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not self._STOP:
+                item.error = sqlite3.ProgrammingError("store closed")
+                item.done.set()
+
+    def _loop(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is self._STOP:
+                return
+            group: List[_PendingWrite] = [first]
+            rows = len(first.rows)
+            deadline = time.monotonic() + self._window_s
+            while rows < self._max_rows:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stopping = True
+                    break
+                group.append(item)
+                rows += len(item.rows)
+            self._commit(group)
+
+    def _commit(self, group: List[_PendingWrite]) -> None:
+        try:
+            results = self._write([(w.verb, w.rows) for w in group])
+            for w, (n, last_seq) in zip(group, results):
+                w.written, w.last_seq, w.group_size = n, last_seq, len(group)
+        except BaseException as e:
+            if len(group) == 1:
+                group[0].error = e
+            else:
+                for w in group:
+                    try:
+                        (w.written, w.last_seq), w.group_size = self._write([(w.verb, w.rows)])[0], 1
+                    except BaseException as e2:
+                        w.error = e2
+        finally:
+            for w in group:
+                w.done.set()
+
+
+def _row_to_assertion(r: sqlite3.Row) -> TripleAssertion:
+    # Rows were written from canonical `TripleAssertion`s: skip re-canonicalization.
+    confidence = r[9]
+    return TripleAssertion._from_canonical(
+        subject=r[1] or "",
+        predicate=r[2] or "",
+        object=r[3] or "",
+        scope=r[4] or "run",
+        owner_id=r[5] or None,
+        observed_at=r[6] or "",
+        valid_from=r[7] or None,
+        valid_until=r[8] or None,
+        confidence=float(confidence) if confidence is not None else None,
+        provenance=_loads_dict(r[10]),
+        attributes=_loads_dict(r[11]),
+        assertion_id=r[0],
+    )
+
+
 class SQLiteTripleStore:
     """SQLite-backed append-only triple store (structured queries only).
 
     Notes:
     - Uses stdlib `sqlite3` (portable; no daemon).
-    - Append-only: there is no update/delete API (see AbstractMemory FAQ).
+    - Append-only: there is no update API; `purge(...)` exists for retention only (see `retention.py`).
     - Semantic/vector queries are intentionally unsupported in v0 for this backend.
+    - The connection is shared across threads behind a lock (routers fan out queries in parallel).
+    - `observed_at`/`valid_from`/`valid_until` are kept verbatim and mirrored into UTC epoch
+      microsecond columns (`*_us`) that drive time filters, ordering and indexes. Older files are
+      migrated on open.
+    - `id_mode="content"` derives ids from the canonical fields (plus `id_provenance_keys`) and
+      inserts with `INSERT OR IGNORE`, so replaying an extraction does not duplicate rows.
+    - `instrumentation` (a `MetricsSink`) receives `sqlite.add` / `sqlite.query` timings split into
+      `encode`/`sql`/`decode` phases; disabled (no overhead beyond a None check) by default.
+    - Writes run in `BEGIN IMMEDIATE` transactions. Lock contention from other processes is waited
+      out by SQLite's busy handler and then retried with jittered backoff for up to
+      `busy_timeout_s` seconds in total before `database is locked` is raised.
+    - `group_commit_ms > 0` coalesces concurrent `add()` calls (threads of this process) arriving
+      within that window into one transaction (one fsync), up to `group_commit_max_rows` rows.
+    - `journal_mode="wal"` is recommended when several processes share the file (readers no longer
+      block the writer); `synchronous` sets the matching PRAGMA (e.g. `"normal"` under WAL).
+    - `trace_sink` (a `TraceSink`) receives one `RecallTrace` per `query()` (filters pushed into SQL,
+      whether the R*Tree answered `active_at`, rows fetched, timings, result ids); off by default.
+    - Every row gets a monotonic `seq` at insert; `changes(since_seq)` pages through rows in `seq`
+      order (any process sees every commit) and `subscribe(callback)` is notified after each
+      `add()` made through this instance. Sequence numbers are never reused, even after `purge()`.
+    - Anchors (see `anchors.py`) are extracted at `add()` into an `anchors` JSON column and mirrored
+      by triggers into a `(anchor, seq)` inverted index table that `anchor_query(...)` reads.
+      Without SQLite's JSON functions `anchor_query` scans the `anchors` column instead.
     """
 
-    def __init__(self, path: Path, *, table_name: str = "triples") -> None:
+    def __init__(
+        self,
+        path: Path,
+        *,
+        table_name: str = "triples",
+        id_mode: str = "uuid",
+        id_provenance_keys: Sequence[str] = (),
+        busy_timeout_s: float = 5.0,
+        journal_mode: Optional[str] = None,
+        synchronous: Optional[str] = None,
+        group_commit_ms: float = 0.0,
+        group_commit_max_rows: int = 10_000,
+        instrumentation: Optional[MetricsSink] = None,
+        trace_sink: Optional[TraceSink] = None,
+    ) -> None:
+        self._id_mode = normalize_id_mode(id_mode)
+        self._id_provenance_keys = tuple(str(k) for k in id_provenance_keys)
         self._path = Path(path).expanduser()
         self._path.parent.mkdir(parents=True, exist_ok=True)
         self._table = str(table_name or "triples").strip() or "triples"
+        self._instrumentation = instrumentation
+        self._trace_sink = trace_sink
+        self._busy_timeout_s = max(0.0, float(busy_timeout_s))
+        self._meta_table = f"{self._table}_meta"
+        self._subscribers = ChangeSubscribers()
 
-        self._conn = sqlite3.connect(str(self._path))
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self._path), timeout=self._busy_timeout_s, check_same_thread=False)
         self._conn.row_factory = sqlite3.Row
-        self._ensure_schema()
+        if journal_mode:
+            mode = str(journal_mode).strip().lower()
+            if mode not in ("delete", "truncate", "persist", "memory", "wal", "off"):
+                raise ValueError(f"unsupported journal_mode: {journal_mode!r}")
+            self._retry_busy(lambda: self._conn.execute(f"PRAGMA journal_mode={mode}").fetchone())
+        if synchronous:
+            level = str(synchronous).strip().lower()
+            if level not in ("off", "normal", "full", "extra"):
+                raise ValueError(f"unsupported synchronous level: {synchronous!r}")
+            self._conn.execute(f"PRAGMA synchronous={level}")
+        self._retry_busy(self._ensure_schema)
+        self._committer: Optional[_GroupCommitter] = None
+        if float(group_commit_ms) > 0:
+            self._committer = _GroupCommitter(
+                self._write_batches,
+                window_s=float(group_commit_ms) / 1000.0,
+                max_rows=max(1, int(group_commit_max_rows)),
+            )
 
     def close(self) -> None:
-        try:
-            self._conn.close()
-        except Exception:
-            pass
+        if self._committer is not None:
+            self._committer.close()
+            self._committer = None
+        with self._lock:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+
+    def _retry_busy(self, fn: Callable[[], T]) -> T:
+        """Run `fn`, retrying with jittered exponential backoff while the database is locked."""
+        deadline = time.monotonic() + self._busy_timeout_s
+        delay = 0.005
+        while True:
+            try:
+                return fn()
+            except sqlite3.OperationalError as e:
+                if not _is_busy(e) or time.monotonic() >= deadline:
+                    raise
+            time.sleep(max(0.0, min(delay, deadline - time.monotonic())) * random.uniform(0.5, 1.0))
+            delay = min(delay * 2, 0.25)
+
+    def _transaction(self, fn: Callable[[sqlite3.Cursor], T]) -> T:
+        """Run `fn(cursor)` in one `BEGIN IMMEDIATE` transaction (retried while locked)."""
+
+        def _once() -> T:
+            with self._lock:
+                cur = self._conn.cursor()
+                try:
+                    cur.execute("BEGIN IMMEDIATE")
+                    out = fn(cur)
+                    self._conn.commit()
+                    return out
+                except BaseException:
+                    if self._conn.in_transaction:
+                        self._conn.rollback()
+                    raise
+
+        return self._retry_busy(_once)
+
+    def _write_batches(self, batches: List[Tuple[str, List[tuple]]]) -> List[Tuple[int, int]]:
+        """Insert each batch in one transaction; returns `(rows_written, last_seq)` per batch.
+
+        Rows written by one batch hold the consecutive sequence numbers ending at `last_seq`.
+        """
+
+        def _insert(cur: sqlite3.Cursor) -> List[Tuple[int, int]]:
+            out: List[Tuple[int, int]] = []
+            for verb, rows in batches:
+                cur.executemany(self._insert_sql(verb), rows)
+                written = cur.rowcount if cur.rowcount >= 0 else len(rows)
+                last_seq = int(cur.execute(f"SELECT COALESCE(MAX(seq), 0) FROM {self._table}").fetchone()[0])
+                out.append((written, last_seq))
+            return out
+
+        return self._transaction(_insert)
+
+    def _next_seq_sql(self) -> str:
+        # `MAX(seq) + 1`, but never below the high-water mark `purge()` records before deleting rows.
+        return (
+            f"(SELECT MAX(COALESCE(MAX(seq), 0), "
+            f"(SELECT COALESCE(MAX(value), 0) FROM {self._meta_table} WHERE key = 'last_seq')) + 1 FROM {self._table})"
+        )
+
+    def _insert_sql(self, verb: str) -> str:
+        return f"""
+            {verb} INTO {self._table} (
+              assertion_id, subject, predicate, object, scope, owner_id,
+              observed_at, valid_from, valid_until, confidence,
+              provenance_json, attributes_json, text,
+              observed_at_us, valid_from_us, valid_until_us, anchors, seq
+            )
+            VALUES (
+              ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+              {self._next_seq_sql()}
+            )
+            """
 
     def _ensure_schema(self) -> None:
         cur = self._conn.cursor()
@@ -77,63 +459,408 @@ class SQLiteTripleStore:
               confidence REAL,
               provenance_json TEXT,
               attributes_json TEXT,
-              text TEXT
+              text TEXT,
+              observed_at_us INTEGER,
+              valid_from_us INTEGER,
+              valid_until_us INTEGER,
+              seq INTEGER,
+              anchors TEXT
             )
             """
         )
+        self._migrate_epoch_columns(cur)
+        self._migrate_seq_column(cur)
+        self._migrate_anchor_column(cur)
+        cur.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{self._table}_seq ON {self._table}(seq)")
+        cur.execute(f"CREATE TABLE IF NOT EXISTS {self._meta_table} (key TEXT PRIMARY KEY, value INTEGER)")
+        self._validity_table = self._ensure_validity_index(cur)
+        self._anchor_table = self._ensure_anchor_index(cur)
         cur.execute(f"CREATE INDEX IF NOT EXISTS idx_{self._table}_spo ON {self._table}(subject, predicate, object)")
-        cur.execute(f"CREATE INDEX IF NOT EXISTS idx_{self._table}_scope_owner ON {self._table}(scope, owner_id)")
-        cur.execute(f"CREATE INDEX IF NOT EXISTS idx_{self._table}_observed ON {self._table}(observed_at)")
+        cur.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{self._table}_scope_owner_observed "
+            f"ON {self._table}(scope, owner_id, observed_at_us)"
+        )
+        cur.execute(f"CREATE INDEX IF NOT EXISTS idx_{self._table}_observed_us ON {self._table}(observed_at_us)")
+        # Superseded by the epoch-microsecond indexes above.
+        cur.execute(f"DROP INDEX IF EXISTS idx_{self._table}_scope_owner")
+        cur.execute(f"DROP INDEX IF EXISTS idx_{self._table}_observed")
         self._conn.commit()
 
-    def add(self, assertions: Iterable[TripleAssertion]) -> List[str]:
+    def _migrate_seq_column(self, cur: sqlite3.Cursor) -> None:
+        """Add `seq` (stable insert sequence; rowids may be renumbered by VACUUM) to older tables."""
+        existing = {str(r[1]) for r in cur.execute(f"PRAGMA table_info({self._table})").fetchall()}
+        if "seq" in existing:
+            return
+        cur.execute(f"ALTER TABLE {self._table} ADD COLUMN seq INTEGER")
+        cur.execute(f"UPDATE {self._table} SET seq = rowid")
+
+    def _migrate_anchor_column(self, cur: sqlite3.Cursor) -> None:
+        """Add and backfill the `anchors` column on tables created before it existed."""
+        existing = {str(r[1]) for r in cur.execute(f"PRAGMA table_info({self._table})").fetchall()}
+        if "anchors" in existing:
+            return
+        cur.execute(f"ALTER TABLE {self._table} ADD COLUMN anchors TEXT")
+        rows = cur.execute(f"SELECT {', '.join(_COLUMNS)} FROM {self._table}").fetchall()
+        cur.executemany(
+            f"UPDATE {self._table} SET anchors = ? WHERE assertion_id = ?",
+            [(json.dumps(extract_anchors(_row_to_assertion(r)), ensure_ascii=False), r[0]) for r in rows],
+        )
+
+    def _ensure_anchor_index(self, cur: sqlite3.Cursor) -> Optional[str]:
+        """Create the `(anchor, seq)` inverted index + sync triggers; None without JSON functions."""
+        name = f"{self._table}_anchors"
+        try:
+            cur.execute("SELECT json_array_length('[]')").fetchone()
+        except sqlite3.OperationalError:
+            return None
+        exists = cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)).fetchone()
+        cur.execute(
+            f"CREATE TABLE IF NOT EXISTS {name} (anchor TEXT NOT NULL, seq INTEGER NOT NULL, "
+            f"PRIMARY KEY (anchor, seq)) WITHOUT ROWID"
+        )
+        cur.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {name}_insert AFTER INSERT ON {self._table}
+            WHEN new.anchors IS NOT NULL
+            BEGIN
+              INSERT OR IGNORE INTO {name} (anchor, seq) SELECT value, new.seq FROM json_each(new.anchors);
+            END
+            """
+        )
+        cur.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {name}_delete AFTER DELETE ON {self._table}
+            WHEN old.anchors IS NOT NULL
+            BEGIN
+              DELETE FROM {name} WHERE anchor IN (SELECT value FROM json_each(old.anchors)) AND seq = old.seq;
+            END
+            """
+        )
+        if not exists:
+            cur.execute(
+                f"INSERT OR IGNORE INTO {name} (anchor, seq) "
+                f"SELECT j.value, t.seq FROM {self._table} AS t, json_each(t.anchors) AS j WHERE t.anchors IS NOT NULL"
+            )
+        return name
+
+    def _ensure_validity_index(self, cur: sqlite3.Cursor) -> Optional[str]:
+        """Create the bitemporal R*Tree + sync triggers; returns its name (None without R*Tree support)."""
+        name = f"{self._table}_validity"
+        exists = cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)).fetchone()
+        if not exists:
+            try:
+                cur.execute(f"CREATE VIRTUAL TABLE {name} USING rtree(id, observed_min, observed_max, valid_min, valid_max)")
+            except sqlite3.OperationalError:
+                # SQLite built without R*Tree: fall back to a plain composite index.
+                cur.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_{self._table}_validity ON {self._table}(valid_from_us, valid_until_us)"
+                )
+                return None
+        # Open validity ends map to the int64 extremes; empty windows get a degenerate box.
+        box = (
+            f"COALESCE({{r}}.observed_at_us, {OPEN_START}), COALESCE({{r}}.observed_at_us, {OPEN_START}), "
+            f"MIN(COALESCE({{r}}.valid_from_us, {OPEN_START}), COALESCE({{r}}.valid_until_us, {OPEN_END})), "
+            f"COALESCE({{r}}.valid_until_us, {OPEN_END})"
+        )
+        cur.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {name}_insert AFTER INSERT ON {self._table}
+            BEGIN
+              INSERT INTO {name} (id, observed_min, observed_max, valid_min, valid_max)
+              VALUES (new.seq, {box.format(r="new")});
+            END
+            """
+        )
+        cur.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {name}_delete AFTER DELETE ON {self._table}
+            BEGIN
+              DELETE FROM {name} WHERE id = old.seq;
+            END
+            """
+        )
+        if not exists:
+            cur.execute(f"INSERT INTO {name} SELECT seq, {box.format(r=self._table)} FROM {self._table}")
+        return name
+
+    def _migrate_epoch_columns(self, cur: sqlite3.Cursor) -> None:
+        """Add and backfill `*_us` columns on tables created before they existed."""
+        existing = {str(r[1]) for r in cur.execute(f"PRAGMA table_info({self._table})").fetchall()}
+        missing = [c for c in ("observed_at_us", "valid_from_us", "valid_until_us") if c not in existing]
+        if not missing:
+            return
+        for column in missing:
+            cur.execute(f"ALTER TABLE {self._table} ADD COLUMN {column} INTEGER")
+        rows = cur.execute(f"SELECT assertion_id, observed_at, valid_from, valid_until FROM {self._table}").fetchall()
+        cur.executemany(
+            f"UPDATE {self._table} SET observed_at_us = ?, valid_from_us = ?, valid_until_us = ? WHERE assertion_id = ?",
+            [(iso_to_epoch_us(r[1]), iso_to_epoch_us(r[2]), iso_to_epoch_us(r[3]), r[0]) for r in rows],
+        )
+
+    def add(self, assertions: Iterable[TripleAssertion], *, ids: Optional[Sequence[str]] = None) -> List[str]:
+        """Insert assertions; `ids` (one per assertion) keeps existing ids and skips ones already stored."""
         pending: List[TripleAssertion] = [a for a in assertions]
         if not pending:
             return []
+        given = given_assertion_ids(ids, len(pending)) if ids is not None else None
 
-        ids: List[str] = []
-        rows: List[tuple] = []
-
-        for a in pending:
-            assertion_id = str(uuid.uuid4())
-            ids.append(assertion_id)
-            rows.append(
-                (
-                    assertion_id,
-                    a.subject,
-                    a.predicate,
-                    a.object,
-                    a.scope,
-                    a.owner_id,
-                    a.observed_at,
-                    a.valid_from,
-                    a.valid_until,
-                    a.confidence,
-                    json.dumps(a.provenance, ensure_ascii=False, separators=(",", ":")),
-                    json.dumps(a.attributes, ensure_ascii=False, separators=(",", ":")),
-                    _canonical_text(a),
+        with start_span(self._instrumentation, "sqlite.add") as span:
+            out_ids: List[str] = []
+            rows: List[tuple] = []
+
+            for n, a in enumerate(pending):
+                if given is not None:
+                    assertion_id = given[n]
+                else:
+                    assertion_id = new_assertion_id(a, id_mode=self._id_mode, provenance_keys=self._id_provenance_keys)
+                out_ids.append(assertion_id)
+                rows.append(
+                    (
+                        assertion_id,
+                        a.subject,
+                        a.predicate,
+                        a.object,
+                        a.scope,
+                        a.owner_id,
+                        a.observed_at,
+                        a.valid_from,
+                        a.valid_until,
+                        a.confidence,
+                        json.dumps(a.provenance, ensure_ascii=False, separators=(",", ":")),
+                        json.dumps(a.attributes, ensure_ascii=False, separators=(",", ":")),
+                        _canonical_text(a),
+                        iso_to_epoch_us(a.observed_at),
+                        iso_to_epoch_us(a.valid_from),
+                        iso_to_epoch_us(a.valid_until),
+                        json.dumps(extract_anchors(a), ensure_ascii=False, separators=(",", ":")),
+                    )
                 )
-            )
+            span.lap("encode")
 
-        cur = self._conn.cursor()
-        cur.executemany(
-            f"""
-            INSERT INTO {self._table} (
-              assertion_id, subject, predicate, object, scope, owner_id,
-              observed_at, valid_from, valid_until, confidence,
-              provenance_json, attributes_json, text
+            verb = "INSERT OR IGNORE" if self._id_mode == "content" or given is not None else "INSERT"
+            if self._committer is not None:
+                done = self._committer.submit(verb, rows)
+                written, last_seq = done.written, done.last_seq
+                span.count("commit_group_size", done.group_size)
+            else:
+                written, last_seq = self._write_batches([(verb, rows)])[0]
+            span.lap("sql")
+            span.count("rows_written", written)
+            if self._subscribers and written:
+                self._subscribers.notify(self._written_changes(pending, out_ids, written, last_seq))
+                span.lap("notify")
+        return out_ids
+
+    def _written_changes(self, pending: List[TripleAssertion], ids: List[str], written: int, last_seq: int) -> List[Change]:
+        first = last_seq - written + 1
+        if written == len(pending):
+            return [(first + n, a._with_assertion_id(ids[n])) for n, a in enumerate(pending)]
+        # Some rows were skipped (known ids): ask which ones landed in this batch's seq range.
+        with self._lock:
+            landed = dict(
+                self._conn.execute(
+                    f"SELECT assertion_id, seq FROM {self._table} WHERE seq BETWEEN ? AND ?", (first, last_seq)
+                ).fetchall()
             )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            rows,
-        )
-        self._conn.commit()
-        return ids
+        out: List[Change] = []
+        for n, a in enumerate(pending):
+            seq = landed.pop(ids[n], None)
+            if seq is not None:
+                out.append((int(seq), a._with_assertion_id(ids[n])))
+        out.sort(key=lambda c: c[0])
+        return out
+
+    def last_seq(self) -> int:
+        """Highest sequence number assigned so far (0 for an empty store)."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT MAX(COALESCE((SELECT MAX(seq) FROM {self._table}), 0), "
+                f"COALESCE((SELECT value FROM {self._meta_table} WHERE key = 'last_seq'), 0))"
+            ).fetchone()
+        return int(row[0] or 0)
+
+    def changes(self, since_seq: int = 0, *, limit: int = 1000) -> List[Change]:
+        """`(seq, assertion)` for rows inserted after `since_seq`, in `seq` order (purged rows are gone)."""
+        n = change_limit(limit)
+        sql = f"SELECT {', '.join(_COLUMNS)}, seq FROM {self._table} WHERE seq > ? ORDER BY seq"
+        params: List[Any] = [int(since_seq)]
+        if n is not None:
+            sql += " LIMIT ?"
+            params.append(n)
+        with start_span(self._instrumentation, "sqlite.changes") as span:
+            with self._lock:
+                rows = self._conn.execute(sql, params).fetchall()
+            span.lap("sql")
+            out = [(int(r["seq"]), _row_to_assertion(r)) for r in rows]
+            span.lap("decode")
+            span.count("rows_returned", len(out))
+        return out
+
+    def subscribe(self, callback: ChangeCallback) -> Callable[[], None]:
+        """Call `callback(changes)` after each `add()` on this instance that wrote rows (returns an unsubscribe)."""
+        return self._subscribers.subscribe(callback)
 
     def query(self, q: TripleQuery) -> List[TripleAssertion]:
         if q.query_text or q.query_vector:
             raise ValueError("SQLiteTripleStore does not support semantic/vector queries (no keyword fallback)")
+        with start_span(self._instrumentation, "sqlite.query", tracer=self._trace_sink, query=q) as span:
+            rows = self._select(q)
+            span.lap("sql")
+            out = [_row_to_assertion(r) for r in rows]
+            span.lap("decode")
+            span.count("rows_scanned", len(rows))
+            span.count("rows_returned", len(out))
+            if span.tracing:
+                span.pushdown(partial(self._pushdown, q))
+                span.results(out)
+        return out
+
+    def _pushdown(self, q: TripleQuery) -> Tuple[str, ...]:
+        # Every structured filter runs inside SQLite; `active_at` goes through the R*Tree when present.
+        return tuple(
+            f"{name}@rtree" if name == "active_at" and self._validity_table and q.active_at_us is not None else f"{name}@sql"
+            for name in structured_filters(q)
+        )
+
+    def anchor_query(
+        self,
+        cues: Union[str, Iterable[str]] = (),
+        *,
+        facets: Optional[Mapping[str, Any]] = None,
+        scope: Optional[str] = None,
+        owner_id: Optional[str] = None,
+        limit: int = 20,
+        max_postings: int = MAX_ANCHOR_POSTINGS,
+    ) -> List[TripleAssertion]:
+        """Assertions sharing anchors with `cues` / `facets`, ranked by matched weight then recency.
+
+        Candidates come from the inverted index (only anchors on at most `max_postings` rows seed
+        them); results carry `attributes["_retrieval"]` with the score and matched anchors.
+        """
+        weights = anchor_cues(cues, facets)
+        keys = sorted(weights)
+        where, params = _build_where(TripleQuery(scope=scope, owner_id=owner_id))
+        with start_span(self._instrumentation, "sqlite.anchor_query") as span:
+            with self._lock:
+                if self._anchor_table is not None:
+                    marks = ",".join("?" for _ in keys)
+                    postings = dict(
+                        self._conn.execute(
+                            f"SELECT anchor, COUNT(*) FROM {self._anchor_table} WHERE anchor IN ({marks}) GROUP BY anchor",
+                            keys,
+                        ).fetchall()
+                    )
+                    seeds = selective_anchors(postings, weights, max_postings)
+                    sql = (
+                        f"SELECT assertion_id, observed_at_us, anchors FROM {self._table} WHERE seq IN "
+                        f"(SELECT seq FROM {self._anchor_table} WHERE anchor IN ({','.join('?' for _ in seeds)}))"
+                    )
+                    rows = self._conn.execute(sql + (f" AND {where}" if where else ""), seeds + params).fetchall() if seeds else []
+                else:
+                    sql = f"SELECT assertion_id, observed_at_us, anchors FROM {self._table} WHERE anchors IS NOT NULL"
+                    rows = self._conn.execute(sql + (f" AND {where}" if where else ""), params).fetchall()
+            span.lap("sql")
+            hits = [(str(r[0]), r[1], _decode_json(r[2]) if r[2] else ()) for r in rows]
+            ranked = rank_anchor_hits(hits, weights, limit=anchor_limit(limit))
+            span.lap("sort")
+            found = self.get_many([i for i, _, _ in ranked])
+            out = [with_anchor_retrieval(found[i], score, m) for i, score, m in ranked if i in found]
+            span.count("rows_scanned", len(rows))
+            span.count("rows_returned", len(out))
+        return out
+
+    def scan(self, q: TripleQuery) -> Iterator[Tuple[str, TripleAssertion]]:
+        """Yield `(assertion_id, assertion)` for structured matches, ordered by `observed_at`."""
+        if q.query_text or q.query_vector:
+            raise ValueError("scan() supports structured filters only")
+        for r in self._select(q):
+            yield str(r["assertion_id"]), _row_to_assertion(r)
+
+    def purge(self, assertion_ids: Iterable[str]) -> int:
+        """Physically remove rows by id (retention only; callers record tombstones first)."""
+        ids = [str(i) for i in assertion_ids]
+
+        def _delete(cur: sqlite3.Cursor) -> int:
+            # Remember the high-water mark so deleting the newest rows never lets a `seq` be reused.
+            cur.execute(
+                f"INSERT OR REPLACE INTO {self._meta_table} (key, value) "
+                f"SELECT 'last_seq', MAX(COALESCE(MAX(seq), 0), "
+                f"COALESCE((SELECT value FROM {self._meta_table} WHERE key = 'last_seq'), 0)) FROM {self._table}"
+            )
+            removed = 0
+            # Stay well below SQLITE_MAX_VARIABLE_NUMBER on older builds.
+            for start in range(0, len(ids), 500):
+                chunk = ids[start : start + 500]
+                marks = ",".join("?" for _ in chunk)
+                cur.execute(f"DELETE FROM {self._table} WHERE assertion_id IN ({marks})", chunk)
+                removed += int(cur.rowcount or 0)
+            return removed
 
+        return self._transaction(_delete) if ids else 0
+
+    def get_many(self, assertion_ids: Iterable[str]) -> Dict[str, TripleAssertion]:
+        """Fetch assertions by id with primary-key lookups (unknown ids are absent from the result)."""
+        ids = list(dict.fromkeys(str(i) for i in assertion_ids))
+        if not ids:
+            return {}
+        cols = ", ".join(_COLUMNS)
+        with start_span(self._instrumentation, "sqlite.get_many") as span:
+            with self._lock:
+                cur = self._conn.cursor()
+                try:
+                    # One statement for any batch size: the ids travel as a single JSON array.
+                    rows = cur.execute(
+                        f"SELECT {cols} FROM {self._table} WHERE assertion_id IN (SELECT value FROM json_each(?))",
+                        (json.dumps(ids),),
+                    ).fetchall()
+                except sqlite3.OperationalError:
+                    # SQLite built without JSON functions.
+                    rows = []
+                    for start in range(0, len(ids), 500):
+                        chunk = ids[start : start + 500]
+                        marks = ",".join("?" for _ in chunk)
+                        cur.execute(f"SELECT {cols} FROM {self._table} WHERE assertion_id IN ({marks})", chunk)
+                        rows.extend(cur.fetchall())
+            span.lap("sql")
+            out = {r[0]: _row_to_assertion(r) for r in rows}
+            span.lap("decode")
+            span.count("rows_returned", len(out))
+        return out
+
+    def aggregate(
+        self,
+        q: TripleQuery,
+        *,
+        group_by: Sequence[str] = (),
+        metrics: Sequence[str] = ("count",),
+    ) -> List[Dict[str, Any]]:
+        """Grouped counts / observed_at bounds computed by SQLite (`GROUP BY`, ordered and limited in SQL)."""
+        groups, wanted = normalize_aggregate(q, group_by, metrics)
+        where, params = _build_where(q, validity_table=self._validity_table)
+        limit = group_limit(q)
+        cols = ", ".join(groups)
+        sql = f"SELECT {cols + ', ' if cols else ''}COUNT(*), MIN(observed_at_us), MAX(observed_at_us) FROM {self._table}"
+        if where:
+            sql += f" WHERE {where}"
+        if groups:
+            sql += f" GROUP BY {cols} ORDER BY COUNT(*) DESC, {cols}"
+            if limit is not None:
+                sql += " LIMIT ?"
+                params.append(limit)
+        with start_span(self._instrumentation, "sqlite.aggregate") as span:
+            with self._lock:
+                rows = self._conn.execute(sql, params).fetchall()
+            span.lap("sql")
+            acc = GroupAccumulator(groups)
+            n = len(groups)
+            for r in rows:
+                if r[n]:
+                    acc.add(tuple(r[:n]), r[n], r[n + 1], r[n + 2])
+            out = acc.rows(wanted, limit=limit)
+            span.count("groups_returned", len(out))
+        return out
+
+    def _select(self, q: TripleQuery) -> List[sqlite3.Row]:
         raw_limit = int(q.limit) if isinstance(q.limit, int) else 100
         limit: Optional[int]
         if raw_limit <= 0:
@@ -141,77 +868,20 @@ class SQLiteTripleStore:
         else:
             limit = max(1, raw_limit)
 
-        parts: List[str] = []
-        params: List[Any] = []
-
-        if q.subject:
-            parts.append("subject = ?")
-            params.append(q.subject)
-        if q.predicate:
-            parts.append("predicate = ?")
-            params.append(q.predicate)
-        if q.object:
-            parts.append("object = ?")
-            params.append(q.object)
-        if q.scope:
-            parts.append("scope = ?")
-            params.append(q.scope)
-        if q.owner_id:
-            parts.append("COALESCE(owner_id, '') = ?")
-            params.append(q.owner_id)
-        if q.since:
-            parts.append("observed_at >= ?")
-            params.append(q.since)
-        if q.until:
-            parts.append("observed_at <= ?")
-            params.append(q.until)
-        if q.active_at:
-            # valid_until is exclusive: valid_until > active_at
-            parts.append("(valid_from IS NULL OR valid_from <= ?)")
-            params.append(q.active_at)
-            parts.append("(valid_until IS NULL OR valid_until > ?)")
-            params.append(q.active_at)
-
-        where = " AND ".join(parts)
+        where, params = _build_where(q, validity_table=self._validity_table)
         order = "asc" if str(q.order or "").strip().lower() == "asc" else "desc"
         order_sql = "ASC" if order == "asc" else "DESC"
 
-        sql = f"SELECT * FROM {self._table}"
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM {self._table}"
         if where:
             sql += f" WHERE {where}"
-        # Deterministic tie-breaker on assertion_id.
-        sql += f" ORDER BY observed_at {order_sql}, assertion_id {order_sql}"
+        # Chronological order on the epoch column; deterministic tie-breaker on assertion_id.
+        sql += f" ORDER BY observed_at_us {order_sql}, assertion_id {order_sql}"
         if limit is not None:
             sql += " LIMIT ?"
             params.append(int(limit))
 
-        cur = self._conn.cursor()
-        cur.execute(sql, params)
-        rows = cur.fetchall()
-
-        out: List[TripleAssertion] = []
-        for r in rows:
-            try:
-                prov = json.loads(r["provenance_json"]) if r["provenance_json"] else {}
-            except Exception:
-                prov = {}
-            try:
-                attrs = json.loads(r["attributes_json"]) if r["attributes_json"] else {}
-            except Exception:
-                attrs = {}
-            out.append(
-                TripleAssertion(
-                    subject=str(r["subject"] or ""),
-                    predicate=str(r["predicate"] or ""),
-                    object=str(r["object"] or ""),
-                    scope=str(r["scope"] or "run"),
-                    owner_id=str(r["owner_id"] or "").strip() or None,
-                    observed_at=str(r["observed_at"] or ""),
-                    valid_from=str(r["valid_from"] or "").strip() or None,
-                    valid_until=str(r["valid_until"] or "").strip() or None,
-                    confidence=float(r["confidence"]) if r["confidence"] is not None else None,
-                    provenance=dict(prov) if isinstance(prov, dict) else {},
-                    attributes=dict(attrs) if isinstance(attrs, dict) else {},
-                )
-            )
-        return out
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute(sql, params)
+            return cur.fetchall()
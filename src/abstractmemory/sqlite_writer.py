@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import argparse
+import json
+import socket
+import socketserver
+import stat
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from .models import TripleAssertion
+from .sqlite_store import SQLiteTripleStore
+
+
+def _remove_stale_socket(path: Path) -> None:
+    """Unlink `path` only if it is a Unix socket nobody listens on (left by a crashed writer)."""
+    try:
+        mode = path.lstat().st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise ValueError(f"{path} exists and is not a socket")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(path))
+    except ConnectionRefusedError:
+        path.unlink()
+        return
+    finally:
+        probe.close()
+    raise RuntimeError(f"another SQLite writer is already listening on {path}")
+
+
+class SQLiteWriterServer:
+    """Single writer process for a SQLite store, fed with batches over a Unix socket.
+
+    Notes:
+    - Each connection sends newline-delimited JSON requests
+      `{"op": "add", "assertions": [...], "ids": [...]?}` and receives `{"ids": [...]}` or
+      `{"error": "..."}` per request. Assertions use `TripleAssertion.to_dict()`.
+    - Connections are served on threads; create the store with `group_commit_ms > 0` so concurrent
+      producers share transactions instead of queueing on the connection lock.
+    - Writers in other processes never contend for the file lock, which removes `database is locked`
+      retries entirely; readers can keep opening the file directly (prefer `journal_mode="wal"`).
+    - An existing `socket_path` is only replaced if it is a socket that refuses connections; a live
+      writer raises `RuntimeError`, any other file `ValueError`.
+    """
+
+    def __init__(self, store: SQLiteTripleStore, socket_path: Path) -> None:
+        self._store = store
+        self._socket_path = Path(socket_path).expanduser()
+        _remove_stale_socket(self._socket_path)
+        self._socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self._thread: Optional[threading.Thread] = None
+
+        owner = self
+
+        class _Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    reply = owner._dispatch(line)
+                    self.wfile.write((json.dumps(reply) + "\n").encode("utf-8"))
+                    self.wfile.flush()
+
+        class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+        self._server = _Server(str(self._socket_path), _Handler)
+
+    @property
+    def socket_path(self) -> Path:
+        return self._socket_path
+
+    def _dispatch(self, line: bytes) -> Dict[str, Any]:
+        try:
+            req = json.loads(line)
+            if not isinstance(req, dict) or req.get("op") != "add":
+                raise ValueError("unsupported request (expected op='add')")
+            assertions = [TripleAssertion.from_dict(d) for d in req.get("assertions") or []]
+            ids = req.get("ids")
+            return {"ids": self._store.add(assertions, ids=ids)}
+        except Exception as e:
+            return {"error": f"{type(e).__name__}: {e}"}
+
+    def start(self) -> "SQLiteWriterServer":
+        """Serve on a background thread (returns self)."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="abstractmemory-sqlite-writer", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join(timeout=5.0)
+            self._thread = None
+        self._server.server_close()
+        try:
+            self._socket_path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SQLiteWriterClient:
+    """Client for `SQLiteWriterServer`: `add()` batches are committed by the writer process.
+
+    One persistent connection per client; calls from several threads are serialized. If a call
+    fails mid-request (timeout, reset, server gone) the connection is dropped and `ConnectionError`
+    is raised: the batch may or may not have been committed, and every later call fails before
+    sending anything, so open a new client (and check before retrying the batch).
+    """
+
+    def __init__(self, socket_path: Path, *, timeout_s: Optional[float] = 30.0) -> None:
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout_s)
+        self._sock.connect(str(Path(socket_path).expanduser()))
+        self._reader = self._sock.makefile("rb")
+        self._lock = threading.Lock()
+        self._broken: Optional[str] = None
+
+    def add(self, assertions: Iterable[TripleAssertion], *, ids: Optional[Sequence[str]] = None) -> List[str]:
+        req: Dict[str, Any] = {"op": "add", "assertions": [a.to_dict() for a in assertions]}
+        if ids is not None:
+            req["ids"] = [str(i) for i in ids]
+        payload = (json.dumps(req) + "\n").encode("utf-8")
+        with self._lock:
+            if self._broken is not None:
+                raise ConnectionError(f"SQLite writer connection was dropped after an earlier failure ({self._broken})")
+            try:
+                self._sock.sendall(payload)
+                line = self._reader.readline()
+                if not line:
+                    raise ConnectionError("SQLite writer closed the connection")
+            except BaseException as e:
+                self._broken = f"{type(e).__name__}: {e}"
+                self._close_quietly()
+                if not isinstance(e, Exception):
+                    raise
+                raise ConnectionError(f"SQLite writer connection failed ({self._broken}); the batch outcome is unknown") from e
+        reply = json.loads(line)
+        if "error" in reply:
+            raise RuntimeError(f"SQLite writer rejected the batch: {reply['error']}")
+        return [str(i) for i in reply.get("ids") or []]
+
+    def close(self) -> None:
+        try:
+            self._reader.close()
+        finally:
+            self._sock.close()
+
+    def _close_quietly(self) -> None:
+        try:
+            self.close()
+        except OSError:
+            pass
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m abstractmemory.sqlite_writer",
+        description="Own the writes to a SQLite store and accept batches over a Unix socket",
+    )
+    parser.add_argument("path", type=Path, help="SQLite database file")
+    parser.add_argument("--socket", type=Path, required=True, help="Unix socket path to listen on")
+    parser.add_argument("--table", default="triples")
+    parser.add_argument("--group-commit-ms", type=float, default=5.0)
+    parser.add_argument("--journal-mode", default="wal")
+    args = parser.parse_args(argv)
+
+    store = SQLiteTripleStore(
+        args.path,
+        table_name=args.table,
+        journal_mode=args.journal_mode,
+        group_commit_ms=args.group_commit_ms,
+    )
+    server = SQLiteWriterServer(store, args.socket)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterable, List, Optional, Protocol
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Protocol, Sequence, Tuple
 
-from .models import TripleAssertion, canonicalize_term
+from .models import TripleAssertion, canonicalize_term, iso_to_epoch_us
+
+if TYPE_CHECKING:
+    from .scoring import RecallScoring
 
 
 @dataclass(frozen=True)
@@ -26,9 +29,27 @@ class TripleQuery:
     vector_column: str = "vector"
     min_score: Optional[float] = None  # cosine similarity threshold (semantic queries)
 
+    # Optional diversity reranking of semantic results over an over-fetched candidate pool:
+    # - mmr_lambda enables maximal marginal relevance (1.0 = pure relevance, 0.0 = pure novelty)
+    # - collapse_triples keeps only the best-scoring assertion per (subject, predicate, object)
+    # - mmr_pool sets the pool size (default: 10 * limit)
+    mmr_lambda: Optional[float] = None
+    collapse_triples: bool = False
+    mmr_pool: Optional[int] = None
+
+    # Optional ranking of semantic results by cosine * recency * confidence * predicate boost
+    # (see `RecallScoring`); None ranks by cosine alone.
+    scoring: Optional["RecallScoring"] = None
+
     limit: int = 100
     order: str = "desc"  # asc|desc by observed_at
 
+    # Derived: the time bounds as UTC epoch microseconds (None when unset or unparseable; stores
+    # then fall back to comparing the raw strings).
+    since_us: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+    until_us: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+    active_at_us: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+
     def __post_init__(self) -> None:
         # Canonicalize KG terms once (trim + lower; stable exact match).
         if isinstance(self.subject, str):
@@ -59,6 +80,10 @@ class TripleQuery:
             a = self.active_at.strip()
             object.__setattr__(self, "active_at", a if a else None)
 
+        object.__setattr__(self, "since_us", iso_to_epoch_us(self.since))
+        object.__setattr__(self, "until_us", iso_to_epoch_us(self.until))
+        object.__setattr__(self, "active_at_us", iso_to_epoch_us(self.active_at))
+
         # For semantic retrieval, normalize text input once.
         if isinstance(self.query_text, str):
             qt = str(self.query_text or "").strip()
@@ -78,6 +103,16 @@ class TripleQuery:
             else:
                 object.__setattr__(self, "min_score", ms)
 
+        if self.mmr_lambda is not None:
+            lam = float(self.mmr_lambda)
+            if not (0.0 <= lam <= 1.0):
+                raise ValueError("mmr_lambda must be within [0, 1]")
+            object.__setattr__(self, "mmr_lambda", lam)
+        object.__setattr__(self, "collapse_triples", bool(self.collapse_triples))
+        if self.mmr_pool is not None:
+            pool = int(self.mmr_pool)
+            object.__setattr__(self, "mmr_pool", pool if pool > 0 else None)
+
         if isinstance(self.order, str):
             object.__setattr__(self, "order", self.order.strip().lower() or "desc")
 
@@ -87,4 +122,22 @@ class TripleStore(Protocol):
 
     def query(self, q: TripleQuery) -> List[TripleAssertion]: ...
 
+    def get_many(self, assertion_ids: Iterable[str]) -> Dict[str, TripleAssertion]: ...
+
+    def aggregate(
+        self,
+        q: TripleQuery,
+        *,
+        group_by: Sequence[str] = (),
+        metrics: Sequence[str] = ("count",),
+    ) -> List[Dict[str, Any]]: ...
+
     def close(self) -> None: ...
+
+
+class MaintainableTripleStore(TripleStore, Protocol):
+    """Store with id-level maintenance hooks (used by retention; not part of normal recall)."""
+
+    def scan(self, q: TripleQuery) -> Iterator[Tuple[str, TripleAssertion]]: ...
+
+    def purge(self, assertion_ids: Iterable[str]) -> int: ...
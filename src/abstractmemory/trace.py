@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Protocol, Sequence, Tuple, Union
+
+# Structured `TripleQuery` filters, in the order traces list them.
+FILTER_FIELDS = ("subject", "predicate", "object", "scope", "owner_id", "since", "until", "active_at")
+_SEMANTIC_FIELDS = ("vector_column", "min_score", "mmr_lambda", "mmr_pool")
+_QUERY_FIELDS = FILTER_FIELDS + ("query_text",) + _SEMANTIC_FIELDS + ("limit", "order")
+
+
+def structured_filters(q: Any) -> Tuple[str, ...]:
+    """Names of the structured filters set on `q`."""
+    return tuple(name for name in FILTER_FIELDS if getattr(q, name))
+
+
+def normalized_query(q: Any) -> Dict[str, Any]:
+    """JSON-able view of a (normalized) `TripleQuery`: set fields only; vectors by dimension."""
+    out: Dict[str, Any] = {}
+    for name in _QUERY_FIELDS:
+        value = getattr(q, name, None)
+        if value is not None:
+            out[name] = value
+    if q.query_text or q.query_vector:
+        if q.collapse_triples:
+            out["collapse_triples"] = True
+        if q.scoring is not None:
+            out["scoring"] = q.scoring.to_dict()
+    else:
+        for name in _SEMANTIC_FIELDS:
+            out.pop(name, None)
+    if q.query_vector:
+        out["query_vector_dim"] = len(q.query_vector)
+    return out
+
+
+def _scores(results: Sequence[Any]) -> List[float]:
+    found: List[float] = []
+    for a in results:
+        retrieval = a.attributes.get("_retrieval") if isinstance(a.attributes, dict) else None
+        score = retrieval.get("score") if isinstance(retrieval, dict) else None
+        if isinstance(score, (int, float)):
+            found.append(float(score))
+    return found
+
+
+class RecallTrace:
+    """What one `query()` did: filters pushed down, candidates, pruning, timings and results.
+
+    - `operation`: the span name, e.g. `sqlite.query`, `inmemory.query`, `lancedb.query`
+    - `query`: the normalized query (set fields only; `query_vector` as `query_vector_dim`)
+    - `pushdown`: `filter@mechanism` entries for filters answered by an index or the backend
+      (`subject@sql`, `active_at@rtree`, `subject@snapshot_codes`, `owner_id@where`, `vector@ann`);
+      filters not listed were checked row by row
+    - `candidates`: rows the store examined; `pruned_by_min_score`: semantic candidates under `min_score`
+    - `result_ids` / `scores`: returned assertion ids, in order, and their scores (semantic queries)
+    - `phases` / `counters`: the same per-step seconds and counts `MetricsSink`s receive
+
+    Recording copies only the result ids (and scores for semantic queries) and keeps a reference to
+    the query; `trace_id` and the query dict are derived on first access. Result objects are not
+    retained: thousands of buffered traces holding them would make every GC pass slower. Treat
+    traces as read-only.
+    """
+
+    __slots__ = (
+        "operation", "started_at", "duration_s", "ok", "phases", "counters",
+        "result_ids", "scores", "_q", "_trace_id", "_query", "_pushdown",
+    )
+
+    def __init__(
+        self,
+        *,
+        operation: str,
+        started_at: float,
+        duration_s: float,
+        ok: bool = True,
+        query: Any = None,
+        pushdown: Union[Sequence[str], Callable[[], Sequence[str]]] = (),
+        phases: Optional[Dict[str, float]] = None,
+        counters: Optional[Dict[str, float]] = None,
+        results: Sequence[Any] = (),
+        trace_id: Optional[str] = None,
+        result_ids: Optional[Sequence[str]] = None,
+        scores: Optional[Sequence[float]] = None,
+    ) -> None:
+        self.operation = operation
+        self.started_at = started_at  # unix seconds
+        self.duration_s = duration_s
+        self.ok = ok
+        self._pushdown = pushdown  # or a callable producing it on first access
+        self.phases: Dict[str, float] = phases if phases is not None else {}
+        self.counters: Dict[str, float] = counters if counters is not None else {}
+        self._q = query  # a `TripleQuery`, or an already normalized dict
+        self._trace_id = trace_id
+        self._query: Optional[Dict[str, Any]] = query if isinstance(query, dict) else None
+        self.result_ids: Tuple[str, ...] = (
+            tuple(result_ids) if result_ids is not None else tuple([a.assertion_id or "" for a in results])
+        )
+        if scores is None:
+            semantic = query is not None and not isinstance(query, dict) and (query.query_text or query.query_vector)
+            scores = _scores(results) if semantic else ()
+        self.scores: Tuple[float, ...] = tuple(scores)
+
+    def __repr__(self) -> str:
+        return f"RecallTrace(operation={self.operation!r}, duration_s={self.duration_s:.6f}, results={len(self.result_ids)})"
+
+    @property
+    def trace_id(self) -> str:
+        if self._trace_id is None:
+            self._trace_id = uuid.uuid4().hex
+        return self._trace_id
+
+    @property
+    def pushdown(self) -> Tuple[str, ...]:
+        if not isinstance(self._pushdown, tuple):
+            self._pushdown = tuple(self._pushdown() if callable(self._pushdown) else self._pushdown)
+        return self._pushdown
+
+    @property
+    def query(self) -> Dict[str, Any]:
+        if self._query is None:
+            self._query = normalized_query(self._q) if self._q is not None else {}
+        return self._query
+
+    @property
+    def query_fingerprint(self) -> str:
+        """Stable hash of the normalized query (identical queries share it across processes)."""
+        raw = json.dumps(self.query, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+    @property
+    def candidates(self) -> int:
+        return int(self.counters.get("rows_scanned", 0))
+
+    @property
+    def pruned_by_min_score(self) -> int:
+        return int(self.counters.get("rows_pruned_min_score", 0))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "operation": self.operation,
+            "started_at": self.started_at,
+            "duration_s": self.duration_s,
+            "ok": self.ok,
+            "query": dict(self.query),
+            "query_fingerprint": self.query_fingerprint,
+            "pushdown": list(self.pushdown),
+            "candidates": self.candidates,
+            "pruned_by_min_score": self.pruned_by_min_score,
+            "result_ids": list(self.result_ids),
+            "scores": list(self.scores),
+            "phases": dict(self.phases),
+            "counters": dict(self.counters),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RecallTrace":
+        return cls(
+            trace_id=str(data.get("trace_id") or "") or None,
+            operation=str(data.get("operation") or ""),
+            started_at=float(data.get("started_at") or 0.0),
+            duration_s=float(data.get("duration_s") or 0.0),
+            ok=bool(data.get("ok", True)),
+            query=dict(data.get("query") or {}),
+            pushdown=tuple(str(p) for p in data.get("pushdown") or ()),
+            phases={str(k): float(v) for k, v in (data.get("phases") or {}).items()},
+            counters={str(k): float(v) for k, v in (data.get("counters") or {}).items()},
+            result_ids=[str(i) for i in data.get("result_ids") or ()],
+            scores=[float(x) for x in data.get("scores") or ()],
+        )
+
+
+class TraceSink(Protocol):
+    """Receives one `RecallTrace` per traced query (must be cheap and must not raise)."""
+
+    def record(self, trace: RecallTrace) -> None: ...
+
+
+class TraceRingBuffer:
+    """Keep the last `capacity` traces in memory (bounded; older traces are overwritten).
+
+    Notes:
+    - `record()` takes no lock: a slot index comes from an `itertools.count` and the slot is
+      replaced in one list assignment, both atomic under the GIL.
+    - `traces()` returns what is buffered, oldest first; `dropped` counts overwritten traces.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        if int(capacity) <= 0:
+            raise ValueError("capacity must be > 0")
+        self._capacity = int(capacity)
+        self._slots: List[Optional[Tuple[int, RecallTrace]]] = [None] * self._capacity
+        self._counter = itertools.count()
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def record(self, trace: RecallTrace) -> None:
+        n = next(self._counter)
+        self._slots[n % self._capacity] = (n, trace)
+
+    def traces(self, last: Optional[int] = None) -> List[RecallTrace]:
+        """Buffered traces, oldest first (`last`: only the most recent N)."""
+        entries = sorted((e for e in list(self._slots) if e is not None), key=lambda e: e[0])
+        if last is not None:
+            entries = entries[-int(last) :] if int(last) > 0 else []
+        return [t for _, t in entries]
+
+    @property
+    def recorded(self) -> int:
+        """Traces recorded since creation (or the last `clear()`)."""
+        seen = [e[0] for e in list(self._slots) if e is not None]
+        return (max(seen) + 1) if seen else 0
+
+    @property
+    def dropped(self) -> int:
+        return max(0, self.recorded - self._capacity)
+
+    def clear(self) -> None:
+        self._slots = [None] * self._capacity
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return sum(1 for e in self._slots if e is not None)
+
+
+class TraceLog:
+    """Append traces to a JSON-lines file in batches (one write per `batch_size` traces).
+
+    `flush()` writes whatever is pending; `close()` flushes and closes the file. Traces still
+    pending when the process dies are lost (at most `batch_size - 1`).
+    """
+
+    def __init__(self, path: Path, *, batch_size: int = 256) -> None:
+        self._path = Path(path).expanduser()
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._batch_size = max(1, int(batch_size))
+        self._pending: List[RecallTrace] = []
+        self._lock = threading.Lock()
+        self._fh: Any = open(self._path, "a", encoding="utf-8")
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def record(self, trace: RecallTrace) -> None:
+        # Only the append happens per query; serialization and the write happen once per batch.
+        with self._lock:
+            self._pending.append(trace)
+            full = len(self._pending) >= self._batch_size
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            batch, self._pending = self._pending, []
+            if not batch or self._fh is None:
+                return
+            self._fh.write(
+                "".join(json.dumps(t.to_dict(), ensure_ascii=False, separators=(",", ":")) + "\n" for t in batch)
+            )
+            self._fh.flush()
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+
+def read_trace_log(path: Path) -> List[RecallTrace]:
+    """Load every trace written by `TraceLog` (a torn last line is ignored)."""
+    out: List[RecallTrace] = []
+    with open(Path(path).expanduser(), "r", encoding="utf-8") as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            try:
+                out.append(RecallTrace.from_dict(json.loads(line)))
+            except ValueError:
+                break
+    return out
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from .embeddings import TextEmbedder
+
+
+@dataclass(frozen=True)
+class VectorColumn:
+    """A named vector column bound to the embedder (model) that fills it.
+
+    - `dimension`: expected vector length; None learns it from the first embedding. Embeddings of
+      another length raise `ValueError`, so two models can never share a column by accident.
+    - `model_id`: identity of the embedding model (default: the embedder's `model_id`, if any);
+      informational, reported by `vector_columns()`.
+    """
+
+    name: str
+    embedder: TextEmbedder = field(compare=False, repr=False)
+    dimension: Optional[int] = None
+    model_id: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        name = str(self.name or "").strip()
+        if not name:
+            raise ValueError("vector column name is required")
+        object.__setattr__(self, "name", name)
+        if self.dimension is not None:
+            dim = int(self.dimension)
+            if dim <= 0:
+                raise ValueError("dimension must be > 0")
+            object.__setattr__(self, "dimension", dim)
+        if self.model_id is None:
+            model_id = getattr(self.embedder, "model_id", None)
+            object.__setattr__(self, "model_id", model_id if isinstance(model_id, str) and model_id else None)
+
+
+class VectorColumnRegistry:
+    """The vector columns a store writes, and the embedder that answers `query_text` for each.
+
+    Notes:
+    - The store's own `embedder` / `vector_column` is the default column; `VectorColumn`s passed
+      to the constructor or to `add_vector_column()` are written next to it by every `add()`.
+    - Queries route by `TripleQuery.vector_column`: a registered column embeds `query_text` with
+      its own embedder, any other column with the default one.
+    """
+
+    def __init__(self, default: str, embedder: Optional[TextEmbedder], columns: Iterable[VectorColumn] = ()) -> None:
+        self._lock = threading.Lock()
+        self._default = str(default or "vector")
+        self._columns: Dict[str, VectorColumn] = {}
+        self._dims: Dict[str, int] = {}
+        if embedder is not None:
+            self.register(VectorColumn(self._default, embedder))
+        for column in columns:
+            self.register(column)
+
+    @property
+    def default(self) -> str:
+        return self._default
+
+    @property
+    def default_embedder(self) -> Optional[TextEmbedder]:
+        column = self._columns.get(self._default)
+        return column.embedder if column is not None else None
+
+    def register(self, column: VectorColumn) -> None:
+        if not isinstance(column, VectorColumn):
+            raise ValueError("expected a VectorColumn")
+        with self._lock:
+            if column.name in self._columns:
+                raise ValueError(f"vector column {column.name!r} is already registered")
+            self._columns[column.name] = column
+            if column.dimension is not None:
+                self._dims[column.name] = column.dimension
+
+    def get(self, name: str) -> Optional[VectorColumn]:
+        return self._columns.get(name)
+
+    def extra_names(self) -> List[str]:
+        """Registered columns other than the default one, in registration order."""
+        return [name for name in self._columns if name != self._default]
+
+    def dimension(self, name: str) -> Optional[int]:
+        return self._dims.get(name)
+
+    def pin(self, name: str, dimension: int) -> None:
+        """Record the column's dimension (first call) or raise `ValueError` if it differs."""
+        expected = self._dims.setdefault(name, int(dimension))
+        if int(dimension) != expected:
+            raise ValueError(f"vector column {name!r} holds {expected}-dimensional vectors, got {int(dimension)}")
+
+    def check(self, name: str, vectors: Sequence[Sequence[float]]) -> None:
+        for v in vectors:
+            self.pin(name, len(v))
+
+    def embed(self, name: str, texts: Sequence[str]) -> List[List[float]]:
+        column = self._columns.get(name)
+        if column is None:
+            raise ValueError(f"no embedder registered for vector column {name!r}")
+        vectors = column.embedder.embed_texts(list(texts))
+        if len(vectors) != len(texts):
+            raise ValueError(f"embedder for {name!r} returned {len(vectors)} vectors for {len(texts)} texts")
+        self.check(name, vectors)
+        return vectors
+
+    def query_embedder(self, name: str) -> Optional[TextEmbedder]:
+        column = self._columns.get(name)
+        return column.embedder if column is not None else self.default_embedder
+
+    def describe(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "name": c.name,
+                "dimension": self._dims.get(c.name),
+                "model_id": c.model_id,
+                "default": c.name == self._default,
+            }
+            for c in self._columns.values()
+        ]
+
+
+class VectorBackfill:
+    """Embed one vector column for the rows written before it was registered, in batches.
+
+    Returned by `backfill_vectors(...)` on the stores. `run()` works in the calling thread;
+    `start()` runs it in a daemon thread while the store keeps serving reads and writes (queries
+    keep whatever `vector_column` they name, so switch once `done`). Each batch is one embedder
+    call and one write; rows added meanwhile are embedded by `add()` itself. `on_batch(rows)` is
+    called after each written batch (e.g. to drop cached query results).
+    """
+
+    def __init__(
+        self,
+        store: Any,
+        column: str,
+        *,
+        batch_size: int = 256,
+        on_batch: Optional[Callable[[int], None]] = None,
+    ) -> None:
+        size = int(batch_size)
+        if size <= 0:
+            raise ValueError("batch_size must be > 0")
+        self._store = store
+        self.column = str(column)
+        self.batch_size = size
+        self._on_batch = on_batch
+        self.rows_filled = 0
+        self.batches = 0
+        self.error: Optional[BaseException] = None
+        self._cancelled = threading.Event()
+        self._done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def run(self) -> int:
+        """Fill batches until no row lacks the column (or `cancel()`); returns the rows filled."""
+        try:
+            while not self._cancelled.is_set():
+                n = int(self._store._backfill_batch(self.column, self.batch_size))
+                if n <= 0:
+                    break
+                self.rows_filled += n
+                self.batches += 1
+                if self._on_batch is not None:
+                    self._on_batch(n)
+        except BaseException as e:
+            self.error = e
+            raise
+        finally:
+            self._done.set()
+        return self.rows_filled
+
+    def start(self) -> "VectorBackfill":
+        if self._thread is not None:
+            raise ValueError("backfill already started")
+
+        def target() -> None:
+            try:
+                self.run()
+            except BaseException:
+                pass  # kept in `error`, re-raised by `wait()`
+
+        self._thread = threading.Thread(target=target, name=f"abstractmemory-backfill-{self.column}", daemon=True)
+        self._thread.start()
+        return self
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        """Block until the background run ends (or `timeout`); re-raises its error."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self.error is not None:
+            raise self.error
+        return self.rows_filled
+
+    def cancel(self) -> None:
+        """Stop after the current batch (filled rows stay filled; a new backfill resumes)."""
+        self._cancelled.set()
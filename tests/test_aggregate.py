@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from abstractmemory import InMemoryTripleStore, ShardedTripleStore, SQLiteTripleStore, TripleAssertion, TripleQuery
+
+
+def _open(backend: str, tmp_path: Path):
+    if backend == "inmemory":
+        return InMemoryTripleStore()
+    if backend == "sqlite":
+        return SQLiteTripleStore(tmp_path / "kg.sqlite")
+    if backend == "sharded":
+        return ShardedTripleStore(lambda shard_id: SQLiteTripleStore(tmp_path / f"{shard_id}.sqlite"))
+    pytest.importorskip("lancedb")
+    from abstractmemory import LanceDBTripleStore
+
+    return LanceDBTripleStore(tmp_path / "kg")
+
+
+def _facts():
+    rows = [
+        ("alice", "likes", "r1", "2026-01-01T00:00:00+00:00"),
+        ("alice", "likes", "r1", "2026-01-03T00:00:00+02:00"),
+        ("alice", "knows", "r1", "2026-01-02T00:00:00Z"),
+        ("bob", "likes", "r2", "2026-01-05T00:00:00+00:00"),
+        ("bob", "knows", "r2", "2026-01-04T00:00:00+00:00"),
+        ("carol", "likes", "r1", "not-a-date"),
+    ]
+    return [
+        TripleAssertion(subject=s, predicate=p, object=f"{s}-{i}", owner_id=o, observed_at=t)
+        for i, (s, p, o, t) in enumerate(rows)
+    ]
+
+
+@pytest.mark.parametrize("backend", ["inmemory", "sqlite", "lancedb", "sharded"])
+def test_aggregate_groups_counts_and_time_bounds(backend: str, tmp_path: Path) -> None:
+    store = _open(backend, tmp_path)
+    store.add(_facts())
+
+    by_predicate = store.aggregate(
+        TripleQuery(), group_by=["predicate"], metrics=["count", "min_observed_at", "max_observed_at"]
+    )
+    assert by_predicate == [
+        {
+            "predicate": "likes",
+            "count": 4,
+            "min_observed_at": "2026-01-01T00:00:00.000000+00:00",
+            "max_observed_at": "2026-01-05T00:00:00.000000+00:00",
+        },
+        {
+            "predicate": "knows",
+            "count": 2,
+            "min_observed_at": "2026-01-02T00:00:00.000000+00:00",
+            "max_observed_at": "2026-01-04T00:00:00.000000+00:00",
+        },
+    ]
+
+    top_subjects = store.aggregate(TripleQuery(scope="run", owner_id="r1", limit=2), group_by=["subject"])
+    assert top_subjects == [{"subject": "alice", "count": 3}, {"subject": "carol", "count": 1}]
+
+    assert store.aggregate(TripleQuery(subject="nobody")) == [{"count": 0}]
+    assert store.aggregate(TripleQuery(predicate="likes", since="2026-01-02T00:00:00Z")) == [{"count": 2}]
+    assert store.aggregate(TripleQuery(), group_by=["owner_id", "predicate"], metrics=["count"])[0] == {
+        "owner_id": "r1",
+        "predicate": "likes",
+        "count": 3,
+    }
+
+    with pytest.raises(ValueError):
+        store.aggregate(TripleQuery(), group_by=["confidence"])
+    with pytest.raises(ValueError):
+        store.aggregate(TripleQuery(query_vector=[1.0]))
+    store.close()
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from abstractmemory import InMemoryTripleStore, ShardedTripleStore, SQLiteTripleStore, TripleAssertion
+from abstractmemory.anchors import anchor_cues, anchor_tokens, extract_anchors
+
+
+class _CountingEmbedder:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def embed_texts(self, texts):
+        self.calls += 1
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+def _open(backend: str, tmp_path: Path, embedder=None):
+    if backend == "inmemory":
+        return InMemoryTripleStore(embedder=embedder)
+    if backend == "sqlite":
+        return SQLiteTripleStore(tmp_path / "kg.sqlite")
+    pytest.importorskip("lancedb")
+    from abstractmemory import LanceDBTripleStore
+
+    return LanceDBTripleStore(tmp_path / "kg", embedder=embedder)
+
+
+def _facts():
+    return [
+        TripleAssertion(
+            subject="alice",
+            predicate="edited",
+            object="src/abstractmemory/store.py",
+            owner_id="o1",
+            observed_at="2026-01-01T00:00:00Z",
+            provenance={"model": "GPT-4o", "span_id": "s1"},
+        ),
+        TripleAssertion(
+            subject="bob",
+            predicate="said",
+            object="ship it",
+            owner_id="o1",
+            observed_at="2026-01-02T00:00:00Z",
+            attributes={"subject_type": "Person", "evidence_quote": "Bob: per ADR-0009, store.py stays."},
+        ),
+        TripleAssertion(
+            subject="carol",
+            predicate="mentions",
+            object="store.py",
+            owner_id="o2",
+            observed_at="2026-01-03T00:00:00Z",
+        ),
+    ]
+
+
+def test_anchors_are_id_like_tokens_terms_and_facets() -> None:
+    assert anchor_tokens("See src/a/store.py, ADR-0009 and gpt-4o; the plan is fine.") == [
+        "src/a/store.py",
+        "store.py",
+        "adr-0009",
+        "gpt-4o",
+    ]
+    a = _facts()[1]
+    assert extract_anchors(a) == ("adr-0009", "bob", "ship it", "store.py", "subject_type=person")
+    assert extract_anchors(a) == extract_anchors(TripleAssertion.from_dict(a.to_dict()))
+    assert "model=gpt-4o" in extract_anchors(_facts()[0])
+    with pytest.raises(ValueError):
+        anchor_cues("   ")
+    with pytest.raises(ValueError, match="unknown anchor facet"):
+        anchor_cues(facets={"colour": "red"})
+
+
+@pytest.mark.parametrize("backend", ["inmemory", "sqlite", "lancedb"])
+def test_anchor_query_ranks_explains_and_respects_owner(backend: str, tmp_path: Path) -> None:
+    embedder = _CountingEmbedder() if backend != "sqlite" else None
+    store = _open(backend, tmp_path, embedder)
+    ids = store.add(_facts())
+    calls = embedder.calls if embedder is not None else 0
+
+    # Facet (2) + token (1) beats a token alone; equal scores fall back to recency.
+    out = store.anchor_query("where is store.py?", facets={"subject_type": "person"})
+    assert [a.assertion_id for a in out] == [ids[1], ids[2], ids[0]]
+    assert out[0].attributes["_retrieval"] == {"metric": "anchors", "score": 3.0, "anchors": ["store.py", "subject_type=person"]}
+    assert out[0].attributes["evidence_quote"].startswith("Bob:")
+
+    assert [a.assertion_id for a in store.anchor_query(["store.py"], owner_id="o2")] == [ids[2]]
+    assert [a.assertion_id for a in store.anchor_query("ADR-0009")] == [ids[1]]
+    assert [a.assertion_id for a in store.anchor_query([], facets={"model": "gpt-4o"})] == [ids[0]]
+    assert [a.assertion_id for a in store.anchor_query("alice")] == [ids[0]]
+    assert store.anchor_query("nothing-like-this-1") == []
+    assert len(store.anchor_query("store.py", limit=1)) == 1
+    assert (embedder.calls if embedder is not None else 0) == calls  # no embedding on the anchor path
+
+    store.purge([ids[2]])
+    assert [a.assertion_id for a in store.anchor_query("store.py")] == [ids[1], ids[0]]
+    more = store.add([TripleAssertion(subject="dave", predicate="opened", object="store.py", owner_id="o3")])
+    assert store.anchor_query("store.py")[0].assertion_id == more[0]
+
+
+@pytest.mark.parametrize("backend", ["inmemory", "sqlite"])
+def test_generic_anchors_do_not_seed_candidates(backend: str, tmp_path: Path) -> None:
+    store = _open(backend, tmp_path)
+    rows = [TripleAssertion(subject=f"user{i}", predicate="uses", object="gpt-4o") for i in range(6)]
+    rows.append(TripleAssertion(subject="user9", predicate="filed", object="bug-1234", attributes={"evidence_quote": "gpt-4o"}))
+    ids = store.add(rows)
+
+    out = store.anchor_query("gpt-4o bug-1234", max_postings=3)
+    # `gpt-4o` is on 7 rows: it no longer seeds candidates but still adds to the score.
+    assert [a.assertion_id for a in out] == [ids[-1]]
+    assert out[0].attributes["_retrieval"]["anchors"] == ["bug-1234", "gpt-4o"]
+    assert store.anchor_query("gpt-4o", max_postings=3) == []
+    assert len(store.anchor_query("gpt-4o", max_postings=0)) == 7
+
+
+def test_sqlite_backfills_anchors_for_existing_rows(tmp_path: Path) -> None:
+    path = tmp_path / "legacy.sqlite"
+    store = SQLiteTripleStore(path)
+    ids = store.add(_facts())
+    store.close()
+    conn = sqlite3.connect(str(path))
+    conn.execute("DROP TABLE triples_anchors")
+    conn.execute("DROP TRIGGER triples_anchors_insert")
+    conn.execute("DROP TRIGGER triples_anchors_delete")
+    conn.execute("ALTER TABLE triples DROP COLUMN anchors")
+    conn.commit()
+    conn.close()
+
+    reopened = SQLiteTripleStore(path)
+    assert [a.assertion_id for a in reopened.anchor_query("adr-0009")] == [ids[1]]
+    assert reopened.purge([ids[1]]) == 1
+    assert reopened._conn.execute("SELECT COUNT(*) FROM triples_anchors WHERE anchor = 'adr-0009'").fetchone()[0] == 0
+
+
+def test_in_memory_anchor_index_covers_snapshot_rows(tmp_path: Path) -> None:
+    store = InMemoryTripleStore()
+    ids = store.add(_facts())
+    store.save(tmp_path / "kg.snap")
+    loaded = InMemoryTripleStore.load(tmp_path / "kg.snap")
+    assert [a.assertion_id for a in loaded.anchor_query("store.py", owner_id="o1")] == [ids[1], ids[0]]
+
+
+def test_sharded_anchor_query_merges_by_score(tmp_path: Path) -> None:
+    store = ShardedTripleStore(lambda shard_id: InMemoryTripleStore())
+    ids = store.add(_facts())
+    out = store.anchor_query("store.py", facets={"subject_type": "person"})
+    assert [a.assertion_id for a in out] == [ids[1], ids[2], ids[0]]
+    assert [a.assertion_id for a in store.anchor_query("store.py", scope="run", owner_id="o2")] == [ids[2]]
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+# `benchmarks/` lives at the repository root (not shipped in the wheel).
+_ROOT = Path(__file__).resolve().parents[1]
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from benchmarks.compare import compare_reports  # noqa: E402
+from benchmarks.run import BenchConfig, run_suite  # noqa: E402
+from benchmarks.synthetic import HashingEmbedder, SyntheticKGConfig, generate_assertions  # noqa: E402
+
+
+def test_synthetic_kg_is_deterministic_and_skewed() -> None:
+    cfg = SyntheticKGConfig(entities=50, assertions=400, predicates=10, predicate_skew=1.5, owners=4, seed=9)
+    a = generate_assertions(cfg)
+    b = generate_assertions(cfg)
+    assert [x.to_dict() for x in a] == [x.to_dict() for x in b]
+    counts: dict[str, int] = {}
+    for x in a:
+        counts[x.predicate] = counts.get(x.predicate, 0) + 1
+    assert counts["p:rel_0"] > counts.get("p:rel_9", 0) * 3
+    assert {x.owner_id for x in a if x.scope == "global"} == {None}
+
+    emb = HashingEmbedder(dim=32)
+    v1, v2 = emb.embed_texts(["alice likes tea", "alice likes tea"])
+    assert v1 == v2 and abs(sum(x * x for x in v1) - 1.0) < 1e-9
+
+
+def test_benchmark_suite_emits_comparable_json(tmp_path: Path) -> None:
+    cfg = BenchConfig(
+        kg=SyntheticKGConfig(entities=30, assertions=120, owners=3),
+        backends=("inmemory", "sqlite"),
+        batch_size=50,
+        queries=5,
+        semantic_queries=3,
+        quantization_corpus=40,
+    )
+    report = json.loads(json.dumps(run_suite(cfg, workdir=tmp_path)))
+    inmem = report["backends"]["inmemory"]
+    assert inmem["add"]["rows"] == 120 and inmem["add"]["embed_calls"] == 3
+    for workload in ("point_query", "subject_scan", "anchor_index_query", "time_range_scan", "semantic_topk", "semantic_mmr"):
+        assert inmem[workload]["n"] > 0 and "p99_ms" in inmem[workload]
+    assert report["backends"]["sqlite"]["footprint"]["disk_bytes"] > 0
+    assert "skipped" in report["backends"]["sqlite"]["semantic_topk"]
+    assert report["quantization"]["float32"]["recall_at_k"] == 1.0
+
+    deltas = compare_reports(report, report)
+    assert deltas and not any(d["regression"] for d in deltas)
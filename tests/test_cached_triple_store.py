@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from abstractmemory import CachedTripleStore, InMemoryTripleStore, TripleAssertion, TripleQuery
+
+
+class _CountingEmbedder:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def embed_texts(self, texts):
+        self.calls += 1
+        return [[1.0, 0.0] if "alice" in t else [0.0, 1.0] for t in texts]
+
+
+def test_cached_store_hits_and_precise_invalidation() -> None:
+    store = CachedTripleStore(InMemoryTripleStore(), max_entries=8)
+    store.add(
+        [
+            TripleAssertion(subject="alice", predicate="likes", object="tea", scope="session", owner_id="s1"),
+            TripleAssertion(subject="bob", predicate="likes", object="coffee", scope="session", owner_id="s2"),
+        ]
+    )
+
+    q_alice = TripleQuery(subject=" Alice ", scope="session", owner_id="s1")
+    q_bob = TripleQuery(subject="bob", scope="session", owner_id="s2")
+    assert len(store.query(q_alice)) == 1
+    assert len(store.query(TripleQuery(subject="alice", scope="session", owner_id="s1"))) == 1  # same normalized key
+    assert len(store.query(q_bob)) == 1
+    assert store.stats()["hits"] == 1
+
+    # Touches s1/alice only: bob's cached entry survives, alice's is dropped.
+    store.add([TripleAssertion(subject="alice", predicate="likes", object="cake", scope="session", owner_id="s1")])
+    assert store.stats()["invalidations"] == 1
+    assert len(store.query(q_alice)) == 2
+    store.query(q_bob)
+
+    stats = store.stats()
+    assert stats["hits"] == 2 and stats["misses"] == 3
+    assert abs(stats["hit_rate"] - 0.4) < 1e-9
+    store.close()
+
+
+def test_cached_store_semantic_queries_skip_reembedding_and_evict_lru() -> None:
+    embedder = _CountingEmbedder()
+    store = CachedTripleStore(InMemoryTripleStore(embedder=embedder), max_entries=2)
+    store.add([TripleAssertion(subject="alice", predicate="is_a", object="person", scope="global")])
+    calls_after_add = embedder.calls
+
+    q = TripleQuery(query_text="alice", scope="global", limit=5)
+    first = store.query(q)
+    second = store.query(q)
+    assert first[0].subject == "alice" and second[0].subject == "alice"
+    assert embedder.calls == calls_after_add + 1
+
+    store.query(TripleQuery(query_vector=[1.0, 0.0], scope="global"))
+    store.query(TripleQuery(query_vector=[0.0, 1.0], scope="global"))
+    assert store.stats()["evictions"] == 1
+    assert store.stats()["entries"] == 2
+
+    # A global add invalidates every unpinned-owner semantic entry.
+    store.add([TripleAssertion(subject="carol", predicate="is_a", object="person", scope="global")])
+    assert store.stats()["entries"] == 0
+
+
+def test_cached_store_evicts_queries_on_mixed_case_literal_objects() -> None:
+    cache = CachedTripleStore(InMemoryTripleStore())
+    q = TripleQuery(object="Foo")
+    assert cache.query(q) == []
+    cache.add([TripleAssertion(subject="s", predicate="p", object="Foo", attributes={"literal": True})])
+    assert cache.store.query(q) != []
+    assert len(cache.query(q)) == 1
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from abstractmemory import CachedTripleStore, InMemoryTripleStore, SQLiteTripleStore, TripleAssertion
+
+
+def _open(backend: str, tmp_path: Path):
+    if backend == "inmemory":
+        return InMemoryTripleStore()
+    if backend == "sqlite":
+        return SQLiteTripleStore(tmp_path / "kg.sqlite")
+    pytest.importorskip("lancedb")
+    from abstractmemory import LanceDBTripleStore
+
+    return LanceDBTripleStore(tmp_path / "kg")
+
+
+def _facts(n: int, *, tag: str = "o", observed_at: str = "2026-03-01T00:00:00Z"):
+    return [TripleAssertion(subject="alice", predicate="likes", object=f"{tag}{i}", observed_at=observed_at) for i in range(n)]
+
+
+@pytest.mark.parametrize("backend", ["inmemory", "sqlite", "lancedb"])
+def test_changes_tail_in_insert_order_and_seq_is_never_reused(backend: str, tmp_path: Path) -> None:
+    store = CachedTripleStore(_open(backend, tmp_path))
+    assert store.last_seq() == 0 and store.changes() == []
+    ids = store.add(_facts(5))
+    # Late-arriving rows (older observed_at) still come after everything already seen.
+    late = store.add(_facts(2, tag="late", observed_at="2020-01-01T00:00:00Z"))
+
+    page = store.changes(0, limit=4)
+    assert [s for s, _ in page] == [1, 2, 3, 4]
+    assert [a.assertion_id for _, a in page] == ids[:4]
+    rest = store.changes(page[-1][0], limit=0)
+    assert [a.assertion_id for _, a in rest] == ids[4:] + late
+    assert store.last_seq() == 7
+
+    store.purge(late)  # the newest rows
+    more = store.add(_facts(1, tag="new"))
+    assert store.changes(7) == [(8, store.get_many(more)[more[0]])]
+
+
+@pytest.mark.parametrize("backend", ["inmemory", "sqlite", "lancedb"])
+def test_subscribers_hear_written_rows_only(backend: str, tmp_path: Path) -> None:
+    store = _open(backend, tmp_path)
+    heard = []
+    unsubscribe = store.subscribe(heard.append)
+    store.subscribe(lambda changes: 1 / 0)  # a failing subscriber never breaks add()
+
+    ids = store.add(_facts(3))
+    store.add(_facts(2), ids=ids[:2])  # already stored: nothing new
+    assert len(heard) == 1
+    assert [(s, a.assertion_id) for s, a in heard[0]] == [(1, ids[0]), (2, ids[1]), (3, ids[2])]
+
+    mixed = store.add(_facts(2, tag="x"), ids=[ids[0], "fresh"])
+    assert mixed == [ids[0], "fresh"]
+    assert [(s, a.assertion_id, a.object) for s, a in heard[1]] == [(4, "fresh", "x1")]
+
+    unsubscribe()
+    store.add(_facts(1, tag="y"))
+    assert len(heard) == 2
+
+
+def test_in_memory_seq_survives_snapshot_and_wal_replay(tmp_path: Path) -> None:
+    store = InMemoryTripleStore(wal_path=tmp_path / "kg.wal")
+    ids = store.add(_facts(4))
+    store.purge(ids[3:])
+    store.save(tmp_path / "kg.snap")
+    store.add(_facts(2, tag="after"))
+    expected = store.changes(0, limit=0)
+    assert [s for s, _ in expected] == [1, 2, 3, 5, 6]
+    store.close()
+
+    reopened = InMemoryTripleStore.load(tmp_path / "kg.snap", wal_path=tmp_path / "kg.wal")
+    assert reopened.changes(0, limit=0) == expected
+    assert [s for s, _ in reopened.changes(2, limit=2)] == [3, 5]
+    assert reopened.last_seq() == 6
+    reopened.add(_facts(1, tag="z"))
+    assert [s for s, _ in reopened.changes(6)] == [7]
+
+
+def test_sqlite_changes_see_other_connections(tmp_path: Path) -> None:
+    reader = SQLiteTripleStore(tmp_path / "kg.sqlite")
+    writer = SQLiteTripleStore(tmp_path / "kg.sqlite")
+    writer.add(_facts(3))
+    cursor = 0
+    seen = []
+    for _ in range(2):
+        batch = reader.changes(cursor, limit=2)
+        seen += [a.object for _, a in batch]
+        cursor = batch[-1][0]
+    assert seen == ["o0", "o1", "o2"]
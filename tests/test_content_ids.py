@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from abstractmemory import InMemoryTripleStore, SQLiteTripleStore, TripleAssertion, TripleQuery
+from abstractmemory.models import content_assertion_id
+
+
+class _Embedder:
+    def __init__(self) -> None:
+        self.texts = 0
+
+    def embed_texts(self, texts):
+        self.texts += len(texts)
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+def _open(backend: str, tmp_path: Path, embedder=None, **kwargs):
+    if backend == "inmemory":
+        return InMemoryTripleStore(embedder=embedder, **kwargs)
+    if backend == "sqlite":
+        return SQLiteTripleStore(tmp_path / "kg.sqlite", **kwargs)
+    pytest.importorskip("lancedb")
+    from abstractmemory import LanceDBTripleStore
+
+    return LanceDBTripleStore(tmp_path / "kg", embedder=embedder, **kwargs)
+
+
+def _fact(obj: str = "1", *, observed_at: str = "2026-01-01T00:00:00+00:00", **kwargs) -> TripleAssertion:
+    return TripleAssertion(subject="Alice", predicate="likes", object=obj, owner_id="r1", observed_at=observed_at, **kwargs)
+
+
+def test_content_id_is_stable_over_spelling_and_ignores_confidence() -> None:
+    a = _fact(confidence=0.9)
+    assert content_assertion_id(a) == content_assertion_id(_fact(observed_at="2026-01-01T00:00:00Z"))
+    assert content_assertion_id(a) != content_assertion_id(_fact("2"))
+    tagged = _fact(provenance={"span_id": "s1"})
+    assert content_assertion_id(tagged) == content_assertion_id(a)
+    assert content_assertion_id(tagged, provenance_keys=["span_id"]) != content_assertion_id(a, provenance_keys=["span_id"])
+
+
+@pytest.mark.parametrize("backend", ["inmemory", "sqlite", "lancedb"])
+def test_content_id_mode_makes_replays_idempotent(backend: str, tmp_path: Path) -> None:
+    embedder = _Embedder() if backend != "sqlite" else None
+    store = _open(backend, tmp_path, embedder, id_mode="content")
+    first = store.add([_fact("1"), _fact("2"), _fact("1")])
+    assert first[0] == first[2] and len(set(first)) == 2
+
+    replay = store.add([_fact("2"), _fact("3"), _fact("1", observed_at="2026-01-01T00:00:00Z")])
+    assert replay[0] == first[1] and replay[2] == first[0]
+    assert sorted(a.object for a in store.query(TripleQuery(limit=0))) == ["1", "2", "3"]
+    if embedder is not None:
+        assert embedder.texts == 3  # duplicates are dropped before embedding
+    store.close()
+
+
+def test_uuid_mode_still_appends_duplicates(tmp_path: Path) -> None:
+    store = SQLiteTripleStore(tmp_path / "kg.sqlite")
+    assert len(set(store.add([_fact(), _fact()]))) == 2
+    assert len(store.query(TripleQuery(limit=0))) == 2
+    with pytest.raises(ValueError):
+        SQLiteTripleStore(tmp_path / "other.sqlite", id_mode="hash")
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from abstractmemory import CachedTextEmbedder, InMemoryTripleStore, TripleAssertion, TripleQuery
+
+
+class _RecordingEmbedder:
+    def __init__(self) -> None:
+        self.seen: list[str] = []
+
+    def embed_texts(self, texts):
+        self.seen.extend(texts)
+        return [[float(len(t)), 0.5, -1.25] for t in texts]
+
+
+def test_cached_embedder_only_sends_misses_and_persists(tmp_path: Path) -> None:
+    inner = _RecordingEmbedder()
+    cache = CachedTextEmbedder(inner, path=tmp_path / "emb.sqlite", model_id="gw:model-a")
+    first = cache.embed_texts(["alpha", "beta", "alpha"])
+    assert inner.seen == ["alpha", "beta"]
+    assert first[0] == first[2] == [5.0, 0.5, -1.25]
+
+    assert cache.embed_texts(["beta", "gamma"]) == [[4.0, 0.5, -1.25], [5.0, 0.5, -1.25]]
+    assert inner.seen == ["alpha", "beta", "gamma"]
+    cache.close()
+
+    # Reopen: everything is served from disk; a different model id is a different space.
+    inner2 = _RecordingEmbedder()
+    reopened = CachedTextEmbedder(inner2, path=tmp_path / "emb.sqlite", model_id="gw:model-a")
+    assert reopened.embed_texts(["alpha", "gamma"]) == [[5.0, 0.5, -1.25], [5.0, 0.5, -1.25]]
+    assert inner2.seen == []
+    assert reopened.stats()["entries"] == 3 and reopened.stats()["hit_rate"] == 1.0
+
+    other = CachedTextEmbedder(inner2, path=tmp_path / "emb.sqlite", model_id="gw:model-b")
+    other.embed_texts(["alpha"])
+    assert inner2.seen == ["alpha"]
+
+
+def test_cached_embedder_requires_model_identity_and_wraps_stores(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        CachedTextEmbedder(_RecordingEmbedder(), path=tmp_path / "emb.sqlite")
+
+    inner = _RecordingEmbedder()
+    cache = CachedTextEmbedder.alongside(tmp_path / "kg", inner, model_id="m")
+    assert (tmp_path / "kg.embeddings.sqlite").exists()
+
+    facts = [TripleAssertion(subject="a", predicate="p", object="o", scope="global")]
+    InMemoryTripleStore(embedder=cache).add(facts)
+    restarted = InMemoryTripleStore(embedder=cache)
+    restarted.add(facts)
+    assert len(inner.seen) == 1
+    assert restarted.query(TripleQuery(query_vector=[1.0, 0.0, 0.0], scope="global"))[0].subject == "a"
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from abstractmemory import InMemoryTripleStore, SQLiteTripleStore, TripleAssertion, TripleQuery
+from abstractmemory.models import iso_to_epoch_us
+
+
+def _open(backend: str, tmp_path: Path):
+    if backend == "inmemory":
+        return InMemoryTripleStore()
+    if backend == "sqlite":
+        return SQLiteTripleStore(tmp_path / "kg.sqlite")
+    pytest.importorskip("lancedb")
+    from abstractmemory import LanceDBTripleStore
+
+    return LanceDBTripleStore(tmp_path / "kg")
+
+
+def _facts():
+    # Chronological order is a < b < c, but string order disagrees because of the offsets.
+    return [
+        TripleAssertion(subject="a", predicate="p", object="a", observed_at="2026-01-01T01:30:00+02:00"),
+        TripleAssertion(subject="b", predicate="p", object="b", observed_at="2026-01-01T00:00:00Z"),
+        TripleAssertion(
+            subject="c",
+            predicate="p",
+            object="c",
+            observed_at="2025-12-31T20:00:00.250000-05:00",
+            valid_from="2026-01-01T02:00:00+02:00",
+            valid_until="2026-01-02",
+        ),
+    ]
+
+
+def test_iso_to_epoch_us_normalizes_offsets_and_precision() -> None:
+    assert iso_to_epoch_us("2026-01-01T02:00:00+02:00") == iso_to_epoch_us("2026-01-01T00:00:00Z")
+    assert iso_to_epoch_us("2026-01-01T00:00:00") == iso_to_epoch_us("2026-01-01T00:00:00.000000+00:00")
+    assert iso_to_epoch_us("1970-01-01T00:00:01Z") == 1_000_000
+    assert iso_to_epoch_us("not a timestamp") is None and iso_to_epoch_us(None) is None
+    assert TripleQuery(since=" 2026-01-01T00:00:00Z ").since_us == iso_to_epoch_us("2026-01-01")
+
+
+@pytest.mark.parametrize("backend", ["inmemory", "sqlite", "lancedb"])
+def test_time_filters_and_ordering_follow_instants_not_strings(backend: str, tmp_path: Path) -> None:
+    store = _open(backend, tmp_path)
+    try:
+        store.add(_facts())
+
+        assert [a.object for a in store.query(TripleQuery(order="asc", limit=0))] == ["a", "b", "c"]
+        assert [a.object for a in store.query(TripleQuery(order="desc", limit=2))] == ["c", "b"]
+        # 23:45Z: only b (00:00Z) and c (01:00:00.25Z) are later.
+        since = store.query(TripleQuery(since="2025-12-31T23:45:00+00:00", order="asc", limit=0))
+        assert [a.object for a in since] == ["b", "c"]
+        until = store.query(TripleQuery(until="2026-01-01T01:00:00+01:00", order="asc", limit=0))
+        assert [a.object for a in until] == ["a", "b"]
+        # valid_from is 00:00Z: inclusive at the same instant written with another offset.
+        active = store.query(TripleQuery(active_at="2026-01-01T00:00:00Z", limit=0))
+        assert [a.object for a in active] == ["c", "b", "a"]
+        assert [a.object for a in store.query(TripleQuery(active_at="2025-12-31T23:59:59Z", limit=0))] == ["b", "a"]
+
+        # The original strings are kept verbatim.
+        (c,) = store.query(TripleQuery(subject="c"))
+        assert c.observed_at == "2025-12-31T20:00:00.250000-05:00"
+        assert c.valid_until == "2026-01-02"
+    finally:
+        store.close()
+
+
+def test_sqlite_migrates_and_backfills_tables_without_epoch_columns(tmp_path: Path) -> None:
+    path = tmp_path / "legacy.sqlite"
+    conn = sqlite3.connect(str(path))
+    conn.execute(
+        """
+        CREATE TABLE triples (
+          assertion_id TEXT PRIMARY KEY, subject TEXT NOT NULL, predicate TEXT NOT NULL, object TEXT NOT NULL,
+          scope TEXT NOT NULL, owner_id TEXT, observed_at TEXT NOT NULL, valid_from TEXT, valid_until TEXT,
+          confidence REAL, provenance_json TEXT, attributes_json TEXT, text TEXT
+        )
+        """
+    )
+    conn.executemany(
+        "INSERT INTO triples VALUES (?, ?, 'p', 'o', 'run', NULL, ?, NULL, NULL, NULL, '{}', '{}', '')",
+        [("1", "late", "2026-01-01T01:30:00+02:00"), ("2", "later", "2026-01-01T00:00:00Z")],
+    )
+    conn.commit()
+    conn.close()
+
+    store = SQLiteTripleStore(path)
+    try:
+        assert [a.subject for a in store.query(TripleQuery(order="asc", limit=0))] == ["late", "later"]
+        assert [a.subject for a in store.query(TripleQuery(since="2025-12-31T23:45:00Z"))] == ["later"]
+    finally:
+        store.close()
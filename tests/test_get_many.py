@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from abstractmemory import (
+    CachedTripleStore,
+    InMemoryTripleStore,
+    ShardedTripleStore,
+    SQLiteTripleStore,
+    TripleAssertion,
+    TripleQuery,
+)
+
+
+def _open(backend: str, tmp_path: Path):
+    if backend == "inmemory":
+        return InMemoryTripleStore()
+    if backend == "sqlite":
+        return SQLiteTripleStore(tmp_path / "kg.sqlite")
+    if backend == "sharded":
+        return ShardedTripleStore(lambda shard_id: SQLiteTripleStore(tmp_path / f"{shard_id}.sqlite"))
+    pytest.importorskip("lancedb")
+    from abstractmemory import LanceDBTripleStore
+
+    return LanceDBTripleStore(tmp_path / "kg")
+
+
+@pytest.mark.parametrize("backend", ["inmemory", "sqlite", "lancedb", "sharded"])
+def test_results_carry_ids_and_get_many_resolves_them(backend: str, tmp_path: Path) -> None:
+    store = CachedTripleStore(_open(backend, tmp_path))
+    facts = [
+        TripleAssertion(
+            subject=f"s{i}",
+            predicate="p",
+            object=str(i),
+            owner_id=f"r{i % 3}",
+            observed_at=f"2026-01-01T00:{i // 60:02d}:{i % 60:02d}+00:00",
+            provenance={"n": i},
+        )
+        for i in range(3000)
+    ]
+    ids = store.add(facts)
+
+    hits = store.query(TripleQuery(subject="s7"))
+    assert [h.assertion_id for h in hits] == [ids[7]]
+    assert hits[0] == facts[7]  # store-assigned ids do not affect equality
+
+    found = store.get_many(ids + ["missing"])
+    assert len(found) == 3000 and "missing" not in found
+    assert found[ids[1234]].object == "1234" and found[ids[1234]].provenance == {"n": 1234}
+    assert found[ids[1234]].assertion_id == ids[1234]
+    assert store.get_many([]) == {}
+    store.close()
+
+
+def test_assertion_id_round_trips_through_dicts() -> None:
+    a = TripleAssertion(subject="a", predicate="p", object="o", assertion_id=" x1 ")
+    assert a.assertion_id == "x1"
+    assert TripleAssertion.from_dict(a.to_dict()).assertion_id == "x1"
+    assert "assertion_id" not in TripleAssertion(subject="a", predicate="p", object="o").to_dict()
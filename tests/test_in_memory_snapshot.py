@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from abstractmemory import InMemoryTripleStore, TripleAssertion, TripleQuery
+
+
+class _Embedder:
+    def embed_texts(self, texts):
+        return [[float(len(t) % 7) - 3.0, 1.0, float(sum(map(ord, t)) % 5)] for t in texts]
+
+
+def _facts(n: int):
+    return [
+        TripleAssertion(
+            subject=f"user{i % 4}",
+            predicate="likes",
+            object=f"Item {i}" if i % 3 else f"item{i}",
+            scope="session",
+            owner_id="s1" if i % 2 else None,
+            observed_at=f"2026-01-{1 + i % 9:02d}T00:00:00Z",
+            valid_from="2026-01-05T00:00:00Z" if i % 2 else None,
+            valid_until="2026-01-07T00:00:00Z" if i % 5 == 0 else None,
+            confidence=0.5 if i % 4 else None,
+            provenance={"span_id": f"s{i}"},
+            attributes={"literal": True} if i % 3 == 1 else {},
+        )
+        for i in range(n)
+    ]
+
+
+def _ids(results):
+    return [a.assertion_id for a in results]
+
+
+@pytest.mark.parametrize("precision", ["float64", "float32", "float16", "int8", "binary"])
+def test_snapshot_round_trips_rows_ids_and_vectors(tmp_path: Path, precision: str) -> None:
+    store = InMemoryTripleStore(embedder=_Embedder(), vector_precision=precision)
+    store.add(_facts(40))
+    store.save(tmp_path / "kg.snap")
+    loaded = InMemoryTripleStore.load(tmp_path / "kg.snap", embedder=_Embedder())
+
+    everything = TripleQuery(limit=0)
+    assert loaded.query(everything) == store.query(everything)
+    assert _ids(loaded.query(everything)) == _ids(store.query(everything))
+    semantic = TripleQuery(query_text="user1 likes item 5", limit=5)
+    assert [(a.assertion_id, a.attributes["_retrieval"]["score"]) for a in loaded.query(semantic)] == [
+        (a.assertion_id, a.attributes["_retrieval"]["score"]) for a in store.query(semantic)
+    ]
+
+
+def test_loaded_store_filters_before_and_after_absorbing_the_snapshot(tmp_path: Path) -> None:
+    store = InMemoryTripleStore()
+    store.add(_facts(40))
+    store.save(tmp_path / "kg.snap")
+    loaded = InMemoryTripleStore.load(tmp_path / "kg.snap")
+
+    # Equality filters are served from the mapped snapshot (literal objects still match case-insensitively).
+    for q in (
+        TripleQuery(subject="user1", limit=0),
+        TripleQuery(object="item 4", limit=0),
+        TripleQuery(owner_id="s1", subject="user3", order="asc", limit=3),
+    ):
+        assert _ids(loaded.query(q)) == _ids(store.query(q))
+    some = _ids(store.query(TripleQuery(subject="user2", limit=3)))
+    assert set(loaded.get_many(some + ["missing"])) == set(some)
+    assert loaded.aggregate(TripleQuery(limit=0), group_by=["subject"]) == store.aggregate(TripleQuery(limit=0), group_by=["subject"])
+
+    # `active_at` needs the validity index, built when the snapshot rows are absorbed.
+    q = TripleQuery(active_at="2026-01-06T00:00:00Z", limit=0)
+    assert _ids(loaded.query(q)) == _ids(store.query(q))
+
+
+def test_adds_after_load_dedupe_against_the_snapshot_and_save_again(tmp_path: Path) -> None:
+    store = InMemoryTripleStore(id_mode="content")
+    first = store.add(_facts(10))
+    store.save(tmp_path / "kg.snap")
+    loaded = InMemoryTripleStore.load(tmp_path / "kg.snap")
+
+    ids = loaded.add(_facts(12))
+    assert ids[:10] == first
+    assert len(loaded.query(TripleQuery(limit=0))) == 12
+    loaded.save(tmp_path / "kg.snap")
+    again = InMemoryTripleStore.load(tmp_path / "kg.snap")
+    assert sorted(_ids(again.query(TripleQuery(limit=0)))) == sorted(ids)
+    assert again.purge(ids[:2]) == 2
+    assert len(again.query(TripleQuery(limit=0))) == 10
+
+
+def test_wal_replays_adds_and_purges_and_is_truncated_by_save(tmp_path: Path) -> None:
+    wal = tmp_path / "kg.wal"
+    store = InMemoryTripleStore(embedder=_Embedder(), wal_path=wal)
+    ids = store.add(_facts(6))
+    store.purge(ids[:1])
+    store.close()
+
+    reopened = InMemoryTripleStore(embedder=_Embedder(), wal_path=wal)
+    assert sorted(_ids(reopened.query(TripleQuery(limit=0)))) == sorted(ids[1:])
+    semantic = TripleQuery(query_text="user1 likes item 1", limit=3)
+    assert _ids(reopened.query(semantic)) == _ids(store.query(semantic))
+
+    reopened.save(tmp_path / "kg.snap")
+    assert wal.read_text(encoding="utf-8") == ""
+    more = reopened.add(_facts(8)[6:])
+    reopened.close()
+    with open(wal, "a", encoding="utf-8") as fh:
+        fh.write('{"op":"add","id":"torn')  # crash mid-write
+
+    restored = InMemoryTripleStore.load(tmp_path / "kg.snap", embedder=_Embedder(), wal_path=wal)
+    assert sorted(_ids(restored.query(TripleQuery(limit=0)))) == sorted(ids[1:] + more)
+
+
+@pytest.mark.parametrize("precision", ["float32", "int8"])
+def test_close_unmaps_the_snapshot(tmp_path: Path, precision: str) -> None:
+    store = InMemoryTripleStore(embedder=_Embedder(), vector_precision=precision)
+    store.add(_facts(20))
+    store.save(tmp_path / "kg.snap")
+    loaded = InMemoryTripleStore.load(tmp_path / "kg.snap", embedder=_Embedder())
+    snap = loaded._snapshot
+    assert loaded.query(TripleQuery(query_text="user1 likes item 5", limit=3))  # decodes vectors from the map
+    assert loaded.query(TripleQuery(active_at="2026-01-06T00:00:00Z", limit=0))  # absorbs the rows
+    loaded.close()
+    assert snap._mm.closed
+    loaded.close()  # idempotent
+    (tmp_path / "kg.snap").unlink()
+
+
+def test_load_rejects_files_that_are_not_snapshots(tmp_path: Path) -> None:
+    path = tmp_path / "not.snap"
+    path.write_bytes(b"x" * 64)
+    with pytest.raises(ValueError):
+        InMemoryTripleStore.load(path)
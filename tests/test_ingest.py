@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from abstractmemory import InMemoryTripleStore, IngestPipeline, SQLiteTripleStore, TripleAssertion, TripleQuery
+
+
+class _CountingEmbedder:
+    def __init__(self) -> None:
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        with self._lock:
+            self.calls += 1
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+def _data(n: int) -> List[TripleAssertion]:
+    return [
+        TripleAssertion(
+            subject=f"s{i}",
+            predicate="p",
+            object=str(i),
+            scope="run",
+            owner_id="r1",
+            observed_at=f"2026-01-01T00:{i // 60:02d}:{i % 60:02d}+00:00",
+        )
+        for i in range(n)
+    ]
+
+
+def test_pipeline_embeds_in_parallel_and_preserves_input_order() -> None:
+    embedder = _CountingEmbedder()
+    store = InMemoryTripleStore(embedder=embedder)
+    stats = IngestPipeline(store, chunk_size=7, embed_concurrency=3, queue_size=2).run(_data(100))
+
+    assert stats.rows_in == stats.rows_written == 100 and stats.chunks == 15
+    assert embedder.calls == 15
+    assert stats.to_dict()["rows_per_s"] > 0
+    hits = store.query(TripleQuery(limit=0, order="asc"))
+    assert [a.object for a in hits] == [str(i) for i in range(100)]
+    # Vectors came from the pipeline, not from a second embed inside add().
+    assert store.query(TripleQuery(query_vector=[2.0, 1.0], limit=1))
+
+
+class _FlakyStore(SQLiteTripleStore):
+    def __init__(self, path: Path, *, fail_after: int) -> None:
+        super().__init__(path)
+        self.fail_after = fail_after
+
+    def add(self, assertions):  # type: ignore[override]
+        ids = super().add(assertions)
+        self.fail_after -= 1
+        if self.fail_after < 0:
+            raise RuntimeError("disk went away")  # written, but the checkpoint never saw it
+        return ids
+
+
+def test_pipeline_resumes_from_checkpoint_without_duplicates(tmp_path: Path) -> None:
+    data = _data(50)
+    ckpt = tmp_path / "ingest.json"
+    db = tmp_path / "kg.sqlite"
+
+    flaky = _FlakyStore(db, fail_after=2)
+    with pytest.raises(RuntimeError, match="disk went away"):
+        IngestPipeline(flaky, chunk_size=10, checkpoint_path=ckpt).run(data)
+    flaky.close()
+    state = json.loads(ckpt.read_text(encoding="utf-8"))
+    assert state["offset"] == 20 and state["pending"] == {"offset": 20, "count": 10}
+
+    store = SQLiteTripleStore(db)
+    stats = IngestPipeline(store, chunk_size=10, checkpoint_path=ckpt).run(data)
+    assert stats.rows_skipped == 30 and stats.rows_written == 20
+
+    rows = store.query(TripleQuery(limit=0, order="asc"))
+    assert [a.object for a in rows] == [str(i) for i in range(50)]
+    store.close()
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+from abstractmemory import (
+    CachedTripleStore,
+    CallbackSink,
+    InMemoryTripleStore,
+    MetricsRegistry,
+    OpenTelemetrySink,
+    OperationEvent,
+    SQLiteTripleStore,
+    TripleAssertion,
+    TripleQuery,
+)
+
+
+class _Embedder:
+    def embed_texts(self, texts: Sequence[str]) -> List[List[float]]:
+        return [[1.0, float(len(t) % 3), 0.5] for t in texts]
+
+
+def _facts() -> List[TripleAssertion]:
+    return [
+        TripleAssertion(subject="alice", predicate="knows", object="bob", scope="session", owner_id="s1"),
+        TripleAssertion(subject="alice", predicate="likes", object="tea", scope="session", owner_id="s1"),
+        TripleAssertion(subject="carol", predicate="knows", object="dave", scope="session", owner_id="s2"),
+    ]
+
+
+def test_sqlite_store_reports_phases_and_row_counts(tmp_path: Path) -> None:
+    events: List[OperationEvent] = []
+    store = SQLiteTripleStore(tmp_path / "kg.sqlite", instrumentation=CallbackSink(events.append))
+    store.add(_facts())
+    store.query(TripleQuery(subject="alice", scope="session", owner_id="s1"))
+    store.close()
+
+    assert [e.operation for e in events] == ["sqlite.add", "sqlite.query"]
+    add, query = events
+    assert add.counters["rows_written"] == 3
+    assert set(add.phases) == {"encode", "sql"}
+    assert query.ok
+    assert set(query.phases) == {"sql", "decode"}
+    assert query.counters["rows_returned"] == 2
+    assert query.duration_s >= sum(query.phases.values()) * 0.99
+
+
+def test_registry_aggregates_in_memory_and_cache_events() -> None:
+    registry = MetricsRegistry()
+    store = CachedTripleStore(
+        InMemoryTripleStore(embedder=_Embedder(), instrumentation=registry),
+        instrumentation=registry,
+    )
+    store.add(_facts())
+    q = TripleQuery(query_text="who does alice know", scope="session", limit=2)
+    store.query(q)
+    store.query(q)
+
+    snap = registry.snapshot()
+    assert snap["inmemory.add"]["counters"]["embed_texts"] == 3
+    mem = snap["inmemory.query"]
+    assert mem["calls"] == 1
+    assert mem["counters"] == {"rows_scanned": 3, "embed_texts": 1, "vectors_scored": 3, "rows_returned": 2}
+    assert {"filter", "embed", "score", "sort", "materialize"} <= set(mem["phases"])
+    assert snap["cache.query"]["counters"] == {"cache_miss": 1, "cache_hit": 1}
+    assert snap["cache.query"]["latency"]["count"] == 2
+
+
+def test_failed_calls_are_recorded_and_broken_sinks_are_ignored() -> None:
+    registry = MetricsRegistry()
+    store = InMemoryTripleStore(instrumentation=registry)
+    try:
+        store.query(TripleQuery(query_text="needs an embedder"))
+    except ValueError:
+        pass
+    assert registry.snapshot()["inmemory.query"]["errors"] == 1
+
+    def _boom(_: OperationEvent) -> None:
+        raise RuntimeError("sink down")
+
+    noisy = InMemoryTripleStore(instrumentation=CallbackSink(_boom))
+    noisy.add(_facts())
+    assert len(noisy.query(TripleQuery(limit=0))) == 3
+
+
+def test_opentelemetry_sink_uses_meter_interface() -> None:
+    recorded: Dict[str, List[Any]] = {}
+
+    class _Instrument:
+        def __init__(self, name: str) -> None:
+            self.name = name
+
+        def record(self, value: float, attributes: Dict[str, Any]) -> None:
+            recorded.setdefault(self.name, []).append((value, attributes))
+
+        add = record
+
+    class _Meter:
+        def create_histogram(self, name: str, unit: str = "", description: str = "") -> _Instrument:
+            return _Instrument(name)
+
+        def create_counter(self, name: str, unit: str = "", description: str = "") -> _Instrument:
+            return _Instrument(name)
+
+    sink = OpenTelemetrySink(_Meter())
+    sink.record(OperationEvent(operation="sqlite.query", duration_s=0.002, phases={"sql": 0.001}, counters={"rows_returned": 4}))
+
+    assert recorded["abstractmemory.operation.duration"][0] == (2.0, {"operation": "sqlite.query", "ok": True})
+    assert recorded["abstractmemory.phase.duration"][0][1] == {"operation": "sqlite.query", "phase": "sql"}
+    assert recorded["abstractmemory.rows_returned"] == [(4, {"operation": "sqlite.query"})]
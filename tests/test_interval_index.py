@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from abstractmemory import InMemoryTripleStore, SQLiteTripleStore, TripleAssertion, TripleQuery
+from abstractmemory.interval_index import IntervalIndex
+
+
+def test_interval_index_matches_brute_force_with_open_ends_and_removals() -> None:
+    rng = random.Random(7)
+    index: IntervalIndex[int] = IntervalIndex(rebuild_min=8)
+    live = {}
+    for key in range(600):
+        start = rng.choice([None, rng.randint(0, 200)])
+        end = rng.choice([None, rng.randint(0, 200)])
+        index.add(key, start, end)
+        live[key] = (start, end)
+        if rng.random() < 0.05:
+            doomed = rng.sample(sorted(live), min(len(live), 6))
+            index.discard(doomed)
+            for k in doomed:
+                live.pop(k)
+        if rng.random() < 0.3:
+            at = rng.randint(-10, 210)
+            expected = [k for k, (s, e) in live.items() if (s is None or s <= at) and (e is None or at < e)]
+            assert index.stab(at) == expected
+
+
+def _bitemporal_facts(n: int = 400):
+    rng = random.Random(11)
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    facts = []
+    for i in range(n):
+        start = base + timedelta(hours=rng.randint(0, 500))
+        until = None if i % 5 == 0 else start + timedelta(hours=rng.randint(0, 48))
+        facts.append(
+            TripleAssertion(
+                subject=f"e{i % 20}",
+                predicate="located_in",
+                object=f"place{i}",
+                observed_at=(start + timedelta(minutes=rng.randint(0, 600))).isoformat(),
+                valid_from=None if i % 7 == 0 else start.isoformat(),
+                valid_until=until.isoformat() if until else None,
+            )
+        )
+    return base, facts
+
+
+def test_active_at_queries_agree_across_indexed_stores(tmp_path: Path) -> None:
+    base, facts = _bitemporal_facts()
+    memory = InMemoryTripleStore()
+    sqlite = SQLiteTripleStore(tmp_path / "kg.sqlite")
+    memory.add(facts)
+    sqlite.add(facts)
+    try:
+        assert sqlite._validity_table == "triples_validity"
+        for hours in (-1, 0, 37, 250, 499, 600):
+            at = base + timedelta(hours=hours)
+            # "valid at Y", and "as observed by X, valid at Y" (bitemporal).
+            for q in (
+                TripleQuery(active_at=at.isoformat(), limit=0),
+                TripleQuery(active_at=at.isoformat(), until=(at + timedelta(hours=2)).isoformat(), limit=0),
+                TripleQuery(active_at=at.isoformat(), since=at.isoformat(), subject="e3", limit=0),
+            ):
+                expected = {
+                    a.object
+                    for a in facts
+                    if (a.valid_from is None or a.valid_from <= q.active_at)
+                    and (a.valid_until is None or a.valid_until > q.active_at)
+                    and (q.until is None or a.observed_at <= q.until)
+                    and (q.since is None or a.observed_at >= q.since)
+                    and (q.subject is None or a.subject == q.subject)
+                }
+                assert {a.object for a in memory.query(q)} == expected
+                assert {a.object for a in sqlite.query(q)} == expected
+
+        # Removals keep the index in sync.
+        doomed = [i for i, a in sqlite.scan(TripleQuery(subject="e3", limit=0))]
+        assert sqlite.purge(doomed) == len(doomed) > 0
+        at = (base + timedelta(hours=250)).isoformat()
+        assert not [a for a in sqlite.query(TripleQuery(active_at=at, limit=0)) if a.subject == "e3"]
+        (n,) = sqlite._conn.execute("SELECT COUNT(*) FROM triples_validity").fetchone()
+        assert n == len(facts) - len(doomed)
+    finally:
+        memory.close()
+        sqlite.close()
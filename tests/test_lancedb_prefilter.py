@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import pytest
+
+from abstractmemory import CallbackSink, TraceRingBuffer, TripleAssertion, TripleQuery
+
+pytest.importorskip("lancedb")
+
+from abstractmemory import LanceDBTripleStore  # noqa: E402
+
+DIM = 16
+
+
+def _vec(rng: random.Random):
+    return [rng.gauss(0.0, 1.0) for _ in range(DIM)]
+
+
+def _seed(store: LanceDBTripleStore, *, crowd: int = 3000, rare: int = 40) -> None:
+    rng = random.Random(11)
+    facts = [TripleAssertion(subject=f"s{i}", predicate="p", object="o", owner_id="crowd") for i in range(crowd)]
+    facts += [TripleAssertion(subject=f"r{i}", predicate="p", object="o", owner_id="rare") for i in range(rare)]
+    store.add(facts, vectors=[_vec(rng) for _ in facts])
+
+
+def _indexed(tmp_path: Path, **kwargs) -> LanceDBTripleStore:
+    from lancedb.index import IvfFlat
+
+    store = LanceDBTripleStore(tmp_path / "kg", **kwargs)
+    _seed(store)
+    store.create_vector_index(config=IvfFlat(distance_type="cosine", num_partitions=64))
+    return store
+
+
+@pytest.mark.parametrize("flat_search_max_rows", [10_000, 0])
+def test_selective_owner_filter_still_fills_the_limit(tmp_path: Path, flat_search_max_rows: int) -> None:
+    store = _indexed(tmp_path, flat_search_max_rows=flat_search_max_rows)
+    q = TripleQuery(query_vector=_vec(random.Random(3)), owner_id="rare", limit=10)
+    out = store.query(q)
+    assert len(out) == 10 and {a.owner_id for a in out} == {"rare"}
+
+    if flat_search_max_rows:
+        # Small tenant: an exact scan of its rows, not an approximate probe.
+        rows = store.query(TripleQuery(query_vector=q.query_vector, owner_id="rare", limit=40))
+        scores = [a.attributes["_retrieval"]["score"] for a in rows]
+        assert scores == sorted(scores, reverse=True)
+        assert [a.assertion_id for a in out] == [a.assertion_id for a in rows[:10]]
+    assert len(store.query(TripleQuery(query_vector=q.query_vector, owner_id="rare", limit=100))) == 40
+
+
+def test_min_score_is_a_distance_bound_and_limit_is_honoured(tmp_path: Path) -> None:
+    ring = TraceRingBuffer()
+    store = _indexed(tmp_path, flat_search_max_rows=0, trace_sink=ring)
+    qv = _vec(random.Random(5))
+    out = store.query(TripleQuery(query_vector=qv, limit=25, min_score=0.2))
+    assert len(out) == 25
+    assert all(a.attributes["_retrieval"]["score"] >= 0.2 for a in out)
+    assert "min_score@distance_range" in ring.traces()[-1].pushdown
+
+    # Only rows within the bound come back, however large the limit.
+    everything = store.query(TripleQuery(query_vector=qv, min_score=0.6))
+    assert all(a.attributes["_retrieval"]["score"] >= 0.6 for a in everything)
+    assert len(store.query(TripleQuery(query_vector=qv, min_score=0.6, limit=1000))) == len(everything)
+
+
+def test_vector_index_bookkeeping(tmp_path: Path) -> None:
+    events = []
+    store = LanceDBTripleStore(tmp_path / "kg", instrumentation=CallbackSink(events.append))
+    with pytest.raises(ValueError):
+        store.create_vector_index()
+    _seed(store, crowd=300, rare=5)
+    assert store._vector_indexes == set()
+    assert ["owner_id"] in [list(i.columns) for i in store._table.list_indices()]
+
+    store.create_vector_index()
+    assert LanceDBTripleStore(tmp_path / "kg")._vector_indexes == {"vector"}
+    assert len(store.query(TripleQuery(query_vector=[1.0] * DIM, owner_id="rare", limit=5))) == 5
+
+    quantized = LanceDBTripleStore(tmp_path / "q", vector_precision="int8")
+    _seed(quantized, crowd=10, rare=1)
+    with pytest.raises(ValueError):
+        quantized.create_vector_index()
+
+
+def test_quantized_search_grows_the_pool_until_min_score_fills_the_limit(tmp_path: Path) -> None:
+    store = LanceDBTripleStore(tmp_path / "kg", vector_precision="int8", rescore_factor=1)
+    _seed(store)
+    qv = _vec(random.Random(7))
+    exact = store.query(TripleQuery(query_vector=qv, owner_id="rare", limit=0))
+    assert len(exact) == 40
+    # Exactly the 10 best rows qualify; the Hamming first pass alone ranks them only roughly.
+    threshold = exact[9].attributes["_retrieval"]["score"]
+    out = store.query(TripleQuery(query_vector=qv, owner_id="rare", limit=10, min_score=threshold))
+    assert [a.assertion_id for a in out] == [a.assertion_id for a in exact[:10]]
+    assert all(a.attributes["_retrieval"]["first_pass"] == "hamming" for a in out)
@@ -178,6 +178,51 @@ def test_where_clause_builder_escapes_and_compares():
     assert "lower(predicate) = 'says'" in where
     assert "lower(object) = 'bob''s car'" in where  # escaped
     assert "scope = 'session'" in where
-    assert "observed_at >= '2026-01-01T00:00:00+00:00'" in where
-    assert "observed_at <= '2026-02-01T00:00:00+00:00'" in where
-    assert "valid_from" in where and "valid_until" in where
+    # Time bounds compare UTC epoch microseconds.
+    assert "observed_at_us >= 1767225600000000" in where
+    assert "observed_at_us <= 1769904000000000" in where
+    assert "valid_from_us <= 1768435200000000" in where and "valid_until_us > 1768435200000000" in where
+
+    # Legacy tables (no epoch columns) and unparseable bounds keep the string comparison.
+    legacy = _build_where_clause(q, epoch_columns=False)
+    assert "observed_at >= '2026-01-01T00:00:00+00:00'" in legacy
+    assert "observed_at <= '2026-02-01T00:00:00+00:00'" in legacy
+    assert "valid_from" in legacy and "valid_until" in legacy
+    assert "observed_at >= 'someday'" in _build_where_clause(TripleQuery(since="someday"))
+
+
+def test_lancedb_scan_and_purge(tmp_path):
+    try:
+        import lancedb  # noqa: F401
+    except Exception:
+        pytest.skip("lancedb not installed")
+
+    store = LanceDBTripleStore(tmp_path / "kg")
+    ids = store.add(
+        [
+            TripleAssertion(subject="a", predicate="p", object="1", scope="run", owner_id="r1", observed_at="2026-01-01T00:00:00+00:00"),
+            TripleAssertion(subject="a", predicate="p", object="2", scope="run", owner_id="r1", observed_at="2026-01-02T00:00:00+00:00"),
+        ]
+    )
+    scanned = list(store.scan(TripleQuery(scope="run", owner_id="r1", order="asc", limit=0)))
+    assert [i for i, _ in scanned] == ids
+    assert store.purge([ids[0]]) == 1
+    assert [a.object for a in store.query(TripleQuery(scope="run", limit=0))] == ["2"]
+
+
+def test_lancedb_later_batches_keep_fields_missing_from_their_first_row(tmp_path):
+    try:
+        import lancedb  # noqa: F401
+    except Exception:
+        pytest.skip("lancedb not installed")
+
+    store = LanceDBTripleStore(tmp_path / "kg")
+    store.add([TripleAssertion(subject="x", predicate="p", object="o")])
+    store.add(
+        [
+            TripleAssertion(subject="a", predicate="p", object="o"),
+            TripleAssertion(subject="b", predicate="p", object="o", valid_from="2026-01-01T00:00:00+00:00", confidence=0.5),
+        ]
+    )
+    (b,) = store.query(TripleQuery(subject="b"))
+    assert b.valid_from == "2026-01-01T00:00:00+00:00" and b.confidence == 0.5
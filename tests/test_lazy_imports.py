@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+import abstractmemory
+
+_ROOT = Path(__file__).resolve().parents[1]
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from benchmarks.cold_start import measure_import  # noqa: E402
+
+
+def test_core_import_leaves_backends_and_http_unloaded() -> None:
+    result = measure_import(runs=1)
+    assert result["heavy_modules"] == []
+    # Generous ceiling: a regression back to eager imports costs several times this on CI machines.
+    assert result["min_ms"] < 500
+
+
+def test_lazy_exports_resolve_on_access() -> None:
+    assert set(abstractmemory.__all__) <= set(dir(abstractmemory))
+    for name in abstractmemory.__all__:
+        assert getattr(abstractmemory, name).__name__ == name
+    from abstractmemory import InMemoryTripleStore
+    from abstractmemory.in_memory_store import InMemoryTripleStore as direct
+
+    assert InMemoryTripleStore is direct
+    with pytest.raises(AttributeError):
+        abstractmemory.NoSuchStore  # noqa: B018
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from abstractmemory import InMemoryTripleStore, LanceDBTripleStore, TripleAssertion, TripleQuery
+from abstractmemory.quantization import compare_precisions, pack_sign_bits, quantize
+
+
+def _random_vectors(n: int, dim: int, seed: int) -> list[list[float]]:
+    rng = random.Random(seed)
+    return [[rng.gauss(0.0, 1.0) for _ in range(dim)] for _ in range(n)]
+
+
+class _TableEmbedder:
+    """Maps `subject` tokens to fixed vectors so tests control the geometry."""
+
+    def __init__(self, vectors: dict[str, list[float]]) -> None:
+        self._vectors = vectors
+
+    def embed_texts(self, texts):
+        return [self._vectors[t.split(" ", 1)[0]] for t in texts]
+
+
+def test_quantize_roundtrip_and_sign_bits() -> None:
+    v = [0.5, -1.0, 0.25, 0.0, 2.0, -0.125, 0.75, 1.0, -3.0]
+    assert pack_sign_bits(v) == bytes([0b10101011, 0b00000000])
+    for precision, tol in (("float32", 1e-6), ("float16", 2e-3), ("int8", 3e-2), ("binary", 3e-2)):
+        decoded = quantize(v, precision).to_list()
+        assert max(abs(a - b) for a, b in zip(decoded, v)) <= tol, precision
+
+
+@pytest.mark.parametrize("precision", ["float32", "float16", "int8", "binary"])
+def test_in_memory_quantized_search_matches_float64(precision: str) -> None:
+    vectors = _random_vectors(60, 32, seed=7)
+    emb = _TableEmbedder({f"e{i}": v for i, v in enumerate(vectors)})
+    facts = [TripleAssertion(subject=f"e{i}", predicate="p", object="o", scope="global") for i in range(60)]
+
+    exact = InMemoryTripleStore(embedder=emb)
+    exact.add(facts)
+    quant = InMemoryTripleStore(embedder=emb, vector_precision=precision, rescore_factor=8)
+    quant.add(facts)
+
+    q = TripleQuery(query_vector=vectors[11], scope="global", limit=5)
+    top_exact = [a.subject for a in exact.query(q)]
+    top_quant = quant.query(q)
+    assert top_quant[0].subject == "e11"
+    assert len(set(top_exact) & {a.subject for a in top_quant}) >= 4
+    assert top_quant[0].attributes["_retrieval"]["score"] == pytest.approx(1.0, abs=0.02)
+
+
+def test_compare_precisions_reports_recall_against_float32() -> None:
+    corpus = _random_vectors(300, 48, seed=1)
+    queries = _random_vectors(10, 48, seed=2)
+    report = compare_precisions(corpus, queries, k=10, rescore_factor=8)
+    assert report["float32"]["recall_at_k"] == 1.0
+    assert report["float16"]["recall_at_k"] >= 0.95
+    assert report["int8"]["recall_at_k"] >= 0.9
+    assert report["binary"]["recall_at_k"] >= 0.6
+    assert report["binary"]["bytes_per_vector"] < report["float32"]["bytes_per_vector"] / 3
+    assert all(r["latency_ms"] >= 0.0 for r in report.values())
+
+
+@pytest.mark.parametrize("precision", ["float16", "int8"])
+def test_lancedb_quantized_storage_and_rescoring(tmp_path, precision: str) -> None:
+    pytest.importorskip("lancedb")
+
+    vectors = _random_vectors(40, 16, seed=3)
+    emb = _TableEmbedder({f"e{i}": v for i, v in enumerate(vectors)})
+    store = LanceDBTripleStore(tmp_path / "kg", embedder=emb, vector_precision=precision)
+    store.add([TripleAssertion(subject=f"e{i}", predicate="p", object="o", scope="global") for i in range(20)])
+    store.add([TripleAssertion(subject=f"e{i}", predicate="p", object="o", scope="global") for i in range(20, 40)])
+
+    value_type = str(store._table.schema.field("vector").type.value_type)
+    assert value_type == ("halffloat" if precision == "float16" else "int8")
+
+    hits = store.query(TripleQuery(query_vector=vectors[27], scope="global", limit=3))
+    assert hits[0].subject == "e27"
+    assert hits[0].attributes["_retrieval"]["score"] == pytest.approx(1.0, abs=0.02)
+    if precision == "int8":
+        assert hits[0].attributes["_retrieval"]["first_pass"] == "hamming"
+
+    # Reopening infers the layout; a conflicting explicit precision is rejected.
+    reopened = LanceDBTripleStore(tmp_path / "kg", embedder=emb)
+    assert reopened.query(TripleQuery(query_vector=vectors[5], scope="global", limit=1))[0].subject == "e5"
+    with pytest.raises(ValueError):
+        LanceDBTripleStore(tmp_path / "kg", vector_precision="float32")
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from abstractmemory import (
+    CachedTripleStore,
+    CallbackSink,
+    InMemoryTripleStore,
+    RecallScoring,
+    TraceRingBuffer,
+    TripleAssertion,
+    TripleQuery,
+)
+
+NOW = "2026-03-01T00:00:00Z"
+
+
+def _open(backend: str, tmp_path: Path, **kwargs):
+    if backend == "inmemory":
+        return InMemoryTripleStore(**kwargs)
+    pytest.importorskip("lancedb")
+    from abstractmemory import LanceDBTripleStore
+
+    return LanceDBTripleStore(tmp_path / "kg", **kwargs)
+
+
+def _seed(store) -> None:
+    facts = [
+        (TripleAssertion(subject="old", predicate="said", object="x", observed_at="2026-01-01T00:00:00Z", confidence=1.0), [1.0, 0.0]),
+        (TripleAssertion(subject="new", predicate="said", object="x", observed_at=NOW, confidence=1.0), [0.8, 0.6]),
+        (TripleAssertion(subject="unsure", predicate="said", object="x", observed_at=NOW, confidence=0.2), [0.9, 0.4359]),
+        (TripleAssertion(subject="boosted", predicate="decided", object="x", observed_at=NOW), [0.5, 0.866]),
+    ]
+    # Old near-duplicates with a high cosine: they fill the first ANN candidates.
+    facts += [
+        (TripleAssertion(subject=f"filler{i}", predicate="said", object="y", observed_at="2025-06-01T00:00:00Z"), [0.95, 0.3122])
+        for i in range(30)
+    ]
+    store.add([a for a, _ in facts], vectors=[v for _, v in facts])
+
+
+_SCORING = RecallScoring(half_life_s=7 * 86400, confidence_weight=1.0, predicate_boosts={"Decided": 3.0}, now=NOW)
+
+
+@pytest.mark.parametrize("backend", ["inmemory", "lancedb"])
+def test_scoring_ranks_by_recency_confidence_and_boosts(backend: str, tmp_path: Path) -> None:
+    store = _open(backend, tmp_path)
+    _seed(store)
+    q = TripleQuery(query_vector=[1.0, 0.0], limit=3, scoring=_SCORING)
+
+    out = store.query(q)
+    assert [a.subject for a in out] == ["boosted", "new", "unsure"]
+    retrieval = out[0].attributes["_retrieval"]
+    assert retrieval["score"] == pytest.approx(1.5, abs=1e-3)
+    assert retrieval["cosine"] == pytest.approx(0.5, abs=1e-3)
+    assert out[2].attributes["_retrieval"]["score"] == pytest.approx(0.9 * 0.2, abs=1e-3)
+
+    # Without scoring the same query is plain cosine order.
+    assert [a.subject for a in store.query(TripleQuery(query_vector=[1.0, 0.0], limit=2))][0] == "old"
+    # `min_score` thresholds the raw cosine, not the combined score.
+    limited = store.query(TripleQuery(query_vector=[1.0, 0.0], limit=3, min_score=0.6, scoring=_SCORING))
+    assert [a.subject for a in limited] == ["new", "unsure", "old"]
+
+
+@pytest.mark.parametrize("precision", ["float32", "int8"])
+def test_lancedb_distance_stays_the_cosine_distance_under_scoring(precision: str, tmp_path: Path) -> None:
+    store = _open("lancedb", tmp_path, vector_precision=precision)
+    _seed(store)
+    out = store.query(TripleQuery(query_vector=[1.0, 0.0], limit=3, scoring=_SCORING))
+    assert out[0].subject == "boosted"
+    for a in out:
+        retrieval = a.attributes["_retrieval"]
+        assert retrieval["distance"] == pytest.approx(1.0 - retrieval["cosine"], abs=1e-4)
+
+
+def test_lancedb_fetches_only_what_the_bound_requires(tmp_path: Path) -> None:
+    events = []
+    store = _open("lancedb", tmp_path, instrumentation=CallbackSink(events.append))
+    _seed(store)
+
+    # Confidence only: unscored rows count as 1.0, so the first `limit` cosine hits already win.
+    store.query(TripleQuery(query_vector=[1.0, 0.0], limit=2, scoring=RecallScoring(confidence_weight=0.5)))
+    first = [e for e in events if e.operation == "lancedb.query"][-1]
+    assert first.counters["search_rounds"] == 1 and first.counters["rows_scanned"] == 2
+
+    # Decay and boosts push the best rows far down the cosine order: more rounds, still bounded.
+    store.query(TripleQuery(query_vector=[1.0, 0.0], limit=2, scoring=_SCORING))
+    second = [e for e in events if e.operation == "lancedb.query"][-1]
+    assert second.counters["search_rounds"] > 1
+
+
+def test_scoring_is_validated_hashable_and_traced(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        RecallScoring(half_life_s=0)
+    with pytest.raises(ValueError):
+        RecallScoring(confidence_weight=1.5)
+    with pytest.raises(ValueError):
+        RecallScoring(predicate_boosts={"p": -1})
+    with pytest.raises(ValueError):
+        RecallScoring(now="yesterday")
+    assert RecallScoring(predicate_boosts={" Decided ": 3}) == RecallScoring(predicate_boosts=(("decided", 3.0),))
+
+    ring = TraceRingBuffer()
+    store = CachedTripleStore(InMemoryTripleStore(trace_sink=ring))
+    _seed(store)
+    q = TripleQuery(query_vector=[1.0, 0.0], limit=3, scoring=_SCORING)
+    assert store.query(q) == store.query(q)
+    (trace,) = ring.traces()  # the second call was a cache hit
+    assert trace.query["scoring"] == {
+        "half_life_s": 604800.0,
+        "confidence_weight": 1.0,
+        "default_confidence": 1.0,
+        "predicate_boosts": {"decided": 3.0},
+        "now": NOW,
+    }
+    assert len(trace.query_fingerprint) == 16
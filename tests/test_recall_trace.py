@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from abstractmemory import (
+    InMemoryTripleStore,
+    RecallTrace,
+    SQLiteTripleStore,
+    TraceLog,
+    TraceRingBuffer,
+    TripleAssertion,
+    TripleQuery,
+)
+from abstractmemory.trace import read_trace_log
+
+
+class _TopicEmbedder:
+    """Two topics: texts mentioning fruit vs everything else."""
+
+    def embed_texts(self, texts):
+        return [[1.0, 0.0] if ("apple" in t or "fruit" in t) else [0.0, 1.0] for t in texts]
+
+
+def _open(backend: str, tmp_path: Path, sink: TraceRingBuffer, embedder=None):
+    if backend == "inmemory":
+        return InMemoryTripleStore(embedder=embedder, trace_sink=sink)
+    if backend == "sqlite":
+        return SQLiteTripleStore(tmp_path / "kg.sqlite", trace_sink=sink)
+    pytest.importorskip("lancedb")
+    from abstractmemory import LanceDBTripleStore
+
+    return LanceDBTripleStore(tmp_path / "kg", embedder=embedder, trace_sink=sink)
+
+
+def _facts():
+    return [
+        TripleAssertion(subject="alice", predicate="likes", object="apple", observed_at="2026-01-01T00:00:00Z"),
+        TripleAssertion(subject="alice", predicate="drives", object="car", observed_at="2026-01-02T00:00:00Z"),
+        TripleAssertion(subject="bob", predicate="likes", object="apple pie", observed_at="2026-01-03T00:00:00Z"),
+    ]
+
+
+def test_ring_buffer_keeps_the_most_recent_traces_in_order() -> None:
+    ring = TraceRingBuffer(capacity=3)
+    for i in range(5):
+        ring.record(RecallTrace(operation=f"op{i}", started_at=0.0, duration_s=0.0))
+    assert [t.operation for t in ring.traces()] == ["op2", "op3", "op4"]
+    assert [t.operation for t in ring.traces(last=2)] == ["op3", "op4"]
+    assert len(ring) == 3 and ring.recorded == 5 and ring.dropped == 2
+    ring.clear()
+    assert ring.traces() == [] and ring.recorded == 0
+    with pytest.raises(ValueError):
+        TraceRingBuffer(capacity=0)
+
+
+@pytest.mark.parametrize("backend", ["inmemory", "sqlite", "lancedb"])
+def test_structured_query_trace_reports_pushdown_and_results(backend: str, tmp_path: Path) -> None:
+    ring = TraceRingBuffer()
+    store = _open(backend, tmp_path, ring)
+    ids = store.add(_facts())
+    assert ring.traces() == []  # add() is not traced
+
+    out = store.query(TripleQuery(subject="alice", predicate="likes", limit=10))
+    (trace,) = ring.traces()
+    assert trace.operation == f"{backend}.query" and trace.ok
+    assert trace.result_ids == tuple(a.assertion_id for a in out) == (ids[0],)
+    assert trace.query == {"subject": "alice", "predicate": "likes", "limit": 10, "order": "desc"}
+    assert trace.scores == ()
+    assert trace.duration_s > 0 and trace.candidates >= 1
+    if backend == "sqlite":
+        assert trace.pushdown == ("subject@sql", "predicate@sql")
+    elif backend == "lancedb":
+        assert trace.pushdown == ("subject@where", "predicate@where")
+    else:
+        assert trace.pushdown == ()  # a scan over the rows
+        store.save(tmp_path / "kg.snap")
+        loaded = InMemoryTripleStore.load(tmp_path / "kg.snap", trace_sink=ring)
+        loaded.query(TripleQuery(subject="alice", predicate="likes"))
+        assert ring.traces()[-1].pushdown == ("subject@snapshot_codes",)
+
+
+@pytest.mark.parametrize("backend", ["inmemory", "lancedb"])
+def test_semantic_trace_counts_min_score_pruning(backend: str, tmp_path: Path) -> None:
+    ring = TraceRingBuffer()
+    store = _open(backend, tmp_path, ring, embedder=_TopicEmbedder())
+    store.add(_facts())
+
+    out = store.query(TripleQuery(query_text="fruit", min_score=0.5, limit=10))
+    trace = ring.traces()[-1]
+    assert len(out) == 2
+    # LanceDB bounds the distance in the search itself: nothing is left to prune afterwards.
+    assert trace.pruned_by_min_score == (0 if backend == "lancedb" else 1)
+    assert len(trace.scores) == 2 and all(s >= 0.5 for s in trace.scores)
+    assert trace.query["query_text"] == "fruit" and trace.query["min_score"] == 0.5
+    if backend == "lancedb":
+        assert "vector@ann" in trace.pushdown and "min_score@distance_range" in trace.pushdown
+
+
+def test_trace_round_trips_and_fingerprint_ignores_unset_fields() -> None:
+    q = TripleQuery(subject="alice", limit=5)
+    trace = RecallTrace(operation="sqlite.query", started_at=1.0, duration_s=0.002, query=q, pushdown=("subject@sql",))
+    copy = RecallTrace.from_dict(trace.to_dict())
+    assert copy.to_dict() == trace.to_dict()
+    assert copy.trace_id == trace.trace_id
+    same = RecallTrace(operation="inmemory.query", started_at=2.0, duration_s=0.1, query=TripleQuery(subject="alice", limit=5))
+    other = RecallTrace(operation="sqlite.query", started_at=1.0, duration_s=0.1, query=TripleQuery(subject="bob", limit=5))
+    assert same.query_fingerprint == trace.query_fingerprint != other.query_fingerprint
+
+
+def test_trace_log_writes_in_batches(tmp_path: Path) -> None:
+    log = TraceLog(tmp_path / "traces" / "recall.jsonl", batch_size=3)
+    store = SQLiteTripleStore(tmp_path / "kg.sqlite", trace_sink=log)
+    store.add(_facts())
+    for _ in range(4):
+        store.query(TripleQuery(subject="bob"))
+    assert len(read_trace_log(log.path)) == 3  # one full batch; the 4th is pending
+    log.close()
+    traces = read_trace_log(log.path)
+    assert len(traces) == 4 and all(t.operation == "sqlite.query" for t in traces)
+    assert traces[0].pushdown == ("subject@sql",)
+
+
+def test_failing_query_is_traced_and_untraced_store_records_nothing(tmp_path: Path) -> None:
+    ring = TraceRingBuffer()
+    store = InMemoryTripleStore(trace_sink=ring)
+    with pytest.raises(ValueError):
+        store.query(TripleQuery(query_text="x"))  # no embedder configured
+    assert [t.ok for t in ring.traces()] == [False]
+
+    untraced = InMemoryTripleStore()
+    untraced.add(_facts())
+    assert len(untraced.query(TripleQuery(subject="alice"))) == 2
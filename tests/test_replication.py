@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from abstractmemory import InMemoryTripleStore, ShardedTripleStore, SQLiteTripleStore, TripleAssertion, TripleQuery
+from abstractmemory.replication import copy_store, main
+
+
+class _Embedder:
+    def __init__(self) -> None:
+        self.texts = 0
+
+    def embed_texts(self, texts):
+        self.texts += len(texts)
+        return [[float(len(t) % 7), 1.0, float(sum(map(ord, t)) % 11)] for t in texts]
+
+
+def _facts(n: int, *, day: int = 1, same_instant: bool = False):
+    return [
+        TripleAssertion(
+            subject=f"user{i % 5}",
+            predicate="likes",
+            object=f"item{day}-{i}",
+            scope="session",
+            owner_id=f"s{i % 2}",
+            observed_at=f"2026-01-{day:02d}T00:00:00Z" if same_instant else f"2026-01-{day:02d}T00:{i // 60:02d}:{i % 60:02d}Z",
+        )
+        for i in range(n)
+    ]
+
+
+def _all(store) -> dict:
+    return {a.assertion_id: a for a in store.query(TripleQuery(limit=0))}
+
+
+def test_copy_preserves_ids_and_pages_through_shared_instants(tmp_path: Path) -> None:
+    src = SQLiteTripleStore(tmp_path / "edge.sqlite")
+    src.add(_facts(40) + _facts(25, day=2, same_instant=True))
+    dst = InMemoryTripleStore(embedder=_Embedder())
+
+    stats = copy_store(src, dst, batch_size=10)
+    assert _all(dst) == _all(src)
+    assert stats.rows_sent == 65 and stats.vectors_copied == 0
+    assert dst.embedder.texts == 65  # SQLite has no vectors: the destination embeds
+
+    # Copying again is a no-op: ids already present are skipped.
+    copy_store(src, dst, batch_size=7)
+    assert len(_all(dst)) == 65 and dst.embedder.texts == 65
+
+
+def test_copy_passes_stored_vectors_through_without_reembedding(tmp_path: Path) -> None:
+    src = InMemoryTripleStore(embedder=_Embedder(), vector_precision="int8")
+    src.add(_facts(30))
+    dst_embedder = _Embedder()
+    dst = InMemoryTripleStore(embedder=dst_embedder)
+
+    stats = copy_store(src, dst, where=TripleQuery(owner_id="s1"), batch_size=4)
+    assert stats.vectors_copied == 15 and dst_embedder.texts == 0
+    assert set(_all(dst)) == {a.assertion_id for a in src.query(TripleQuery(owner_id="s1", limit=0))}
+    q = TripleQuery(query_vector=[1.0, 1.0, 3.0], owner_id="s1", limit=5)
+    assert [a.assertion_id for a in dst.query(q)] == [a.assertion_id for a in src.query(q)]
+
+
+def test_incremental_sync_resumes_from_the_watermark(tmp_path: Path) -> None:
+    src = SQLiteTripleStore(tmp_path / "edge.sqlite")
+    src.add(_facts(20))
+    dst = ShardedTripleStore(lambda shard_id: SQLiteTripleStore(tmp_path / f"{shard_id}.sqlite"), manifest_path=tmp_path / "shards.json")
+    state = tmp_path / "sync.json"
+
+    first = copy_store(src, dst, batch_size=6, state_path=state)
+    assert first.rows_sent == 20 and first.watermark_us is not None
+    src.add(_facts(5, day=3))
+    second = copy_store(src, dst, batch_size=6, state_path=state)
+    # Only the last instant of the previous run is re-read (and skipped by id in the destination).
+    assert second.rows_sent == 6
+    assert _all(dst) == _all(src)
+
+
+def test_resumed_sync_keeps_a_later_where_since(tmp_path: Path) -> None:
+    src = InMemoryTripleStore()
+    src.add(_facts(10))
+    dst = InMemoryTripleStore()
+    state = tmp_path / "sync.json"
+    copy_store(src, dst, state_path=state)
+    src.add(_facts(10, day=2) + _facts(10, day=5))
+
+    later = TripleQuery(since="2026-01-04T00:00:00Z")
+    stats = copy_store(src, dst, where=later, state_path=state)
+    # Day 2 is past the watermark but before `where.since`: it stays out.
+    assert stats.rows_sent == 10
+    copied = [a.object for a in dst.query(TripleQuery(limit=0))]
+    assert not any(o.startswith("item2-") for o in copied)
+    assert sum(o.startswith("item5-") for o in copied) == 10
+
+
+def test_cli_copies_into_a_snapshot(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    src = SQLiteTripleStore(tmp_path / "edge.sqlite")
+    src.add(_facts(12))
+    src.close()
+    assert main([f"sqlite:{tmp_path / 'edge.sqlite'}", f"snapshot:{tmp_path / 'kg.snap'}", "--batch-size", "5"]) == 0
+    assert '"rows_sent": 12' in capsys.readouterr().out
+    restored = InMemoryTripleStore.load(tmp_path / "kg.snap")
+    assert _all(restored) == _all(SQLiteTripleStore(tmp_path / "edge.sqlite"))
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import pytest
+
+from abstractmemory import InMemoryTripleStore, ShardedTripleStore, TripleAssertion, TripleQuery
+from abstractmemory import rerank as rerank_mod
+from abstractmemory.rerank import rerank
+
+
+class _FruitEmbedder:
+    def embed_texts(self, texts):
+        out = []
+        for t in texts:
+            if "apple" in t:
+                out.append([1.0, 0.0, 0.0])
+            elif "pear" in t:
+                out.append([0.9, 0.4359, 0.0])
+            else:
+                out.append([0.6, 0.0, 0.8])
+        return out
+
+
+def _open(backend: str, tmp_path: Path, **kwargs):
+    if backend == "inmemory":
+        return InMemoryTripleStore(embedder=_FruitEmbedder(), **kwargs)
+    pytest.importorskip("lancedb")
+    from abstractmemory import LanceDBTripleStore
+
+    return LanceDBTripleStore(tmp_path / "kg", embedder=_FruitEmbedder(), **kwargs)
+
+
+def _facts(owner_id=None):
+    # Five re-assertions of the same fact, then two distinct ones.
+    facts = [
+        TripleAssertion(subject="alice", predicate="likes", object="apple", owner_id=owner_id, observed_at=f"2026-01-0{i + 1}T00:00:00Z")
+        for i in range(5)
+    ]
+    facts.append(TripleAssertion(subject="alice", predicate="likes", object="pear", owner_id=owner_id))
+    facts.append(TripleAssertion(subject="alice", predicate="drives", object="car", owner_id=owner_id))
+    return facts
+
+
+@pytest.mark.parametrize(
+    "backend,kwargs",
+    [("inmemory", {}), ("inmemory", {"vector_precision": "int8"}), ("lancedb", {}), ("lancedb", {"vector_precision": "int8"})],
+)
+def test_mmr_and_collapse_diversify_semantic_results(backend: str, kwargs: dict, tmp_path: Path) -> None:
+    store = _open(backend, tmp_path, **kwargs)
+    store.add(_facts())
+    q = dict(query_vector=[1.0, 0.0, 0.0], limit=3)
+
+    assert [a.object for a in store.query(TripleQuery(**q))] == ["apple"] * 3
+    # Collapsing keeps relevance order; MMR (novelty-leaning lambda) prefers the farther "car".
+    assert [a.object for a in store.query(TripleQuery(**q, collapse_triples=True))] == ["apple", "pear", "car"]
+    out = store.query(TripleQuery(**q, mmr_lambda=0.3))
+    assert [a.object for a in out] == ["apple", "car", "pear"]
+    retrieval = out[1].attributes["_retrieval"]
+    assert retrieval["score"] == pytest.approx(0.6, abs=0.02)
+    assert retrieval["mmr"] == pytest.approx(0.3 * 0.6 - 0.7 * 0.6, abs=0.02)
+    # lambda=1 is plain relevance ranking.
+    assert [a.object for a in store.query(TripleQuery(**q, mmr_lambda=1.0))] == ["apple"] * 3
+    # min_score still applies before reranking.
+    assert [a.object for a in store.query(TripleQuery(**q, collapse_triples=True, min_score=0.8))] == ["apple", "pear"]
+
+
+def test_numpy_and_pure_python_mmr_agree(monkeypatch: pytest.MonkeyPatch) -> None:
+    rng = random.Random(7)
+    vectors = [[rng.gauss(0.0, 1.0) for _ in range(16)] for _ in range(120)]
+    scores = sorted((rng.random() for _ in vectors), reverse=True)
+    keys = [i % 90 for i in range(120)]
+    fast = rerank(scores, vectors, keys, limit=20, mmr_lambda=0.6)
+    monkeypatch.setattr(rerank_mod, "_numpy", lambda: None)
+    slow = rerank(scores, vectors, keys, limit=20, mmr_lambda=0.6)
+    assert [i for i, _ in fast] == [i for i, _ in slow]
+    assert [m for _, m in fast] == pytest.approx([m for _, m in slow], abs=1e-5)
+    assert len({keys[i] for i, _ in fast}) == 20
+    assert rerank(scores, vectors, None, limit=3, mmr_lambda=None) == [(0, None), (1, None), (2, None)]
+
+
+def test_rerank_options_are_validated_and_ignored_by_structured_queries() -> None:
+    with pytest.raises(ValueError):
+        TripleQuery(query_text="x", mmr_lambda=1.5)
+    assert TripleQuery(mmr_pool=0).mmr_pool is None
+
+    store = InMemoryTripleStore(embedder=_FruitEmbedder())
+    store.add(_facts())
+    assert len(store.query(TripleQuery(subject="alice", mmr_lambda=0.5, collapse_triples=True))) == 7
+
+
+def test_sharded_store_collapses_across_shards() -> None:
+    store = ShardedTripleStore(lambda shard_id: InMemoryTripleStore(embedder=_FruitEmbedder()))
+    store.add(_facts("o1") + _facts("o2"))
+    out = store.query(TripleQuery(query_vector=[1.0, 0.0, 0.0], collapse_triples=True, limit=5))
+    assert [a.object for a in out] == ["apple", "pear", "car"]
+    diverse = store.query(TripleQuery(query_vector=[1.0, 0.0, 0.0], mmr_lambda=0.3, collapse_triples=True, limit=3))
+    assert [a.object for a in diverse] == ["apple", "car", "pear"]
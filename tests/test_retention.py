@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from abstractmemory import (
+    InMemoryTripleStore,
+    RetentionEngine,
+    RetentionPolicy,
+    SQLiteTripleStore,
+    TripleAssertion,
+    TripleQuery,
+)
+
+
+def _ts(day: int) -> str:
+    return f"2026-01-{day:02d}T00:00:00+00:00"
+
+
+def _seed(store) -> None:
+    store.add(
+        [
+            TripleAssertion(subject="job", predicate="status", object="queued", scope="run", owner_id="r1", observed_at=_ts(1)),
+            TripleAssertion(subject="job", predicate="status", object="running", scope="run", owner_id="r2", observed_at=_ts(9)),
+            TripleAssertion(subject="alice", predicate="mood", object="calm", scope="session", owner_id="s1", observed_at=_ts(2)),
+            TripleAssertion(subject="alice", predicate="mood", object="tense", scope="session", owner_id="s1", observed_at=_ts(3)),
+            TripleAssertion(subject="alice", predicate="mood", object="happy", scope="session", owner_id="s1", observed_at=_ts(4)),
+            TripleAssertion(subject="bob", predicate="likes", object="tea", scope="session", owner_id="s-old", observed_at=_ts(1)),
+        ]
+    )
+
+
+def test_retention_ttl_compaction_and_archive(tmp_path: Path) -> None:
+    store = SQLiteTripleStore(tmp_path / "kg.sqlite")
+    _seed(store)
+    policy = RetentionPolicy(
+        ttl_seconds={"run": 3 * 86400},
+        keep_latest=1,
+        compact_scopes=("session",),
+        archive_after_seconds={"session": 5 * 86400},
+    )
+    engine = RetentionEngine(store, policy, root=tmp_path / "retention")
+
+    preview = engine.run(now=_ts(10), dry_run=True)
+    assert (preview.expired, preview.compacted, preview.archived) == (1, 0, 4)
+    assert len(store.query(TripleQuery(limit=0))) == 6
+
+    report = engine.run(now=_ts(10))
+    assert (report.expired, report.archived) == (1, 4)
+    live = store.query(TripleQuery(limit=0))
+    assert [a.object for a in live] == ["running"]
+
+    tombstones = engine.tombstones()
+    assert {t["action"] for t in tombstones} == {"expire", "archive"}
+    assert all(t.get("applied_at") for t in tombstones)
+    assert sum(t["count"] for t in tombstones) == 5
+
+    archived = engine.query_archived(TripleQuery(scope="session", owner_id="s1", order="asc"))
+    assert [a.object for a in archived] == ["calm", "tense", "happy"]
+    merged = engine.query_archived(TripleQuery(subject="job", limit=0), include_live=True)
+    assert [a.object for a in merged] == ["running", "queued"]
+    store.close()
+
+
+
+def test_retention_keep_latest_without_archive(tmp_path: Path) -> None:
+    store = InMemoryTripleStore()
+    _seed(store)
+    engine = RetentionEngine(store, RetentionPolicy(keep_latest=2, archive_removed=False), root=tmp_path / "r")
+    report = engine.run(now=_ts(10))
+    assert report.compacted == 1 and report.archive_paths == []
+    objs = [a.object for a in store.query(TripleQuery(subject="alice", predicate="mood"))]
+    assert objs == ["happy", "tense"]
+    assert engine.tombstoned_ids() and len(engine.tombstoned_ids()) == 1
+
+
+def test_retention_resumes_pending_tombstones(tmp_path: Path) -> None:
+    store = InMemoryTripleStore()
+    _seed(store)
+    root = tmp_path / "r"
+    engine = RetentionEngine(store, RetentionPolicy(ttl_seconds={"run": 0}), root=root)
+
+    # Simulate a crash after the tombstone was written but before the purge.
+    doomed = [i for i, a in store.scan(TripleQuery(scope="run", limit=0))]
+    root.mkdir(parents=True, exist_ok=True)
+    (root / "tombstones.jsonl").write_text(
+        json.dumps({"kind": "tombstone", "tombstone_id": "t-1", "action": "expire", "assertion_ids": doomed}) + "\n",
+        encoding="utf-8",
+    )
+    report = engine.run(now=_ts(10), dry_run=False)
+    assert report.resumed == 2
+    assert report.expired == 0
+    assert store.query(TripleQuery(scope="run")) == []
+
+
+def test_retention_parquet_archive_roundtrip(tmp_path: Path) -> None:
+    pytest.importorskip("pyarrow")
+    store = InMemoryTripleStore()
+    _seed(store)
+    engine = RetentionEngine(
+        store,
+        RetentionPolicy(archive_after_seconds={"session": 86400}, archive_format="parquet"),
+        root=tmp_path / "r",
+    )
+    report = engine.run(now=_ts(10))
+    assert report.archived == 4
+    assert all(p.endswith(".parquet") for p in report.archive_paths)
+    hits = engine.query_archived(TripleQuery(subject="bob"))
+    assert [a.object for a in hits] == ["tea"]
+
+
+def test_archived_results_keep_their_original_ids(tmp_path: Path) -> None:
+    store = InMemoryTripleStore()
+    _seed(store)
+    engine = RetentionEngine(store, RetentionPolicy(archive_after_seconds={"session": 5 * 86400}), root=tmp_path / "retention")
+    report = engine.run(now=_ts(10))
+    archived = {
+        i
+        for rec in engine.tombstones()
+        if rec.get("tombstone_id") in report.tombstone_ids
+        for i in rec.get("assertion_ids") or ()
+    }
+    assert len(archived) == report.archived == 4
+    assert {a.assertion_id for a in engine.query_archived(TripleQuery(limit=0))} == archived
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+from abstractmemory import InMemoryTripleStore, ShardedTripleStore, SQLiteTripleStore, TripleAssertion, TripleQuery
+
+
+def _sqlite_factory(root: Path, opened: list[str]):
+    def _open(shard_id: str) -> SQLiteTripleStore:
+        opened.append(shard_id)
+        return SQLiteTripleStore(root / f"{shard_id}.sqlite")
+
+    return _open
+
+
+def test_sharded_store_routes_by_scope_owner_and_merges_fan_out(tmp_path: Path) -> None:
+    opened: list[str] = []
+    store = ShardedTripleStore(_sqlite_factory(tmp_path, opened), manifest_path=tmp_path / "shards.json")
+    ids = store.add(
+        [
+            TripleAssertion(subject="a", predicate="p", object="1", scope="run", owner_id="r1", observed_at="2026-01-01T00:00:01+00:00"),
+            TripleAssertion(subject="a", predicate="p", object="2", scope="run", owner_id="r2", observed_at="2026-01-01T00:00:03+00:00"),
+            TripleAssertion(subject="a", predicate="p", object="3", scope="run", owner_id="r1", observed_at="2026-01-01T00:00:02+00:00"),
+            TripleAssertion(subject="a", predicate="p", object="4", scope="session", owner_id="s/1", observed_at="2026-01-01T00:00:04+00:00"),
+        ]
+    )
+    assert len(ids) == 4 and all(ids)
+    assert store.shard_ids() == ["run__r1", "run__r2", "session__s%2F1"]
+
+    pinned = store.query(TripleQuery(scope="run", owner_id="r1", order="asc"))
+    assert [a.object for a in pinned] == ["1", "3"]
+
+    fanned = store.query(TripleQuery(subject="a", limit=3))
+    assert [a.object for a in fanned] == ["4", "2", "3"]
+
+    run_only = store.query(TripleQuery(scope="run", order="asc", limit=0))
+    assert [a.object for a in run_only] == ["1", "3", "2"]
+    store.close()
+
+    # Shard discovery survives a restart through the manifest.
+    reopened = ShardedTripleStore(_sqlite_factory(tmp_path, []), manifest_path=tmp_path / "shards.json")
+    assert len(reopened.query(TripleQuery(limit=0))) == 4
+    reopened.close()
+
+
+def test_sharded_store_lru_closes_idle_shards(tmp_path: Path) -> None:
+    opened: list[str] = []
+    store = ShardedTripleStore(_sqlite_factory(tmp_path, opened), max_open_shards=2)
+    for i in range(4):
+        store.add([TripleAssertion(subject="s", predicate="p", object=str(i), scope="run", owner_id=f"r{i}")])
+    assert store.open_shard_ids() == ["run__r2", "run__r3"]
+
+    assert [a.object for a in store.query(TripleQuery(scope="run", owner_id="r0"))] == ["0"]
+    assert store.open_shard_ids() == ["run__r3", "run__r0"]
+    assert opened.count("run__r0") == 2
+    store.close()
+
+
+def test_sharded_store_hash_partition_semantic_merge() -> None:
+    class _Embedder:
+        def embed_texts(self, texts):
+            return [[1.0, 0.0] if "close" in t else [0.6, 0.8] for t in texts]
+
+    shards: dict[str, InMemoryTripleStore] = {}
+
+    def _open(shard_id: str) -> InMemoryTripleStore:
+        return shards.setdefault(shard_id, InMemoryTripleStore(embedder=_Embedder()))
+
+    store = ShardedTripleStore(_open, partition="hash", num_shards=4, max_open_shards=None)
+    store.add([TripleAssertion(subject=f"far{i}", predicate="p", object="o", owner_id=f"o{i}") for i in range(6)])
+    store.add([TripleAssertion(subject="close", predicate="p", object="o", owner_id="o9")])
+
+    hits = store.query(TripleQuery(query_vector=[1.0, 0.0], limit=3))
+    assert len(hits) == 3
+    assert hits[0].subject == "close"
+    scores = [h.attributes["_retrieval"]["score"] for h in hits]
+    assert scores == sorted(scores, reverse=True)
+
+    assert [a.subject for a in store.query(TripleQuery(owner_id="o3"))] == ["far3"]
+    store.close()
+
+
+def test_sharded_semantic_fan_out_embeds_the_query_once() -> None:
+    class _CountingEmbedder:
+        def __init__(self) -> None:
+            self.calls = 0
+
+        def embed_texts(self, texts):
+            self.calls += 1
+            return [[1.0, 0.0] if "close" in t else [0.6, 0.8] for t in texts]
+
+    embedder = _CountingEmbedder()
+    store = ShardedTripleStore(lambda shard_id: InMemoryTripleStore(embedder=embedder), partition="hash", num_shards=8)
+    store.add([TripleAssertion(subject=f"far{i}", predicate="p", object="o", owner_id=f"o{i}") for i in range(16)])
+    store.add([TripleAssertion(subject="close", predicate="p", object="o", owner_id="o99")])
+
+    embedder.calls = 0
+    hits = store.query(TripleQuery(query_text="close", limit=3))
+    assert embedder.calls == 1
+    assert hits[0].subject == "close" and len(hits) == 3
+    store.close()
+
+
+def test_sharded_reads_do_not_create_shards_and_opens_do_not_hold_the_lock(tmp_path: Path) -> None:
+    opened: list[str] = []
+    store = ShardedTripleStore(_sqlite_factory(tmp_path, opened))
+    store.add([TripleAssertion(subject="s", predicate="p", object="o", scope="run", owner_id="r1")])
+    assert store.query(TripleQuery(scope="run", owner_id="typo")) == []
+    assert store.anchor_query("s", scope="run", owner_id="typo") == []
+    assert opened == ["run__r1"] and not (tmp_path / "run__typo.sqlite").exists()
+    store.close()
+
+    entered, gate = threading.Event(), threading.Event()
+
+    def _slow(shard_id: str) -> InMemoryTripleStore:
+        if shard_id == "run__slow":
+            entered.set()
+            gate.wait(5)
+        return InMemoryTripleStore()
+
+    router = ShardedTripleStore(_slow)
+    router.add([TripleAssertion(subject="s", predicate="p", object="fast", scope="run", owner_id="fast")])
+    writer = threading.Thread(target=lambda: router.add([TripleAssertion(subject="s", predicate="p", object="o", scope="run", owner_id="slow")]))
+    writer.start()
+    assert entered.wait(5)
+    try:
+        # The slow open is in progress; other shards still answer.
+        assert [a.object for a in router.query(TripleQuery(scope="run", owner_id="fast"))] == ["fast"]
+        assert writer.is_alive()
+    finally:
+        gate.set()
+        writer.join(5)
+    assert len(router.query(TripleQuery(scope="run", owner_id="slow"))) == 1
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from abstractmemory import SQLiteTripleStore, TripleAssertion, TripleQuery
+from abstractmemory.instrumentation import MetricsRegistry
+from abstractmemory.sqlite_store import _GroupCommitter, _PendingWrite
+from abstractmemory.sqlite_writer import SQLiteWriterClient, SQLiteWriterServer
+
+
+def _fact(i: int, *, prefix: str = "item") -> TripleAssertion:
+    return TripleAssertion(subject=f"user{i % 3}", predicate="likes", object=f"{prefix}{i}", observed_at="2026-01-01T00:00:00Z")
+
+
+def test_group_commit_coalesces_concurrent_adds(tmp_path: Path) -> None:
+    metrics = MetricsRegistry()
+    store = SQLiteTripleStore(tmp_path / "kg.sqlite", group_commit_ms=50, instrumentation=metrics)
+    commits = []
+    store._conn.set_trace_callback(lambda sql: commits.append(sql) if sql.strip().upper() == "COMMIT" else None)
+    barrier = threading.Barrier(8)
+    ids = {}
+
+    def _worker(w: int) -> None:
+        barrier.wait()
+        ids[w] = store.add([_fact(w * 10 + j) for j in range(5)])
+
+    threads = [threading.Thread(target=_worker, args=(w,)) for w in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sum(len(v) for v in ids.values()) == 40
+    assert len(store.query(TripleQuery(limit=0))) == 40
+    assert len(commits) < 8
+    store.close()
+
+
+def test_group_commit_isolates_a_failing_call() -> None:
+    calls = []
+
+    def _write(batches):
+        calls.append(len(batches))
+        if any(rows == ["bad"] for _, rows in batches):
+            raise sqlite3.IntegrityError("UNIQUE constraint failed")
+        return [(len(rows), 0) for _, rows in batches]
+
+    committer = _GroupCommitter(_write, window_s=0.05, max_rows=100)
+    barrier = threading.Barrier(3)
+    results = {}
+
+    def _worker(rows) -> None:
+        barrier.wait()
+        try:
+            results[rows[0]] = committer.submit("INSERT", rows).written
+        except sqlite3.IntegrityError as e:
+            results[rows[0]] = e
+
+    threads = [threading.Thread(target=_worker, args=(rows,)) for rows in (["a", "b"], ["bad"], ["c"])]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    committer.close()
+
+    assert results["a"] == 2 and results["c"] == 1
+    assert isinstance(results["bad"], sqlite3.IntegrityError)
+    assert calls[0] == 3 and calls[1:] == [1, 1, 1]  # one group, then each call on its own
+
+
+def test_busy_database_is_retried_until_the_lock_is_released(tmp_path: Path) -> None:
+    path = tmp_path / "kg.sqlite"
+    store = SQLiteTripleStore(path, busy_timeout_s=5.0)
+    other = sqlite3.connect(str(path), isolation_level=None, check_same_thread=False)
+    other.execute("BEGIN IMMEDIATE")
+    timer = threading.Timer(0.3, lambda: other.execute("COMMIT"))
+    timer.start()
+    try:
+        assert len(store.add([_fact(1)])) == 1
+    finally:
+        timer.join()
+        other.close()
+
+    impatient = SQLiteTripleStore(path, busy_timeout_s=0.1)
+    blocker = sqlite3.connect(str(path), isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+    with pytest.raises(sqlite3.OperationalError, match="locked"):
+        impatient.add([_fact(2)])
+    blocker.execute("ROLLBACK")
+    blocker.close()
+    assert len(impatient.query(TripleQuery(limit=0))) == 1
+
+
+def test_journal_mode_is_validated(tmp_path: Path) -> None:
+    store = SQLiteTripleStore(tmp_path / "kg.sqlite", journal_mode="wal", synchronous="normal")
+    assert store._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    with pytest.raises(ValueError):
+        SQLiteTripleStore(tmp_path / "other.sqlite", journal_mode="sideways")
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Unix sockets")
+def test_writer_process_accepts_batches_over_a_unix_socket(tmp_path: Path) -> None:
+    store = SQLiteTripleStore(tmp_path / "kg.sqlite", group_commit_ms=5)
+    server = SQLiteWriterServer(store, tmp_path / "w.sock").start()
+    clients = [SQLiteWriterClient(server.socket_path) for _ in range(3)]
+    try:
+        got = [c.add([_fact(i, prefix=f"c{n}-")]) for n, c in enumerate(clients) for i in range(4)]
+        assert all(len(ids) == 1 for ids in got)
+        assert clients[0].add([_fact(0, prefix="c0-")], ids=got[0]) == got[0]
+        with pytest.raises(RuntimeError, match="ValueError"):
+            clients[1].add([_fact(7)], ids=["a", "b"])
+    finally:
+        for c in clients:
+            c.close()
+        server.close()
+    assert len(store.query(TripleQuery(limit=0))) == 12
+    assert not (tmp_path / "w.sock").exists()
+    store.close()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Unix sockets")
+def test_writer_client_drops_the_connection_after_a_late_reply(tmp_path: Path) -> None:
+    path = tmp_path / "slow.sock"
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(str(path))
+    listener.listen(1)
+    received = []
+
+    def _late_server() -> None:
+        conn, _ = listener.accept()
+        with conn, conn.makefile("rb") as rfile:
+            for line in rfile:
+                received.append(line)
+                time.sleep(0.3)  # reply after the client gave up
+                try:
+                    conn.sendall(b'{"ids": ["late"]}\n')
+                except OSError:
+                    return  # the client already hung up
+
+    server = threading.Thread(target=_late_server, daemon=True)
+    server.start()
+    client = SQLiteWriterClient(path, timeout_s=0.1)
+    try:
+        with pytest.raises(ConnectionError, match="outcome is unknown"):
+            client.add([_fact(1)])
+        with pytest.raises(ConnectionError, match="dropped"):
+            client.add([_fact(2)])
+        server.join(timeout=5.0)
+        assert len(received) == 1  # the second batch was never sent
+    finally:
+        client.close()
+        listener.close()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Unix sockets")
+def test_writer_server_only_replaces_dead_sockets(tmp_path: Path) -> None:
+    store = SQLiteTripleStore(tmp_path / "kg.sqlite")
+    regular = tmp_path / "not-a.sock"
+    regular.write_text("keep me")
+    with pytest.raises(ValueError, match="not a socket"):
+        SQLiteWriterServer(store, regular)
+    assert regular.read_text() == "keep me"
+
+    live = SQLiteWriterServer(store, tmp_path / "w.sock").start()
+    try:
+        with pytest.raises(RuntimeError, match="already listening"):
+            SQLiteWriterServer(store, live.socket_path)
+        client = SQLiteWriterClient(live.socket_path)  # the running writer kept its socket
+        assert len(client.add([_fact(1)])) == 1
+        client.close()
+    finally:
+        live.close()
+
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(tmp_path / "stale.sock"))
+    stale.close()  # bound but never listening: what a crashed writer leaves behind
+    SQLiteWriterServer(store, tmp_path / "stale.sock").close()
+    store.close()
+
+
+def test_closing_the_store_releases_blocked_writers(tmp_path: Path) -> None:
+    store = SQLiteTripleStore(tmp_path / "kg.sqlite", group_commit_ms=10_000)
+    results = []
+    writer = threading.Thread(target=lambda: results.append(store.add([_fact(1)])))
+    writer.start()
+    time.sleep(0.1)  # the writer now waits for its 10 s commit window
+    store.close()
+    writer.join(timeout=5.0)
+    assert not writer.is_alive() and len(results[0]) == 1  # committed by close(), not abandoned
+    with pytest.raises(sqlite3.ProgrammingError):
+        store.add([_fact(2)])
+
+    committer = _GroupCommitter(lambda batches: [(len(rows), 0) for _, rows in batches], window_s=0.01, max_rows=10)
+    committer.close()
+    errors = []
+
+    def late_submit() -> None:
+        try:
+            committer.submit("INSERT", ["late"])
+        except sqlite3.ProgrammingError as e:
+            errors.append(e)
+
+    late = threading.Thread(target=late_submit, daemon=True)
+    late.start()
+    late.join(timeout=5.0)
+    assert not late.is_alive() and "store closed" in str(errors[0])
+    # A write that raced in behind the stop marker is failed, not left waiting forever.
+    straggler = _PendingWrite("INSERT", ["x"])
+    committer._queue.put(straggler)
+    committer._fail_pending()
+    assert straggler.done.is_set() and isinstance(straggler.error, sqlite3.ProgrammingError)
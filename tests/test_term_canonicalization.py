@@ -33,3 +33,40 @@ def test_terms_are_canonicalized_on_write_and_query() -> None:
     assert out[0].subject == "scrooge"
     assert out[0].predicate == "related_to"
     assert out[0].object == "christmas"
+
+
+def test_stored_rows_round_trip_through_the_trusted_constructor(tmp_path) -> None:
+    import dataclasses
+    import pickle
+
+    from abstractmemory import SQLiteTripleStore
+
+    original = TripleAssertion(
+        subject=" Alice ",
+        predicate="Works_At",
+        object=" ACME Corp ",
+        scope="Session",
+        owner_id=" s1 ",
+        observed_at="2026-01-01T00:00:00+00:00",
+        valid_from=" ",
+        confidence=0.5,
+        provenance={"span_id": "x"},
+        attributes={"literal": True, "_retrieval": {"score": 1.0}},
+    )
+    store = SQLiteTripleStore(tmp_path / "kg.sqlite")
+    store.add([original])
+    (loaded,) = store.query(TripleQuery(limit=0))
+    store.close()
+
+    assert loaded == original
+    assert loaded.object == "ACME Corp"  # literal objects keep their case
+    assert loaded.owner_id == "s1" and loaded.valid_from is None
+
+    # Slotted dataclass: no per-instance __dict__, still frozen and picklable.
+    assert not hasattr(loaded, "__dict__")
+    try:
+        loaded.subject = "bob"  # type: ignore[misc]
+        raise AssertionError("TripleAssertion must stay frozen")
+    except dataclasses.FrozenInstanceError:
+        pass
+    assert pickle.loads(pickle.dumps(loaded)) == loaded
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from abstractmemory import CachedTripleStore, InMemoryTripleStore, TripleAssertion, TripleQuery, VectorColumn
+
+
+class _OldModel:
+    model_id = "old-2d"
+
+    def embed_texts(self, texts):
+        return [[1.0, 0.0] if "apple" in t else [0.0, 1.0] for t in texts]
+
+
+class _NewModel:
+    model_id = "new-3d"
+
+    def __init__(self, gate: threading.Event | None = None) -> None:
+        self.calls = 0
+        self.gate = gate
+
+    def embed_texts(self, texts):
+        self.calls += 1
+        if self.gate is not None:
+            self.gate.wait(5)
+        return [[0.0, 0.0, 1.0] if "pear" in t else [1.0, 0.0, 0.0] for t in texts]
+
+
+def _open(backend: str, tmp_path: Path, **kwargs):
+    if backend == "inmemory":
+        return InMemoryTripleStore(embedder=_OldModel(), **kwargs)
+    pytest.importorskip("lancedb")
+    from abstractmemory import LanceDBTripleStore
+
+    return LanceDBTripleStore(tmp_path / "kg", embedder=_OldModel(), **kwargs)
+
+
+def _facts(n: int = 5):
+    return [TripleAssertion(subject=f"u{i}", predicate="likes", object="pear" if i % 2 else "apple") for i in range(n)]
+
+
+@pytest.mark.parametrize("backend", ["inmemory", "lancedb"])
+def test_new_column_is_backfilled_and_queries_route_to_its_embedder(backend: str, tmp_path: Path) -> None:
+    store = _open(backend, tmp_path)
+    ids = store.add(_facts())
+    new = _NewModel()
+    store.add_vector_column(VectorColumn("vector_v2", new))
+
+    # Until backfilled, the new column only holds rows added after registration.
+    more = store.add([TripleAssertion(subject="late", predicate="likes", object="pear")])
+    assert [a.assertion_id for a in store.query(TripleQuery(query_text="pear", vector_column="vector_v2"))] == more
+    assert len(store.query(TripleQuery(query_text="pear", limit=3))) == 3  # the old column keeps working
+
+    job = store.backfill_vectors("vector_v2", batch_size=2)
+    assert job.done and job.rows_filled == 5 and job.batches == 3
+    out = store.query(TripleQuery(query_text="pear", vector_column="vector_v2", limit=10, min_score=0.9))
+    assert {a.assertion_id for a in out} == {ids[1], ids[3], more[0]}
+    assert store.get_vectors([ids[1]], vector_column="vector_v2") == {ids[1]: [0.0, 0.0, 1.0]}
+    assert store.get_vectors([ids[1]]) == {ids[1]: [0.0, 1.0]}
+    assert store.backfill_vectors("vector_v2").rows_filled == 0
+    assert {c["name"]: (c["dimension"], c["model_id"]) for c in store.vector_columns()} == {
+        "vector": (2, "old-2d"),
+        "vector_v2": (3, "new-3d"),
+    }
+
+
+@pytest.mark.parametrize("backend", ["inmemory", "lancedb"])
+def test_background_backfill_runs_while_the_store_serves(backend: str, tmp_path: Path) -> None:
+    gate = threading.Event()
+    store = _open(backend, tmp_path)
+    store.add(_facts(6))
+    store.add_vector_column(VectorColumn("vector_v2", _NewModel(gate), dimension=3))
+    job = store.backfill_vectors("vector_v2", batch_size=4, background=True)
+    assert not job.done
+    assert len(store.query(TripleQuery(query_text="apple", limit=2))) == 2
+    gate.set()
+    assert job.wait(10) == 6 and job.done
+    assert len(store.query(TripleQuery(query_text="apple", vector_column="vector_v2", limit=10))) == 6
+
+
+def test_columns_are_validated(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        VectorColumn("", _OldModel())
+    store = InMemoryTripleStore(embedder=_OldModel(), vector_columns=[VectorColumn("v2", _NewModel(), dimension=4)])
+    with pytest.raises(ValueError, match="4-dimensional"):
+        store.add(_facts(1))
+    with pytest.raises(ValueError, match="already registered"):
+        store.add_vector_column(VectorColumn("v2", _NewModel()))
+    with pytest.raises(ValueError, match="no embedder"):
+        store.backfill_vectors("v3")
+
+    pytest.importorskip("lancedb")
+    from abstractmemory import LanceDBTripleStore
+
+    lance = LanceDBTripleStore(tmp_path / "kg", embedder=_OldModel(), vector_columns=[VectorColumn("v2", _NewModel())])
+    lance.add(_facts(2))
+    # The stored column pins the dimension: a declared mismatch fails on open, a learned one on embed.
+    with pytest.raises(ValueError, match="2-dimensional vectors, got 3"):
+        LanceDBTripleStore(tmp_path / "kg", vector_columns=[VectorColumn("v2", _OldModel(), dimension=2)])
+    other_model = LanceDBTripleStore(tmp_path / "kg", embedder=_OldModel(), vector_columns=[VectorColumn("v2", _OldModel())])
+    with pytest.raises(ValueError, match="3-dimensional vectors, got 2"):
+        other_model.add(_facts(1))
+
+
+def test_wal_replays_extra_columns_and_cache_drops_on_backfill(tmp_path: Path) -> None:
+    wal = tmp_path / "kg.wal"
+    store = InMemoryTripleStore(embedder=_OldModel(), vector_columns=[VectorColumn("v2", _NewModel())], wal_path=wal)
+    ids = store.add(_facts(2))
+    reopened = InMemoryTripleStore(vector_columns=[VectorColumn("v2", _NewModel())], wal_path=wal)
+    assert reopened.get_vectors(ids, vector_column="v2") == {ids[0]: [1.0, 0.0, 0.0], ids[1]: [0.0, 0.0, 1.0]}
+
+    cached = CachedTripleStore(InMemoryTripleStore(embedder=_OldModel()))
+    cached.add(_facts(3))
+    cached.add_vector_column(VectorColumn("v2", _NewModel()))
+    q = TripleQuery(query_text="pear", vector_column="v2")
+    assert cached.query(q) == []
+    cached.backfill_vectors("v2")
+    assert len(cached.query(q)) == 3